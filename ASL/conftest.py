@@ -0,0 +1,33 @@
+"""
+Pytest configuration: makes the `src` package importable from tests/.
+"""
+
+import importlib.util
+import sys
+import types
+
+import pytest
+
+# A manual script (python src/test_agent_local.py) that needs Strands and AWS, not a test module
+collect_ignore = ["src/test_agent_local.py"]
+
+
+@pytest.fixture
+def requests_importable(monkeypatch):
+    """
+    Lets src.agent_client be imported where the requests package is not installed.
+
+    Only the import is satisfied; tests using this fixture never open an HTTP session.
+    """
+
+    if importlib.util.find_spec("requests") is not None:
+        return
+
+    requests = types.ModuleType("requests")
+    adapters = types.ModuleType("requests.adapters")
+    adapters.HTTPAdapter = object
+    requests.adapters = adapters
+    monkeypatch.setitem(sys.modules, "requests", requests)
+    monkeypatch.setitem(sys.modules, "requests.adapters", adapters)
+    for name in ("src.agent_client", "src.invoke_agent_iam"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
@@ -1,15 +1,33 @@
 """
 ASL Q&A Agent - Main Package
+
+The entrypoint names below are resolved on first access, so importing a
+lightweight submodule (e.g. src.metrics) does not load the agents, Strands or
+the AgentCore runtime.
 """
 
-from src.asl_swarm_agent import (
-    create_asl_coordinator_agent,
-    create_asl_swarm_configuration,
-    agent_invocation,
-)
+import importlib
+
+_LAZY_EXPORTS = {
+    'create_asl_coordinator_agent': 'src.asl_swarm_agent',
+    'create_asl_swarm_configuration': 'src.asl_swarm_agent',
+    'agent_invocation': 'src.asl_swarm_agent',
+}
 
 __all__ = [
     'create_asl_coordinator_agent',
     'create_asl_swarm_configuration',
     'agent_invocation',
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
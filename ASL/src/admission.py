@@ -0,0 +1,237 @@
+"""
+ASL Admission Control
+
+Concurrency limiter in front of the Swarm.
+
+At most `max_concurrent` requests run at once. Further requests wait in a bounded
+priority queue (interactive users ahead of batch jobs, first-come first-served
+within a class) for at most `max_queue_wait_seconds`. When the queue is full a
+new request is rejected immediately - or, if it outranks the lowest-priority
+waiter, takes that waiter's place - so spikes are shed quickly instead of piling
+up model calls until everything times out.
+
+Exported metrics:
+
+- admission.in_flight, admission.queue_depth{priority}: gauges
+- admission.admitted{priority}, admission.shed{priority,reason}: counters
+- admission.queue_wait_ms{priority}: observations
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Sequence
+
+from src.metrics import metrics
+
+
+# Priority classes, highest first
+DEFAULT_PRIORITIES = ("interactive", "batch")
+
+
+class Overloaded(Exception):
+    """
+    Raised when a request is shed instead of admitted.
+
+    Attributes:
+        reason: "queue_full", "queue_timeout", "deadline" or "displaced"
+        retry_after: Suggested seconds before the caller tries again
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "priority", "future")
+
+    def __init__(self, rank: int, seq: int, priority: str, future: "asyncio.Future"):
+        self.rank = rank
+        self.seq = seq
+        self.priority = priority
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class AdmissionController:
+    """
+    Bounded-concurrency gate with a bounded, prioritized wait queue.
+
+    All methods must be called from the event loop serving the requests.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 16,
+        max_queue_depth: int = 64,
+        max_queue_wait_seconds: float = 5.0,
+        priorities: Sequence[str] = DEFAULT_PRIORITIES,
+    ):
+        """
+        Args:
+            max_concurrent: Requests allowed to run at once
+            max_queue_depth: Requests allowed to wait; 0 rejects as soon as all slots are busy
+            max_queue_wait_seconds: Longest a request may wait before it is rejected
+            priorities: Priority class names, highest first
+        """
+
+        self.max_concurrent = max_concurrent
+        self.max_queue_depth = max_queue_depth
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self.priorities = tuple(priorities)
+        self._ranks: Dict[str, int] = {name: rank for rank, name in enumerate(self.priorities)}
+        self._in_flight = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def normalize_priority(self, priority: Optional[str]) -> str:
+        """Maps unknown or missing priorities to the lowest class."""
+
+        return priority if priority in self._ranks else self.priorities[-1]
+
+    def _retry_after(self) -> float:
+        # Rough time for the current backlog to drain through the free slots
+        return round(max(1.0, self.max_queue_wait_seconds * (1 + len(self._queue)) / max(1, self.max_concurrent)), 1)
+
+    def _publish(self) -> None:
+        metrics.set_gauge("admission.in_flight", self._in_flight)
+        for name in self.priorities:
+            metrics.set_gauge("admission.queue_depth", sum(1 for w in self._queue if w.priority == name), priority=name)
+
+    def _shed(self, priority: str, reason: str) -> Overloaded:
+        metrics.increment("admission.shed", priority=priority, reason=reason)
+        return Overloaded(reason, self._retry_after())
+
+    def _remove(self, waiter: _Waiter) -> None:
+        try:
+            self._queue.remove(waiter)
+        except ValueError:
+            return
+        heapq.heapify(self._queue)
+
+    def _enqueue(self, priority: str) -> Optional[_Waiter]:
+        """Queues a waiter, displacing a lower-priority one if the queue is full."""
+
+        rank = self._ranks[priority]
+        if len(self._queue) >= self.max_queue_depth:
+            # The newest waiter of the lowest class gives way to a higher-priority arrival
+            victim = max(self._queue, default=None)
+            if victim is None or victim.rank <= rank:
+                return None
+            self._remove(victim)
+            victim.future.set_exception(self._shed(victim.priority, "displaced"))
+
+        waiter = _Waiter(rank, next(self._seq), priority, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        return waiter
+
+    async def acquire(self, priority: Optional[str] = None, timeout: Optional[float] = None) -> float:
+        """
+        Waits for a slot.
+
+        Args:
+            priority: Priority class; unknown values are treated as the lowest class
+            timeout: Seconds the caller can still wait (e.g. until its deadline), if
+                shorter than max_queue_wait_seconds
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            Overloaded: If the queue is full or the wait exceeded max_queue_wait_seconds or timeout
+        """
+
+        priority = self.normalize_priority(priority)
+
+        if self._in_flight < self.max_concurrent and not self._queue:
+            self._in_flight += 1
+            self._admitted(priority, 0.0)
+            return 0.0
+
+        waiter = self._enqueue(priority)
+        if waiter is None:
+            raise self._shed(priority, "queue_full")
+        self._publish()
+
+        max_wait = self.max_queue_wait_seconds
+        if timeout is not None and timeout < max_wait:
+            max_wait = timeout
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=max_wait)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            reason = "queue_timeout" if max_wait == self.max_queue_wait_seconds else "deadline"
+            raise self._shed(priority, reason) from None
+        except BaseException:
+            # Displaced (Overloaded) or cancelled because the client went away
+            self._abandon(waiter)
+            raise
+        finally:
+            self._publish()
+
+        waited = time.monotonic() - started
+        self._admitted(priority, waited)
+        return waited
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Drops a waiter that stopped waiting; passes its slot on if it was just granted one."""
+
+        if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+            self.release()
+            return
+        self._remove(waiter)
+        if not waiter.future.done():
+            waiter.future.cancel()
+
+    def _admitted(self, priority: str, waited: float) -> None:
+        metrics.increment("admission.admitted", priority=priority)
+        metrics.observe("admission.queue_wait_ms", waited * 1000, priority=priority)
+        self._publish()
+
+    def release(self) -> None:
+        """Frees a slot, handing it straight to the highest-priority waiter."""
+
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            if not waiter.future.done():
+                # The slot moves to the waiter; in_flight is unchanged
+                waiter.future.set_result(None)
+                self._publish()
+                return
+
+        self._in_flight = max(0, self._in_flight - 1)
+        self._publish()
+
+    @asynccontextmanager
+    async def admit(self, priority: Optional[str] = None):
+        """
+        Holds a slot for the duration of the block.
+
+        Yields:
+            Seconds spent waiting in the queue
+
+        Raises:
+            Overloaded: If the request was shed
+        """
+
+        waited = await self.acquire(priority)
+        try:
+            yield waited
+        finally:
+            self.release()
@@ -0,0 +1,493 @@
+"""
+ASL Agent Client
+
+Reusable asyncio client for the deployed ASL agent, shared by the invoke scripts.
+
+- OAuthAgentClient: bearer-token auth over a keep-alive requests.Session pool
+- IamAgentClient: SigV4 auth over one pooled boto3 bedrock-agentcore client
+
+Both stream the response: bytes are decoded with an incremental UTF-8 decoder (so
+a multibyte character split across chunks is never corrupted), parsed into the
+agent's stream frames, and accumulated in a list that is joined once at the end.
+Optional callbacks report time-to-first-byte and per-chunk timing.
+
+With a RetryPolicy (and optionally a HedgePolicy) from resilience.py, throttled,
+5xx and timed-out invocations are retried with backoff before any response byte
+has arrived; a partly streamed answer is never replayed. Hedged requests reuse
+the session ID, so only hedge independent, single-turn questions.
+
+With a request_timeout, the time limit is sent to the agent as "latency_budget_ms"
+so the server stops working on the request when the client would give up, and
+the client abandons the stream at the same deadline.
+
+Usage:
+    client = OAuthAgentClient(endpoint, token)
+    result = await client.invoke("How do I sign hello?")
+    print(result.text, result.timing.first_byte_ms)
+
+    async for frame in client.stream("What are Wh-questions?"):
+        ...
+"""
+
+import asyncio
+import codecs
+import json
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.resilience import HedgePolicy, RetryPolicy, resilient_stream
+
+
+# Called with the milliseconds from request start to the first response byte
+FirstByteCallback = Callable[[float], None]
+
+# Called with each decoded chunk and the milliseconds since request start
+ChunkCallback = Callable[[str, float], None]
+
+
+class AgentClientError(Exception):
+    """Raised when an invocation fails; `status_code` is set for HTTP errors."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+
+
+class StreamDecoder:
+    """
+    Incrementally decodes a UTF-8 byte stream and parses it into frames.
+
+    The agent streams server-sent events ("data: <json>" blocks); a plain text
+    body is passed through as text frames.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+        self._is_sse: Optional[bool] = None
+
+    def feed(self, data: bytes) -> tuple:
+        """
+        Decodes one chunk of bytes.
+
+        Returns:
+            (decoded text, list of complete frames)
+        """
+
+        return self._parse(self._decoder.decode(data))
+
+    def finish(self) -> tuple:
+        """Flushes the decoder and any final, unterminated event."""
+
+        text, frames = self._parse(self._decoder.decode(b"", final=True), final=True)
+        if self._is_sse and self._pending.strip():
+            frames.extend(self._parse_event(self._pending))
+            self._pending = ""
+        return text, frames
+
+    def _parse(self, text: str, final: bool = False) -> tuple:
+        if not text and not (final and self._pending):
+            return text, []
+
+        self._pending += text.replace("\r\n", "\n")
+
+        # Hold the first bytes until there are enough to tell SSE from plain text
+        if self._is_sse is None:
+            head = self._pending.lstrip()
+            if len(head) < 5 and not final:
+                return text, []
+            self._is_sse = head.startswith("data:")
+
+        if not self._is_sse:
+            body, self._pending = self._pending, ""
+            return text, [{"type": "text", "data": body}] if body else []
+
+        frames = []
+        while "\n\n" in self._pending:
+            event, self._pending = self._pending.split("\n\n", 1)
+            frames.extend(self._parse_event(event))
+        return text, frames
+
+    @staticmethod
+    def _parse_event(event: str) -> List[Any]:
+        data = "\n".join(line[5:].lstrip() for line in event.split("\n") if line.startswith("data:"))
+        if not data:
+            return []
+        try:
+            frame = json.loads(data)
+        except json.JSONDecodeError:
+            frame = data
+
+        # Plain string payloads are answer text
+        return [frame if isinstance(frame, dict) else {"type": "text", "data": str(frame)}]
+
+
+@dataclass
+class InvocationTiming:
+    """Client-side timing for one invocation."""
+
+    first_byte_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+    chunks: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class InvocationResult:
+    """Outcome of a completed invocation."""
+
+    session_id: str
+    text: str
+    frames: List[dict] = field(default_factory=list)
+    timing: InvocationTiming = field(default_factory=InvocationTiming)
+
+    @property
+    def summary(self) -> Optional[dict]:
+        """The agent's final summary frame, if it sent one."""
+
+        for frame in reversed(self.frames):
+            if frame.get("type") == "summary":
+                return frame
+        return None
+
+
+class AgentClient(ABC):
+    """
+    Base class: async streaming over a blocking, pooled transport.
+
+    Subclasses implement _open(payload, session_id), returning an iterator of
+    response byte chunks. The iterator runs in a worker thread and chunks are
+    handed to the event loop as they arrive, so many invocations can stream
+    concurrently from one event loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        request_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            pool_size: Maximum concurrent invocations (worker threads and pooled connections)
+            retry_policy: Optional retries for failures before the first response byte
+            hedge_policy: Optional hedging of invocations slow to send their first byte
+            request_timeout: Optional end-to-end limit per invocation in seconds, retries included
+        """
+
+        self.pool_size = pool_size
+        self.retry_policy = retry_policy
+        self.hedge_policy = hedge_policy
+        self.request_timeout = request_timeout
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="asl-agent-client")
+
+    @abstractmethod
+    def _open(self, payload: dict, session_id: str) -> Iterator[bytes]:
+        """
+        Sends one invocation over the transport.
+
+        Args:
+            payload: JSON request body
+            session_id: Runtime session ID for the invocation
+
+        Returns:
+            Iterator of response body chunks, run in a worker thread
+        """
+
+    async def _chunks(self, payload: dict, session_id: str) -> AsyncIterator[bytes]:
+        """Bridges the blocking chunk iterator into the event loop."""
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # The event loop closed while this worker was still reading
+                stop.set()
+
+        def pump():
+            try:
+                for chunk in self._open(payload, session_id):
+                    if stop.is_set():
+                        break
+                    put(chunk)
+            except BaseException as e:
+                put(e)
+            finally:
+                put(done)
+
+        worker = loop.run_in_executor(self._executor, pump)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Stops reading if the caller gives up early; the worker exits at the next chunk
+            stop.set()
+            if worker.done():
+                await worker
+
+    async def stream(
+        self,
+        user_input: str,
+        session_id: Optional[str] = None,
+        on_first_byte: Optional[FirstByteCallback] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+        timing: Optional[InvocationTiming] = None,
+        **payload_fields,
+    ) -> AsyncIterator[dict]:
+        """
+        Invokes the agent and yields its stream frames as they arrive.
+
+        Args:
+            user_input: The user's question
+            session_id: Optional session ID for conversation continuity
+            on_first_byte: Called once with the time to the first response byte
+            on_chunk: Called with each decoded chunk and its arrival time
+            timing: Optional InvocationTiming filled in as the stream progresses
+            **payload_fields: Extra payload fields (e.g. events=True, trace=True)
+
+        Yields:
+            Frame dictionaries ({"type": "text", "data": ...}, summary, events)
+
+        Raises:
+            AgentClientError: If the invocation fails or request_timeout passes
+        """
+
+        session_id = session_id or str(uuid.uuid4())
+        timing = timing or InvocationTiming()
+        payload = {"input": user_input, "session_id": session_id, **payload_fields}
+
+        deadline = None
+        if self.request_timeout is not None:
+            deadline = time.monotonic() + self.request_timeout
+            payload.setdefault("latency_budget_ms", int(self.request_timeout * 1000))
+
+        decoder = StreamDecoder()
+        started = time.perf_counter()
+
+        chunks = resilient_stream(
+            lambda: self._chunks(payload, session_id), self.retry_policy, self.hedge_policy, deadline=deadline
+        ).__aiter__()
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    data = await asyncio.wait_for(chunks.__anext__(), timeout)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise AgentClientError(
+                        f"Deadline exceeded after {self.request_timeout:g}s", code="deadline_exceeded"
+                    ) from None
+
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if timing.first_byte_ms is None:
+                    timing.first_byte_ms = elapsed_ms
+                    if on_first_byte is not None:
+                        on_first_byte(elapsed_ms)
+
+                timing.chunks += 1
+                timing.bytes += len(data)
+                text, frames = decoder.feed(data)
+                if text and on_chunk is not None:
+                    on_chunk(text, elapsed_ms)
+                for frame in frames:
+                    yield frame
+        finally:
+            # Closes the connection's reader when the caller stops early or the deadline passes
+            await chunks.aclose()
+
+        _, frames = decoder.finish()
+        for frame in frames:
+            yield frame
+        timing.total_ms = (time.perf_counter() - started) * 1000
+
+    async def invoke(
+        self,
+        user_input: str,
+        session_id: Optional[str] = None,
+        on_first_byte: Optional[FirstByteCallback] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        **payload_fields,
+    ) -> InvocationResult:
+        """
+        Invokes the agent and returns the complete answer.
+
+        Arguments are the same as stream(), plus:
+
+        Args:
+            on_text: Called with each piece of answer text as it arrives
+
+        Returns:
+            InvocationResult with the answer text, all frames and timing
+
+        Raises:
+            AgentClientError: If the invocation fails or the agent reports an error
+        """
+
+        session_id = session_id or str(uuid.uuid4())
+        timing = InvocationTiming()
+        frames: List[dict] = []
+        parts: List[str] = []
+
+        async for frame in self.stream(
+            user_input,
+            session_id=session_id,
+            on_first_byte=on_first_byte,
+            on_chunk=on_chunk,
+            timing=timing,
+            **payload_fields,
+        ):
+            frames.append(frame)
+            if frame.get("type") == "text":
+                parts.append(frame.get("data", ""))
+                if on_text is not None:
+                    on_text(frame.get("data", ""))
+            elif frame.get("type") == "error":
+                raise AgentClientError(frame.get("error", "Agent error"), code=frame.get("code"))
+
+        return InvocationResult(session_id=session_id, text="".join(parts), frames=frames, timing=timing)
+
+    def close(self) -> None:
+        """Releases worker threads and pooled connections."""
+
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+class OAuthAgentClient(AgentClient):
+    """
+    Bearer-token (OAuth/JWT) client over a keep-alive connection pool.
+    """
+
+    def __init__(self, endpoint: str, auth_token: str, pool_size: int = 10, timeout: float = 60.0, **policies):
+        """
+        Args:
+            endpoint: AgentCore runtime endpoint URL
+            auth_token: JWT bearer token
+            pool_size: Keep-alive connections kept open to the endpoint
+            timeout: Connect/read timeout in seconds
+            **policies: retry_policy / hedge_policy / request_timeout, see AgentClient
+        """
+
+        super().__init__(pool_size, **policies)
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update({"Authorization": f"Bearer {auth_token}", "Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _open(self, payload: dict, session_id: str) -> Iterator[bytes]:
+        try:
+            response = self._session.post(
+                self.endpoint,
+                headers={"X-Amzn-Bedrock-AgentCore-Runtime-Session-Id": session_id},
+                json=payload,
+                stream=True,
+                timeout=self.timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            raise AgentClientError(f"Request Error: {str(e)}") from e
+
+        with response:
+            if response.status_code >= 400:
+                raise AgentClientError(
+                    f"HTTP Error: {response.status_code} - {response.text}", status_code=response.status_code
+                )
+            # Raw bytes; decoding is done incrementally by StreamDecoder
+            yield from response.iter_content(chunk_size=None)
+
+    def close(self) -> None:
+        super().close()
+        self._session.close()
+
+
+class IamAgentClient(AgentClient):
+    """
+    SigV4 (IAM) client over one pooled, thread-safe boto3 client.
+    """
+
+    def __init__(
+        self,
+        agent_runtime_arn: str,
+        region_name: str = "us-east-1",
+        pool_size: int = 10,
+        client=None,
+        **policies,
+    ):
+        """
+        Args:
+            agent_runtime_arn: The AgentCore runtime ARN
+            region_name: AWS region
+            pool_size: Keep-alive connections kept open to the endpoint
+            client: Optional existing bedrock-agentcore client
+            **policies: retry_policy / hedge_policy / request_timeout, see AgentClient
+        """
+
+        super().__init__(pool_size, **policies)
+        self.agent_runtime_arn = agent_runtime_arn
+        self.region_name = region_name
+        if client is None:
+            import boto3
+            from botocore.config import Config
+
+            client = boto3.client(
+                "bedrock-agentcore",
+                region_name=region_name,
+                config=Config(
+                    max_pool_connections=pool_size,
+                    tcp_keepalive=True,
+                    # With a retry policy, retries happen here rather than inside botocore
+                    retries={"max_attempts": 1} if policies.get("retry_policy") else None,
+                ),
+            )
+        self._client = client
+
+    def _open(self, payload: dict, session_id: str) -> Iterator[bytes]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self._client.invoke_agent_runtime(
+                agentRuntimeArn=self.agent_runtime_arn,
+                qualifier="DEFAULT",
+                body=json.dumps(payload),
+                contentType="application/json",
+            )
+        except ClientError as e:
+            error = e.response["Error"]
+            raise AgentClientError(f"AWS Error ({error['Code']}): {error['Message']}", code=error["Code"]) from e
+
+        status_code = response["ResponseMetadata"]["HTTPStatusCode"]
+        if status_code != 200:
+            raise AgentClientError(f"Unexpected status code: {status_code}", status_code=status_code)
+
+        for event in response.get("body", []):
+            if "chunk" in event:
+                yield event["chunk"].get("bytes", b"")
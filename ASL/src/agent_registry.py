@@ -0,0 +1,238 @@
+"""
+ASL Agent Registry
+
+Process-level registry for the ASL Swarm agents.
+
+The expensive parts of the agents - Strands itself, the shared model clients,
+the static system prompts and the data their tools read - are loaded once per
+process by warm_up(). Each request then builds its own set of agents and its own
+Swarm from the factories, so conversation state is never shared between
+concurrent requests.
+"""
+
+import hashlib
+import json
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    from strands import Agent
+    from strands.multiagent import Swarm
+
+
+class AgentRegistry:
+    """
+    Warms up the process-wide agent dependencies and builds per-request agents.
+
+    Agents are built fresh for every request rather than copied from a prebuilt
+    one: a Strands Agent holds references to itself (tool caller, hook and plugin
+    registries, interrupt state) that a shallow copy would share between requests.
+    Construction only wires up objects the process already holds - the model
+    client is shared - so it stays cheap.
+    """
+
+    def __init__(
+        self,
+        factories: Dict[str, Callable[..., "Agent"]],
+        model=None,
+        swarm_settings: Optional[dict] = None,
+        system_prompts: Optional[Dict[str, str]] = None,
+        model_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            factories: Mapping of agent key to its create_* factory
+            model: Shared model instance passed to every factory; None lets each
+                factory use the provider's shared model, created on first use
+            swarm_settings: Default keyword arguments for every Swarm built
+            system_prompts: Mapping of agent key to its static system prompt,
+                used to version the answering configuration
+            model_id: Model identifier for the configuration version; defaults
+                to the model's own model_id
+        """
+
+        self._factories = dict(factories)
+        self._model = model
+        self._swarm_settings = dict(swarm_settings or {})
+        self._system_prompts = dict(system_prompts or {})
+        self._model_id = model_id
+        self._names: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+        self.config_version = self._compute_config_version()
+
+    def _compute_config_version(self) -> str:
+        """
+        Hashes everything that changes an answer: prompts, model and Swarm settings.
+
+        Caches key their entries on this version so a prompt or model change
+        never serves answers produced by the previous configuration.
+        """
+
+        config = {
+            "agents": list(self._factories),
+            "model": self._model_id or getattr(self._model, "model_id", str(self._model)),
+            "swarm_settings": self._swarm_settings,
+            "system_prompts": self._system_prompts,
+        }
+        digest = hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def update_system_prompt(self, key: str, value: Any) -> str:
+        """
+        Replaces one versioned input, e.g. the version of a reloaded data source.
+
+        Args:
+            key: Key in system_prompts
+            value: New prompt or data source version
+
+        Returns:
+            The new configuration version
+        """
+
+        # Swapped rather than mutated, so concurrent fingerprints() calls see one version or the other
+        self._system_prompts = {**self._system_prompts, key: value}
+        self.config_version = self._compute_config_version()
+        return self.config_version
+
+    def fingerprints(self, keys) -> Dict[str, str]:
+        """
+        Per-part hashes of the configuration, for answers that depend on only some agents.
+
+        Precomputed answers store the fingerprints of the parts that produced them,
+        so a prompt change invalidates just the answers of the agents it touches.
+
+        Args:
+            keys: Keys in system_prompts the answer depends on (agents, "synthesis", data sources)
+
+        Returns:
+            Key to hash, plus "model" for the model and Swarm settings shared by every agent
+        """
+
+        def digest(value) -> str:
+            return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+        fingerprints = {key: digest(self._system_prompts.get(key)) for key in keys}
+        fingerprints["model"] = digest({
+            "model": self._model_id or getattr(self._model, "model_id", str(self._model)),
+            "swarm_settings": self._swarm_settings,
+        })
+        return fingerprints
+
+    @property
+    def agent_keys(self) -> list:
+        """Keys of all registered agents, in registration order."""
+        return list(self._factories)
+
+    @property
+    def factories(self) -> Dict[str, Callable[..., "Agent"]]:
+        """Copy of the agent key to factory mapping."""
+        return dict(self._factories)
+
+    def warm_up(self) -> Dict[str, str]:
+        """
+        Builds every agent once, if that has not happened yet.
+
+        This is where Strands and the model client are first loaded, so calling it
+        ahead of the first request keeps that cost off the request path. Safe to
+        call from several threads; only the first call builds anything. The agents
+        built here are discarded; only their names are kept.
+
+        Returns:
+            Dictionary of agent key to agent name
+        """
+
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    import strands.multiagent  # noqa: F401 - loaded here rather than by the first Swarm
+
+                    self._names = {key: factory(model=self._model).name for key, factory in self._factories.items()}
+
+        return self._names
+
+    def agent_name(self, key: str) -> str:
+        """
+        Returns the name an agent runs under, as it appears in Swarm node IDs.
+
+        Args:
+            key: Agent key, e.g. "vocabulary_agent"
+
+        Returns:
+            The agent's name
+        """
+
+        return self.warm_up()[key]
+
+    def create_agents(
+        self,
+        keys: Optional[Iterable[str]] = None,
+        models: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, "Agent"]:
+        """
+        Builds an isolated set of agents for a single request.
+
+        The agents share the process's model clients and system prompts but start
+        with an empty conversation, so concurrent requests never see each other's state.
+        Only the agents the request's execution path runs need to be built.
+
+        Args:
+            keys: Agent keys to build, in any order; defaults to every registered agent
+            models: Optional per-agent models for this request, e.g. from
+                RequestTiers.models(); agents not listed use the registry's model
+
+        Returns:
+            Dictionary of agent key to a fresh agent, in registration order
+        """
+
+        self.warm_up()
+        wanted = set(self._factories if keys is None else keys)
+        models = models or {}
+
+        return {
+            key: factory(model=models.get(key, self._model))
+            for key, factory in self._factories.items()
+            if key in wanted
+        }
+
+    def create_agent(self, key: str, model: Any = None) -> "Agent":
+        """
+        Creates one fresh agent for a request, outside its set from create_agents().
+
+        Args:
+            key: Agent key, e.g. "vocabulary_agent"
+            model: Optional model for this agent; defaults to the registry's model
+
+        Returns:
+            A fresh agent
+        """
+
+        self.warm_up()
+        return self._factories[key](model=model if model is not None else self._model)
+
+    def create_swarm(
+        self,
+        agents: Dict[str, "Agent"],
+        entry_point: str = "coordinator",
+        **overrides,
+    ) -> "Swarm":
+        """
+        Creates a Swarm over a per-request set of agents.
+
+        Args:
+            agents: Agents returned by create_agents()
+            entry_point: Key of the agent the Swarm starts with
+            **overrides: Swarm settings that replace the registry defaults
+
+        Returns:
+            Swarm ready to run a single request
+        """
+
+        from strands.multiagent import Swarm
+
+        settings = {**self._swarm_settings, **overrides}
+
+        return Swarm(
+            agents=list(agents.values()),
+            entry_point=agents[entry_point],
+            **settings,
+        )
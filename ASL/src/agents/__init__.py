@@ -1,12 +1,38 @@
 """
 ASL Q&A Agent - Specialized Agent Modules
+
+The agent modules import Strands only when an agent is created, so importing the
+package for its system prompts stays cheap.
 """
 
+from . import grammar_expert, vocabulary_agent, cultural_agent, learning_agent, general_asl_agent, synthesis_agent
 from .grammar_expert import create_grammar_expert
 from .vocabulary_agent import create_vocabulary_agent
 from .cultural_agent import create_cultural_agent
 from .learning_agent import create_learning_agent
 from .general_asl_agent import create_general_asl_agent
+from .synthesis_agent import create_synthesis_agent
+
+# Static system prompts by agent key
+SPECIALIST_SYSTEM_PROMPTS = {
+    "grammar_expert": grammar_expert.SYSTEM_PROMPT,
+    "vocabulary_agent": vocabulary_agent.SYSTEM_PROMPT,
+    "cultural_agent": cultural_agent.SYSTEM_PROMPT,
+    "learning_agent": learning_agent.SYSTEM_PROMPT,
+    "general_asl_agent": general_asl_agent.SYSTEM_PROMPT,
+}
+
+SYNTHESIS_SYSTEM_PROMPT = synthesis_agent.SYSTEM_PROMPT
+
+# Default model tier by agent key
+AGENT_MODEL_TIERS = {
+    "grammar_expert": grammar_expert.MODEL_TIER,
+    "vocabulary_agent": vocabulary_agent.MODEL_TIER,
+    "cultural_agent": cultural_agent.MODEL_TIER,
+    "learning_agent": learning_agent.MODEL_TIER,
+    "general_asl_agent": general_asl_agent.MODEL_TIER,
+    "synthesis": synthesis_agent.MODEL_TIER,
+}
 
 __all__ = [
     'create_grammar_expert',
@@ -14,4 +40,8 @@ __all__ = [
     'create_cultural_agent',
     'create_learning_agent',
     'create_general_asl_agent',
+    'create_synthesis_agent',
+    'SPECIALIST_SYSTEM_PROMPTS',
+    'SYNTHESIS_SYSTEM_PROMPT',
+    'AGENT_MODEL_TIERS',
 ]
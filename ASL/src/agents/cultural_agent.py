@@ -4,18 +4,22 @@ ASL Cultural Agent
 Specializes in Deaf culture, community, history, and etiquette.
 """
 
-from strands import Agent
+import os
+from typing import TYPE_CHECKING
 
+from src.model_provider import get_model
 
-def create_cultural_agent() -> Agent:
-    """
-    Creates an agent specialized in Deaf culture and community.
+if TYPE_CHECKING:
+    from strands import Agent
 
-    Returns:
-        Agent configured with Deaf culture expertise
-    """
 
-    system_prompt = """You are an expert in Deaf culture, community, and the social aspects of American Sign Language.
+AGENT_NAME = "ASL Cultural Agent"
+AGENT_DESCRIPTION = "Expert in Deaf culture, community, history, etiquette, and social aspects of the Deaf world"
+
+# Cultural questions need care and context: large model tier (src/model_tiers.py)
+MODEL_TIER = os.getenv("ASL_MODEL_TIER_CULTURAL_AGENT", "large")
+
+SYSTEM_PROMPT = """You are an expert in Deaf culture, community, and the social aspects of American Sign Language.
 
 Your expertise includes:
 
@@ -80,11 +84,25 @@ Emphasize that Deaf culture is a linguistic and cultural minority, not a disabil
 
 Always approach topics with cultural sensitivity and awareness of diverse perspectives within the Deaf community."""
 
+
+def create_cultural_agent(model=None) -> "Agent":
+    """
+    Creates an agent specialized in Deaf culture and community.
+
+    Args:
+        model: Optional shared model instance. Defaults to the provider's shared model for MODEL_TIER.
+
+    Returns:
+        Agent configured with Deaf culture expertise
+    """
+
+    from strands import Agent
+
     agent = Agent(
-        name="ASL Cultural Agent",
-        description="Expert in Deaf culture, community, history, etiquette, and social aspects of the Deaf world",
-        instructions=system_prompt,
-        model="anthropic.claude-3-5-sonnet-20240620-v1:0",
+        name=AGENT_NAME,
+        description=AGENT_DESCRIPTION,
+        instructions=SYSTEM_PROMPT,
+        model=model or get_model(MODEL_TIER),
     )
 
     return agent
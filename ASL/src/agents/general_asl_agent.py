@@ -4,18 +4,22 @@ General ASL Agent
 Handles general ASL questions and coordinates responses across all ASL knowledge domains.
 """
 
-from strands import Agent
+import os
+from typing import TYPE_CHECKING
 
+from src.model_provider import get_model
 
-def create_general_asl_agent() -> Agent:
-    """
-    Creates a general ASL knowledge agent for broad questions.
+if TYPE_CHECKING:
+    from strands import Agent
 
-    Returns:
-        Agent configured with general ASL knowledge
-    """
 
-    system_prompt = """You are a knowledgeable assistant specializing in American Sign Language (ASL).
+AGENT_NAME = "General ASL Agent"
+AGENT_DESCRIPTION = "General knowledge agent for broad ASL questions covering language, culture, and learning"
+
+# Overview questions run on the fast model tier and escalate when needed (src/model_tiers.py)
+MODEL_TIER = os.getenv("ASL_MODEL_TIER_GENERAL_ASL_AGENT", "fast")
+
+SYSTEM_PROMPT = """You are a knowledgeable assistant specializing in American Sign Language (ASL).
 
 You have broad knowledge across all aspects of ASL including:
 - Grammar and linguistic structure
@@ -71,11 +75,25 @@ When answering:
 - Acknowledge the diversity within the Deaf community
 - Encourage continued learning and engagement"""
 
+
+def create_general_asl_agent(model=None) -> "Agent":
+    """
+    Creates a general ASL knowledge agent for broad questions.
+
+    Args:
+        model: Optional shared model instance. Defaults to the provider's shared model for MODEL_TIER.
+
+    Returns:
+        Agent configured with general ASL knowledge
+    """
+
+    from strands import Agent
+
     agent = Agent(
-        name="General ASL Agent",
-        description="General knowledge agent for broad ASL questions covering language, culture, and learning",
-        instructions=system_prompt,
-        model="anthropic.claude-3-5-sonnet-20240620-v1:0",
+        name=AGENT_NAME,
+        description=AGENT_DESCRIPTION,
+        instructions=SYSTEM_PROMPT,
+        model=model or get_model(MODEL_TIER),
     )
 
     return agent
@@ -4,18 +4,22 @@ ASL Grammar Expert Agent
 Specializes in ASL grammar, syntax, linguistic structure, and grammatical rules.
 """
 
-from strands import Agent
+import os
+from typing import TYPE_CHECKING
 
+from src.model_provider import get_model
 
-def create_grammar_expert() -> Agent:
-    """
-    Creates an agent specialized in ASL grammar and linguistic structure.
+if TYPE_CHECKING:
+    from strands import Agent
 
-    Returns:
-        Agent configured with ASL grammar expertise
-    """
 
-    system_prompt = """You are an expert in American Sign Language (ASL) grammar and linguistics.
+AGENT_NAME = "ASL Grammar Expert"
+AGENT_DESCRIPTION = "Expert in ASL grammar, syntax, linguistic structure, and grammatical rules including questions, sentence structure, and non-manual markers"
+
+# Nuanced grammar explanations need the large model tier (src/model_tiers.py)
+MODEL_TIER = os.getenv("ASL_MODEL_TIER_GRAMMAR_EXPERT", "large")
+
+SYSTEM_PROMPT = """You are an expert in American Sign Language (ASL) grammar and linguistics.
 
 Your expertise includes:
 
@@ -58,11 +62,25 @@ include both the linguistic explanation and practical examples of how they're us
 
 Always cite established ASL linguistic research when relevant."""
 
+
+def create_grammar_expert(model=None) -> "Agent":
+    """
+    Creates an agent specialized in ASL grammar and linguistic structure.
+
+    Args:
+        model: Optional shared model instance. Defaults to the provider's shared model for MODEL_TIER.
+
+    Returns:
+        Agent configured with ASL grammar expertise
+    """
+
+    from strands import Agent
+
     agent = Agent(
-        name="ASL Grammar Expert",
-        description="Expert in ASL grammar, syntax, linguistic structure, and grammatical rules including questions, sentence structure, and non-manual markers",
-        instructions=system_prompt,
-        model="anthropic.claude-3-5-sonnet-20240620-v1:0",
+        name=AGENT_NAME,
+        description=AGENT_DESCRIPTION,
+        instructions=SYSTEM_PROMPT,
+        model=model or get_model(MODEL_TIER),
     )
 
     return agent
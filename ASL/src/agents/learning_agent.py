@@ -4,18 +4,23 @@ ASL Learning Resources Agent
 Specializes in ASL learning materials, courses, tutorials, and practice resources.
 """
 
-from strands import Agent
+import os
+from typing import TYPE_CHECKING
 
+from src.model_provider import get_model
+from src.resource_index import get_resource_index, get_resource_search_tool
 
-def create_learning_agent() -> Agent:
-    """
-    Creates an agent specialized in ASL learning resources and educational materials.
+if TYPE_CHECKING:
+    from strands import Agent
 
-    Returns:
-        Agent configured with ASL learning resource expertise
-    """
 
-    system_prompt = """You are an expert in American Sign Language learning resources and educational strategies.
+AGENT_NAME = "ASL Learning Resources Agent"
+AGENT_DESCRIPTION = "Expert in ASL learning materials, courses, tutorials, practice resources, and educational strategies for all skill levels"
+
+# Resource recommendations are list-like answers: fast model tier (src/model_tiers.py)
+MODEL_TIER = os.getenv("ASL_MODEL_TIER_LEARNING_AGENT", "fast")
+
+SYSTEM_PROMPT = """You are an expert in American Sign Language learning resources and educational strategies.
 
 Your expertise includes:
 
@@ -106,11 +111,44 @@ Emphasize that learning ASL is learning a new language AND culture.
 
 Always recommend learning from Deaf instructors and native signers when possible."""
 
+
+# Appended when a resource catalog is configured (ASL_RESOURCE_INDEX_DIR, see src/resource_index.py)
+CATALOG_INSTRUCTIONS = """
+
+A curated catalog of learning resources is available. Recommend resources from the catalog
+entries included in the question or returned by the search_learning_resources tool, with their
+links, in one or two sentences each. Only search again when the provided entries do not fit the
+learner's level, budget or preferred format, and mention resources outside the catalog only when
+it has nothing suitable."""
+
+
+def system_prompt() -> str:
+    """The agent's instructions, including the catalog guidance when a resource index is configured."""
+    return SYSTEM_PROMPT + CATALOG_INSTRUCTIONS if get_resource_index() is not None else SYSTEM_PROMPT
+
+
+def create_learning_agent(model=None) -> "Agent":
+    """
+    Creates an agent specialized in ASL learning resources and educational materials.
+
+    With a resource index configured the agent gets the search_learning_resources tool.
+
+    Args:
+        model: Optional shared model instance. Defaults to the provider's shared model for MODEL_TIER.
+
+    Returns:
+        Agent configured with ASL learning resource expertise
+    """
+
+    from strands import Agent
+
+    search_tool = get_resource_search_tool()
     agent = Agent(
-        name="ASL Learning Resources Agent",
-        description="Expert in ASL learning materials, courses, tutorials, practice resources, and educational strategies for all skill levels",
-        instructions=system_prompt,
-        model="anthropic.claude-3-5-sonnet-20240620-v1:0",
+        name=AGENT_NAME,
+        description=AGENT_DESCRIPTION,
+        instructions=system_prompt(),
+        model=model or get_model(MODEL_TIER),
+        tools=[search_tool] if search_tool is not None else None,
     )
 
     return agent
@@ -0,0 +1,56 @@
+"""
+ASL Answer Synthesis Agent
+
+Merges answers from several specialists into one response for multi-domain questions.
+"""
+
+import os
+from typing import TYPE_CHECKING
+
+from src.model_provider import get_model
+
+if TYPE_CHECKING:
+    from strands import Agent
+
+
+AGENT_NAME = "ASL Answer Synthesizer"
+AGENT_DESCRIPTION = "Merges answers from several ASL specialists into a single, non-repetitive response"
+
+# Merging several answers is a long-context task: large model tier (src/model_tiers.py)
+MODEL_TIER = os.getenv("ASL_MODEL_TIER_SYNTHESIS", "large")
+
+SYSTEM_PROMPT = """You combine answers from American Sign Language (ASL) specialists into one response.
+
+You will receive the learner's question and one answer per specialist (for example grammar and
+Deaf culture). Your job is to:
+
+- Merge the answers into a single, well-organized response to the question
+- Keep every accurate, relevant point; drop repetition
+- Keep each specialist's domain in its own short section when that reads better
+- Never add new facts that none of the specialists provided
+- If specialists disagree, say so briefly and present both views
+
+Use respectful terminology (Deaf, not "hearing impaired") and keep the response concise."""
+
+
+def create_synthesis_agent(model=None) -> "Agent":
+    """
+    Creates an agent that merges several specialist answers into one.
+
+    Args:
+        model: Optional shared model instance. Defaults to the provider's shared model for MODEL_TIER.
+
+    Returns:
+        Agent configured for answer synthesis
+    """
+
+    from strands import Agent
+
+    agent = Agent(
+        name=AGENT_NAME,
+        description=AGENT_DESCRIPTION,
+        instructions=SYSTEM_PROMPT,
+        model=model or get_model(MODEL_TIER),
+    )
+
+    return agent
@@ -4,18 +4,23 @@ ASL Vocabulary Agent
 Specializes in ASL signs, vocabulary, meanings, and translations.
 """
 
-from strands import Agent
+import os
+from typing import TYPE_CHECKING
 
+from src.model_provider import get_model
+from src.sign_lexicon import get_sign_lexicon, get_sign_lookup_tool
 
-def create_vocabulary_agent() -> Agent:
-    """
-    Creates an agent specialized in ASL vocabulary and signs.
+if TYPE_CHECKING:
+    from strands import Agent
 
-    Returns:
-        Agent configured with ASL vocabulary expertise
-    """
 
-    system_prompt = """You are an expert in American Sign Language (ASL) vocabulary and signs.
+AGENT_NAME = "ASL Vocabulary Agent"
+AGENT_DESCRIPTION = "Expert in ASL signs, vocabulary, meanings, translations, sign descriptions, and fingerspelling"
+
+# Sign lookups are short, so they run on the fast model tier (src/model_tiers.py)
+MODEL_TIER = os.getenv("ASL_MODEL_TIER_VOCABULARY_AGENT", "fast")
+
+SYSTEM_PROMPT = """You are an expert in American Sign Language (ASL) vocabulary and signs.
 
 Your expertise includes:
 
@@ -69,11 +74,42 @@ When explaining signs, provide:
 
 Always note if a sign has regional variations or if there are multiple acceptable ways to sign a concept."""
 
+# Appended when a sign dictionary is configured (ASL_SIGN_LEXICON_PATH, see src/sign_lexicon.py)
+LEXICON_INSTRUCTIONS = """
+
+A local sign dictionary is available. When sign dictionary entries are included in the question,
+or the lookup_sign tool returns entries, take the handshape, location, movement, orientation,
+non-manual markers and regional variants from them and write your explanation around them.
+Only call lookup_sign for signs whose entries were not already provided."""
+
+
+def system_prompt() -> str:
+    """The agent's instructions, including the sign dictionary guidance when a lexicon is configured."""
+    return SYSTEM_PROMPT + LEXICON_INSTRUCTIONS if get_sign_lexicon() is not None else SYSTEM_PROMPT
+
+
+def create_vocabulary_agent(model=None) -> "Agent":
+    """
+    Creates an agent specialized in ASL vocabulary and signs.
+
+    With a sign lexicon configured the agent gets the lookup_sign tool.
+
+    Args:
+        model: Optional shared model instance. Defaults to the provider's shared model for MODEL_TIER.
+
+    Returns:
+        Agent configured with ASL vocabulary expertise
+    """
+
+    from strands import Agent
+
+    lookup_tool = get_sign_lookup_tool()
     agent = Agent(
-        name="ASL Vocabulary Agent",
-        description="Expert in ASL signs, vocabulary, meanings, translations, sign descriptions, and fingerspelling",
-        instructions=system_prompt,
-        model="anthropic.claude-3-5-sonnet-20240620-v1:0",
+        name=AGENT_NAME,
+        description=AGENT_DESCRIPTION,
+        instructions=system_prompt(),
+        model=model or get_model(MODEL_TIER),
+        tools=[lookup_tool] if lookup_tool is not None else None,
     )
 
     return agent
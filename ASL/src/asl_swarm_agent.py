@@ -5,15 +5,46 @@ This module implements the main Swarm coordinator for the ASL Q&A system.
 It uses the Strands Swarm pattern to dynamically route questions to specialized agents.
 
 Deployable to AWS Bedrock AgentCore Runtime.
+
+Importing this module is kept light so the container answers health checks
+quickly: Strands, the model client and the agent modules are loaded by
+warm_up(), which runs in a background thread after import (ASL_WARM_UP).
 """
 
+import asyncio
+import atexit
+import functools
+import json
+import logging
+import threading
+import time
 import uuid
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from bedrock_agentcore.runtime import BedrockAgentCoreApp, RequestContext
-from bedrock_agentcore.models import BedrockModel
-from strands import Agent  # Strands Agent
-from strands.multiagent import Swarm  # Swarm for multi-agent coordination
+
+from src.admission import AdmissionController, Overloaded
+from src.agent_registry import AgentRegistry
+from src.circuit_breaker import circuit_open_cause
+from src.deadlines import current_deadline, remaining_seconds, request_timeout_seconds, set_deadline
+from src.execution_policy import AdaptiveExecutionPolicy
+from src.fanout import FanOutRun, select_fanout_domains
+from src.faq_store import get_faq_store, is_fresh
+from src.metrics import MetricsExporter, metrics
+from src.model_provider import DEFAULT_MODEL_ID, get_model, tier_unavailable_for
+from src.model_tiers import TierPolicy
+from src.prompt_cache import prompt_cache_stats
+from src.resilience import is_retryable
+from src.resource_index import RESOURCE_TOP_K, format_resource_context, get_resource_index, infer_filters
+from src.response_cache import ResponseCache, make_cache_key
+from src.router import KeywordNgramRouter, parse_coordinator_domains
+from src.semantic_cache import SemanticCache
+from src.session_store import DiskSessionBackend, InMemorySessionBackend, SessionStore
+from src.sign_lexicon import extract_sign_term, format_lexicon_context, get_sign_lexicon
+from src.single_flight import SingleFlight
+from src.speculation import SpeculationBudget, SpeculativeRun
+from src.streaming import StreamTimer, SwarmStream, error_frame, event_frame, stream_until, text_frame
+from src.tracing import tracer_from_env
 
 # Import specialized agents
 from src.agents import (
@@ -22,28 +53,41 @@ from src.agents import (
     create_cultural_agent,
     create_learning_agent,
     create_general_asl_agent,
+    create_synthesis_agent,
+    SPECIALIST_SYSTEM_PROMPTS,
+    SYNTHESIS_SYSTEM_PROMPT,
+    AGENT_MODEL_TIERS,
 )
 
+if TYPE_CHECKING:
+    from strands import Agent
+
+logger = logging.getLogger(__name__)
+
 
 # Model configuration
-model = BedrockModel(
-    model_id="anthropic.claude-3-5-sonnet-20240620-v1:0",
-    # Optional: Add guardrails if needed
-    # guardrail_id="your-guardrail-id",
-    # guardrail_version="1",
-    # guardrail_trace="enabled",
-)
+MODEL_ID = DEFAULT_MODEL_ID
 
+# The shared model comes from the configured backend (ASL_MODEL_BACKEND: "bedrock"
+# or "mock") and is created on first use by get_model(). Bedrock marks the static
+# system prompts cacheable when ASL_PROMPT_CACHE_ENABLED=true (off by default, the
+# prompts are below Bedrock's minimum cacheable length; see src/prompt_cache.py).
 
-def create_asl_coordinator_agent() -> Agent:
-    """
-    Creates the main coordinator agent that uses Swarm to route questions.
 
-    Returns:
-        Agent configured as the Swarm coordinator
-    """
+def __getattr__(name: str):
+    # `asl_swarm_agent.model` still resolves, without creating the model at import
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+COORDINATOR_NAME = "ASL Q&A Coordinator"
+COORDINATOR_DESCRIPTION = "Main coordinator that routes ASL questions to specialized agents using Swarm pattern"
 
-    system_prompt = """You are the ASL Q&A Coordinator Agent. Your role is to analyze incoming questions
+# Routing is classification only, so the coordinator runs on the fast model tier
+COORDINATOR_MODEL_TIER = os.getenv("ASL_MODEL_TIER_COORDINATOR", "fast")
+
+COORDINATOR_SYSTEM_PROMPT = """You are the ASL Q&A Coordinator Agent. Your role is to analyze incoming questions
 about American Sign Language and route them to the most appropriate specialized agent.
 
 You have access to a swarm of specialized agents:
@@ -111,14 +155,28 @@ You have access to a swarm of specialized agents:
 When you determine which specialist is needed, you can hand off to them by indicating their name and role.
 The Swarm will automatically route the question to that specialist."""
 
+
+def create_asl_coordinator_agent(model=None) -> "Agent":
+    """
+    Creates the main coordinator agent that uses Swarm to route questions.
+
+    Args:
+        model: Optional shared model instance. Defaults to the provider's shared model.
+
+    Returns:
+        Agent configured as the Swarm coordinator
+    """
+
     # Create the coordinator agent
     # Note: When used in a Swarm, the coordinator doesn't need the swarm tool
     # The Swarm itself handles agent coordination and handoffs
+    from strands import Agent
+
     coordinator = Agent(
-        name="ASL Q&A Coordinator",
-        description="Main coordinator that routes ASL questions to specialized agents using Swarm pattern",
-        instructions=system_prompt,
-        model=model.model_id,
+        name=COORDINATOR_NAME,
+        description=COORDINATOR_DESCRIPTION,
+        instructions=COORDINATOR_SYSTEM_PROMPT,
+        model=model or get_model(COORDINATOR_MODEL_TIER),
     )
 
     return coordinator
@@ -146,9 +204,261 @@ def create_asl_swarm_configuration() -> dict:
     return swarm_config
 
 
+# Swarm settings shared by every request
+SWARM_SETTINGS = {
+    "max_handoffs": 20,  # Allow up to 20 agent handoffs
+    "max_iterations": 20,  # Maximum iterations for the swarm
+    "repetitive_handoff_detection_window": 8,  # Detect ping-pong behavior
+    "repetitive_handoff_min_unique_agents": 3,  # Require 3 unique agents to avoid loops
+}
+
+# Fast/large model tier per agent, escalating requests that need the large model
+# (ASL_MODEL_TIERING_ENABLED, ASL_MODEL_ESCALATE_*; see src/model_tiers.py)
+model_tier_policy = TierPolicy(
+    default_tiers={"coordinator": COORDINATOR_MODEL_TIER, **AGENT_MODEL_TIERS},
+    escalate_below_confidence=float(os.getenv("ASL_MODEL_ESCALATE_BELOW_CONFIDENCE", "0.35")),
+    escalate_prompt_tokens=int(os.getenv("ASL_MODEL_ESCALATE_PROMPT_TOKENS", "300")),
+    escalate_on_handoff=os.getenv("ASL_MODEL_ESCALATE_ON_HANDOFF", "true").lower() == "true",
+    enabled=os.getenv("ASL_MODEL_TIERING_ENABLED", "true").lower() == "true",
+)
+
+# Local sign dictionary for the Vocabulary Agent (ASL_SIGN_LEXICON_PATH); mapping
+# the file is cheap, and its build time versions the answers it feeds
+sign_lexicon = get_sign_lexicon()
+
+# Curated learning-resource catalog for the Learning Agent (ASL_RESOURCE_INDEX_DIR)
+resource_index = get_resource_index()
+
+# Process-level agent registry
+# Strands and the model client are loaded once (by warm_up() or the first
+# request); each request builds its own agents from the factories
+agent_registry = AgentRegistry(
+    factories={
+        "coordinator": create_asl_coordinator_agent,
+        "grammar_expert": create_grammar_expert,
+        "vocabulary_agent": create_vocabulary_agent,
+        "cultural_agent": create_cultural_agent,
+        "learning_agent": create_learning_agent,
+        "general_asl_agent": create_general_asl_agent,
+    },
+    swarm_settings=SWARM_SETTINGS,
+    system_prompts={
+        "coordinator": COORDINATOR_SYSTEM_PROMPT,
+        **SPECIALIST_SYSTEM_PROMPTS,
+        "synthesis": SYNTHESIS_SYSTEM_PROMPT,
+        "sign_lexicon": sign_lexicon.meta["built_at"] if sign_lexicon is not None else "",
+        "resource_index": str(resource_index.version) if resource_index is not None else "",
+    },
+    model_id=json.dumps(model_tier_policy.describe(), sort_keys=True),
+)
+
+# Precomputed, reviewed answers to frequent questions (ASL_FAQ_STORE_PATH; built
+# with src/faq_precompute.py); served without any model call
+faq_store = get_faq_store()
+
+# Local pre-router in front of the Swarm
+# Any object with route(question) -> RoutingDecision can be plugged in here
+ROUTER_CONFIDENCE_THRESHOLD = float(os.getenv("ASL_ROUTER_CONFIDENCE_THRESHOLD", "0.6"))
+
+question_router = KeywordNgramRouter(
+    parse_coordinator_domains(COORDINATOR_SYSTEM_PROMPT),
+    confidence_threshold=ROUTER_CONFIDENCE_THRESHOLD,
+)
+
+# Per-request handoff/iteration budgets instead of fixed limits; confident
+# single-domain questions are answered by one specialist with no handoffs
+execution_policy = AdaptiveExecutionPolicy(
+    max_handoffs=SWARM_SETTINGS["max_handoffs"],
+    max_iterations=SWARM_SETTINGS["max_iterations"],
+    latency_target_seconds=float(os.getenv("ASL_LATENCY_TARGET_SECONDS", "30")),
+)
+
+# Parallel mode: multi-domain questions go to several specialists concurrently
+# and their answers are merged. Enabled per deployment or per request ("mode": "parallel").
+FANOUT_ENABLED = os.getenv("ASL_FANOUT_ENABLED", "false").lower() == "true"
+FANOUT_BRANCH_TIMEOUT_SECONDS = float(os.getenv("ASL_FANOUT_BRANCH_TIMEOUT_SECONDS", "20"))
+
+# Speculative mode: when the coordinator has to route, the router's most likely
+# specialist starts at the same time. Enabled per deployment or per request
+# ("mode": "speculative"); cancelled speculations draw on a spend budget per hour.
+SPECULATION_ENABLED = os.getenv("ASL_SPECULATION_ENABLED", "false").lower() == "true"
+SPECULATION_MIN_CONFIDENCE = float(os.getenv("ASL_SPECULATION_MIN_CONFIDENCE", "0.3"))
+speculation_budget = SpeculationBudget(usd_per_hour=float(os.getenv("ASL_SPECULATION_BUDGET_USD_PER_HOUR", "1.0")))
+
+# Answer cache in front of the Swarm for session-independent questions
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("ASL_RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("ASL_RESPONSE_CACHE_TTL_SECONDS", "3600")),
+)
+
+# Optional near-duplicate cache over a local similarity index, partitioned by the
+# specialist the router picked. Set ASL_SEMANTIC_CACHE_PATH to persist it across restarts.
+semantic_cache: Optional[SemanticCache] = None
+SEMANTIC_CACHE_PATH = os.getenv("ASL_SEMANTIC_CACHE_PATH")
+
+if os.getenv("ASL_SEMANTIC_CACHE_ENABLED", "false").lower() == "true":
+    semantic_cache = SemanticCache(
+        domains=list(SPECIALIST_SYSTEM_PROMPTS),
+        config_version=agent_registry.config_version,
+        capacity_per_domain=int(os.getenv("ASL_SEMANTIC_CACHE_CAPACITY_PER_DOMAIN", "20000")),
+        threshold=float(os.getenv("ASL_SEMANTIC_CACHE_THRESHOLD", "0.9")),
+        ttl_seconds=float(os.getenv("ASL_SEMANTIC_CACHE_TTL_SECONDS", "3600")),
+        lexicon=sign_lexicon,
+    )
+    if SEMANTIC_CACHE_PATH:
+        semantic_cache.load(SEMANTIC_CACHE_PATH)
+        # Saved periodically too, since a killed container never runs atexit
+        semantic_cache.start_autosave(
+            SEMANTIC_CACHE_PATH, interval_seconds=float(os.getenv("ASL_SEMANTIC_CACHE_SAVE_INTERVAL_SECONDS", "60"))
+        )
+        atexit.register(semantic_cache.save, SEMANTIC_CACHE_PATH)
+
+# Concurrent cache misses for the same question wait on one in-flight run instead of
+# each starting a Swarm
+COALESCING_ENABLED = os.getenv("ASL_COALESCING_ENABLED", "true").lower() == "true"
+coalescer = SingleFlight()
+
+# Whether streams include "routed"/"handoff" events unless the payload sets "events"
+STREAM_EVENTS_DEFAULT = os.getenv("ASL_STREAM_EVENTS", "false").lower() == "true"
+
+# Per-session conversation memory with a flat token budget per turn
+# Set ASL_SESSION_STORE_DIR to keep sessions on local disk instead of in memory
+SESSION_STORE_DIR = os.getenv("ASL_SESSION_STORE_DIR")
+
+session_store = SessionStore(
+    backend=DiskSessionBackend(SESSION_STORE_DIR) if SESSION_STORE_DIR else InMemorySessionBackend(),
+    token_budget=int(os.getenv("ASL_SESSION_TOKEN_BUDGET", "1500")),
+    idle_ttl_seconds=float(os.getenv("ASL_SESSION_IDLE_TTL_SECONDS", "3600")),
+)
+session_store.start_sweeper()
+
+# Metrics are written to stdout every ASL_METRICS_EXPORT_INTERVAL_SECONDS, from where
+# the runtime ships them to CloudWatch. ASL_METRICS_EXPORT is "emf" (CloudWatch
+# Embedded Metric Format), "log" (a JSON snapshot line) or "none"
+METRICS_EXPORT = os.getenv("ASL_METRICS_EXPORT", "emf")
+
+if METRICS_EXPORT != "none":
+    metrics_exporter = MetricsExporter(
+        metrics, METRICS_EXPORT, namespace=os.getenv("ASL_METRICS_NAMESPACE", "ASL/Agent")
+    )
+    metrics_exporter.start(float(os.getenv("ASL_METRICS_EXPORT_INTERVAL_SECONDS", "60")))
+    atexit.register(metrics_exporter.export)
+
+
+# Per-agent span tracing (ASL_TRACE_EXPORTERS, ASL_TRACE_SAMPLE_RATE)
+tracer = tracer_from_env()
+
+# Admission control in front of the Swarm: bounded concurrency, a bounded priority
+# queue with a maximum wait, and fast "overloaded" rejections beyond that
+admission = AdmissionController(
+    max_concurrent=int(os.getenv("ASL_ADMISSION_MAX_CONCURRENT", "16")),
+    max_queue_depth=int(os.getenv("ASL_ADMISSION_MAX_QUEUE_DEPTH", "64")),
+    max_queue_wait_seconds=float(os.getenv("ASL_ADMISSION_MAX_QUEUE_WAIT_SECONDS", "5")),
+)
+DEFAULT_PRIORITY = os.getenv("ASL_ADMISSION_DEFAULT_PRIORITY", "interactive")
+
+
+# How the heavy dependencies are loaded: "background" (default) warms up in a thread
+# after import, "eager" blocks the import until warm, "lazy" leaves it to the first request
+WARM_UP_MODE = os.getenv("ASL_WARM_UP", "background").lower()
+
+
+def warm_up() -> float:
+    """
+    Pre-initializes Strands, the shared model client and the agent modules.
+
+    Safe to call more than once and from several threads; only the first call
+    does any work. Requests arriving before it finishes wait for it.
+
+    Returns:
+        Seconds spent in this call
+    """
+
+    started = time.perf_counter()
+    get_model()
+    agent_registry.warm_up()
+    elapsed = time.perf_counter() - started
+    metrics.observe("startup.warm_up_ms", elapsed * 1000)
+    return elapsed
+
+
+def _warm_up_in_background() -> None:
+    try:
+        elapsed = warm_up()
+        logger.info("Warm-up finished in %.0f ms", elapsed * 1000)
+    except Exception:
+        # The first request retries the warm-up and reports the error itself
+        logger.exception("Warm-up failed")
+
+
+def _request_priority(request: RequestContext) -> str:
+    """
+    Picks the admission priority class for a request.
+
+    An explicit "priority" in the payload wins (the IAM batch client sends
+    "batch"); otherwise requests carrying an OAuth bearer token are interactive
+    and the rest get ASL_ADMISSION_DEFAULT_PRIORITY.
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        Priority class name known to the admission controller
+    """
+
+    if isinstance(request.input, dict) and request.input.get("priority"):
+        return admission.normalize_priority(request.input["priority"])
+
+    headers = getattr(request, "request_headers", None) or {}
+    authorization = next((v for k, v in headers.items() if k.lower() == "authorization"), "")
+    if str(authorization).lower().startswith("bearer "):
+        return "interactive"
+
+    return admission.normalize_priority(DEFAULT_PRIORITY)
+
+
+async def _is_follow_up_turn(request: RequestContext, session_id: str) -> bool:
+    """
+    Reports whether a turn may depend on earlier turns in its session.
+
+    A turn is a follow-up if the caller marks it as one ("follow_up": true in the
+    payload) or if the session store already holds history for the session.
+
+    Args:
+        request: The incoming request
+        session_id: Session ID for the request
+
+    Returns:
+        True if the answer may depend on earlier turns in the session
+    """
+
+    flagged = isinstance(request.input, dict) and bool(request.input.get("follow_up"))
+    return flagged or await session_store.has_history(session_id)
+
+
+def _refresh_resource_index() -> None:
+    """
+    Picks up a resource catalog rebuilt since the last request.
+
+    The catalog version is part of the configuration version, so cached answers
+    built from the previous catalog stop matching and the semantic cache starts over.
+    """
+
+    if resource_index is None or not resource_index.reload_if_changed():
+        return
+    config_version = agent_registry.update_system_prompt("resource_index", str(resource_index.version))
+    if semantic_cache is not None:
+        semantic_cache.reset(config_version)
+
+
 # AgentCore Application Setup
 app = BedrockAgentCoreApp()
 
+if WARM_UP_MODE == "eager":
+    warm_up()
+elif WARM_UP_MODE == "background":
+    threading.Thread(target=_warm_up_in_background, name="asl-warm-up", daemon=True).start()
+
 
 @app.entrypoint
 async def agent_invocation(request: RequestContext):
@@ -156,15 +466,22 @@ async def agent_invocation(request: RequestContext):
     Main entrypoint for AgentCore Runtime.
 
     This function is called when the agent is invoked via AgentCore.
-    It handles the request, creates the Swarm, and returns streaming responses.
+    It handles the request, builds a per-request Swarm from the agent registry,
+    and streams the answering specialist's tokens as they are produced.
 
     Args:
         request: RequestContext containing input, session_id, and other metadata
 
-    Returns:
-        Streaming response from the agent
+    Yields:
+        Stream frames (see src/streaming.py): text, optional events, and a final summary
     """
 
+    timer = StreamTimer()
+
+    # The deadline counts from arrival and follows the request into every agent turn and model call
+    deadline = time.monotonic() + request_timeout_seconds(request, execution_policy.latency_target_seconds)
+    set_deadline(deadline)
+
     # Extract session and user information
     session_id = request.session_id or str(uuid.uuid4())
     user_id = getattr(request, "user_id", "anonymous")
@@ -172,55 +489,440 @@ async def agent_invocation(request: RequestContext):
     # Parse input - handle both string and dict formats
     if isinstance(request.input, dict):
         user_message = request.input.get("input", request.input.get("prompt", ""))
+        include_events = bool(request.input.get("events", STREAM_EVENTS_DEFAULT))
     elif isinstance(request.input, str):
         user_message = request.input
+        include_events = STREAM_EVENTS_DEFAULT
     else:
         user_message = str(request.input)
+        include_events = STREAM_EVENTS_DEFAULT
+
+    _refresh_resource_index()
+
+    force_trace = isinstance(request.input, dict) and bool(request.input.get("trace"))
+    trace = tracer.start_trace("agent_invocation", force_sample=force_trace, session_id=session_id)
+
+    # Serve repeated, session-independent questions from the answer cache, then the FAQ store
+    cache_key = None
+    if not await _is_follow_up_turn(request, session_id):
+        cache_key = make_cache_key(user_message, agent_registry.config_version)
+        cached_response = response_cache.get(cache_key)
+        if cached_response is not None:
+            timer.mark_token()
+            await session_store.append_turns(session_id, [("user", user_message), ("assistant", cached_response)])
+            trace.finish(cached="exact")
+            yield text_frame(cached_response)
+            yield {"type": "summary", "cached": "exact", "timing": timer.timing(), "trace_id": trace.trace_id}
+            return
+
+        faq = faq_store.lookup(user_message, fresh=lambda record: is_fresh(record, agent_registry)) if faq_store is not None else None
+        if faq is not None:
+            timer.mark_token()
+            await session_store.append_turns(session_id, [("user", user_message), ("assistant", faq["answer"])])
+            trace.finish(cached="faq", faq_version=faq_store.version)
+            yield text_frame(faq["answer"])
+            yield {
+                "type": "summary",
+                "cached": "faq",
+                "faq_version": faq_store.version,
+                "agents": faq["agents"],
+                "timing": timer.timing(),
+                "trace_id": trace.trace_id,
+            }
+            return
+
+    # Route locally first - when the router is confident the Swarm starts at the
+    # specialist directly, otherwise the coordinator makes the routing decision
+    decision = question_router.route(user_message)
+
+    # Paraphrases of answered questions in the same specialist domain
+    use_semantic_cache = semantic_cache is not None and cache_key is not None and decision.confident
+    if use_semantic_cache:
+        semantic_hit = semantic_cache.lookup(user_message, decision.agent_key)
+        if semantic_hit is not None:
+            timer.mark_token()
+            await session_store.append_turns(session_id, [("user", user_message), ("assistant", semantic_hit[0])])
+            trace.finish(cached="semantic")
+            yield text_frame(semantic_hit[0])
+            yield {
+                "type": "summary",
+                "cached": "semantic",
+                "similarity": semantic_hit[1],
+                "timing": timer.timing(),
+                "trace_id": trace.trace_id,
+            }
+            return
+
+    execute = functools.partial(
+        _execute,
+        request,
+        user_message=user_message,
+        session_id=session_id,
+        include_events=include_events,
+        timer=timer,
+        trace=trace,
+        decision=decision,
+        cache_key=cache_key,
+        use_semantic_cache=use_semantic_cache,
+    )
 
-    # Create the coordinator agent
-    coordinator = create_asl_coordinator_agent()
-
-    # Create all specialized agents
-    grammar_expert = create_grammar_expert()
-    vocabulary_agent = create_vocabulary_agent()
-    cultural_agent = create_cultural_agent()
-    learning_agent = create_learning_agent()
-    general_asl_agent = create_general_asl_agent()
-
-    # Create the Swarm with all agents
-    # The coordinator is the entry point, and it can hand off to any specialist
-    asl_swarm = Swarm(
-        agents=[
-            coordinator,
-            grammar_expert,
-            vocabulary_agent,
-            cultural_agent,
-            learning_agent,
-            general_asl_agent,
-        ],
-        entry_point=coordinator,  # Start with the coordinator
-        max_handoffs=20,  # Allow up to 20 agent handoffs
-        max_iterations=20,  # Maximum iterations for the swarm
-        repetitive_handoff_detection_window=8,  # Detect ping-pong behavior
-        repetitive_handoff_min_unique_agents=3,  # Require 3 unique agents to avoid loops
+    if cache_key is None or not COALESCING_ENABLED:
+        frames = execute()
+        try:
+            async for frame in frames:
+                yield frame
+        finally:
+            await frames.aclose()
+        return
+
+    # Concurrent requests for the same session-independent question share one run.
+    # The leader's request owns the run's trace, admission slot and session turns;
+    # followers replay its frames and record their own.
+    subscription = coalescer.join(_flight_key(request, cache_key, include_events), execute)
+    frames = subscription.frames()
+    if not subscription.leader:
+        # A follower stops waiting at its own deadline; the run goes on for the others
+        frames = stream_until(frames, deadline)
+    answer_chunks = []
+    last_frame = None
+    try:
+        try:
+            async for frame in frames:
+                if not subscription.leader:
+                    if frame.get("type") == "text":
+                        timer.mark_token()
+                        answer_chunks.append(frame["data"])
+                    elif frame.get("type") == "summary":
+                        last_frame = frame
+                        frame = {
+                            **frame,
+                            "session_id": session_id,
+                            "trace_id": trace.trace_id,
+                            "timing": timer.timing(),
+                            "coalesced": True,
+                        }
+                    elif frame.get("type") == "error":
+                        last_frame = frame
+                yield frame
+        except asyncio.TimeoutError:
+            last_frame = error_frame("Request deadline exceeded", code="deadline_exceeded", retryable=False)
+            yield last_frame
+
+        if not subscription.leader:
+            if last_frame is not None and last_frame.get("type") == "summary":
+                await session_store.append_turns(session_id, [("user", user_message), ("assistant", "".join(answer_chunks))])
+                trace.finish(status=last_frame.get("status"), coalesced=True, leader_trace_id=last_frame.get("trace_id"))
+            else:
+                last_frame = last_frame or {}
+                trace.finish(status=last_frame.get("code", "error"), coalesced=True, error=last_frame.get("error"))
+    finally:
+        subscription.close()
+        if not subscription.leader:
+            trace.finish(status="cancelled", coalesced=True)
+
+
+def _flight_key(request: RequestContext, cache_key, include_events: bool) -> tuple:
+    """
+    Identity of a run for coalescing: the question and configuration plus every option that changes the run.
+
+    The run waits for admission at its leader's priority and stops at its leader's
+    deadline, so both are part of the key: an interactive request never queues
+    behind a batch leader, and no request joins a run with a shorter deadline.
+    """
+
+    options = request.input if isinstance(request.input, dict) else {}
+    timeout = request_timeout_seconds(request, execution_policy.latency_target_seconds)
+    return (cache_key, include_events, options.get("mode"), _request_priority(request), timeout)
+
+
+async def _execute(
+    request: RequestContext,
+    user_message: str,
+    session_id: str,
+    include_events: bool,
+    timer: StreamTimer,
+    trace,
+    decision,
+    cache_key,
+    use_semantic_cache: bool,
+):
+    """
+    Runs a routed question through the fast path, fan-out or the Swarm.
+
+    Args:
+        request: The incoming request (execution options and admission priority)
+        user_message: The user's question
+        session_id: Session whose history and turns the run uses
+        include_events: Whether to emit progress events
+        timer: Request timer
+        trace: Request trace the run records its spans in
+        decision: The router's decision for the question
+        cache_key: Answer cache key, or None for follow-up turns
+        use_semantic_cache: Whether to add the answer to the semantic cache
+
+    Yields:
+        Stream frames, ending with a summary or error frame
+    """
+
+    entry_point = decision.agent_key if decision.confident else "coordinator"
+
+    # Budget handoffs and iterations from routing confidence and the time left before the deadline
+    budget = execution_policy.plan(decision, remaining_seconds=remaining_seconds())
+
+    # Multi-domain questions can fan out to several specialists in parallel
+    fanout_keys = []
+    requested_mode = request.input.get("mode") if isinstance(request.input, dict) else None
+    if FANOUT_ENABLED or requested_mode == "parallel":
+        fanout_keys = select_fanout_domains(decision, min_score=execution_policy.secondary_domain_score)
+
+    execution_path = "fanout" if len(fanout_keys) > 1 else "fast" if budget.fast_path else "swarm"
+
+    # While the coordinator routes, the router's best guess can already start answering
+    if (
+        execution_path == "swarm"
+        and entry_point == "coordinator"
+        and (SPECULATION_ENABLED or requested_mode == "speculative")
+        and decision.confidence >= SPECULATION_MIN_CONFIDENCE
+        and speculation_budget.try_start()
+    ):
+        execution_path = "speculative"
+    metrics.increment("execution.path", path=execution_path)
+    trace.set_attributes(
+        path=execution_path,
+        entry_point=entry_point,
+        routing_confidence=round(decision.confidence, 3),
     )
 
+    # Each agent runs on its tier's model; escalation can move the request to the large tier
+    tiers = model_tier_policy.start(decision.confidence, user_message)
+
+    # With every circuit for the first agent's model open, the run would fail at its
+    # first call; answer from stored answers without taking a run slot
+    retry_after = tier_unavailable_for(tiers.tier_for(entry_point))
+    if retry_after is not None:
+        tiers.finish()
+        async for frame in _unavailable_frames(user_message, session_id, decision, cache_key, timer, trace, retry_after):
+            yield frame
+        return
+
+    # Wait for a run slot, or shed the request while the Swarm is saturated. Nothing
+    # is built for the request before it holds a slot, so shed requests cost nothing
+    priority = _request_priority(request)
     try:
-        # Run the swarm with the user's question
-        # The coordinator will analyze and route to appropriate specialists
-        # Specialists can hand off to each other if needed
-        response = await asl_swarm.run_async(
-            user_message,
-            session_id=session_id,
+        queue_wait = await admission.acquire(priority, timeout=remaining_seconds())
+    except Overloaded as e:
+        trace.finish(status="overloaded", reason=e.reason, priority=priority)
+        yield error_frame(
+            "ASL agent is overloaded, please retry later",
+            code="overloaded",
+            reason=e.reason,
+            retry_after=e.retry_after,
+            retryable=True,
         )
+        return
+    trace.set_attributes(priority=priority, admission_wait_ms=round(queue_wait * 1000, 1))
 
-        # Return the response
-        return response
+    try:
+        # Build an isolated set of agents for this request: only the chosen specialist
+        # on the fast path, the branches for fan-out, every agent for a full Swarm
+        if execution_path == "fast":
+            agent_keys = [entry_point]
+        elif execution_path == "fanout":
+            agent_keys = fanout_keys
+        else:
+            agent_keys = agent_registry.agent_keys
+        agents = agent_registry.create_agents(agent_keys, models=tiers.models(agent_keys))
+
+        if include_events:
+            yield event_frame(
+                "routed",
+                agent=agent_registry.agent_name(entry_point),
+                confidence=round(decision.confidence, 3),
+                method=decision.method if decision.confident else "coordinator",
+            )
+
+        # Earlier turns reach the agents only as the session's bounded history
+        prompt = await session_store.build_prompt(session_id, user_message)
+
+        answering_keys = fanout_keys if execution_path == "fanout" else [entry_point]
+        if execution_path == "speculative":
+            answering_keys.append(decision.agent_key)
+
+        # Sign lookups get their dictionary entries up front, saving the tool round trip
+        if sign_lexicon is not None and "vocabulary_agent" in answering_keys:
+            sign_term = extract_sign_term(user_message)
+            sign_hits = sign_lexicon.search(sign_term, limit=3) if sign_term else []
+            if sign_hits:
+                prompt = f"{prompt}\n\n{format_lexicon_context(sign_term, sign_hits)}"
+            trace.set_attributes(sign_lexicon_hits=len(sign_hits))
+
+        # Resource questions start from the catalog's best matches instead of the model's memory
+        if resource_index is not None and "learning_agent" in answering_keys:
+            resources = resource_index.search(user_message, k=RESOURCE_TOP_K, **infer_filters(user_message))
+            if resources:
+                prompt = f"{prompt}\n\n{format_resource_context(resources)}"
+            trace.set_attributes(resource_index_hits=len(resources))
+
+        if execution_path == "fanout":
+            run = FanOutRun(
+                branches={key: agents[key] for key in fanout_keys},
+                synthesizer=create_synthesis_agent(model=tiers.model_for("synthesis")),
+                task=prompt,
+                question=user_message,
+                timer=timer,
+                branch_timeout=FANOUT_BRANCH_TIMEOUT_SECONDS,
+                include_events=include_events,
+                trace=trace,
+            )
+        elif execution_path == "speculative":
+            # The speculative specialist is a separate agent: on a miss the Swarm may still
+            # hand off to its own copy later, which must start with a clean conversation
+            speculation_tiers = tiers.fork()
+            run = SpeculativeRun(
+                agent_registry.create_swarm(agents, entry_point=entry_point, **budget.swarm_settings()),
+                specialist_key=decision.agent_key,
+                specialist=agent_registry.create_agent(
+                    decision.agent_key, model=speculation_tiers.model_for(decision.agent_key)
+                ),
+                task=prompt,
+                timer=timer,
+                coordinator_name=COORDINATOR_NAME,
+                tiers=tiers,
+                speculation_tiers=speculation_tiers,
+                budget=speculation_budget,
+                include_events=include_events,
+                trace=trace,
+                session_id=session_id,
+            )
+        else:
+            # On the fast path the Swarm holds only the chosen specialist, so it cannot
+            # hand off; otherwise the entry point can hand off to any agent within budget
+            asl_swarm = agent_registry.create_swarm(agents, entry_point=entry_point, **budget.swarm_settings())
+            run = SwarmStream(
+                asl_swarm,
+                prompt,
+                timer=timer,
+                coordinator_name=COORDINATOR_NAME,
+                include_events=include_events,
+                trace=trace,
+                session_id=session_id,
+            )
+
+        # Forward tokens as they arrive. The run is closed explicitly, so a client
+        # disconnect stops the Swarm and its model streams right away
+        frames = run.frames(deadline=current_deadline())
+        try:
+            async for frame in frames:
+                yield frame
+        finally:
+            await frames.aclose()
+
+        answer = run.text
+        prompt_cache_stats.record_node_results(run.node_results)
+        await session_store.append_turns(session_id, [("user", user_message), ("assistant", answer)])
+
+        if cache_key is not None and run.status == "completed":
+            response_cache.put(cache_key, answer)
+            if use_semantic_cache:
+                semantic_cache.add(user_message, decision.agent_key, answer)
+
+        tier_summary = tiers.finish()
+        trace.finish(status=run.status, model_tier_escalation=tiers.escalation_reason, cost_usd=tier_summary["cost_usd"])
+        yield run.summary_frame(
+            session_id=session_id,
+            path=execution_path,
+            trace_id=trace.trace_id,
+            tiers=tier_summary,
+        )
 
     except Exception as e:
+        circuit_open = circuit_open_cause(e)
+        if circuit_open is not None and timer.first_token_at is None:
+            # The models went down before any answer text was sent
+            tiers.finish()
+            async for frame in _unavailable_frames(
+                user_message, session_id, decision, cache_key, timer, trace, circuit_open.retry_after
+            ):
+                yield frame
+            return
+
         error_message = f"Error processing ASL question: {str(e)}"
-        print(error_message)
-        return {"error": error_message}
+        logger.exception(error_message, extra={"trace_id": trace.trace_id, "session_id": session_id})
+        tiers.finish()
+        trace.finish(status="error", error=str(e))
+        # Throttling/5xx that outlasted the model retries - the caller may retry later
+        yield error_frame(error_message, retryable=is_retryable(e))
+
+    finally:
+        admission.release()
+        # Client disconnects close the generator mid-run; still record the trace
+        trace.finish(status="cancelled")
+
+
+def _stored_answer(user_message: str, decision, cache_key) -> Optional[tuple]:
+    """
+    Finds a stored answer to serve while the models are unavailable.
+
+    Approved FAQ answers are served even if the configuration has changed since
+    they were built, and paraphrase matches even if routing was not confident.
+
+    Args:
+        user_message: The user's question
+        decision: The router's decision for the question
+        cache_key: Answer cache key, or None for follow-up turns, which get no stored answer
+
+    Returns:
+        Tuple of (answer, summary fields), or None
+    """
+
+    if cache_key is None:
+        return None
+
+    faq = faq_store.lookup(user_message) if faq_store is not None else None
+    if faq is not None:
+        return faq["answer"], {"cached": "faq", "faq_version": faq_store.version, "agents": faq["agents"]}
+
+    semantic_hit = semantic_cache.lookup(user_message, decision.agent_key) if semantic_cache is not None else None
+    if semantic_hit is not None:
+        return semantic_hit[0], {"cached": "semantic", "similarity": semantic_hit[1]}
+
+    return None
+
+
+async def _unavailable_frames(user_message: str, session_id: str, decision, cache_key, timer: StreamTimer, trace, retry_after: float):
+    """
+    Answers a request whose models' circuits are all open.
+
+    Yields:
+        A stored answer and a "degraded" summary, or a retryable "model_unavailable" error
+    """
+
+    stored = _stored_answer(user_message, decision, cache_key)
+    metrics.increment("degraded.responses", source=stored[1]["cached"] if stored else "none")
+
+    if stored is None:
+        trace.finish(status="model_unavailable", retry_after=retry_after)
+        yield error_frame(
+            "ASL agent's models are unavailable, please retry later",
+            code="model_unavailable",
+            retry_after=round(retry_after, 1),
+            retryable=True,
+        )
+        return
+
+    answer, fields = stored
+    timer.mark_token()
+    await session_store.append_turns(session_id, [("user", user_message), ("assistant", answer)])
+    trace.finish(status="degraded", cached=fields["cached"])
+    yield text_frame(answer)
+    yield {
+        "type": "summary",
+        "status": "degraded",
+        **fields,
+        "session_id": session_id,
+        "timing": timer.timing(),
+        "trace_id": trace.trace_id,
+    }
 
 
 # For local testing
@@ -0,0 +1,356 @@
+"""
+ASL Benchmark Suite
+
+Offline end-to-end benchmark for the Swarm pipeline.
+
+Drives agent_invocation (routing, caches, fast path / fan-out / Swarm, streaming)
+and the direct coordinator-led Swarm over a labeled question corpus, using the
+mock model backend so no AWS access is needed. For each path it reports p50/p95/p99
+end-to-end latency and time-to-first-token, handoffs and model calls per question,
+input/output tokens and peak RSS, and writes everything as JSON so results can be
+compared between commits.
+
+Usage:
+    ASL_MODEL_BACKEND=mock python -m src.benchmark --output bench.json
+    ASL_MODEL_BACKEND=mock python -m src.benchmark --latency-ms 400 --tokens-per-second 60
+    ASL_MODEL_BACKEND=mock python -m src.benchmark --output new.json --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import types
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from src.metrics import metrics, percentile
+from src.mock_model import LatencyDistribution, MockModel
+from src.router import parse_coordinator_domains
+from src.streaming import StreamTimer, SwarmStream
+from src.test_agent_local import EXAMPLE_QUESTIONS
+
+
+# Expected specialist for each example question in test_agent_local.py
+EXAMPLE_LABELS = {
+    "How do I sign 'thank you' in ASL?": "vocabulary_agent",
+    "What are Wh-questions in ASL?": "grammar_expert",
+    "Tell me about Deaf culture": "cultural_agent",
+    "Where can I learn ASL online?": "learning_agent",
+    "What is the difference between ASL and English?": "general_asl_agent",
+    "How do you form yes/no questions in ASL?": "grammar_expert",
+    "What are non-manual markers?": "grammar_expert",
+    "What is a name sign?": "cultural_agent",
+}
+
+# Summary fields compared against a baseline run
+COMPARED_FIELDS = (
+    "latency_ms",
+    "time_to_first_token_ms",
+    "model_calls",
+    "handoffs",
+    "input_tokens",
+    "output_tokens",
+    "cost_usd",
+)
+
+
+def build_corpus(coordinator_prompt: str) -> List[Tuple[str, str]]:
+    """
+    Builds the labeled benchmark corpus.
+
+    The example questions from test_agent_local.py are followed by one question per
+    entry in the coordinator's agent domain lists.
+
+    Args:
+        coordinator_prompt: The coordinator's system prompt
+
+    Returns:
+        List of (question, expected agent key)
+    """
+
+    corpus = [(question, EXAMPLE_LABELS[question]) for question in EXAMPLE_QUESTIONS if question in EXAMPLE_LABELS]
+    for agent_key, topics in parse_coordinator_domains(coordinator_prompt).items():
+        corpus.extend((f"Can you explain this: {topic}?", agent_key) for topic in topics)
+    return corpus
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(samples: List[dict]) -> dict:
+    """
+    Aggregates per-question samples into p50/p95/p99 and means.
+
+    Args:
+        samples: Per-question measurements
+
+    Returns:
+        Dictionary of field to {"p50", "p95", "p99", "mean"}
+    """
+
+    summary = {"questions": len(samples), "errors": sum(1 for s in samples if s.get("error"))}
+    for field in COMPARED_FIELDS:
+        values = [s[field] for s in samples if s.get(field) is not None]
+        if not values:
+            continue
+        summary[field] = {
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "mean": sum(values) / len(values),
+        }
+
+    routed = [s for s in samples if "routed_correctly" in s]
+    if routed:
+        summary["routing_accuracy"] = sum(s["routed_correctly"] for s in routed) / len(routed)
+    return summary
+
+
+def compare(current: dict, baseline: dict) -> Dict[str, dict]:
+    """
+    Relative change of each compared p50/p95/p99 against a baseline report.
+
+    Returns:
+        Path to {"<field>.<pct>": relative change}, e.g. 0.12 for 12% slower
+    """
+
+    changes = {}
+    for path, result in current["paths"].items():
+        base_summary = baseline.get("paths", {}).get(path, {}).get("summary", {})
+        path_changes = {}
+        for field in COMPARED_FIELDS:
+            for pct in ("p50", "p95", "p99"):
+                new = result["summary"].get(field, {}).get(pct)
+                old = base_summary.get(field, {}).get(pct)
+                if new is not None and old:
+                    path_changes[f"{field}.{pct}"] = round((new - old) / old, 4)
+        changes[path] = path_changes
+    return changes
+
+
+class Benchmark:
+    """
+    Runs the corpus through each pipeline path against the shared MockModels.
+    """
+
+    def __init__(self, app_module, models: Dict[str, MockModel], clear_caches: bool = True):
+        """
+        Args:
+            app_module: The imported src.asl_swarm_agent module
+            models: The shared MockModel of each model tier
+            clear_caches: Whether to empty the answer cache before each question
+        """
+
+        self.app = app_module
+        self.models = models
+        self.clear_caches = clear_caches
+
+    def _model_calls(self) -> int:
+        return sum(model.calls for model in self.models.values())
+
+    def _reset_cache(self) -> None:
+        if self.clear_caches:
+            self.app.response_cache.clear()
+
+    async def _measure(self, run_question, question: str, expected: str) -> dict:
+        """Runs one question and collects the measurements common to every path."""
+
+        self._reset_cache()
+        calls_before = self._model_calls()
+        started = time.perf_counter()
+
+        sample = {"question": question, "expected": expected}
+        try:
+            summary = await run_question(question)
+        except Exception as e:
+            sample["error"] = str(e)
+            summary = {}
+
+        sample["latency_ms"] = (time.perf_counter() - started) * 1000
+        sample["model_calls"] = self._model_calls() - calls_before
+        sample["time_to_first_token_ms"] = summary.get("timing", {}).get("time_to_first_token_ms")
+        sample["handoffs"] = summary.get("handoffs", 0)
+        sample["input_tokens"] = summary.get("usage", {}).get("input_tokens", 0)
+        sample["output_tokens"] = summary.get("usage", {}).get("output_tokens", 0)
+        if summary.get("tiers"):
+            sample["cost_usd"] = summary["tiers"]["cost_usd"]
+            sample["cost_saved_usd"] = summary["tiers"]["cost_saved_usd"]
+            sample["model_tier_escalation"] = summary["tiers"]["escalated"]
+        if summary.get("path"):
+            sample["path"] = summary["path"]
+        if summary.get("status"):
+            sample["status"] = summary["status"]
+        if summary.get("type") == "error":
+            sample["error"] = summary["error"]
+        return sample
+
+    async def _entrypoint_question(self, question: str) -> dict:
+        """Runs agent_invocation and returns its final (summary or error) frame."""
+
+        request = types.SimpleNamespace(input={"input": question}, session_id=f"bench-{uuid.uuid4()}")
+        last_frame = {}
+        async for frame in self.app.agent_invocation(request):
+            if frame.get("type") in ("summary", "error"):
+                last_frame = frame
+        return last_frame
+
+    async def _swarm_question(self, question: str) -> dict:
+        """Runs the full Swarm from the coordinator, bypassing routing and caches."""
+
+        agents = self.app.agent_registry.create_agents()
+        swarm = self.app.agent_registry.create_swarm(agents, entry_point="coordinator")
+        run = SwarmStream(swarm, question, timer=StreamTimer(), coordinator_name=self.app.COORDINATOR_NAME)
+        async for _ in run.frames():
+            pass
+        return run.summary_frame()
+
+    async def run_path(self, path: str, corpus: List[Tuple[str, str]], iterations: int) -> dict:
+        """
+        Runs every corpus question `iterations` times through one path.
+
+        Args:
+            path: "entrypoint" or "swarm"
+            corpus: Labeled questions
+            iterations: Passes over the corpus
+
+        Returns:
+            {"summary": ..., "samples": [...]}
+        """
+
+        run_question = self._entrypoint_question if path == "entrypoint" else self._swarm_question
+        samples = []
+        for _ in range(iterations):
+            for question, expected in corpus:
+                sample = await self._measure(run_question, question, expected)
+                if path == "entrypoint":
+                    sample["routed_correctly"] = self.app.question_router.route(question).agent_key == expected
+                samples.append(sample)
+
+        return {"summary": summarize(samples), "samples": samples}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _coordinator_handoff(app_module):
+    """Handoff script for the mock coordinator: hand off to the router's best specialist."""
+
+    def choose_agent(question: str) -> str:
+        agent_key = app_module.question_router.route(question).agent_key
+        return app_module.agent_registry.agent_name(agent_key)
+
+    return choose_agent
+
+
+def main():
+    """Command-line entry point."""
+
+    parser = argparse.ArgumentParser(description="Offline benchmark for the ASL Swarm pipeline")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", type=str, help="Earlier JSON report to compare against")
+    parser.add_argument("--paths", type=str, default="entrypoint,swarm", help="Comma-separated paths to run")
+    parser.add_argument("--iterations", type=int, default=3, help="Passes over the corpus per path")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mock first-token latency (median)")
+    parser.add_argument("--latency-distribution", type=str, default="lognormal", help="Mock latency distribution")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Mock streaming rate")
+    parser.add_argument("--fast-latency-ms", type=float, default=None, help="Fast-tier mock latency (default: a third)")
+    parser.add_argument("--fast-tokens-per-second", type=float, default=None, help="Fast-tier streaming rate (default: 3x)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Mock per-call failure probability")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--keep-caches", action="store_true", help="Do not clear the answer cache between questions")
+    args = parser.parse_args()
+
+    # The backend is read when the provider module is first imported, so it must
+    # be selected before the app module is imported
+    os.environ.setdefault("ASL_MODEL_BACKEND", "mock")
+    # Keep the report on stdout free of metric lines
+    os.environ.setdefault("ASL_METRICS_EXPORT", "none")
+    from src import asl_swarm_agent
+    from src.model_provider import MODEL_TIER_IDS, get_model
+
+    # The shared models may be wrapped in ResilientModel and FallbackModel
+    models = {}
+    for tier in MODEL_TIER_IDS:
+        shared_model = get_model(tier)
+        while hasattr(shared_model, "inner"):
+            shared_model = shared_model.inner
+        models[tier] = shared_model
+    if not all(isinstance(model, MockModel) for model in models.values()):
+        parser.error("the benchmark runs offline only; set ASL_MODEL_BACKEND=mock")
+
+    # Apply the benchmark's mock settings to the shared models in place; the fast
+    # tier answers sooner and streams quicker
+    fast_latency_ms = args.fast_latency_ms if args.fast_latency_ms is not None else args.latency_ms / 3
+    fast_tokens_per_second = args.fast_tokens_per_second or args.tokens_per_second * 3
+    for index, (tier, model) in enumerate(sorted(models.items())):
+        model.first_token_latency = LatencyDistribution(
+            kind=args.latency_distribution,
+            mean_ms=fast_latency_ms if tier == "fast" else args.latency_ms,
+        )
+        model.tokens_per_second = fast_tokens_per_second if tier == "fast" else args.tokens_per_second
+        model.failure_rate = args.failure_rate
+        model.handoff_rules = [
+            {"match": asl_swarm_agent.COORDINATOR_NAME, "handoff_to": _coordinator_handoff(asl_swarm_agent)}
+        ]
+        model.reseed(args.seed + index)
+
+    corpus = build_corpus(asl_swarm_agent.COORDINATOR_SYSTEM_PROMPT)
+    benchmark = Benchmark(asl_swarm_agent, models, clear_caches=not args.keep_caches)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+            "corpus_size": len(corpus),
+        },
+        "paths": {},
+    }
+
+    for path in [p.strip() for p in args.paths.split(",") if p.strip()]:
+        metrics.reset()
+        report["paths"][path] = asyncio.run(benchmark.run_path(path, corpus, args.iterations))
+        report["paths"][path]["metrics"] = metrics.snapshot()
+
+    report["peak_rss_mb"] = peak_rss_mb()
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["baseline_comparison"] = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    # Print just the summaries to the console
+    for path, result in report["paths"].items():
+        print(f"\n{path}:")
+        print(json.dumps(result["summary"], indent=2))
+    print(f"\nPeak RSS: {report['peak_rss_mb']:.1f} MiB")
+    if "baseline_comparison" in report:
+        print("\nChange vs baseline:")
+        print(json.dumps(report["baseline_comparison"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
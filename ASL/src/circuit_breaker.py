@@ -0,0 +1,265 @@
+"""
+ASL Circuit Breaker
+
+Fails fast on a dependency - here a model in a region - that keeps erroring or
+answering slowly, instead of letting every request wait out its retries.
+
+A CircuitBreaker keeps a sliding time window of call outcomes:
+
+- closed: calls go through. Once the window holds at least `min_calls` calls and
+  the share of failed calls or of slow calls reaches its threshold, it opens
+- open: calls are rejected right away with CircuitOpen. After `open_seconds`
+  it turns half-open
+- half-open: up to `half_open_probes` calls go through as probes. If they all
+  succeed quickly the circuit closes again; one failed or slow probe opens it
+  for another `open_seconds`
+
+Only errors the classifier counts (by default the transient ones, see
+is_retryable) are failures; a malformed request says nothing about the
+backend's health. Like src/resilience.py, this module only uses the standard library.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from src.resilience import is_retryable
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge value exported for each state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Called with the breaker name, the previous state and the new state
+TransitionCallback = Callable[[str, str, str], None]
+
+
+@dataclass(frozen=True)
+class Permit:
+    """Admission of one call: the state it was admitted in and the state's generation."""
+
+    state: str
+    generation: int
+
+
+class CircuitOpen(Exception):
+    """Raised when a call is rejected because its circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit for {name} is open, retry after {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def circuit_open_cause(error: BaseException) -> Optional[CircuitOpen]:
+    """
+    Finds a CircuitOpen behind an error, e.g. one re-raised by the Swarm.
+
+    Args:
+        error: The exception that reached the caller
+
+    Returns:
+        The CircuitOpen in the error's cause/context chain, or None
+    """
+
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, CircuitOpen):
+            return error
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a sliding window of call outcomes.
+
+    Callers ask for a permit before each call and report the call's outcome
+    with it. Every transition starts a new generation, so outcomes of calls
+    admitted before it are ignored:
+
+        permit = breaker.acquire()
+        if permit is None:
+            raise CircuitOpen(breaker.name, breaker.retry_after())
+        ...
+        breaker.record(permit, seconds, error)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 30.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        classify: Callable[[BaseException], bool] = is_retryable,
+        on_transition: Optional[TransitionCallback] = None,
+    ):
+        """
+        Args:
+            name: Identifies the protected dependency, e.g. "<model id>@<region>"
+            window_seconds: How far back call outcomes are kept
+            min_calls: Calls the window needs before the breaker may open
+            failure_rate: Share of failed calls that opens the breaker
+            slow_call_seconds: Calls slower than this count as slow
+            slow_call_rate: Share of slow calls that opens the breaker
+            open_seconds: How long the breaker rejects calls before probing
+            half_open_probes: Probe calls let through, and needed to close again
+            classify: Decides whether an error counts as a failure
+            on_transition: Optional callback for state changes; called after the
+                breaker's lock is released, so it may read the breaker
+        """
+
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.classify = classify
+        self.on_transition = on_transition
+
+        self._state = CLOSED
+        self._generation = 0
+        # (previous, new) states not yet reported to on_transition
+        self._transitions: List[Tuple[str, str]] = []
+        self._opened_at = 0.0
+        # (finished at, failed, slow) per call while closed
+        self._window = deque()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """Holds the lock, then reports the transitions made under it once it is released."""
+
+        self._lock.acquire()
+        try:
+            yield
+        finally:
+            transitions, self._transitions = self._transitions, []
+            self._lock.release()
+
+        if self.on_transition is not None:
+            for previous, state in transitions:
+                self.on_transition(self.name, previous, state)
+
+    def _transition(self, state: str) -> None:
+        """Changes state; caller holds the lock."""
+
+        self._transitions.append((self._state, state))
+        self._state = state
+        self._generation += 1
+        self._window.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+
+    def _refresh(self) -> None:
+        """Moves an open breaker to half-open once its open period is over."""
+
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'."""
+
+        with self._locked():
+            self._refresh()
+            return self._state
+
+    @property
+    def available(self) -> bool:
+        """Whether calls may currently be attempted; half-open breakers take probes."""
+        return self.state != OPEN
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets probes through; 0 otherwise."""
+
+        with self._locked():
+            self._refresh()
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def acquire(self) -> Optional[Permit]:
+        """
+        Asks to make a call.
+
+        Returns:
+            A Permit to pass to record() or release(), or None if the call must
+            not be made
+        """
+
+        with self._locked():
+            self._refresh()
+            if self._state == CLOSED:
+                return Permit(CLOSED, self._generation)
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return Permit(HALF_OPEN, self._generation)
+            return None
+
+    def record(self, permit: Permit, seconds: float, error: Optional[BaseException] = None) -> None:
+        """
+        Reports the outcome of a call.
+
+        Args:
+            permit: Value returned by acquire() for the call
+            seconds: The call's latency (for streams, the time to the first event)
+            error: The error the call failed with, if any
+        """
+
+        failed = error is not None and self.classify(error)
+        slow = seconds >= self.slow_call_seconds
+
+        with self._locked():
+            # Outcomes of calls admitted before the last transition no longer matter,
+            # e.g. a probe from an earlier half-open period
+            if permit.generation != self._generation:
+                return
+
+            if self._state == HALF_OPEN:
+                self._probes_in_flight -= 1
+                if failed or slow:
+                    self._transition(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+                return
+
+            now = time.monotonic()
+            self._window.append((now, failed, slow))
+            while self._window and self._window[0][0] < now - self.window_seconds:
+                self._window.popleft()
+
+            calls = len(self._window)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for _, call_failed, _ in self._window if call_failed)
+            slow_calls = sum(1 for _, _, call_slow in self._window if call_slow)
+            if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+                self._transition(OPEN)
+
+    def release(self, permit: Permit) -> None:
+        """Gives a permit back without an outcome, e.g. when the caller abandoned the call."""
+
+        with self._locked():
+            if permit.state == HALF_OPEN and permit.generation == self._generation:
+                self._probes_in_flight -= 1
@@ -0,0 +1,100 @@
+"""
+ASL Request Deadlines
+
+End-to-end deadline of a request, counted from the moment the entrypoint receives it.
+
+Callers state how long they will wait with the "latency_budget_ms" payload field
+or the TIMEOUT_HEADER request header (the shorter one wins); ASL_LATENCY_TARGET_SECONDS
+caps every request. The deadline lives in a context variable set once per request,
+so it follows the request into the Swarm, every agent turn and every model call,
+including tasks started on the request's behalf. Model calls are cut off at the
+deadline with their streams closed, and retries never start after it.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Mapping, Optional
+
+
+# Custom headers reach the runtime only with AgentCore's custom-header prefix
+TIMEOUT_HEADER = "X-Amzn-Bedrock-AgentCore-Runtime-Custom-Timeout-Ms"
+
+_current_deadline: ContextVar[Optional[float]] = ContextVar("asl_request_deadline", default=None)
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    """Case-insensitive header lookup."""
+
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _milliseconds(value: Any) -> Optional[float]:
+    """A positive number of milliseconds, or None for missing or malformed values."""
+
+    try:
+        milliseconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return milliseconds if milliseconds > 0 else None
+
+
+def request_timeout_seconds(request, max_seconds: float) -> float:
+    """
+    Reads how long a request may take.
+
+    Args:
+        request: The incoming RequestContext
+        max_seconds: Server-side cap for every request
+
+    Returns:
+        Seconds from arrival until the request's deadline
+    """
+
+    candidates = [max_seconds]
+    if isinstance(request.input, dict):
+        payload_ms = _milliseconds(request.input.get("latency_budget_ms"))
+        if payload_ms is not None:
+            candidates.append(payload_ms / 1000)
+
+    header_ms = _milliseconds(_header(getattr(request, "request_headers", None), TIMEOUT_HEADER))
+    if header_ms is not None:
+        candidates.append(header_ms / 1000)
+
+    return min(candidates)
+
+
+def set_deadline(deadline: Optional[float]) -> None:
+    """
+    Sets the current request's deadline.
+
+    Args:
+        deadline: time.monotonic() value, or None for no deadline
+    """
+
+    _current_deadline.set(deadline)
+
+
+def current_deadline() -> Optional[float]:
+    """The time.monotonic() deadline of the request being served, if any."""
+    return _current_deadline.get()
+
+
+def remaining_seconds(deadline: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before a deadline, never negative.
+
+    Args:
+        deadline: time.monotonic() value; defaults to the current request's deadline
+
+    Returns:
+        Seconds left, or None if there is no deadline
+    """
+
+    deadline = current_deadline() if deadline is None else deadline
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
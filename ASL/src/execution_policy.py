@@ -0,0 +1,121 @@
+"""
+ASL Execution Policy
+
+Adaptive per-request handoff and iteration budgets for the Swarm.
+
+Single-domain questions the router is sure about take a fast path: one specialist
+answers and no further handoffs are possible. Everything else gets a handoff and
+iteration budget derived from routing confidence and the time left before the
+request's latency deadline, instead of the fixed max_handoffs=20/max_iterations=20.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from src.router import RoutingDecision
+
+
+@dataclass
+class ExecutionBudget:
+    """Limits applied to a single Swarm run."""
+
+    fast_path: bool
+    max_handoffs: int
+    max_iterations: int
+    execution_timeout: float
+    node_timeout: float
+
+    def swarm_settings(self) -> dict:
+        """Keyword arguments for Swarm(...) that enforce this budget."""
+
+        return {
+            "max_handoffs": self.max_handoffs,
+            "max_iterations": self.max_iterations,
+            "execution_timeout": self.execution_timeout,
+            "node_timeout": self.node_timeout,
+        }
+
+
+class AdaptiveExecutionPolicy:
+    """
+    Derives an ExecutionBudget from a routing decision and a latency deadline.
+    """
+
+    def __init__(
+        self,
+        fast_path_confidence: float = 0.65,
+        secondary_domain_score: float = 0.3,
+        max_handoffs: int = 20,
+        max_iterations: int = 20,
+        latency_target_seconds: float = 30.0,
+        seconds_per_hop: float = 6.0,
+    ):
+        """
+        Args:
+            fast_path_confidence: Minimum routing confidence for the single-specialist path
+            secondary_domain_score: A runner-up domain scoring this high makes the
+                question multi-domain, which disables the fast path
+            max_handoffs: Upper bound on handoffs for any request
+            max_iterations: Upper bound on iterations for any request
+            latency_target_seconds: Default end-to-end deadline per request
+            seconds_per_hop: Expected duration of one agent turn
+        """
+
+        self.fast_path_confidence = fast_path_confidence
+        self.secondary_domain_score = secondary_domain_score
+        self.max_handoffs = max_handoffs
+        self.max_iterations = max_iterations
+        self.latency_target_seconds = latency_target_seconds
+        self.seconds_per_hop = seconds_per_hop
+
+    def is_single_domain(self, decision: RoutingDecision) -> bool:
+        """True if the router is sure and no other domain scores meaningfully."""
+
+        return (
+            decision.confident
+            and decision.confidence >= self.fast_path_confidence
+            and len(decision.domains_above(self.secondary_domain_score)) == 1
+        )
+
+    def plan(self, decision: RoutingDecision, remaining_seconds: Optional[float] = None) -> ExecutionBudget:
+        """
+        Builds the budget for one request.
+
+        Args:
+            decision: Routing decision for the question
+            remaining_seconds: Time left before the request deadline; defaults to
+                latency_target_seconds
+
+        Returns:
+            ExecutionBudget for the Swarm run
+        """
+
+        remaining = self.latency_target_seconds if remaining_seconds is None else max(0.0, remaining_seconds)
+        affordable_hops = max(1, int(remaining // self.seconds_per_hop))
+
+        if self.is_single_domain(decision):
+            return ExecutionBudget(
+                fast_path=True,
+                max_handoffs=1,
+                max_iterations=1,
+                execution_timeout=remaining,
+                node_timeout=remaining,
+            )
+
+        # Less confident routing earns more room to hand off, capped by what the
+        # deadline can pay for. Coordinator-routed requests need one extra hop.
+        wanted_handoffs = 2 + math.ceil((1.0 - decision.confidence) * 4)
+        if not decision.confident:
+            wanted_handoffs += 1
+
+        max_handoffs = max(1, min(self.max_handoffs, wanted_handoffs, affordable_hops))
+        max_iterations = max(1, min(self.max_iterations, max_handoffs + 1))
+
+        return ExecutionBudget(
+            fast_path=False,
+            max_handoffs=max_handoffs,
+            max_iterations=max_iterations,
+            execution_timeout=remaining,
+            node_timeout=max(self.seconds_per_hop, remaining / max_iterations),
+        )
@@ -0,0 +1,128 @@
+"""
+ASL Fallback Model
+
+Model wrapper that puts a circuit breaker (src/circuit_breaker.py) in front of
+a tier's model and of its fallback models.
+
+Each call goes to the first model whose circuit admits it, so while the
+tier's own model is throttled or degraded its calls move to the fallback
+model right away, and move back once half-open probes find it healthy again.
+When every circuit is open the call fails immediately with CircuitOpen, which
+the entrypoint answers from precomputed and cached answers.
+
+The call's metadata event carries the tier whose price applies to the model
+that served it (SERVED_TIER_KEY), so usage is costed at the fallback model's
+price rather than the tier's own.
+"""
+
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from strands.models import Model
+
+from src.circuit_breaker import STATE_VALUES, CircuitBreaker, CircuitOpen
+from src.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+# Added to a call's metadata event: tier whose price applies to the model that served the call
+SERVED_TIER_KEY = "asl_served_tier"
+
+
+def record_circuit_transition(name: str, previous: str, state: str) -> None:
+    """Exports breaker state changes as circuit.* metrics and logs them."""
+
+    metrics.increment("circuit.transitions", breaker=name, previous=previous, state=state)
+    metrics.set_gauge("circuit.state", STATE_VALUES[state], breaker=name)
+    logger.warning("Circuit for %s: %s -> %s", name, previous, state)
+
+
+class FallbackModel(Model):
+    """
+    Delegates each call to the first model in order whose circuit is not open.
+    """
+
+    def __init__(self, routes: List[Tuple[Model, CircuitBreaker]], tier: str, price_tiers: Optional[List[str]] = None):
+        """
+        Args:
+            routes: (model, breaker) pairs, the tier's own model first, then its fallbacks
+            tier: Tier the models serve, used as a metric label
+            price_tiers: Per route, the tier whose price applies to its model; defaults to `tier`
+        """
+
+        self.routes = routes
+        self.tier = tier
+        self.price_tiers = price_tiers or [tier] * len(routes)
+        # The tier's own model; configuration and attributes come from it
+        self.inner = routes[0][0]
+
+    def update_config(self, **model_config) -> None:
+        self.inner.update_config(**model_config)
+
+    def get_config(self):
+        return self.inner.get_config()
+
+    def __getattr__(self, name):
+        if name in ("inner", "routes", "tier", "price_tiers"):
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def _select(self) -> Tuple[Model, CircuitBreaker, str, str]:
+        for index, (model, breaker) in enumerate(self.routes):
+            permit = breaker.acquire()
+            if permit is None:
+                metrics.increment("circuit.rejected", breaker=breaker.name)
+                continue
+            if index > 0:
+                metrics.increment("model.fallback_calls", tier=self.tier, breaker=breaker.name)
+            return model, breaker, permit, self.price_tiers[index]
+
+        breaker = min((breaker for _, breaker in self.routes), key=lambda b: b.retry_after())
+        raise CircuitOpen(breaker.name, breaker.retry_after())
+
+    async def stream(self, messages, tool_specs=None, system_prompt: Optional[str] = None, **kwargs):
+        """
+        Streams from the first available model and reports the call to its breaker.
+
+        The metadata event is tagged with the serving model's price tier (SERVED_TIER_KEY).
+
+        Raises:
+            CircuitOpen: If every model's circuit is open
+        """
+
+        model, breaker, permit, price_tier = self._select()
+        started = time.monotonic()
+        first_event_seconds = None
+
+        try:
+            async for event in model.stream(messages, tool_specs, system_prompt, **kwargs):
+                if first_event_seconds is None:
+                    first_event_seconds = time.monotonic() - started
+                if "metadata" in event:
+                    event = {**event, SERVED_TIER_KEY: price_tier}
+                yield event
+        except Exception as e:
+            breaker.record(permit, self._latency(started, first_event_seconds), e)
+            raise
+        except BaseException:
+            # Abandoned by the caller (deadline, disconnect); only a call that had
+            # already answered or was already slow says anything about the model
+            seconds = self._latency(started, first_event_seconds)
+            if first_event_seconds is not None or seconds >= breaker.slow_call_seconds:
+                breaker.record(permit, seconds)
+            else:
+                breaker.release(permit)
+            raise
+
+        breaker.record(permit, self._latency(started, first_event_seconds))
+
+    @staticmethod
+    def _latency(started: float, first_event_seconds: Optional[float]) -> float:
+        """Time to the first event, or the time so far for calls that produced nothing."""
+        return first_event_seconds if first_event_seconds is not None else time.monotonic() - started
+
+    def structured_output(self, output_model, prompt, system_prompt: Optional[str] = None, **kwargs):
+        model = next((model for model, breaker in self.routes if breaker.available), self.inner)
+        return model.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs)
@@ -0,0 +1,237 @@
+"""
+ASL Concurrent Fan-Out
+
+Parallel mode for questions that span several specialist domains.
+
+Instead of sequential handoffs, the question goes to every relevant specialist at
+once with asyncio.gather, each branch bounded by its own timeout. The answers that
+come back are merged in one synthesis step, so wall-clock latency is roughly the
+slowest specialist plus the merge rather than the sum of all hops. Failed or
+timed-out branches are dropped; one surviving answer is streamed as-is.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from src.metrics import metrics
+from src.router import RoutingDecision
+from src.streaming import StreamTimer, event_frame, stream_until, text_frame, usage_from_result
+
+
+def select_fanout_domains(
+    decision: RoutingDecision,
+    min_score: float = 0.3,
+    max_branches: int = 3,
+) -> List[str]:
+    """
+    Picks the specialists to query in parallel.
+
+    Args:
+        decision: Routing decision for the question
+        min_score: Minimum router score for a domain to get a branch
+        max_branches: Maximum number of concurrent specialists
+
+    Returns:
+        Agent keys, best first; fewer than two means the question is single-domain
+    """
+
+    return decision.domains_above(min_score)[:max_branches]
+
+
+def build_synthesis_prompt(question: str, answers: Dict[str, str]) -> str:
+    """
+    Builds the merge prompt from the question and each specialist's answer.
+    """
+
+    sections = [f"Learner's question: {question}", ""]
+    for agent_name, answer in answers.items():
+        sections.append(f"--- Answer from {agent_name} ---")
+        sections.append(answer.strip())
+        sections.append("")
+    sections.append("Merge these answers into a single response to the learner's question.")
+    return "\n".join(sections)
+
+
+class FanOutRun:
+    """
+    Runs specialists concurrently and streams one merged answer.
+
+    Exposes the same attributes as SwarmStream (text, status, node_path,
+    node_results, stopped_early, summary_frame) so the entrypoint can treat
+    both execution modes alike.
+    """
+
+    def __init__(
+        self,
+        branches: Dict[str, Any],
+        synthesizer,
+        task: str,
+        question: str,
+        timer: StreamTimer,
+        branch_timeout: float = 20.0,
+        include_events: bool = False,
+        trace=None,
+    ):
+        """
+        Args:
+            branches: Agent key to a per-request specialist agent
+            synthesizer: Agent used for the merge step
+            task: Prompt sent to each specialist (may include session history)
+            question: The learner's question, used in the merge prompt
+            timer: Request timer used for time-to-first-token
+            branch_timeout: Per-branch timeout in seconds
+            include_events: Whether to emit a fan-out progress event
+            trace: Optional RequestTrace that gets one span per branch and the merge
+        """
+
+        self._branches = branches
+        self._synthesizer = synthesizer
+        self._task = task
+        self._question = question
+        self._timer = timer
+        self._branch_timeout = branch_timeout
+        self._include_events = include_events
+        self._trace = trace
+
+        self.node_results: Dict[str, Any] = {}
+        self.failed_branches: Dict[str, str] = {}
+        self.stopped_early = False
+        self._chunks: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    @property
+    def node_path(self) -> List[str]:
+        return list(self.node_results)
+
+    @property
+    def handoffs(self) -> int:
+        return 0
+
+    @property
+    def status(self) -> str:
+        if self.stopped_early:
+            return "budget_exhausted"
+        if not self.node_results:
+            return "failed"
+        return "partial" if self.failed_branches else "completed"
+
+    async def _run_branch(self, agent_key: str, agent, timeout: float):
+        """Runs one specialist; returns (agent_key, agent, result or None, error or None)."""
+
+        span = self._trace.start_agent(agent.name) if self._trace is not None else None
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(agent.run_async(self._task), timeout)
+        except asyncio.TimeoutError:
+            metrics.increment("fanout.branch_failures", agent=agent_key, reason="timeout")
+            if span is not None:
+                self._trace.end_agent(span, status="timeout")
+            return agent_key, agent, None, "timeout"
+        except Exception as e:
+            metrics.increment("fanout.branch_failures", agent=agent_key, reason="error")
+            if span is not None:
+                self._trace.end_agent(span, status="error")
+            return agent_key, agent, None, str(e)
+
+        if span is not None:
+            self._trace.end_agent(span, result)
+        metrics.observe("fanout.branch_latency_ms", (time.perf_counter() - started) * 1000, agent=agent_key)
+        return agent_key, agent, result, None
+
+    async def frames(self, deadline: Optional[float] = None):
+        """
+        Yields the merged answer as text frames.
+
+        Args:
+            deadline: Optional time.monotonic() value bounding branches and merge
+
+        Raises:
+            RuntimeError: If every branch failed
+        """
+
+        timeout = self._branch_timeout
+        if deadline is not None:
+            timeout = max(0.0, min(timeout, deadline - time.monotonic()))
+
+        outcomes = await asyncio.gather(
+            *(self._run_branch(key, agent, timeout) for key, agent in self._branches.items())
+        )
+
+        answers: Dict[str, str] = {}
+        for agent_key, agent, result, error in outcomes:
+            if result is None:
+                self.failed_branches[agent_key] = error
+            else:
+                self.node_results[agent.name] = result
+                answers[agent.name] = str(result)
+
+        metrics.increment("fanout.requests", branches=len(self._branches), succeeded=len(answers))
+
+        if self._include_events:
+            yield event_frame("fanout", agents=list(answers), failed=list(self.failed_branches))
+
+        if not answers:
+            raise RuntimeError(f"All specialists failed: {self.failed_branches}")
+
+        if len(answers) == 1:
+            answer = next(iter(answers.values()))
+            self._timer.mark_token()
+            self._chunks.append(answer)
+            yield text_frame(answer)
+            return
+
+        # Merge step - stream the synthesizer's tokens as they are produced
+        prompt = build_synthesis_prompt(self._question, answers)
+        span = self._trace.start_agent(self._synthesizer.name) if self._trace is not None else None
+        try:
+            async for event in stream_until(self._synthesizer.stream_async(prompt), deadline):
+                data = event.get("data")
+                if isinstance(data, str) and data:
+                    self._timer.mark_token()
+                    self._chunks.append(data)
+                    yield text_frame(data)
+                elif "result" in event:
+                    self.node_results[self._synthesizer.name] = event["result"]
+        except asyncio.TimeoutError:
+            self.stopped_early = True
+
+        if span is not None:
+            self._trace.end_agent(
+                span,
+                self.node_results.get(self._synthesizer.name),
+                status="cancelled" if self.stopped_early else "ok",
+            )
+
+        # The merge ran out of time before producing anything - fall back to the
+        # best branch answer rather than returning nothing
+        if not self._chunks:
+            answer = next(iter(answers.values()))
+            self._timer.mark_token()
+            self._chunks.append(answer)
+            yield text_frame(answer)
+
+    def summary_frame(self, **fields) -> dict:
+        """
+        Final frame with usage summed over branches and the merge step.
+        """
+
+        usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        for result in self.node_results.values():
+            for key, value in usage_from_result(result).items():
+                usage[key] += value
+
+        return {
+            "type": "summary",
+            "status": self.status,
+            "mode": "fanout",
+            "agents": self.node_path,
+            "failed_agents": list(self.failed_branches),
+            "handoffs": 0,
+            "usage": usage,
+            "timing": self._timer.timing(),
+            **fields,
+        }
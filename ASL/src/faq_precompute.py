@@ -0,0 +1,269 @@
+"""
+ASL FAQ Precompute
+
+Offline pipeline that answers a curated question set with the real pipeline and
+writes the answers to an FAQ store (src/faq_store.py).
+
+Questions run through agent_invocation in concurrent batches at "batch"
+admission priority, so they take the same routing, tiers and Swarm as live
+traffic. Rebuilding against an existing store (--base) regenerates only new
+questions and records whose prompts, data sources or model configuration
+changed; fresh records, including their review decisions, are carried over.
+
+Answers must be approved before they are served: review an exported JSONL file
+and apply it, or pass --auto-approve to approve every completed answer.
+
+Usage:
+    python -m src.faq_precompute build --output data/faq_store.bin
+    python -m src.faq_precompute build --base data/faq_store.bin --questions extra.txt --output data/faq_store.bin
+    python -m src.faq_precompute export --store data/faq_store.bin --output review.jsonl
+    python -m src.faq_precompute review --store data/faq_store.bin --input review.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import types
+import uuid
+from typing import Any, Dict, List, Optional
+
+from src.faq_store import FaqStore, faq_key, is_fresh, merge_reviews, write_faq_store
+from src.test_agent_local import EXAMPLE_QUESTIONS
+
+
+# Everyday vocabulary learners ask for first
+COMMON_VOCABULARY = (
+    "hello", "goodbye", "thank you", "please", "sorry", "yes", "no", "name", "nice to meet you",
+    "deaf", "hearing", "friend", "family", "mother", "father", "sister", "brother", "love",
+    "help", "water", "eat", "drink", "bathroom", "good", "bad", "learn", "understand",
+    "again", "slow", "what", "where", "who", "why", "how", "when", "more", "finished", "want",
+)
+
+VOCABULARY_TEMPLATE = "How do I sign '{word}' in ASL?"
+
+# Data files whose contents reach an agent's answers (keys in the registry's system_prompts)
+AGENT_DATA_SOURCES = {
+    "vocabulary_agent": "sign_lexicon",
+    "learning_agent": "resource_index",
+}
+
+
+def default_questions() -> List[str]:
+    """The built-in question set: the example questions plus common vocabulary lookups."""
+    return list(EXAMPLE_QUESTIONS) + [VOCABULARY_TEMPLATE.format(word=word) for word in COMMON_VOCABULARY]
+
+
+def read_questions(path: str) -> List[str]:
+    """
+    Reads questions from a text file (one per line) or JSONL ({"question": ...} per line).
+
+    Args:
+        path: Question file
+
+    Returns:
+        The questions in file order
+    """
+
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            questions.append(json.loads(line)["question"] if path.endswith(".jsonl") else line)
+    return questions
+
+
+def answer_dependencies(app, summary: Dict[str, Any]) -> List[str]:
+    """
+    Registry keys an answer depends on: the agents that ran, the merge step and their data files.
+
+    Args:
+        app: The imported src.asl_swarm_agent module
+        summary: The run's summary frame
+
+    Returns:
+        Keys for AgentRegistry.fingerprints()
+    """
+
+    keys_by_name = {app.agent_registry.agent_name(key): key for key in app.agent_registry.agent_keys}
+    keys = [keys_by_name[name] for name in summary.get("agents", []) if name in keys_by_name]
+    if summary.get("mode") == "fanout":
+        keys.append("synthesis")
+    keys.extend(AGENT_DATA_SOURCES[key] for key in list(keys) if key in AGENT_DATA_SOURCES)
+    return sorted(set(keys))
+
+
+async def answer_question(app, question: str) -> Dict[str, Any]:
+    """
+    Answers one question through agent_invocation.
+
+    Args:
+        app: The imported src.asl_swarm_agent module
+        question: Question text
+
+    Returns:
+        An FAQ record, or {"question", "error"} if the run did not complete
+    """
+
+    request = types.SimpleNamespace(
+        input={"input": question, "priority": "batch"},
+        session_id=f"faq-precompute-{uuid.uuid4()}",
+    )
+    chunks: List[str] = []
+    summary: Dict[str, Any] = {}
+    async for frame in app.agent_invocation(request):
+        if frame.get("type") == "text":
+            chunks.append(frame["data"])
+        elif frame.get("type") in ("summary", "error"):
+            summary = frame
+
+    answer = "".join(chunks).strip()
+    if summary.get("type") != "summary" or summary.get("status") != "completed" or not answer:
+        return {"question": question, "error": summary.get("error") or f"run ended with status {summary.get('status')}"}
+
+    decision = app.question_router.route(question)
+    return {
+        "question": question,
+        "answer": answer,
+        "routing": {
+            "agent_key": decision.agent_key,
+            "confidence": round(decision.confidence, 3),
+            "method": decision.method,
+            "confident": decision.confident,
+        },
+        "path": summary.get("path"),
+        "agents": summary.get("agents", []),
+        "fingerprints": app.agent_registry.fingerprints(answer_dependencies(app, summary)),
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "approved": False,
+    }
+
+
+async def answer_questions(app, questions: List[str], concurrency: int) -> List[Dict[str, Any]]:
+    """
+    Answers questions in batches of `concurrency` concurrent runs.
+
+    Args:
+        app: The imported src.asl_swarm_agent module
+        questions: Questions to answer
+        concurrency: Runs per batch
+
+    Returns:
+        One record (or error record) per question, in order
+    """
+
+    results = []
+    for start in range(0, len(questions), concurrency):
+        batch = questions[start:start + concurrency]
+        results.extend(await asyncio.gather(*(answer_question(app, question) for question in batch)))
+        print(f"  {min(start + concurrency, len(questions))}/{len(questions)} answered", file=sys.stderr)
+    return results
+
+
+def build(args) -> None:
+    """Answers the missing and stale questions and writes the new store version."""
+
+    # The pipeline must generate answers, not serve them from the store or caches
+    os.environ["ASL_FAQ_STORE_PATH"] = ""
+    os.environ["ASL_SEMANTIC_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("ASL_METRICS_EXPORT", "none")
+    from src import asl_swarm_agent as app
+
+    questions: Dict[str, str] = {}
+    for question in (default_questions() if not args.no_defaults else []) + [
+        question for path in args.questions for question in read_questions(path)
+    ]:
+        questions.setdefault(faq_key(question), question)
+
+    base: Optional[FaqStore] = FaqStore(args.base) if args.base and os.path.exists(args.base) else None
+    records: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+    for key, question in questions.items():
+        record = base.get(key) if base is not None else None
+        if record is not None and not args.force and is_fresh(record, app.agent_registry):
+            records[key] = record
+        else:
+            pending.append(question)
+
+    print(f"{len(questions)} questions: {len(records)} fresh in the base store, {len(pending)} to answer")
+    if args.dry_run:
+        for question in pending:
+            print(f"  would answer: {question}")
+        return
+
+    failed = 0
+    for result in asyncio.run(answer_questions(app, pending, max(1, args.concurrency))):
+        if "error" in result:
+            failed += 1
+            print(f"  failed: {result['question']}: {result['error']}", file=sys.stderr)
+            continue
+        result["approved"] = args.auto_approve
+        records[faq_key(result["question"])] = result
+
+    version = (base.version if base is not None else 0) + 1
+    write_faq_store(records, args.output, version)
+    approved = sum(1 for record in records.values() if record.get("approved"))
+    print(f"Wrote {args.output} version {version}: {len(records)} answers ({approved} approved), {failed} failed")
+
+
+def main():
+    """Command-line entry point."""
+
+    parser = argparse.ArgumentParser(description="Precompute and review FAQ answers for the ASL agent")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Answer the question set and write the store")
+    build_parser.add_argument("--questions", action="append", default=[], help="Question file (.txt or .jsonl, repeatable)")
+    build_parser.add_argument("--no-defaults", action="store_true", help="Skip the built-in question set")
+    build_parser.add_argument("--base", type=str, default=None, help="Existing store to reuse fresh answers from")
+    build_parser.add_argument("--output", type=str, required=True, help="Store file to write")
+    build_parser.add_argument("--concurrency", type=int, default=4, help="Questions answered concurrently")
+    build_parser.add_argument("--auto-approve", action="store_true", help="Approve every newly generated answer")
+    build_parser.add_argument("--force", action="store_true", help="Regenerate every answer")
+    build_parser.add_argument("--dry-run", action="store_true", help="Only list the questions that would be answered")
+
+    export_parser = commands.add_parser("export", help="Write the store's records as JSONL for review")
+    export_parser.add_argument("--store", type=str, required=True, help="Store file")
+    export_parser.add_argument("--output", type=str, required=True, help="JSONL file to write")
+
+    review_parser = commands.add_parser("review", help="Apply reviewed approvals and edits")
+    review_parser.add_argument("--store", type=str, required=True, help="Store file")
+    review_parser.add_argument("--input", type=str, required=True, help="Reviewed JSONL file")
+    review_parser.add_argument("--output", type=str, default=None, help="Store file to write (default: --store)")
+
+    stats_parser = commands.add_parser("stats", help="Show a store's version and counts")
+    stats_parser.add_argument("--store", type=str, required=True, help="Store file")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args)
+
+    elif args.command == "export":
+        with FaqStore(args.store) as store, open(args.output, "w", encoding="utf-8") as f:
+            for _, record in store.records():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            exported = len(store)
+        print(f"Exported {exported} records to {args.output}")
+
+    elif args.command == "review":
+        with open(args.input, "r", encoding="utf-8") as f:
+            reviews = [json.loads(line) for line in f if line.strip()]
+        with FaqStore(args.store) as store:
+            records = merge_reviews(store, reviews)
+            version = store.version + 1
+        write_faq_store(records, args.output or args.store, version)
+        approved = sum(1 for record in records.values() if record.get("approved"))
+        print(f"Wrote version {version}: {approved} of {len(records)} answers approved")
+
+    else:
+        with FaqStore(args.store) as store:
+            print(json.dumps({**store.meta, "path": args.store}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
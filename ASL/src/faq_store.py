@@ -0,0 +1,218 @@
+"""
+ASL FAQ Store
+
+Read-optimized file of precomputed answers, served by agent_invocation with no
+model calls.
+
+The file holds one record per normalized question, in a sorted, memory-mapped
+key/offset layout: a lookup normalizes the question and binary-searches the
+keys, then decodes just that record. Each record carries the answer, the routing
+metadata of the run that produced it, whether a reviewer approved it, and the
+fingerprints (AgentRegistry.fingerprints) of the prompts and model configuration
+it depends on. Records whose fingerprints no longer match the running
+configuration are stale and never served; src/faq_precompute.py regenerates
+just those.
+
+Every build increments the file's version, which is reported with each answer.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.metrics import metrics
+from src.mmap_sections import SectionFile, string_table, write_sections
+from src.text_features import normalize_question
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b"ASLFAQ01"
+FORMAT_VERSION = 1
+
+_SECTIONS = ("meta", "key_offsets", "keys", "record_offsets", "records")
+
+
+def faq_key(question: str) -> str:
+    """The lookup key of a question; exact and differently punctuated or cased forms share it."""
+    return normalize_question(question)
+
+
+def write_faq_store(records: Dict[str, Dict[str, Any]], path: str, version: int) -> None:
+    """
+    Writes an FAQ store, replacing path atomically.
+
+    Args:
+        records: FAQ key (see faq_key) to record
+        path: Destination file
+        version: Store version; increase it with every build
+    """
+
+    keys = sorted(records, key=lambda key: key.encode("utf-8"))
+    meta = {
+        "version": version,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "entries": len(keys),
+        "approved": sum(1 for key in keys if records[key].get("approved")),
+    }
+
+    key_offsets, key_blob = string_table(keys)
+    record_offsets, record_blob = string_table(
+        json.dumps(records[key], ensure_ascii=False, separators=(",", ":")) for key in keys
+    )
+    write_sections(path, MAGIC, FORMAT_VERSION, _SECTIONS, {
+        "meta": json.dumps(meta).encode("utf-8"),
+        "key_offsets": key_offsets,
+        "keys": key_blob,
+        "record_offsets": record_offsets,
+        "records": record_blob,
+    })
+
+
+class FaqStore:
+    """Read-only view of an FAQ store file; safe to share between threads."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: File written by write_faq_store
+        """
+
+        self.path = path
+        self._file = SectionFile(path, MAGIC, FORMAT_VERSION, _SECTIONS)
+        self.meta = json.loads(bytes(self._file.sections["meta"]))
+        self._keys = self._file.strings("key_offsets", "keys")
+        self._records = self._file.strings("record_offsets", "records")
+
+    @property
+    def version(self) -> int:
+        return self.meta["version"]
+
+    def close(self) -> None:
+        """Releases the memory map."""
+        self._file.close()
+
+    def __enter__(self) -> "FaqStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """All (key, record) pairs in key order."""
+
+        for index in range(len(self._keys)):
+            yield self._keys[index].decode("utf-8"), json.loads(self._records[index])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The record stored under a FAQ key, approved or not."""
+
+        encoded = key.encode("utf-8")
+        index = bisect.bisect_left(self._keys, encoded)
+        if index < len(self._keys) and self._keys[index] == encoded:
+            return json.loads(self._records[index])
+        return None
+
+    def lookup(self, question: str, fresh: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the servable record for a question.
+
+        Args:
+            question: Raw question text
+            fresh: Check that the record still matches the running configuration (see is_fresh)
+
+        Returns:
+            The record if one exists, is approved and is fresh; otherwise None
+        """
+
+        started = time.perf_counter()
+        record = self.get(faq_key(question))
+        if record is None:
+            result = "miss"
+        elif not record.get("approved"):
+            result = "unapproved"
+        elif fresh is not None and not fresh(record):
+            result = "stale"
+        else:
+            result = "hit"
+
+        metrics.observe("faq_store.lookup_us", (time.perf_counter() - started) * 1e6)
+        metrics.increment("faq_store.lookups", result=result)
+        return record if result == "hit" else None
+
+
+def is_fresh(record: Dict[str, Any], registry) -> bool:
+    """
+    Reports whether a record was produced by the running configuration.
+
+    Args:
+        record: FAQ record with the fingerprints it was built with
+        registry: The AgentRegistry answering live requests
+
+    Returns:
+        True if every prompt, data source and model setting the answer depends on is unchanged
+    """
+
+    fingerprints = record.get("fingerprints") or {}
+    return bool(fingerprints) and registry.fingerprints(key for key in fingerprints if key != "model") == fingerprints
+
+
+def merge_reviews(store: FaqStore, reviews: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Applies reviewer decisions to a store's records.
+
+    Args:
+        store: Store being reviewed
+        reviews: Records with "question" and "approved", and optionally an edited "answer"
+
+    Returns:
+        FAQ key to updated record, ready for write_faq_store
+    """
+
+    records = dict(store.records())
+    for review in reviews:
+        key = faq_key(review["question"])
+        if key not in records:
+            logger.warning("Review for unknown question %r ignored", review["question"])
+            continue
+        record = records[key]
+        record["approved"] = bool(review.get("approved"))
+        if review.get("answer") and review["answer"] != record["answer"]:
+            record["answer"] = review["answer"]
+            record["edited"] = True
+    return records
+
+
+_shared_store: Optional[FaqStore] = None
+_shared_lock = threading.Lock()
+_shared_loaded = False
+
+
+def get_faq_store() -> Optional[FaqStore]:
+    """
+    Returns the process-wide store from ASL_FAQ_STORE_PATH, opening it on first use.
+
+    Returns:
+        The store, or None if no path is configured or the file cannot be opened
+    """
+
+    global _shared_store, _shared_loaded
+
+    if not _shared_loaded:
+        with _shared_lock:
+            if not _shared_loaded:
+                path = os.getenv("ASL_FAQ_STORE_PATH")
+                if path:
+                    try:
+                        _shared_store = FaqStore(path)
+                    except (OSError, ValueError):
+                        logger.exception("FAQ store %s could not be opened; answering without it", path)
+                _shared_loaded = True
+    return _shared_store
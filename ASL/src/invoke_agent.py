@@ -5,23 +5,27 @@ This script invokes the ASL Q&A Agent using OAuth bearer token authentication.
 Use this for interactive user sessions where you have a JWT token.
 
 Usage:
-    python invoke_agent.py --token YOUR_JWT_TOKEN --input "How do I sign hello?"
-    python invoke_agent.py --token YOUR_JWT_TOKEN --input "What are Wh-questions?" --session SESSION_ID
+    python -m src.invoke_agent --token YOUR_JWT_TOKEN --input "How do I sign hello?"
+    python -m src.invoke_agent --token YOUR_JWT_TOKEN --input "What are Wh-questions?" --session SESSION_ID
 """
 
 import argparse
-import json
+import asyncio
 import uuid
-import requests
 import sys
 from typing import Optional
 
+from src.agent_client import AgentClientError, OAuthAgentClient
+from src.resilience import RetryPolicy
+
 
 def invoke_agent_with_oauth(
     agent_endpoint: str,
     auth_token: str,
     user_input: str,
     session_id: Optional[str] = None,
+    retries: int = 3,
+    timeout: float = 60.0,
 ) -> dict:
     """
     Invoke the ASL Agent using OAuth bearer token authentication.
@@ -31,6 +35,8 @@ def invoke_agent_with_oauth(
         auth_token: JWT bearer token for authentication
         user_input: The user's question or input
         session_id: Optional session ID for conversation continuity
+        retries: Retries for throttling, 5xx and timeouts before the response starts
+        timeout: Seconds before the client gives up; the agent stops work at the same deadline
 
     Returns:
         Dictionary containing the agent's response
@@ -40,58 +46,42 @@ def invoke_agent_with_oauth(
     if not session_id:
         session_id = str(uuid.uuid4())
 
-    # Prepare the request
-    headers = {
-        "Authorization": f"Bearer {auth_token}",
-        "Content-Type": "application/json",
-        "X-Amzn-Bedrock-AgentCore-Runtime-Session-Id": session_id,
-    }
-
-    payload = {
-        "input": user_input,
-        "session_id": session_id,
-    }
-
     print(f"Session ID: {session_id}")
     print(f"Question: {user_input}")
     print("-" * 60)
 
-    try:
-        # Make the request with streaming
-        response = requests.post(
-            agent_endpoint,
-            headers=headers,
-            json=payload,
-            stream=True,
-            timeout=60,
-        )
-
-        response.raise_for_status()
+    client = OAuthAgentClient(
+        agent_endpoint,
+        auth_token,
+        pool_size=1,
+        timeout=timeout,
+        retry_policy=RetryPolicy(max_attempts=retries + 1),
+        request_timeout=timeout,
+    )
 
-        # Process streaming response
-        full_response = ""
+    try:
+        # Stream the response as it arrives
         print("Response: ", end="", flush=True)
 
-        for chunk in response.iter_content(chunk_size=1024, decode_unicode=True):
-            if chunk:
-                print(chunk, end="", flush=True)
-                full_response += chunk
+        result = asyncio.run(
+            client.invoke(
+                user_input,
+                session_id=session_id,
+                on_text=lambda text: print(text, end="", flush=True),
+            )
+        )
 
         print("\n" + "-" * 60)
+        print(f"Time to first byte: {result.timing.first_byte_ms:.0f} ms, total: {result.timing.total_ms:.0f} ms")
 
         return {
             "session_id": session_id,
-            "response": full_response,
+            "response": result.text,
             "status": "success",
         }
 
-    except requests.exceptions.HTTPError as e:
-        error_msg = f"HTTP Error: {e.response.status_code} - {e.response.text}"
-        print(f"\nError: {error_msg}", file=sys.stderr)
-        return {"status": "error", "error": error_msg}
-
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Request Error: {str(e)}"
+    except AgentClientError as e:
+        error_msg = str(e)
         print(f"\nError: {error_msg}", file=sys.stderr)
         return {"status": "error", "error": error_msg}
 
@@ -100,6 +90,9 @@ def invoke_agent_with_oauth(
         print(f"\nError: {error_msg}", file=sys.stderr)
         return {"status": "error", "error": error_msg}
 
+    finally:
+        client.close()
+
 
 def main():
     """Main function to handle command-line invocation."""
@@ -136,6 +129,20 @@ def main():
         help="Session ID for conversation continuity (optional)",
     )
 
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries for throttled or failed requests (default: 3)",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Seconds before giving up, sent to the agent as its deadline (default: 60)",
+    )
+
     args = parser.parse_args()
 
     # Get endpoint from args or environment
@@ -160,6 +167,8 @@ def main():
         auth_token=args.token,
         user_input=args.input,
         session_id=args.session,
+        retries=args.retries,
+        timeout=args.timeout,
     )
 
     # Exit with appropriate code
@@ -4,35 +4,54 @@ IAM (SigV4) Invocation Script for ASL Agent
 This script invokes the ASL Q&A Agent using AWS IAM authentication.
 Use this for background jobs and service-to-service communication.
 
+Requests go through the pooled, streaming IamAgentClient in agent_client.py.
+Batch mode runs a JSONL or CSV file of questions with bounded concurrency over one
+shared client, appending results to a JSONL file as they complete. Re-running with
+--resume skips questions that already succeeded.
+
 Usage:
-    python invoke_agent_iam.py --input "How do I sign hello?"
-    python invoke_agent_iam.py --input "What are Wh-questions?" --session SESSION_ID
-    python invoke_agent_iam.py --input "Tell me about Deaf culture" --region us-east-1
+    python -m src.invoke_agent_iam --input "How do I sign hello?"
+    python -m src.invoke_agent_iam --input "What are Wh-questions?" --session SESSION_ID
+    python -m src.invoke_agent_iam --input "Tell me about Deaf culture" --region us-east-1
+    python -m src.invoke_agent_iam --batch questions.jsonl --output results.jsonl --concurrency 16
+    python -m src.invoke_agent_iam --batch questions.csv --output results.jsonl --resume
+
+Batch input: JSONL lines like {"id": "q1", "input": "How do I sign hello?"} or a CSV
+file with "id" and "input" columns. "session_id" is optional; "id" defaults to the
+line number.
 """
 
 import argparse
+import asyncio
+import csv
 import json
+import math
+import os
+import time
 import uuid
 import sys
-from typing import Optional
-import boto3
-from botocore.exceptions import ClientError
+from typing import Dict, Iterator, List, Optional, Set
 
+from src.agent_client import AgentClientError, IamAgentClient
+from src.resilience import HedgePolicy, RetryBudget, RetryPolicy
 
-def invoke_agent_with_iam(
-    agent_runtime_arn: str,
+
+async def invoke_agent_async(
+    client: IamAgentClient,
     user_input: str,
     session_id: Optional[str] = None,
-    region_name: str = "us-east-1",
+    verbose: bool = True,
+    priority: Optional[str] = None,
 ) -> dict:
     """
-    Invoke the ASL Agent using AWS IAM (SigV4) authentication.
+    Invoke the ASL Agent over a shared, pooled IAM client.
 
     Args:
-        agent_runtime_arn: The AgentCore runtime ARN
+        client: IamAgentClient, shared across concurrent invocations
         user_input: The user's question or input
         session_id: Optional session ID for conversation continuity
-        region_name: AWS region (default: us-east-1)
+        verbose: Whether to print the question and stream the response to stdout
+        priority: Optional admission priority class ("interactive" or "batch")
 
     Returns:
         Dictionary containing the agent's response
@@ -42,66 +61,38 @@ def invoke_agent_with_iam(
     if not session_id:
         session_id = str(uuid.uuid4())
 
-    print(f"Session ID: {session_id}")
-    print(f"Question: {user_input}")
-    print(f"Region: {region_name}")
-    print("-" * 60)
+    if verbose:
+        print(f"Session ID: {session_id}")
+        print(f"Question: {user_input}")
+        print(f"Region: {client.region_name}")
+        print("-" * 60)
+        print("Response: ", end="", flush=True)
 
     try:
-        # Create Bedrock AgentCore client
-        client = boto3.client("bedrock-agentcore", region_name=region_name)
-
-        # Prepare the payload
-        payload = {
-            "input": user_input,
-            "session_id": session_id,
-        }
-
-        # Invoke the agent
-        response = client.invoke_agent_runtime(
-            agentRuntimeArn=agent_runtime_arn,
-            qualifier="DEFAULT",
-            body=json.dumps(payload),
-            contentType="application/json",
+        result = await client.invoke(
+            user_input,
+            session_id=session_id,
+            on_text=(lambda text: print(text, end="", flush=True)) if verbose else None,
+            **({"priority": priority} if priority else {}),
         )
 
-        # Process the response
-        if response["ResponseMetadata"]["HTTPStatusCode"] == 200:
-            # Read the streaming response
-            print("Response: ", end="", flush=True)
-
-            full_response = ""
-            if "body" in response:
-                body = response["body"]
-
-                # Read streaming body
-                for chunk in body:
-                    if "chunk" in chunk:
-                        chunk_data = chunk["chunk"].get("bytes", b"")
-                        chunk_text = chunk_data.decode("utf-8")
-                        print(chunk_text, end="", flush=True)
-                        full_response += chunk_text
-
+        if verbose:
             print("\n" + "-" * 60)
 
-            return {
-                "session_id": session_id,
-                "response": full_response,
-                "status": "success",
-            }
-        else:
-            error_msg = f"Unexpected status code: {response['ResponseMetadata']['HTTPStatusCode']}"
-            print(f"\nError: {error_msg}", file=sys.stderr)
-            return {"status": "error", "error": error_msg}
+        return {
+            "session_id": session_id,
+            "response": result.text,
+            "status": "success",
+            "first_byte_ms": result.timing.first_byte_ms,
+        }
 
-    except ClientError as e:
-        error_code = e.response["Error"]["Code"]
-        error_message = e.response["Error"]["Message"]
-        error_msg = f"AWS Error ({error_code}): {error_message}"
-        print(f"\nError: {error_msg}", file=sys.stderr)
+    except AgentClientError as e:
+        error_msg = str(e)
+        if verbose:
+            print(f"\nError: {error_msg}", file=sys.stderr)
 
         # Provide helpful error messages
-        if error_code == "AccessDeniedException":
+        if verbose and e.code == "AccessDeniedException":
             print(
                 "\nTip: Ensure your IAM role has the following permissions:",
                 file=sys.stderr,
@@ -116,10 +107,269 @@ def invoke_agent_with_iam(
 
     except Exception as e:
         error_msg = f"Unexpected Error: {str(e)}"
-        print(f"\nError: {error_msg}", file=sys.stderr)
+        if verbose:
+            print(f"\nError: {error_msg}", file=sys.stderr)
         return {"status": "error", "error": error_msg}
 
 
+def invoke_agent_with_iam(
+    agent_runtime_arn: str,
+    user_input: str,
+    session_id: Optional[str] = None,
+    region_name: str = "us-east-1",
+    retries: int = 3,
+    timeout: float = 60.0,
+) -> dict:
+    """
+    Invoke the ASL Agent using AWS IAM (SigV4) authentication.
+
+    Args:
+        agent_runtime_arn: The AgentCore runtime ARN
+        user_input: The user's question or input
+        session_id: Optional session ID for conversation continuity
+        region_name: AWS region (default: us-east-1)
+        retries: Retries for throttling, 5xx and timeouts before the response starts
+        timeout: Seconds before the client gives up; the agent stops work at the same deadline
+
+    Returns:
+        Dictionary containing the agent's response
+    """
+
+    client = IamAgentClient(
+        agent_runtime_arn,
+        region_name=region_name,
+        pool_size=1,
+        retry_policy=RetryPolicy(max_attempts=retries + 1),
+        request_timeout=timeout,
+    )
+    try:
+        return asyncio.run(invoke_agent_async(client, user_input, session_id=session_id))
+    finally:
+        client.close()
+
+
+def read_batch_questions(path: str) -> Iterator[dict]:
+    """
+    Reads batch questions from a JSONL or CSV file.
+
+    Args:
+        path: Input file; ".csv" files are read as CSV, anything else as JSONL
+
+    Yields:
+        Dictionaries with "id", "input" and optional "session_id"
+    """
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for line_number, row in enumerate(rows, 1):
+            question = row.get("input") or row.get("question") or row.get("prompt")
+            if not question:
+                continue
+            yield {
+                "id": str(row.get("id") or line_number),
+                "input": question,
+                "session_id": row.get("session_id") or None,
+            }
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """
+    Returns the IDs of questions that already succeeded in an earlier run.
+
+    A line cut short by an interruption is ignored, so that question runs again.
+    """
+
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "success":
+                completed.add(str(record.get("id")))
+    return completed
+
+
+def truncate_partial_line(output_path: str) -> int:
+    """
+    Cuts off a last line an interruption left without its newline.
+
+    Otherwise the next appended result would be glued onto the torn line and
+    be lost to load_completed_ids as well.
+
+    Returns:
+        Number of bytes removed
+    """
+
+    if not os.path.exists(output_path):
+        return 0
+
+    with open(output_path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        keep = 0
+        end = size
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            end = start
+        if keep < size:
+            f.truncate(keep)
+    return size - keep
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))]
+
+
+async def run_batch_async(
+    client: IamAgentClient,
+    input_path: str,
+    output_path: str,
+    concurrency: int = 8,
+    resume: bool = False,
+) -> Dict[str, float]:
+    """
+    Runs every question in a batch file with bounded concurrency.
+
+    Results are appended to the output JSONL as they complete, one line per
+    question, so an interrupted run can be resumed.
+
+    Args:
+        client: Shared IamAgentClient; its pool should be at least `concurrency`
+        input_path: JSONL or CSV file of questions
+        output_path: JSONL file results are appended to
+        concurrency: Maximum number of requests in flight
+        resume: Skip questions that already succeeded in output_path
+
+    Returns:
+        Throughput and latency statistics for the run
+    """
+
+    truncate_partial_line(output_path)
+    completed = load_completed_ids(output_path) if resume else set()
+
+    async def run_one(item: dict) -> dict:
+        started = time.perf_counter()
+        # Batch questions queue behind interactive users when the agent is busy
+        result = await invoke_agent_async(
+            client, item["input"], session_id=item["session_id"], verbose=False, priority="batch"
+        )
+        return {
+            "id": item["id"],
+            "input": item["input"],
+            "latency_ms": (time.perf_counter() - started) * 1000,
+            **result,
+        }
+
+    latencies: List[float] = []
+    first_byte: List[float] = []
+    succeeded = failed = skipped = 0
+    started = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as output:
+        in_flight = set()
+
+        def record(done) -> None:
+            nonlocal succeeded, failed
+            for task in done:
+                result = task.result()
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                latencies.append(result["latency_ms"])
+                if result.get("status") == "success":
+                    succeeded += 1
+                    if result.get("first_byte_ms") is not None:
+                        first_byte.append(result["first_byte_ms"])
+                else:
+                    failed += 1
+
+        # Questions are read lazily and at most `concurrency` run at once, so
+        # memory stays flat for input files of any size
+        for item in read_batch_questions(input_path):
+            if item["id"] in completed:
+                skipped += 1
+                continue
+            if len(in_flight) >= concurrency:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                record(done)
+            in_flight.add(asyncio.create_task(run_one(item)))
+
+        while in_flight:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            record(done)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "succeeded": succeeded,
+        "failed": failed,
+        "skipped": skipped,
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": (succeeded + failed) / elapsed if elapsed > 0 else 0.0,
+        "latency_p50_ms": _percentile(latencies, 50),
+        "latency_p95_ms": _percentile(latencies, 95),
+        "latency_p99_ms": _percentile(latencies, 99),
+        "first_byte_p50_ms": _percentile(first_byte, 50),
+        "first_byte_p95_ms": _percentile(first_byte, 95),
+    }
+
+
+def run_batch(
+    agent_runtime_arn: str,
+    input_path: str,
+    output_path: str,
+    concurrency: int = 8,
+    region_name: str = "us-east-1",
+    resume: bool = False,
+    retries: int = 3,
+    hedge: bool = False,
+    timeout: float = 60.0,
+) -> Dict[str, float]:
+    """
+    Runs a batch file over one shared client sized for `concurrency`.
+
+    Retries and hedges share one retry budget, so a failing endpoint is not
+    hit with a multiple of the batch's normal load.
+
+    Args:
+        retries: Retries per question for throttling, 5xx and timeouts
+        hedge: Whether to hedge questions slower than the p95 time to first byte
+        timeout: Seconds before a question is given up; the agent stops work at the same deadline
+
+    See run_batch_async() for the other arguments and the return value.
+    """
+
+    budget = RetryBudget(ratio=0.2)
+    client = IamAgentClient(
+        agent_runtime_arn,
+        region_name=region_name,
+        pool_size=concurrency,
+        retry_policy=RetryPolicy(max_attempts=retries + 1, budget=budget),
+        hedge_policy=HedgePolicy(percentile=95, budget=budget) if hedge else None,
+        request_timeout=timeout,
+    )
+    try:
+        return asyncio.run(run_batch_async(client, input_path, output_path, concurrency=concurrency, resume=resume))
+    finally:
+        client.close()
+
+
 def main():
     """Main function to handle command-line invocation."""
 
@@ -134,13 +384,60 @@ def main():
         default=None,
     )
 
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group(required=True)
+
+    mode.add_argument(
         "--input",
         type=str,
-        required=True,
         help="Question or input for the agent",
     )
 
+    mode.add_argument(
+        "--batch",
+        type=str,
+        help="JSONL or CSV file of questions to run in batch mode",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="batch_results.jsonl",
+        help="Batch mode: JSONL file results are appended to",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Batch mode: maximum requests in flight (default: 8)",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Batch mode: skip questions that already succeeded in --output",
+    )
+
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Batch mode: re-send questions slower than the p95 time to first byte",
+    )
+
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries for throttled or failed requests (default: 3)",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Seconds before giving up on a question, sent to the agent as its deadline (default: 60)",
+    )
+
     parser.add_argument(
         "--session",
         type=str,
@@ -160,7 +457,6 @@ def main():
     # Get ARN from args or environment
     runtime_arn = args.arn
     if not runtime_arn:
-        import os
         from dotenv import load_dotenv
 
         load_dotenv()
@@ -173,12 +469,41 @@ def main():
         )
         sys.exit(1)
 
+    if args.batch:
+        if os.path.exists(args.output) and not args.resume:
+            print(
+                f"Error: {args.output} already exists. Use --resume to continue it or choose another --output",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+        stats = run_batch(
+            agent_runtime_arn=runtime_arn,
+            input_path=args.batch,
+            output_path=args.output,
+            concurrency=args.concurrency,
+            region_name=args.region,
+            resume=args.resume,
+            retries=args.retries,
+            hedge=args.hedge,
+            timeout=args.timeout,
+        )
+
+        print("Batch complete")
+        print("-" * 60)
+        for name, value in stats.items():
+            print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+
+        sys.exit(0 if stats["failed"] == 0 else 1)
+
     # Invoke the agent
     result = invoke_agent_with_iam(
         agent_runtime_arn=runtime_arn,
         user_input=args.input,
         session_id=args.session,
         region_name=args.region,
+        retries=args.retries,
+        timeout=args.timeout,
     )
 
     # Exit with appropriate code
@@ -0,0 +1,323 @@
+"""
+ASL Agent Metrics
+
+Lightweight, thread-safe, in-process metrics registry.
+
+Components record counters, gauges and latency/size observations here, and the
+current values can be read with `metrics.snapshot()`. A MetricsExporter writes
+them to stdout on a timer - as CloudWatch Embedded Metric Format documents or
+as plain JSON snapshot lines - which the AgentCore runtime ships to CloudWatch Logs.
+"""
+
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, TextIO, Tuple
+
+
+def _escape_label(value) -> str:
+    """Backslash-escapes the characters _split_metric_key splits on."""
+
+    text = str(value)
+    for char in ("\\", ",", "="):
+        text = text.replace(char, "\\" + char)
+    return text
+
+
+def _metric_key(name: str, labels: dict) -> str:
+    """Builds a stable key such as 'router.decisions{agent=vocabulary_agent}'."""
+
+    if not labels:
+        return name
+
+    label_text = ",".join(f"{k}={_escape_label(labels[k])}" for k in sorted(labels))
+    return f"{name}{{{label_text}}}"
+
+
+def _split_metric_key(key: str) -> Tuple[str, Dict[str, str]]:
+    """Reverses _metric_key: 'name{a=1,b=x\\,y}' -> ('name', {'a': '1', 'b': 'x,y'})."""
+
+    name, brace, label_text = key.partition("{")
+    if not brace:
+        return name, {}
+
+    labels = {}
+    label, current = None, []
+    chars = iter(label_text[:-1])
+    for char in chars:
+        if char == "\\":
+            current.append(next(chars, ""))
+        elif char == "=" and label is None:
+            label, current = "".join(current), []
+        elif char == ",":
+            labels[label] = "".join(current)
+            label, current = None, []
+        else:
+            current.append(char)
+    labels[label] = "".join(current)
+    return name, labels
+
+
+def percentile(values, pct: float) -> Optional[float]:
+    """
+    Returns the nearest-rank percentile of a sequence of numbers.
+
+    Args:
+        values: Numbers to summarize
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or None if there are no values
+    """
+
+    ordered = sorted(values)
+    if not ordered:
+        return None
+
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class MetricsRegistry:
+    """
+    Holds counters, gauges and bounded observation windows.
+
+    Observations keep only the most recent `max_samples` values per metric,
+    so memory stays bounded no matter how long the process runs.
+    """
+
+    def __init__(self, max_samples: int = 2048):
+        self._max_samples = max_samples
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._observations: Dict[str, deque] = {}
+        # Observations ever recorded per metric, so exporters can tell which are new
+        self._observed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        """Adds `value` to a counter."""
+
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Sets a gauge to its current value."""
+
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Records a single observation, e.g. a latency in milliseconds."""
+
+        key = _metric_key(name, labels)
+        with self._lock:
+            window = self._observations.get(key)
+            if window is None:
+                window = self._observations[key] = deque(maxlen=self._max_samples)
+            window.append(value)
+            self._observed[key] = self._observed.get(key, 0) + 1
+
+    def get_counter(self, name: str, **labels) -> float:
+        """Returns the current value of a counter (0 if never incremented)."""
+
+        with self._lock:
+            return self._counters.get(_metric_key(name, labels), 0)
+
+    def snapshot(self) -> dict:
+        """
+        Returns a point-in-time copy of all metrics.
+
+        Returns:
+            Dictionary with "counters", "gauges" and "observations" sections.
+            Observations are summarized as count/mean/p50/p95/p99/max.
+        """
+
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            windows = {key: list(values) for key, values in self._observations.items()}
+
+        observations = {}
+        for key, values in windows.items():
+            observations[key] = {
+                "count": len(values),
+                "mean": sum(values) / len(values) if values else None,
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values) if values else None,
+            }
+
+        return {"counters": counters, "gauges": gauges, "observations": observations}
+
+    def observations_since(self, marks: Dict[str, int]) -> Dict[str, List[float]]:
+        """
+        Returns the observations recorded since `marks` was last passed in.
+
+        Args:
+            marks: Per-metric observation counts, updated in place; start with {}
+
+        Returns:
+            Metric key to its new values, at most the window's worth per metric
+        """
+
+        new_values = {}
+        with self._lock:
+            for key, window in self._observations.items():
+                total = self._observed[key]
+                count = min(total - marks.get(key, 0), len(window))
+                if count > 0:
+                    new_values[key] = list(window)[-count:]
+                marks[key] = total
+        return new_values
+
+    def reset(self) -> None:
+        """Clears every metric."""
+
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+            self._observed.clear()
+
+
+class MetricsExporter:
+    """
+    Writes a registry's metrics to a stream, once per call to export() or on a timer.
+
+    Formats:
+        emf: one CloudWatch Embedded Metric Format document per metric, labels as
+             dimensions. Counters are sent as the change since the last export and
+             observations as the values recorded since then (split across several
+             documents of at most MAX_EMF_VALUES each), so CloudWatch computes
+             sums and percentiles over any period
+        log: one JSON line holding the whole snapshot()
+    """
+
+    FORMATS = ("emf", "log")
+
+    # Most values CloudWatch accepts for one metric in one EMF document
+    MAX_EMF_VALUES = 100
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        export_format: str = "emf",
+        namespace: str = "ASL/Agent",
+        stream: Optional[TextIO] = None,
+    ):
+        """
+        Args:
+            registry: Registry to export
+            export_format: "emf" or "log"
+            namespace: CloudWatch namespace for EMF documents
+            stream: Where lines are written; defaults to stdout
+
+        Raises:
+            ValueError: If export_format is not one of FORMATS
+        """
+
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Unknown metrics export format '{export_format}'. Available: {sorted(self.FORMATS)}")
+
+        self.registry = registry
+        self.export_format = export_format
+        self.namespace = namespace
+        self.stream = stream
+        self._last_counters: Dict[str, float] = {}
+        self._observation_marks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self) -> int:
+        """
+        Writes the current metrics.
+
+        Returns:
+            Number of lines written
+        """
+
+        with self._lock:
+            if self.export_format == "log":
+                lines = [json.dumps({"metrics": self.registry.snapshot()}, sort_keys=True)]
+            else:
+                lines = [json.dumps(document) for document in self._emf_documents()]
+
+            stream = self.stream or sys.stdout
+            for line in lines:
+                stream.write(line + "\n")
+            stream.flush()
+            return len(lines)
+
+    def _emf_documents(self) -> List[dict]:
+        snapshot = self.registry.snapshot()
+        timestamp_ms = int(time.time() * 1000)
+        documents = []
+
+        for key, total in snapshot["counters"].items():
+            previous = self._last_counters.get(key, 0)
+            # A lower total means the registry was reset since the last export
+            delta = total - previous if total >= previous else total
+            self._last_counters[key] = total
+            if delta:
+                documents.append(self._emf_document(key, delta, "Count", timestamp_ms))
+
+        for key, value in snapshot["gauges"].items():
+            documents.append(self._emf_document(key, value, "None", timestamp_ms))
+
+        for key, values in self.registry.observations_since(self._observation_marks).items():
+            for start in range(0, len(values), self.MAX_EMF_VALUES):
+                chunk = values[start:start + self.MAX_EMF_VALUES]
+                documents.append(self._emf_document(key, chunk, "None", timestamp_ms))
+
+        return documents
+
+    def _emf_document(self, key: str, value, unit: str, timestamp_ms: int) -> dict:
+        name, labels = _split_metric_key(key)
+        return {
+            "_aws": {
+                "Timestamp": timestamp_ms,
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [sorted(labels)],
+                        "Metrics": [{"Name": name, "Unit": unit}],
+                    }
+                ],
+            },
+            **labels,
+            name: value,
+        }
+
+    def start(self, interval_seconds: float = 60.0) -> None:
+        """
+        Exports every `interval_seconds` in a daemon thread; later calls are no-ops.
+
+        Args:
+            interval_seconds: Time between exports
+        """
+
+        if self._thread is not None:
+            return
+
+        def export_forever():
+            while True:
+                time.sleep(interval_seconds)
+                try:
+                    self.export()
+                except Exception:
+                    # Exporting must never take the process down; retried next interval
+                    pass
+
+        self._thread = threading.Thread(target=export_forever, name="asl-metrics-exporter", daemon=True)
+        self._thread.start()
+
+
+# Process-wide metrics registry
+metrics = MetricsRegistry()
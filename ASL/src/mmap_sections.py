@@ -0,0 +1,207 @@
+"""
+ASL Memory-Mapped Sections
+
+Shared binary layout for the read-only data files (sign lexicon, resource index).
+
+A file is a header - magic, format version and an offset/length table - followed
+by named sections aligned to 8 bytes. Readers mmap the file and get each section
+as a memoryview, so opening is instant, nothing is parsed up front and every
+process reading the same file shares the OS page cache. Writers build the whole
+file next to the destination and swap it in with os.replace(), so readers never
+see a partial file. All integers are little-endian.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import Dict, Iterable, Optional, Sequence
+
+if sys.byteorder != "little":
+    raise ImportError("The memory-mapped data files require a little-endian platform")
+
+
+def _header(section_count: int) -> struct.Struct:
+    return struct.Struct(f"<8sII{2 * section_count}Q")
+
+
+def write_sections(path: str, magic: bytes, version: int, names: Sequence[str], sections: Dict[str, bytes]) -> None:
+    """
+    Writes a section file, replacing path atomically.
+
+    Args:
+        path: Destination file
+        magic: 8-byte file type marker
+        version: Format version
+        names: Section names in file order
+        sections: Section name to its bytes
+    """
+
+    header = _header(len(names))
+    body = bytearray()
+    table = []
+    for name in names:
+        body.extend(b"\0" * (-len(body) % 8))
+        table.extend((header.size + len(body), len(sections[name])))
+        body.extend(sections[name])
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.pack(magic, version, len(names), *table))
+            f.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class SectionFile:
+    """A memory-mapped section file; sections are memoryviews into the mapping."""
+
+    def __init__(self, path: str, magic: bytes, version: int, names: Sequence[str]):
+        """
+        Args:
+            path: File written by write_sections
+            magic: Expected file type marker
+            version: Expected format version
+            names: Expected section names in file order
+
+        Raises:
+            ValueError: The file has another type, version or layout
+        """
+
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = _header(len(names))
+        try:
+            found_magic, found_version, section_count, *table = header.unpack_from(self._mmap, 0)
+        except struct.error:
+            found_magic = None
+        if found_magic != magic or found_version != version or section_count != len(names):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {version} {magic.decode(errors='replace')} file")
+
+        self._views = []
+        view = memoryview(self._mmap)
+        self._views.append(view)
+        self.sections = {name: view[table[2 * i]:table[2 * i] + table[2 * i + 1]] for i, name in enumerate(names)}
+        self._views.extend(self.sections.values())
+
+    def array(self, name: str, typecode: str) -> memoryview:
+        """A section as a typed array ("I" for uint32, "Q" for uint64, ...)."""
+
+        view = self.sections[name].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def strings(self, offsets: str, blob: str) -> "StringTable":
+        """A string table stored as an offsets section and a blob section."""
+        return StringTable(self.array(offsets, "Q"), self.sections[blob])
+
+    def postings(self, offsets: str, ids: str) -> "PostingTable":
+        """A posting table stored as an offsets section and a uint32 ids section."""
+        return PostingTable(self.array(offsets, "Q"), self.array(ids, "I"))
+
+    def close(self) -> None:
+        """Releases every view and the mapping."""
+
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+
+class StringTable:
+    """Read-only sequence of UTF-8 byte strings; sorted tables work with bisect."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]])
+
+
+class PostingTable:
+    """Read-only sequence of uint32 lists."""
+
+    def __init__(self, offsets: memoryview, ids: memoryview):
+        self._offsets = offsets
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> memoryview:
+        return self._ids[self._offsets[index]:self._offsets[index + 1]]
+
+
+def string_table(strings: Iterable[str]) -> tuple:
+    """Encodes strings as (offsets section, blob section)."""
+
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for text in strings:
+        blob.extend(text.encode("utf-8"))
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
+
+
+def posting_table(postings: Iterable[Iterable[int]]) -> tuple:
+    """Encodes lists of uint32 values as (offsets section, ids section); values keep their order."""
+
+    offsets = array("Q", [0])
+    ids = array("I")
+    for posting in postings:
+        ids.extend(posting)
+        offsets.append(len(ids))
+    return offsets.tobytes(), ids.tobytes()
+
+
+def hash_slots(strings: Sequence[str]) -> bytes:
+    """
+    Encodes an open-addressing hash table (crc32, linear probing) over strings.
+
+    Each uint32 slot holds a 1-based index into strings; 0 marks an empty slot.
+    The table is at most half full, so lookups take one or two probes.
+    """
+
+    size = 1
+    while size < 2 * len(strings):
+        size *= 2
+    slots = array("I", [0]) * size
+    for index, text in enumerate(strings):
+        slot = zlib.crc32(text.encode("utf-8")) & (size - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (size - 1)
+        slots[slot] = index + 1
+    return slots.tobytes()
+
+
+def hash_lookup(slots: memoryview, strings: StringTable, key: bytes) -> Optional[int]:
+    """
+    Finds key in a hash_slots table.
+
+    Returns:
+        The key's index in strings, or None
+    """
+
+    mask = len(slots) - 1
+    slot = zlib.crc32(key) & mask
+    while slots[slot]:
+        index = slots[slot] - 1
+        if strings[index] == key:
+            return index
+        slot = (slot + 1) & mask
+    return None
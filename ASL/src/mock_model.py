@@ -0,0 +1,318 @@
+"""
+ASL Mock Models
+
+Offline stand-ins for BedrockModel, for local testing and load testing without AWS.
+
+- StubCachingModel answers instantly with a fixed text and reports Bedrock-style
+  usage, including prompt-cache read/write token counts: the first call with a
+  given prefix (tool definitions plus system prompt) "writes" the cache, later
+  calls "read" it. Like Bedrock, prefixes shorter than MIN_CACHEABLE_TOKENS are
+  never cached.
+- MockModel adds configurable latency distributions, token-by-token streaming
+  rate, scripted Swarm handoff decisions and failure injection, so the full
+  Swarm and the agent_invocation entrypoint can be benchmarked on a laptop.
+
+Both are selected through src/model_provider.py (ASL_MODEL_BACKEND=mock).
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import uuid
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Union
+
+from strands.models import Model
+from strands.types.exceptions import ModelThrottledException
+
+from src.prompt_cache import MIN_CACHEABLE_TOKENS
+from src.streaming import HANDOFF_TOOL_NAME
+from src.text_features import estimate_tokens
+
+
+class StubCachingModel(Model):
+    """
+    Deterministic model stub that simulates Bedrock prompt caching.
+    """
+
+    def __init__(self, model_id: str = "stub-model", response_text: str = "Stub answer.", **config):
+        """
+        Args:
+            model_id: Model ID reported in the config
+            response_text: Text streamed back for every call
+            **config: Extra model config; cache_prompt or cache_tools enables cache simulation
+        """
+
+        self.config = {"model_id": model_id, **config}
+        self.response_text = response_text
+        self._cached_prefixes = set()
+        self._lock = threading.Lock()
+
+    def update_config(self, **model_config) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> dict:
+        return self.config
+
+    @staticmethod
+    def _prefix(tool_specs, system_prompt: Optional[str]) -> str:
+        """The static prompt prefix Bedrock caches: tool definitions, then the system prompt."""
+
+        tools = json.dumps(tool_specs, sort_keys=True, default=str) if tool_specs else ""
+        return tools + (system_prompt or "")
+
+    def _cache_usage(self, tool_specs, system_prompt: Optional[str]) -> dict:
+        """Returns cacheRead/cacheWrite token counts for the tool definitions and system prompt."""
+
+        prefix = self._prefix(tool_specs, system_prompt)
+        prompt_tokens = estimate_tokens(prefix)
+        if (
+            not prefix
+            or not (self.config.get("cache_prompt") or self.config.get("cache_tools"))
+            or prompt_tokens < MIN_CACHEABLE_TOKENS
+        ):
+            return {"cacheReadInputTokens": 0, "cacheWriteInputTokens": 0}
+
+        prefix_key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            hit = prefix_key in self._cached_prefixes
+            self._cached_prefixes.add(prefix_key)
+
+        if hit:
+            return {"cacheReadInputTokens": prompt_tokens, "cacheWriteInputTokens": 0}
+        return {"cacheReadInputTokens": 0, "cacheWriteInputTokens": prompt_tokens}
+
+    def _metadata_event(self, messages, tool_specs, system_prompt: Optional[str], output_text: str) -> dict:
+        """Bedrock-shaped metadata event with token usage for one call."""
+
+        cache_usage = self._cache_usage(tool_specs, system_prompt)
+        message_tokens = sum(
+            estimate_tokens(block.get("text", ""))
+            for message in messages
+            for block in message.get("content", [])
+        )
+        # Like Bedrock, inputTokens leaves out the tokens read from or written to the cache
+        prefix_tokens = 0 if any(cache_usage.values()) else estimate_tokens(self._prefix(tool_specs, system_prompt))
+        input_tokens = message_tokens + prefix_tokens
+        output_tokens = estimate_tokens(output_text)
+
+        return {
+            "metadata": {
+                "usage": {
+                    "inputTokens": input_tokens,
+                    "outputTokens": output_tokens,
+                    "totalTokens": input_tokens + output_tokens,
+                    **cache_usage,
+                },
+                "metrics": {"latencyMs": 0},
+            }
+        }
+
+    async def stream(
+        self,
+        messages,
+        tool_specs=None,
+        system_prompt: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncGenerator[dict, None]:
+        """Streams the fixed response as Bedrock ConverseStream-shaped events."""
+
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        yield {"contentBlockDelta": {"delta": {"text": self.response_text}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield self._metadata_event(messages, tool_specs, system_prompt, self.response_text)
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs) -> Any:
+        raise NotImplementedError("Mock models do not support structured output")
+
+
+class LatencyDistribution:
+    """
+    Samples latencies in seconds from a named distribution.
+
+    Supported kinds: "constant" (mean_ms), "uniform" (min_ms..max_ms),
+    "normal" (mean_ms, stddev_ms, floored at 0) and "lognormal" (mean_ms, sigma).
+    """
+
+    def __init__(
+        self,
+        kind: str = "constant",
+        mean_ms: float = 0.0,
+        stddev_ms: float = 0.0,
+        min_ms: float = 0.0,
+        max_ms: float = 0.0,
+        sigma: float = 0.5,
+    ):
+        if kind not in ("constant", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+
+        self.kind = kind
+        self.mean_ms = mean_ms
+        self.stddev_ms = stddev_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.sigma = sigma
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "constant":
+            value_ms = self.mean_ms
+        elif self.kind == "uniform":
+            value_ms = rng.uniform(self.min_ms, self.max_ms)
+        elif self.kind == "normal":
+            value_ms = rng.gauss(self.mean_ms, self.stddev_ms)
+        else:
+            # Parameterized so the distribution's median equals mean_ms
+            value_ms = rng.lognormvariate(0.0, self.sigma) * self.mean_ms
+
+        return max(0.0, value_ms) / 1000.0
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "LatencyDistribution":
+        return cls(**(data or {}))
+
+
+class MockModel(StubCachingModel):
+    """
+    Configurable offline model for load and latency testing.
+
+    Handoff scripts are rules matched against the calling agent's system prompt:
+    {"match": "ASL Q&A Coordinator", "handoff_to": "ASL Vocabulary Agent"}.
+    `handoff_to` may also be a callable taking the latest user text and returning
+    an agent name. A rule fires once per conversation; the call after the handoff
+    tool result answers with text.
+    """
+
+    def __init__(
+        self,
+        model_id: str = "mock-model",
+        response_text: str = "This is a mock answer about American Sign Language.",
+        first_token_latency: Optional[LatencyDistribution] = None,
+        tokens_per_second: float = 0.0,
+        handoff_rules: Optional[List[Dict[str, Union[str, Callable[[str], str]]]]] = None,
+        failure_rate: float = 0.0,
+        failure_kind: str = "throttle",
+        hang_rate: float = 0.0,
+        seed: Optional[int] = None,
+        **config,
+    ):
+        """
+        Args:
+            model_id: Model ID reported in the config
+            response_text: Text streamed back for answers
+            first_token_latency: Delay before the first token
+            tokens_per_second: Streaming rate; 0 streams the whole answer at once
+            handoff_rules: Scripted handoff decisions (see class docstring)
+            failure_rate: Probability that a call fails before streaming
+            failure_kind: "throttle" (ModelThrottledException) or "error" (RuntimeError)
+            hang_rate: Probability that a call never completes (for timeout tests)
+            seed: Random seed for reproducible runs
+            **config: Extra model config; cache_prompt or cache_tools enables cache simulation
+        """
+
+        super().__init__(model_id=model_id, response_text=response_text, **config)
+        self.first_token_latency = first_token_latency or LatencyDistribution()
+        self.tokens_per_second = tokens_per_second
+        self.handoff_rules = list(handoff_rules or [])
+        self.failure_rate = failure_rate
+        self.failure_kind = failure_kind
+        self.hang_rate = hang_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "MockModel":
+        """
+        Builds a MockModel from a JSON-style dict (e.g. the ASL_MOCK_CONFIG file).
+        """
+
+        config = dict(config)
+        config["first_token_latency"] = LatencyDistribution.from_dict(config.pop("first_token_latency", None))
+        return cls(**config)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """Restarts the random sequence, e.g. at the start of a benchmark run."""
+
+        with self._lock:
+            self._rng = random.Random(seed)
+
+    @staticmethod
+    def _last_user_text(messages) -> str:
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                texts = [block["text"] for block in message.get("content", []) if "text" in block]
+                if texts:
+                    return " ".join(texts)
+        return ""
+
+    @staticmethod
+    def _has_tool_result(messages) -> bool:
+        return any("toolResult" in block for message in messages for block in message.get("content", []))
+
+    def _handoff_target(self, messages, tool_specs, system_prompt: Optional[str]) -> Optional[str]:
+        """Returns the scripted handoff target for this call, if any."""
+
+        tool_names = {spec.get("name") for spec in (tool_specs or [])}
+        if HANDOFF_TOOL_NAME not in tool_names or self._has_tool_result(messages):
+            return None
+
+        for rule in self.handoff_rules:
+            if rule.get("match", "") in (system_prompt or ""):
+                target = rule["handoff_to"]
+                return target(self._last_user_text(messages)) if callable(target) else target
+        return None
+
+    def _roll(self, probability: float) -> bool:
+        with self._lock:
+            return self._rng.random() < probability
+
+    async def stream(
+        self,
+        messages,
+        tool_specs=None,
+        system_prompt: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncGenerator[dict, None]:
+        """Streams a scripted handoff or a text answer with simulated timing."""
+
+        with self._lock:
+            self.calls += 1
+            first_token_delay = self.first_token_latency.sample(self._rng)
+
+        await asyncio.sleep(first_token_delay)
+
+        if self._roll(self.hang_rate):
+            await asyncio.Event().wait()
+
+        if self._roll(self.failure_rate):
+            if self.failure_kind == "throttle":
+                raise ModelThrottledException("Mock throttling: too many requests")
+            raise RuntimeError("Mock model failure")
+
+        yield {"messageStart": {"role": "assistant"}}
+
+        target = self._handoff_target(messages, tool_specs, system_prompt)
+        if target:
+            tool_input = json.dumps({"agent_name": target, "message": "Handing off to the specialist.", "context": {}})
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": uuid.uuid4().hex, "name": HANDOFF_TOOL_NAME}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": tool_input}}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "tool_use"}}
+            yield self._metadata_event(messages, tool_specs, system_prompt, tool_input)
+            return
+
+        yield {"contentBlockStart": {"start": {}}}
+        if self.tokens_per_second > 0:
+            words = self.response_text.split(" ")
+            for index, word in enumerate(words):
+                if index:
+                    await asyncio.sleep(1.0 / self.tokens_per_second)
+                yield {"contentBlockDelta": {"delta": {"text": word if index == 0 else f" {word}"}}}
+        else:
+            yield {"contentBlockDelta": {"delta": {"text": self.response_text}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield self._metadata_event(messages, tool_specs, system_prompt, self.response_text)
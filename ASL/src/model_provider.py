@@ -0,0 +1,408 @@
+"""
+ASL Model Provider
+
+Single place where the model behind every agent is created.
+
+The backend is chosen with ASL_MODEL_BACKEND:
+
+- "bedrock" (default): BedrockModel with prompt-cache checkpoints
+- "mock": offline MockModel for deterministic local load and latency testing
+
+The mock backend is configured with a JSON file (ASL_MOCK_CONFIG, keys matching
+MockModel.from_config) or with individual environment variables:
+
+    ASL_MOCK_LATENCY_DISTRIBUTION   constant | uniform | normal | lognormal
+    ASL_MOCK_LATENCY_MS             mean first-token latency in milliseconds
+    ASL_MOCK_LATENCY_STDDEV_MS      spread for the normal distribution
+    ASL_MOCK_TOKENS_PER_SECOND      streaming rate (0 = whole answer at once)
+    ASL_MOCK_FAILURE_RATE           probability of a throttling error per call
+    ASL_MOCK_SEED                   random seed for reproducible runs
+
+Additional backends can be added with register_model_backend().
+
+Models come in tiers (see src/model_tiers.py), one shared instance per tier:
+
+    ASL_MODEL_TIER_FAST_ID          small, fast model for routing and short lookups
+    ASL_MODEL_TIER_LARGE_ID         larger model for nuanced answers (default DEFAULT_MODEL_ID)
+
+The shared model is wrapped in ResilientModel, which retries throttling, 5xx and
+timeout errors with jittered backoff and can hedge slow calls:
+
+    ASL_MODEL_RETRY_ENABLED         default true
+    ASL_MODEL_RETRY_MAX_ATTEMPTS    attempts per model call, including the first (default 4)
+    ASL_MODEL_RETRY_DEADLINE_SECONDS  no retry starts after this long (default 20)
+    ASL_MODEL_RETRY_BUDGET_RATIO    retries + hedges allowed per call on average (default 0.2)
+    ASL_MODEL_HEDGE_ENABLED         default false
+    ASL_MODEL_HEDGE_PERCENTILE      hedge calls slower than this first-event percentile (default 95)
+
+Retries are owned by one layer. With ASL_MODEL_RETRY_ENABLED the Bedrock client
+is created with botocore retries off ({"max_attempts": 1}), so a throttled call
+is retried only by ResilientModel, within its deadline and retry budget. With it
+disabled, botocore's own retry mode applies. Strands' event loop still retries a
+ModelThrottledException that outlives both, as its last resort.
+
+Under the retries, every model ID and region has a circuit breaker (see
+src/circuit_breaker.py). While a tier's model is failing or slow its calls go
+to the tier's fallback model; when that is open too, calls fail fast:
+
+    ASL_CIRCUIT_BREAKER_ENABLED     default true
+    ASL_MODEL_REGION                region of the tier models (default: the AWS SDK's)
+    ASL_MODEL_TIER_FAST_FALLBACK_ID   fallback for the fast tier (default none)
+    ASL_MODEL_TIER_LARGE_FALLBACK_ID  fallback for the large tier (default the fast tier's model)
+    ASL_MODEL_FALLBACK_REGION       region of the fallback models (default ASL_MODEL_REGION)
+    ASL_CIRCUIT_WINDOW_SECONDS      window of call outcomes (default 30)
+    ASL_CIRCUIT_MIN_CALLS           calls in the window before a breaker may open (default 10)
+    ASL_CIRCUIT_FAILURE_RATE        share of failed calls that opens it (default 0.5)
+    ASL_CIRCUIT_SLOW_CALL_SECONDS   first-event latency that counts as slow (default 10)
+    ASL_CIRCUIT_SLOW_CALL_RATE      share of slow calls that opens it (default 0.8)
+    ASL_CIRCUIT_OPEN_SECONDS        how long it stays open before probing (default 30)
+    ASL_CIRCUIT_HALF_OPEN_PROBES    probe calls needed to close it again (default 1)
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.circuit_breaker import CircuitBreaker
+from src.prompt_cache import prompt_cache_config
+from src.resilience import HedgePolicy, RetryBudget, RetryPolicy
+
+
+DEFAULT_MODEL_ID = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+
+MODEL_BACKEND = os.getenv("ASL_MODEL_BACKEND", "bedrock")
+
+# Model ID per tier; get_model() without a tier returns the large tier
+MODEL_TIER_IDS = {
+    "fast": os.getenv("ASL_MODEL_TIER_FAST_ID", "anthropic.claude-3-haiku-20240307-v1:0"),
+    "large": os.getenv("ASL_MODEL_TIER_LARGE_ID", DEFAULT_MODEL_ID),
+}
+DEFAULT_MODEL_TIER = "large"
+
+# None leaves the region to the AWS SDK (AWS_REGION)
+MODEL_REGION = os.getenv("ASL_MODEL_REGION") or None
+
+# Model a tier falls back to while its own model's circuit is open; empty for none
+MODEL_TIER_FALLBACK_IDS = {
+    "fast": os.getenv("ASL_MODEL_TIER_FAST_FALLBACK_ID", ""),
+    "large": os.getenv("ASL_MODEL_TIER_LARGE_FALLBACK_ID", MODEL_TIER_IDS["fast"]),
+}
+MODEL_FALLBACK_REGION = os.getenv("ASL_MODEL_FALLBACK_REGION") or MODEL_REGION
+
+# Coordinator routing used by the mock backend when no handoff rules are configured
+DEFAULT_MOCK_HANDOFF_RULES = [
+    {"match": "ASL Q&A Coordinator", "handoff_to": "General ASL Agent"},
+]
+
+
+def _create_bedrock_model(model_id: str, region_name: Optional[str] = None, **config):
+    # Imported lazily so the mock backend works without AWS dependencies installed
+    from bedrock_agentcore.models import BedrockModel
+
+    if region_name:
+        config["region_name"] = region_name
+
+    if MODEL_RETRY_ENABLED and "boto_client_config" not in config:
+        from botocore.config import Config
+
+        # ResilientModel owns retries and their budget; botocore makes one attempt.
+        # read_timeout keeps Strands' default, which an explicit config replaces
+        config["boto_client_config"] = Config(retries={"max_attempts": 1}, read_timeout=120)
+
+    return BedrockModel(
+        model_id=model_id,
+        **{**prompt_cache_config(), **config},
+        # Optional: Add guardrails if needed
+        # guardrail_id="your-guardrail-id",
+        # guardrail_version="1",
+        # guardrail_trace="enabled",
+    )
+
+
+def mock_config_from_env() -> Dict[str, Any]:
+    """
+    Reads the mock backend configuration from ASL_MOCK_CONFIG or ASL_MOCK_* variables.
+
+    Returns:
+        Dictionary accepted by MockModel.from_config
+    """
+
+    config_path = os.getenv("ASL_MOCK_CONFIG")
+    if config_path:
+        with open(config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    seed = os.getenv("ASL_MOCK_SEED")
+    return {
+        "first_token_latency": {
+            "kind": os.getenv("ASL_MOCK_LATENCY_DISTRIBUTION", "constant"),
+            "mean_ms": float(os.getenv("ASL_MOCK_LATENCY_MS", "0")),
+            "stddev_ms": float(os.getenv("ASL_MOCK_LATENCY_STDDEV_MS", "0")),
+        },
+        "tokens_per_second": float(os.getenv("ASL_MOCK_TOKENS_PER_SECOND", "0")),
+        "failure_rate": float(os.getenv("ASL_MOCK_FAILURE_RATE", "0")),
+        "seed": int(seed) if seed else None,
+    }
+
+
+def configured_model_id(backend: Optional[str] = None, model_id: str = DEFAULT_MODEL_ID) -> str:
+    """
+    Identifies the model a backend will serve, without creating it.
+
+    Args:
+        backend: Backend name; defaults to ASL_MODEL_BACKEND
+        model_id: Model ID passed to the backend
+
+    Returns:
+        The Bedrock model ID, or "<backend>:<model ID>" for other backends
+    """
+
+    backend = backend or MODEL_BACKEND
+    return model_id if backend == "bedrock" else f"{backend}:{model_id}"
+
+
+def _create_mock_model(model_id: str, region_name: Optional[str] = None, **config):
+    # The mock has no regions; region_name is accepted so fallbacks can name one
+    from src.mock_model import MockModel
+
+    mock_config = {
+        "handoff_rules": DEFAULT_MOCK_HANDOFF_RULES,
+        **prompt_cache_config(),
+        **mock_config_from_env(),
+        **config,
+    }
+    mock_config.setdefault("model_id", configured_model_id("mock", model_id))
+    return MockModel.from_config(mock_config)
+
+
+_BACKENDS: Dict[str, Callable[..., Any]] = {
+    "bedrock": _create_bedrock_model,
+    "mock": _create_mock_model,
+}
+
+MODEL_RETRY_ENABLED = os.getenv("ASL_MODEL_RETRY_ENABLED", "true").lower() == "true"
+MODEL_HEDGE_ENABLED = os.getenv("ASL_MODEL_HEDGE_ENABLED", "false").lower() == "true"
+CIRCUIT_BREAKER_ENABLED = os.getenv("ASL_CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+
+_shared_models: Dict[str, Any] = {}
+_shared_model_lock = threading.Lock()
+
+# Backend models by (model ID, region), so a tier and another tier's fallback share one client
+_backend_models: Dict[Tuple[str, Optional[str]], Any] = {}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breaker_lock = threading.Lock()
+
+
+def register_model_backend(name: str, factory: Callable[..., Any]) -> None:
+    """
+    Registers a model backend.
+
+    Args:
+        name: Backend name used in ASL_MODEL_BACKEND
+        factory: Callable taking (model_id, **config) and returning a Strands model;
+            config includes region_name when ASL_MODEL_REGION or ASL_MODEL_FALLBACK_REGION is set
+    """
+
+    _BACKENDS[name] = factory
+
+
+def create_model(backend: Optional[str] = None, model_id: str = DEFAULT_MODEL_ID, **config):
+    """
+    Creates a new model instance.
+
+    Args:
+        backend: Backend name; defaults to ASL_MODEL_BACKEND
+        model_id: Model ID passed to the backend
+        **config: Backend-specific configuration overrides
+
+    Returns:
+        Strands model instance
+    """
+
+    backend = backend or MODEL_BACKEND
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown model backend '{backend}'. Available: {sorted(_BACKENDS)}")
+
+    return _BACKENDS[backend](model_id, **config)
+
+
+def with_resilience(model, retry: bool = MODEL_RETRY_ENABLED, hedge: bool = MODEL_HEDGE_ENABLED):
+    """
+    Wraps a model in ResilientModel using the ASL_MODEL_RETRY_* / ASL_MODEL_HEDGE_* settings.
+
+    Args:
+        model: Strands model to wrap
+        retry: Whether to retry retryable errors
+        hedge: Whether to hedge slow calls
+
+    Returns:
+        The wrapped model, or the model itself if both are disabled
+    """
+
+    if not (retry or hedge):
+        return model
+
+    from src.resilient_model import ResilientModel, record_resilience_event
+
+    budget = RetryBudget(ratio=float(os.getenv("ASL_MODEL_RETRY_BUDGET_RATIO", "0.2")))
+    retry_policy = RetryPolicy(
+        max_attempts=int(os.getenv("ASL_MODEL_RETRY_MAX_ATTEMPTS", "4")) if retry else 1,
+        deadline_seconds=float(os.getenv("ASL_MODEL_RETRY_DEADLINE_SECONDS", "20")),
+        budget=budget,
+        on_event=record_resilience_event,
+    )
+    hedge_policy = None
+    if hedge:
+        hedge_policy = HedgePolicy(
+            percentile=float(os.getenv("ASL_MODEL_HEDGE_PERCENTILE", "95")),
+            budget=budget,
+            on_event=record_resilience_event,
+        )
+
+    return ResilientModel(model, retry_policy, hedge_policy)
+
+
+def circuit_breaker(model_id: str, region: Optional[str] = None) -> CircuitBreaker:
+    """
+    Returns the process-wide circuit breaker of a model in a region.
+
+    Args:
+        model_id: Model ID
+        region: Region the model is called in; None for the SDK's default region
+
+    Returns:
+        The breaker, configured from the ASL_CIRCUIT_* settings
+    """
+
+    name = f"{model_id}@{region or os.getenv('AWS_REGION', 'default')}"
+    with _breaker_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            from src.fallback_model import record_circuit_transition
+
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                window_seconds=float(os.getenv("ASL_CIRCUIT_WINDOW_SECONDS", "30")),
+                min_calls=int(os.getenv("ASL_CIRCUIT_MIN_CALLS", "10")),
+                failure_rate=float(os.getenv("ASL_CIRCUIT_FAILURE_RATE", "0.5")),
+                slow_call_seconds=float(os.getenv("ASL_CIRCUIT_SLOW_CALL_SECONDS", "10")),
+                slow_call_rate=float(os.getenv("ASL_CIRCUIT_SLOW_CALL_RATE", "0.8")),
+                open_seconds=float(os.getenv("ASL_CIRCUIT_OPEN_SECONDS", "30")),
+                half_open_probes=int(os.getenv("ASL_CIRCUIT_HALF_OPEN_PROBES", "1")),
+                on_transition=record_circuit_transition,
+            )
+        return breaker
+
+
+def _tier_routes(tier: str) -> List[Tuple[str, Optional[str]]]:
+    """(model ID, region) of a tier's model, then of its fallback if one is configured."""
+
+    routes = [(MODEL_TIER_IDS[tier], MODEL_REGION)]
+    fallback = (MODEL_TIER_FALLBACK_IDS.get(tier), MODEL_FALLBACK_REGION)
+    if fallback[0] and fallback not in routes:
+        routes.append(fallback)
+    return routes
+
+
+def _price_tier(model_id: str, tier: str) -> str:
+    """Tier whose price applies to a model serving `tier`: its own tier if it is another tier's model."""
+
+    if model_id == MODEL_TIER_IDS[tier]:
+        return tier
+    return next((other for other, other_id in MODEL_TIER_IDS.items() if other_id == model_id), tier)
+
+
+def _backend_model(model_id: str, region: Optional[str]):
+    """The unwrapped backend model for a model ID and region; call with _shared_model_lock held."""
+
+    model = _backend_models.get((model_id, region))
+    if model is None:
+        config = {"region_name": region} if region else {}
+        model = _backend_models[(model_id, region)] = create_model(model_id=model_id, **config)
+    return model
+
+
+def with_fallbacks(tier: str):
+    """
+    Builds a tier's model, behind circuit breakers with its fallback when ASL_CIRCUIT_BREAKER_ENABLED.
+
+    Args:
+        tier: "fast" or "large"
+
+    Returns:
+        FallbackModel over the tier's routes, or the tier's backend model
+    """
+
+    if not CIRCUIT_BREAKER_ENABLED:
+        return _backend_model(MODEL_TIER_IDS[tier], MODEL_REGION)
+
+    from src.fallback_model import FallbackModel
+
+    routes = _tier_routes(tier)
+    return FallbackModel(
+        [(_backend_model(model_id, region), circuit_breaker(model_id, region)) for model_id, region in routes],
+        tier,
+        price_tiers=[_price_tier(model_id, tier) for model_id, _ in routes],
+    )
+
+
+def tier_unavailable_for(tier: Optional[str] = None) -> Optional[float]:
+    """
+    Reports whether a tier can take calls without waiting for its circuits.
+
+    Args:
+        tier: "fast" or "large"; defaults to DEFAULT_MODEL_TIER
+
+    Returns:
+        None while the tier's model or its fallback accepts calls, otherwise
+        seconds until one of their circuits lets a probe through
+    """
+
+    if not CIRCUIT_BREAKER_ENABLED:
+        return None
+
+    breakers = [circuit_breaker(model_id, region) for model_id, region in _tier_routes(tier or DEFAULT_MODEL_TIER)]
+    if any(breaker.available for breaker in breakers):
+        return None
+    return min(breaker.retry_after() for breaker in breakers)
+
+
+def get_model(tier: Optional[str] = None):
+    """
+    Returns the process-wide model for a tier, creating it on first use.
+
+    Args:
+        tier: "fast" or "large"; defaults to DEFAULT_MODEL_TIER
+
+    Returns:
+        The shared model every agent on that tier uses
+    """
+
+    tier = tier or DEFAULT_MODEL_TIER
+    if tier not in MODEL_TIER_IDS:
+        raise ValueError(f"Unknown model tier '{tier}'. Available: {sorted(MODEL_TIER_IDS)}")
+
+    model = _shared_models.get(tier)
+    if model is None:
+        with _shared_model_lock:
+            model = _shared_models.get(tier)
+            if model is None:
+                model = with_resilience(with_fallbacks(tier))
+                _shared_models[tier] = model
+    return model
+
+
+def set_model(model, tier: Optional[str] = None) -> None:
+    """
+    Replaces a shared model, e.g. with a MockModel configured by a benchmark.
+
+    Args:
+        model: The model to use
+        tier: Tier to replace; None replaces every tier
+    """
+
+    with _shared_model_lock:
+        for name in ([tier] if tier else MODEL_TIER_IDS):
+            _shared_models[name] = model
@@ -0,0 +1,266 @@
+"""
+ASL Model Tiers
+
+Picks the model tier each agent runs on, per request.
+
+Every agent has a default tier: the coordinator, which only classifies, and the
+short-lookup specialists run on the small "fast" model; nuanced grammar and
+culture answers use the "large" one (MODEL_TIER in each agent module, overridable
+with ASL_MODEL_TIER_<AGENT_KEY>). A request escalates its fast specialists to
+the large tier when:
+
+- the router's confidence is below ASL_MODEL_ESCALATE_BELOW_CONFIDENCE
+- the question is longer than ASL_MODEL_ESCALATE_PROMPT_TOKENS
+- a fast specialist hands off, i.e. could not answer on its own; every later
+  model call in the request runs on the large tier
+
+Each model call is attributed to the tier that served it; a call a circuit
+breaker moved to a fallback model counts at the fallback model's tier and price
+(see src/fallback_model.py). The request's cost is
+compared with the same tokens on the large tier, and per-tier latency, cost and
+savings are exported as model_tier.* metrics and in the summary frame.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from src.metrics import metrics
+from src.model_provider import DEFAULT_MODEL_TIER, MODEL_TIER_IDS, configured_model_id
+from src.text_features import estimate_tokens
+
+
+@dataclass(frozen=True)
+class TierPrice:
+    """On-demand price of a tier in USD per 1,000 tokens."""
+
+    input_per_1k: float
+    output_per_1k: float
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return input_tokens / 1000 * self.input_per_1k + output_tokens / 1000 * self.output_per_1k
+
+
+# Defaults match Claude 3 Haiku and Claude 3.5 Sonnet on Bedrock
+TIER_PRICES = {
+    "fast": TierPrice(
+        input_per_1k=float(os.getenv("ASL_MODEL_TIER_FAST_INPUT_COST_PER_1K", "0.00025")),
+        output_per_1k=float(os.getenv("ASL_MODEL_TIER_FAST_OUTPUT_COST_PER_1K", "0.00125")),
+    ),
+    "large": TierPrice(
+        input_per_1k=float(os.getenv("ASL_MODEL_TIER_LARGE_INPUT_COST_PER_1K", "0.003")),
+        output_per_1k=float(os.getenv("ASL_MODEL_TIER_LARGE_OUTPUT_COST_PER_1K", "0.015")),
+    ),
+}
+
+
+class RequestTiers:
+    """
+    Tier choices and per-tier usage for one request.
+
+    Created by TierPolicy.start(); hands out the per-agent models for the
+    request's agents and collects what each model call cost.
+    """
+
+    def __init__(self, policy: "TierPolicy", escalation_reason: Optional[str] = None):
+        self.policy = policy
+        self.escalation_reason: Optional[str] = None
+        self.usage: Dict[str, Dict[str, float]] = {}
+        if escalation_reason:
+            self.escalate(escalation_reason)
+
+    @property
+    def escalated(self) -> bool:
+        return self.escalation_reason is not None
+
+    def tier_for(self, agent_key: str) -> str:
+        """The tier an agent's next model call runs on."""
+
+        if not self.policy.enabled:
+            return DEFAULT_MODEL_TIER
+
+        tier = self.policy.default_tiers.get(agent_key, DEFAULT_MODEL_TIER)
+        if tier == "fast" and self.escalated and agent_key not in self.policy.pinned:
+            return "large"
+        return tier
+
+    def escalate(self, reason: str) -> None:
+        """Moves the request's remaining fast-tier calls to the large tier; the first reason wins."""
+
+        if self.escalation_reason is None:
+            self.escalation_reason = reason
+            metrics.increment("model_tier.escalations", reason=reason)
+
+    def record(self, tier: str, usage: Optional[dict], elapsed_ms: float, first_event_ms: Optional[float]) -> None:
+        """
+        Attributes one model call to a tier.
+
+        Args:
+            tier: Tier that served the call
+            usage: Bedrock-style usage from the call's metadata event
+            elapsed_ms: Duration of the whole call
+            first_event_ms: Time to the call's first stream event
+        """
+
+        usage = usage or {}
+        totals = self.usage.setdefault(tier, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "latency_ms": 0.0})
+        totals["calls"] += 1
+        totals["input_tokens"] += usage.get("inputTokens", 0)
+        totals["output_tokens"] += usage.get("outputTokens", 0)
+        totals["latency_ms"] += elapsed_ms
+
+        metrics.increment("model_tier.calls", tier=tier)
+        metrics.observe("model_tier.call_ms", elapsed_ms, tier=tier)
+        if first_event_ms is not None:
+            metrics.observe("model_tier.first_event_ms", first_event_ms, tier=tier)
+
+    def fork(self) -> "RequestTiers":
+        """A separate usage record on the same tiers, for a side run of this request; see merge()."""
+
+        forked = RequestTiers(self.policy)
+        forked.escalation_reason = self.escalation_reason
+        return forked
+
+    def merge(self, other: "RequestTiers") -> None:
+        """
+        Adds the calls recorded by another RequestTiers, e.g. a side run of the same request.
+
+        Args:
+            other: Tier state whose usage is counted towards this request
+        """
+
+        for tier, totals in other.usage.items():
+            mine = self.usage.setdefault(tier, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "latency_ms": 0.0})
+            for key, value in totals.items():
+                mine[key] += value
+
+    def model_for(self, agent_key: str, escalate_on_handoff: Optional[bool] = None):
+        """
+        Returns the model an agent should be built with for this request.
+
+        Args:
+            agent_key: Agent key, e.g. "vocabulary_agent"
+            escalate_on_handoff: Whether a handoff by this agent on the fast tier
+                escalates the request; defaults to True except for pinned agents
+
+        Returns:
+            A TieredModel bound to this request
+        """
+
+        from src.tiered_model import TieredModel
+
+        if escalate_on_handoff is None:
+            escalate_on_handoff = self.policy.escalate_on_handoff and agent_key not in self.policy.pinned
+        return TieredModel(self, agent_key, escalate_on_handoff=escalate_on_handoff)
+
+    def models(self, agent_keys: Iterable[str]) -> Dict[str, Any]:
+        """Per-agent models for a set of agent keys."""
+        return {key: self.model_for(key) for key in agent_keys}
+
+    def summary(self) -> dict:
+        """
+        Per-tier calls, tokens, latency and cost, plus the saving against the large tier.
+
+        Returns:
+            {"escalated": reason or None, "cost_usd", "cost_saved_usd", "by_tier": {...}}
+        """
+
+        large_price = TIER_PRICES["large"]
+        by_tier = {}
+        cost = saved = 0.0
+        for tier, totals in self.usage.items():
+            tier_cost = TIER_PRICES[tier].cost(totals["input_tokens"], totals["output_tokens"])
+            tier_saved = large_price.cost(totals["input_tokens"], totals["output_tokens"]) - tier_cost
+            by_tier[tier] = {
+                "model_id": MODEL_TIER_IDS[tier],
+                **totals,
+                "latency_ms": round(totals["latency_ms"], 1),
+                "cost_usd": round(tier_cost, 6),
+                "cost_saved_usd": round(tier_saved, 6),
+            }
+            cost += tier_cost
+            saved += tier_saved
+
+        return {
+            "escalated": self.escalation_reason,
+            "cost_usd": round(cost, 6),
+            "cost_saved_usd": round(saved, 6),
+            "by_tier": by_tier,
+        }
+
+    def finish(self) -> dict:
+        """Exports the request's cost and savings per tier and returns summary()."""
+
+        summary = self.summary()
+        for tier, totals in summary["by_tier"].items():
+            metrics.increment("model_tier.cost_usd", totals["cost_usd"], tier=tier)
+            metrics.increment("model_tier.cost_saved_usd", totals["cost_saved_usd"], tier=tier)
+        return summary
+
+
+class TierPolicy:
+    """
+    Default tier per agent plus the rules that escalate a request to the large tier.
+    """
+
+    def __init__(
+        self,
+        default_tiers: Dict[str, str],
+        escalate_below_confidence: float = 0.35,
+        escalate_prompt_tokens: int = 300,
+        escalate_on_handoff: bool = True,
+        pinned: Iterable[str] = ("coordinator",),
+        enabled: bool = True,
+    ):
+        """
+        Args:
+            default_tiers: Agent key to "fast" or "large"
+            escalate_below_confidence: Router confidence below which a request starts escalated
+            escalate_prompt_tokens: Question length (estimated tokens) above which a request starts escalated
+            escalate_on_handoff: Whether a fast specialist's handoff escalates the rest of the request
+            pinned: Agents that keep their default tier even when a request escalates
+            enabled: False runs every agent on DEFAULT_MODEL_TIER
+        """
+
+        unknown = {tier for tier in default_tiers.values() if tier not in MODEL_TIER_IDS}
+        if unknown:
+            raise ValueError(f"Unknown model tiers {sorted(unknown)}. Available: {sorted(MODEL_TIER_IDS)}")
+
+        self.default_tiers = dict(default_tiers)
+        self.escalate_below_confidence = escalate_below_confidence
+        self.escalate_prompt_tokens = escalate_prompt_tokens
+        self.escalate_on_handoff = escalate_on_handoff
+        self.pinned = frozenset(pinned)
+        self.enabled = enabled
+
+    def start(self, confidence: float, question: str) -> RequestTiers:
+        """
+        Starts the tier bookkeeping for a request.
+
+        Args:
+            confidence: The router's confidence for the question
+            question: The user's question
+
+        Returns:
+            RequestTiers, already escalated if the question calls for the large tier
+        """
+
+        reason = None
+        if self.enabled:
+            if confidence < self.escalate_below_confidence:
+                reason = "low_confidence"
+            elif estimate_tokens(question) > self.escalate_prompt_tokens:
+                reason = "long_question"
+        return RequestTiers(self, escalation_reason=reason)
+
+    def describe(self) -> dict:
+        """Everything about tiering that changes answers, for the configuration version."""
+
+        return {
+            "enabled": self.enabled,
+            "models": {tier: configured_model_id(model_id=model_id) for tier, model_id in MODEL_TIER_IDS.items()},
+            "default_tiers": self.default_tiers,
+            "escalate_below_confidence": self.escalate_below_confidence,
+            "escalate_prompt_tokens": self.escalate_prompt_tokens,
+            "escalate_on_handoff": self.escalate_on_handoff,
+        }
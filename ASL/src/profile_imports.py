@@ -0,0 +1,191 @@
+"""
+ASL Import Profile
+
+Measures the container cold start: how long importing the AgentCore entrypoint
+takes in a fresh interpreter, how many modules it loads, and which imports cost
+the most (from `python -X importtime`). Optionally also times warm_up().
+
+Each run uses a new subprocess with ASL_WARM_UP=lazy, so the numbers cover the
+import alone. Thresholds turn the report into a regression check for CI.
+
+Usage:
+    python -m src.profile_imports
+    python -m src.profile_imports --warm-up --repeat 5 --output import_profile.json
+    python -m src.profile_imports --max-import-ms 800 --max-modules 900
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter and prints one JSON line
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module} as target
+import_ms = (time.perf_counter() - started) * 1000
+result = {{"import_ms": import_ms, "modules": len(sys.modules)}}
+if {warm_up}:
+    sys.stderr.write("ASL_PROFILE_WARM_UP\\n")
+    sys.stderr.flush()
+    started = time.perf_counter()
+    target.warm_up()
+    result["warm_up_ms"] = (time.perf_counter() - started) * 1000
+    result["modules_after_warm_up"] = len(sys.modules)
+print("ASL_PROFILE " + json.dumps(result))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, object]]:
+    """
+    Parses `python -X importtime` output.
+
+    Args:
+        stderr: The child's stderr
+
+    Returns:
+        One entry per import: module, phase ("import" or "warm_up"), self_us and cumulative_us
+    """
+
+    entries = []
+    phase = "import"
+    for line in stderr.splitlines():
+        if line == "ASL_PROFILE_WARM_UP":
+            phase = "warm_up"
+            continue
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        entries.append({
+            "module": name.strip(),
+            "phase": phase,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return entries
+
+
+def top_level_costs(entries: List[Dict[str, object]], top: int, phase: str = "import") -> List[Dict[str, object]]:
+    """
+    Sums the self time of every module per top-level package (strands, boto3, numpy, ...).
+
+    Self time excludes nested imports, so each millisecond is charged to the
+    package whose code actually ran.
+
+    Args:
+        entries: Output of parse_importtime
+        top: Number of packages to return
+        phase: "import" or "warm_up"
+
+    Returns:
+        The most expensive packages, highest first
+    """
+
+    totals: Dict[str, int] = {}
+    for entry in entries:
+        if entry["phase"] == phase:
+            package = str(entry["module"]).split(".")[0]
+            totals[package] = totals.get(package, 0) + int(entry["self_us"])
+
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": package, "self_ms": round(us / 1000, 1)} for package, us in ranked]
+
+
+def profile_once(module: str, warm_up: bool, env: Dict[str, str]) -> Dict[str, object]:
+    """
+    Imports `module` in a fresh interpreter and reports its cost.
+
+    Args:
+        module: Module to import, e.g. "src.asl_swarm_agent"
+        warm_up: Whether to also call module.warm_up()
+        env: Environment for the child process
+
+    Returns:
+        import_ms, modules, optional warm_up_ms, and the parsed importtime entries
+    """
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, warm_up=warm_up)],
+        cwd=PACKAGE_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("ASL_PROFILE ")]
+    if completed.returncode != 0 or not lines:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith(("import time:", "ASL_PROFILE"))]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(errors[-20:]))
+
+    result = json.loads(lines[-1][len("ASL_PROFILE "):])
+    result["importtime"] = parse_importtime(completed.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the ASL agent's import time (cold start)")
+    parser.add_argument("--module", type=str, default="src.asl_swarm_agent", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to run; the median is reported")
+    parser.add_argument("--warm-up", action="store_true", help="Also time warm_up() after the import")
+    parser.add_argument("--top", type=int, default=15, help="Number of most expensive packages to list")
+    parser.add_argument("--output", type=str, default=None, help="Write the report as JSON")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail if the median import is slower")
+    parser.add_argument("--max-modules", type=int, default=None, help="Fail if more modules are imported")
+    args = parser.parse_args()
+
+    env = {**os.environ, "ASL_WARM_UP": "lazy"}
+    runs = [profile_once(args.module, args.warm_up, env) for _ in range(max(1, args.repeat))]
+
+    report = {
+        "module": args.module,
+        "python": sys.version.split()[0],
+        "runs": len(runs),
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "import_ms_min": round(min(run["import_ms"] for run in runs), 1),
+        "modules": runs[-1]["modules"],
+        "top_packages": top_level_costs(runs[-1]["importtime"], args.top),
+    }
+    if args.warm_up:
+        report["warm_up_ms"] = round(statistics.median(run["warm_up_ms"] for run in runs), 1)
+        report["modules_after_warm_up"] = runs[-1]["modules_after_warm_up"]
+        report["top_packages_warm_up"] = top_level_costs(runs[-1]["importtime"], args.top, phase="warm_up")
+
+    print(f"Import of {report['module']} (median of {report['runs']}): {report['import_ms']} ms, "
+          f"{report['modules']} modules loaded")
+    if args.warm_up:
+        print(f"warm_up(): {report['warm_up_ms']} ms, {report['modules_after_warm_up']} modules loaded")
+    print("\nMost expensive packages at import:")
+    for entry in report["top_packages"]:
+        print(f"  {entry['package']:<30} {entry['self_ms']:>8.1f} ms")
+    if args.warm_up:
+        print("\nLoaded by warm_up():")
+        for entry in report["top_packages_warm_up"]:
+            print(f"  {entry['package']:<30} {entry['self_ms']:>8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    failures = []
+    if args.max_import_ms is not None and report["import_ms"] > args.max_import_ms:
+        failures.append(f"import took {report['import_ms']} ms (limit {args.max_import_ms} ms)")
+    if args.max_modules is not None and report["modules"] > args.max_modules:
+        failures.append(f"{report['modules']} modules imported (limit {args.max_modules})")
+
+    if failures:
+        print("\nRegression: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+ASL Prompt Caching
+
+Bedrock prompt-cache checkpoints for the large, fully static agent system prompts.
+
+With prompt caching enabled, BedrockModel places a cache checkpoint after the
+system prompt, so each coordinator/specialist prompt is processed once and then
+read from the cache on every later model call and handoff. This module builds the
+model configuration, tracks cache-read vs cache-write tokens per agent, and can
+verify the behaviour offline against StubCachingModel.
+
+Usage (offline verification):
+    python -m src.prompt_cache
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Dict
+
+from src.metrics import metrics
+from src.text_features import estimate_tokens
+
+
+# Off by default: the agents' system prompts are about 300-700 tokens, below the
+# minimum Bedrock caches, so the checkpoints would never be used. Turn it on once
+# the prompts (plus tool definitions) reach the minimum; `python -m src.prompt_cache`
+# reports where each prompt stands.
+PROMPT_CACHE_ENABLED = os.getenv("ASL_PROMPT_CACHE_ENABLED", "false").lower() == "true"
+
+# Bedrock only creates a checkpoint when the cached prefix is at least this long
+# (1,024 tokens for Claude 3.5 Sonnet); shorter prefixes are processed uncached.
+# The cached prefix includes the tool definitions, so a system prompt alone may
+# be shorter than this and still be cached.
+MIN_CACHEABLE_TOKENS = 1024
+
+
+def prompt_cache_config(enabled: bool = PROMPT_CACHE_ENABLED) -> dict:
+    """
+    Returns the BedrockModel keyword arguments that enable prompt caching.
+
+    Checkpoints go after the system prompt and after the tool definitions (the
+    Swarm's handoff tools), which are equally static for every call.
+
+    Args:
+        enabled: Whether to add the system-prompt cache checkpoint
+
+    Returns:
+        Dictionary to splat into BedrockModel(...)
+    """
+
+    return {"cache_prompt": "default", "cache_tools": "default"} if enabled else {}
+
+
+def prompt_cache_eligibility(system_prompts: Dict[str, str]) -> Dict[str, dict]:
+    """
+    Reports which system prompts are long enough for Bedrock to cache.
+
+    Args:
+        system_prompts: Agent key to static system prompt
+
+    Returns:
+        Agent key to {"estimated_tokens", "cacheable"}
+    """
+
+    report = {}
+    for agent_key, prompt in system_prompts.items():
+        tokens = estimate_tokens(prompt)
+        report[agent_key] = {"estimated_tokens": tokens, "cacheable": tokens >= MIN_CACHEABLE_TOKENS}
+    return report
+
+
+def _usage_of(result: Any) -> Dict[str, Any]:
+    """Reads the accumulated usage of an agent or node result."""
+
+    usage = getattr(result, "accumulated_usage", None)
+    if usage is None:
+        usage = getattr(getattr(result, "metrics", None), "accumulated_usage", None)
+    return usage or {}
+
+
+class PromptCacheStats:
+    """
+    Per-agent prompt-cache token counters.
+    """
+
+    def __init__(self):
+        self._agents: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record_usage(self, agent_name: str, usage: Dict[str, Any]) -> None:
+        """
+        Records the usage block of one agent run.
+
+        Args:
+            agent_name: Agent (Swarm node) name
+            usage: Bedrock usage with inputTokens, cacheReadInputTokens, cacheWriteInputTokens
+        """
+
+        read_tokens = int(usage.get("cacheReadInputTokens", 0))
+        write_tokens = int(usage.get("cacheWriteInputTokens", 0))
+        input_tokens = int(usage.get("inputTokens", 0))
+
+        with self._lock:
+            counters = self._agents.setdefault(
+                agent_name, {"calls": 0, "input_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0}
+            )
+            counters["calls"] += 1
+            counters["input_tokens"] += input_tokens
+            counters["cache_read_tokens"] += read_tokens
+            counters["cache_write_tokens"] += write_tokens
+
+        metrics.increment("prompt_cache.read_tokens", read_tokens, agent=agent_name)
+        metrics.increment("prompt_cache.write_tokens", write_tokens, agent=agent_name)
+
+    def record_node_results(self, node_results: Dict[str, Any]) -> None:
+        """
+        Records usage for every agent of a finished run.
+
+        Args:
+            node_results: Agent (node) name to its result, e.g. SwarmStream.node_results
+        """
+
+        for node_name, node_result in node_results.items():
+            usage = _usage_of(node_result)
+            if usage:
+                self.record_usage(node_name, usage)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Returns per-agent counters with the fraction of prompt tokens read from cache.
+        """
+
+        with self._lock:
+            agents = {name: dict(counters) for name, counters in self._agents.items()}
+
+        for counters in agents.values():
+            prompt_tokens = counters["input_tokens"] + counters["cache_read_tokens"] + counters["cache_write_tokens"]
+            counters["cache_read_ratio"] = counters["cache_read_tokens"] / prompt_tokens if prompt_tokens else 0.0
+
+        return agents
+
+
+# Process-wide prompt cache statistics
+prompt_cache_stats = PromptCacheStats()
+
+
+async def verify_prompt_caching(factories: Dict[str, Any], model, calls_per_agent: int = 2) -> Dict[str, dict]:
+    """
+    Runs every agent several times and reports cache reads vs writes per agent.
+
+    With caching working, the first call of each agent writes its system prompt to
+    the cache and every later call reads it; prompts below MIN_CACHEABLE_TOKENS
+    report neither. Use with StubCachingModel offline or
+    a real BedrockModel against AWS.
+
+    Args:
+        factories: Agent key to create_* factory
+        model: Model instance shared by the agents
+        calls_per_agent: Number of fresh agents to run per key
+
+    Returns:
+        Per-agent counters as returned by PromptCacheStats.snapshot()
+    """
+
+    stats = PromptCacheStats()
+
+    for agent_key, factory in factories.items():
+        for _ in range(calls_per_agent):
+            agent = factory(model=model)
+            result = await agent.run_async("Cache verification question.")
+            stats.record_usage(agent_key, _usage_of(result))
+
+    return stats.snapshot()
+
+
+if __name__ == "__main__":
+    from src.agents import SPECIALIST_SYSTEM_PROMPTS
+    from src.asl_swarm_agent import COORDINATOR_SYSTEM_PROMPT, agent_registry
+    from src.mock_model import StubCachingModel
+
+    system_prompts = {"coordinator": COORDINATOR_SYSTEM_PROMPT, **SPECIALIST_SYSTEM_PROMPTS}
+
+    print("Prompt cache eligibility (estimated tokens):")
+    for agent_key, info in prompt_cache_eligibility(system_prompts).items():
+        status = "cacheable" if info["cacheable"] else f"below {MIN_CACHEABLE_TOKENS}-token minimum"
+        print(f"  - {agent_key}: {info['estimated_tokens']} ({status})")
+
+    stub_model = StubCachingModel(**prompt_cache_config(enabled=True))
+    report = asyncio.run(verify_prompt_caching(agent_registry.factories, stub_model))
+
+    print("\nStub verification (cache read / write tokens):")
+    for agent_key, counters in report.items():
+        print(f"  - {agent_key}: read={counters['cache_read_tokens']} write={counters['cache_write_tokens']}")
@@ -0,0 +1,421 @@
+"""
+ASL Resilience
+
+Retry, backoff and hedging shared by the model calls inside the Swarm and by the
+client scripts. This module has no dependencies outside the standard library so
+the standalone client scripts can import it too.
+
+- is_retryable() classifies throttling, 5xx, timeouts and connection errors
+- RetryPolicy: jittered exponential backoff bounded by a total deadline
+- RetryBudget: caps retries and hedges at a fraction of recent requests, so a
+  full outage does not multiply load
+- HedgePolicy: sends a second request when the first has not produced anything
+  after a latency-percentile threshold; the first to respond wins
+- resilient_stream(): applies all three to an async stream. Only the start of a
+  stream is retried or hedged - once an item has been yielded it is never replayed
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Optional
+
+
+# Error codes (AWS and HTTP-style) worth retrying
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "InternalFailure",
+    "ModelNotReadyException",
+    "ModelTimeoutException",
+    "RequestTimeout",
+    "RequestTimeoutException",
+}
+
+# Exception class names that indicate a transient failure, matched without
+# importing the libraries that define them (strands, botocore, requests)
+RETRYABLE_EXCEPTION_NAMES = ("Throttl", "Timeout", "ConnectionError", "ServiceUnavailable", "TooManyRequests")
+
+# Called with an event name ("retry", "hedge", "hedge_won", "budget_exhausted",
+# "gave_up") and a dict of details, e.g. to feed a metrics registry
+EventCallback = Callable[[str, dict], None]
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        if isinstance(response, dict):
+            status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        else:
+            status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _error_code(error: BaseException) -> Optional[str]:
+    code = getattr(error, "code", None)
+    if isinstance(code, str):
+        return code
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Reports whether an error is transient: throttling, 5xx, timeouts or dropped connections.
+
+    Args:
+        error: The exception raised by a model or runtime call
+
+    Returns:
+        True if the same request may succeed when retried
+    """
+
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+
+    if _error_code(error) in RETRYABLE_ERROR_CODES:
+        return True
+
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+
+    if any(name in type(error).__name__ for name in RETRYABLE_EXCEPTION_NAMES):
+        return True
+
+    # Wrapped errors (raise ... from e) are classified by their cause
+    return error.__cause__ is not None and is_retryable(error.__cause__)
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries and hedges to a fraction of requests.
+
+    Every request deposits `ratio` tokens; every retry or hedge withdraws one.
+    While the backend is healthy there are always tokens; during an outage
+    they run out and failing requests stop being repeated.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        """
+        Args:
+            ratio: Extra attempts allowed per request on average
+            min_tokens: Starting balance, so a cold process can still retry
+            max_tokens: Cap on saved-up tokens
+        """
+
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraws one token if available."""
+
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff with a total deadline.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 4.0,
+        deadline_seconds: float = 20.0,
+        budget: Optional[RetryBudget] = None,
+        classify: Callable[[BaseException], bool] = is_retryable,
+        on_event: Optional[EventCallback] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            max_attempts: Attempts including the first
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound for a single backoff
+            deadline_seconds: No retry starts after this much time since the first attempt
+            budget: Shared retry budget; None allows every retry
+            classify: Decides whether an error is retryable
+            on_event: Optional callback for retry events
+            rng: Random source for the jitter
+        """
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+        self.budget = budget
+        self.classify = classify
+        self.on_event = on_event
+        self._rng = rng or random.Random()
+
+    def _emit(self, event: str, **details) -> None:
+        if self.on_event is not None:
+            self.on_event(event, details)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number `attempt` (1-based)."""
+
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def next_delay(self, attempt: int, error: BaseException, deadline: float) -> Optional[float]:
+        """
+        Returns how long to wait before retrying, or None to give up.
+
+        Args:
+            attempt: Number of attempts made so far
+            error: The error from the last attempt
+            deadline: time.monotonic() value after which no retry may start
+        """
+
+        if not self.classify(error):
+            return None
+
+        if attempt >= self.max_attempts:
+            self._emit("gave_up", reason="attempts", error=type(error).__name__)
+            return None
+
+        delay = self.backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            self._emit("gave_up", reason="deadline", error=type(error).__name__)
+            return None
+
+        if self.budget is not None and not self.budget.try_spend():
+            self._emit("budget_exhausted", kind="retry")
+            return None
+
+        self._emit("retry", attempt=attempt, delay=delay, error=type(error).__name__)
+        return delay
+
+    def deadline(self, limit: Optional[float] = None) -> float:
+        """The retry deadline for a call starting now, never past `limit` (monotonic)."""
+
+        deadline = time.monotonic() + self.deadline_seconds
+        return deadline if limit is None else min(deadline, limit)
+
+    async def call(self, fn: Callable[[], "asyncio.Future"], deadline: Optional[float] = None):
+        """
+        Awaits fn(), retrying retryable failures with backoff.
+
+        Args:
+            fn: Zero-argument callable returning a fresh awaitable per attempt
+            deadline: Optional outer time.monotonic() deadline
+
+        Returns:
+            The result of the first successful attempt
+        """
+
+        deadline = self.deadline(deadline)
+        if self.budget is not None:
+            self.budget.record_request()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self.next_delay(attempt, e, deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+
+class HedgePolicy:
+    """
+    Decides when to send a second, hedged request.
+
+    The threshold is a percentile of recent time-to-first-item latencies, so only
+    the slowest few percent of requests are hedged.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window: int = 512,
+        min_delay: float = 0.05,
+        budget: Optional[RetryBudget] = None,
+        on_event: Optional[EventCallback] = None,
+    ):
+        """
+        Args:
+            percentile: Latency percentile after which a request is hedged
+            min_samples: Observations needed before hedging starts
+            window: Number of recent latencies kept
+            min_delay: Lower bound for the hedge threshold, in seconds
+            budget: Shared retry budget that hedges draw from
+            on_event: Optional callback for hedge events
+        """
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = budget
+        self.on_event = on_event
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def threshold(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little data."""
+
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+
+        rank = max(0, min(len(ordered) - 1, math.ceil(self.percentile / 100.0 * len(ordered)) - 1))
+        return max(self.min_delay, ordered[rank])
+
+    def try_hedge(self) -> bool:
+        if self.budget is not None and not self.budget.try_spend():
+            self._emit("budget_exhausted", kind="hedge")
+            return False
+        self._emit("hedge")
+        return True
+
+    def _emit(self, event: str, **details) -> None:
+        if self.on_event is not None:
+            self.on_event(event, details)
+
+
+async def _close(iterator) -> None:
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+async def _cancel(task: "asyncio.Task") -> None:
+    if not task.done():
+        task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+async def _first_item(open_stream: Callable[[], AsyncIterator], hedge: Optional[HedgePolicy]):
+    """
+    Opens the stream and waits for its first item, hedging if it is slow.
+
+    Returns:
+        (iterator, first item) of the winning stream
+
+    Raises:
+        StopAsyncIteration: If the stream was empty
+    """
+
+    started = time.monotonic()
+    primary = open_stream().__aiter__()
+    threshold = hedge.threshold() if hedge is not None else None
+
+    if threshold is None:
+        try:
+            first = await primary.__anext__()
+        except BaseException:
+            await _close(primary)
+            raise
+        if hedge is not None:
+            hedge.record(time.monotonic() - started)
+        return primary, first
+
+    contenders = {asyncio.ensure_future(primary.__anext__()): primary}
+    done, _ = await asyncio.wait(contenders, timeout=threshold)
+    if not done and hedge.try_hedge():
+        secondary = open_stream().__aiter__()
+        contenders[asyncio.ensure_future(secondary.__anext__())] = secondary
+
+    pending = set(contenders)
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is not None:
+                error = task.exception()
+                await _close(contenders[task])
+                continue
+
+            # Winner: stop the other request and keep streaming from this one
+            for other in pending:
+                await _cancel(other)
+                await _close(contenders[other])
+            if hedge is not None:
+                hedge.record(time.monotonic() - started)
+                if contenders[task] is not primary:
+                    hedge._emit("hedge_won")
+            return contenders[task], task.result()
+
+    raise error
+
+
+async def resilient_stream(
+    open_stream: Callable[[], AsyncIterator],
+    policy: Optional[RetryPolicy] = None,
+    hedge: Optional[HedgePolicy] = None,
+    deadline: Optional[float] = None,
+) -> AsyncIterator:
+    """
+    Yields from open_stream(), retrying and hedging the start of the stream.
+
+    Failures before the first item are retried with backoff; a slow first item
+    may be raced against a hedged second stream. Errors after the first item are
+    raised to the caller unchanged, since the items already yielded cannot be
+    taken back.
+
+    Args:
+        open_stream: Zero-argument callable returning a fresh async iterator
+        policy: Retry policy; None means no retries
+        hedge: Hedge policy; None means no hedging
+        deadline: Optional outer time.monotonic() deadline for retries
+    """
+
+    retry_deadline = policy.deadline(deadline) if policy is not None else None
+    if policy is not None and policy.budget is not None:
+        policy.budget.record_request()
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            iterator, first = await _first_item(open_stream, hedge)
+            break
+        except StopAsyncIteration:
+            return
+        except Exception as e:
+            delay = policy.next_delay(attempt, e, retry_deadline) if policy is not None else None
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+
+    try:
+        yield first
+        async for item in iterator:
+            yield item
+    finally:
+        await _close(iterator)
@@ -0,0 +1,70 @@
+"""
+ASL Resilient Model
+
+Model wrapper that applies the shared retry/backoff/hedging policies to every
+model call made inside the Swarm.
+
+Throttling, 5xx and timeout errors raised before the model produces its first
+stream event are retried with jittered backoff within a deadline; slow first
+events can optionally be hedged. Retries and hedges share one retry budget, so
+during an outage the wrapper stops multiplying load. It is the only retrying
+layer: model_provider creates the Bedrock client under it with botocore retries
+off.
+"""
+
+from typing import Optional
+
+from strands.models import Model
+
+from src.deadlines import current_deadline
+from src.metrics import metrics
+from src.resilience import HedgePolicy, RetryPolicy, resilient_stream
+
+
+def record_resilience_event(event: str, details: dict) -> None:
+    """Exports retry and hedge events as model.<event> counters."""
+
+    labels = {key: details[key] for key in ("reason", "kind", "error") if key in details}
+    metrics.increment(f"model.{event}", **labels)
+
+
+class ResilientModel(Model):
+    """
+    Delegates to an inner Strands model, adding retries and optional hedging.
+    """
+
+    def __init__(self, inner: Model, retry_policy: RetryPolicy, hedge_policy: Optional[HedgePolicy] = None):
+        """
+        Args:
+            inner: The model doing the actual calls (BedrockModel, MockModel, ...)
+            retry_policy: Backoff and deadline for retryable errors
+            hedge_policy: Optional hedging of slow first events
+        """
+
+        self.inner = inner
+        self.retry_policy = retry_policy
+        self.hedge_policy = hedge_policy
+
+    def update_config(self, **model_config) -> None:
+        self.inner.update_config(**model_config)
+
+    def get_config(self):
+        return self.inner.get_config()
+
+    def __getattr__(self, name):
+        # Anything else (e.g. config attributes) comes from the inner model
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    async def stream(self, messages, tool_specs=None, system_prompt: Optional[str] = None, **kwargs):
+        """Streams from the inner model; the start of the stream is retried/hedged until the request deadline."""
+
+        def open_stream():
+            return self.inner.stream(messages, tool_specs, system_prompt, **kwargs)
+
+        async for event in resilient_stream(open_stream, self.retry_policy, self.hedge_policy, deadline=current_deadline()):
+            yield event
+
+    def structured_output(self, output_model, prompt, system_prompt: Optional[str] = None, **kwargs):
+        return self.inner.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs)
@@ -0,0 +1,726 @@
+"""
+ASL Resource Index
+
+BM25 retrieval over a curated catalog of learning resources for the Learning Agent.
+
+Each resource has an id, title, URL, description, tags and three filter fields:
+level (beginner / intermediate / advanced / all), cost (free / freemium / paid)
+and format (course, app, dictionary, video, book, website, community).
+
+The index is a directory of immutable, memory-mapped segments plus a manifest:
+
+- a segment stores the resources, their lengths and filter values, a hashed
+  term table and (doc, term frequency) postings - the term statistics BM25
+  needs are precomputed, so a search only sums scores over the query's postings
+- adding resources writes one new segment; a resource whose id already exists
+  replaces the old copy, which is marked deleted in the manifest
+- compacting merges the live resources into a single segment
+
+The manifest is replaced atomically, so a build never disturbs a running agent;
+a running process picks up the new catalog with reload_if_changed(), which
+reopens the index when the manifest file changes. Segments of the replaced
+catalog are unmapped once no search still reads them.
+
+    python -m src.resource_index --index data/resource_index add --input data/learning_resources_sample.jsonl
+    python -m src.resource_index --index data/resource_index search --level beginner --cost free "practice apps"
+    python -m src.resource_index --index data/resource_index compact
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from src.metrics import metrics
+from src.mmap_sections import SectionFile, hash_lookup, hash_slots, posting_table, string_table, write_sections
+from src.text_features import fold_plural, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b"ASLRIX01"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+FILTER_FIELDS = ("level", "cost", "format")
+FILTER_VALUES = {
+    "level": ("beginner", "intermediate", "advanced", "all"),
+    "cost": ("free", "freemium", "paid"),
+    "format": ("course", "app", "dictionary", "video", "book", "website", "community"),
+}
+_NO_VALUE = 255
+
+# Stored value a filter also accepts, by (field position, wanted code): resources
+# for "all" levels match any level, and freemium resources have a free tier
+_ALSO_MATCHES = {
+    (FILTER_FIELDS.index("level"), code): FILTER_VALUES["level"].index("all")
+    for code in range(len(FILTER_VALUES["level"]))
+}
+_ALSO_MATCHES[(FILTER_FIELDS.index("cost"), FILTER_VALUES["cost"].index("free"))] = FILTER_VALUES["cost"].index("freemium")
+
+# BM25 parameters; titles count twice towards term frequency
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+_STOPWORDS = frozenset(
+    "a an and are as at be best can do for from good how i in is it learn learning me my of on or "
+    "recommend resource resources some the there to what where which with you your asl sign signing".split()
+)
+
+_SECTIONS = (
+    "meta",
+    "doc_offsets",
+    "docs",
+    "id_offsets",
+    "ids",
+    "doc_lengths",
+    "doc_filters",
+    "term_offsets",
+    "terms",
+    "term_slots",
+    "posting_offsets",
+    "postings",
+)
+
+
+def index_terms(text: str) -> List[str]:
+    """
+    Tokens used for indexing and queries: lowercased, stopwords dropped, plurals folded.
+
+    "Free apps for beginners" -> ["free", "app", "beginner"]
+    """
+
+    return [fold_plural(token) for token in tokenize(text) if token not in _STOPWORDS]
+
+
+def normalize_resource(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validates a catalog record.
+
+    Args:
+        raw: Record with at least "title"; "tags" may be a list or a ";"-separated string
+
+    Returns:
+        Resource with an id (derived from the title if missing) and validated filter fields
+    """
+
+    title = str(raw.get("title") or "").strip()
+    if not title:
+        raise ValueError(f"Resource without a title: {raw}")
+
+    resource: Dict[str, Any] = {
+        "id": str(raw.get("id") or "-".join(tokenize(title))),
+        "title": title,
+    }
+    for field in ("url", "description"):
+        if raw.get(field):
+            resource[field] = str(raw[field]).strip()
+
+    for field in FILTER_FIELDS:
+        value = str(raw.get(field) or "").strip().lower()
+        if value and value not in FILTER_VALUES[field]:
+            raise ValueError(f"Resource {resource['id']}: unknown {field} {value!r}. Available: {FILTER_VALUES[field]}")
+        if value:
+            resource[field] = value
+
+    tags = raw.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(";")
+    resource["tags"] = [tag.strip() for tag in tags if tag and tag.strip()]
+    return resource
+
+
+def read_resources(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Reads catalog records from JSON (a list, or {"resources": [...]}) or JSONL.
+
+    Args:
+        path: Source file
+
+    Yields:
+        Normalized resources
+    """
+
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield normalize_resource(json.loads(line))
+        else:
+            data = json.load(f)
+            for record in data.get("resources", []) if isinstance(data, dict) else data:
+                yield normalize_resource(record)
+
+
+def _document_terms(resource: Dict[str, Any]) -> List[str]:
+    text = " ".join([resource.get("description", ""), " ".join(resource.get("tags", [])), resource.get("format", "")])
+    return index_terms(resource["title"]) * TITLE_WEIGHT + index_terms(text)
+
+
+def write_segment(resources: Sequence[Dict[str, Any]], path: str) -> None:
+    """
+    Writes one immutable segment.
+
+    Args:
+        resources: Normalized resources; ids must be unique within the segment
+        path: Segment file
+    """
+
+    term_postings: Dict[str, List[int]] = {}
+    lengths = array("I")
+    filters = bytearray()
+    for doc, resource in enumerate(resources):
+        counts: Dict[str, int] = {}
+        terms = _document_terms(resource)
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            term_postings.setdefault(term, []).extend((doc, tf))
+        lengths.append(len(terms))
+        for field in FILTER_FIELDS:
+            value = resource.get(field)
+            filters.append(FILTER_VALUES[field].index(value) if value else _NO_VALUE)
+
+    terms = sorted(term_postings)
+    doc_offsets, doc_blob = string_table(json.dumps(r, ensure_ascii=False, separators=(",", ":")) for r in resources)
+    id_offsets, id_blob = string_table(r["id"] for r in resources)
+    term_offsets, term_blob = string_table(terms)
+    posting_offsets, postings = posting_table(term_postings[term] for term in terms)
+
+    meta = {"docs": len(resources), "total_length": sum(lengths), "terms": len(terms)}
+    write_sections(path, MAGIC, FORMAT_VERSION, _SECTIONS, {
+        "meta": json.dumps(meta).encode("utf-8"),
+        "doc_offsets": doc_offsets,
+        "docs": doc_blob,
+        "id_offsets": id_offsets,
+        "ids": id_blob,
+        "doc_lengths": lengths.tobytes(),
+        "doc_filters": bytes(filters),
+        "term_offsets": term_offsets,
+        "terms": term_blob,
+        "term_slots": hash_slots(terms),
+        "posting_offsets": posting_offsets,
+        "postings": postings,
+    })
+
+
+class _Segment:
+    """A mapped segment plus the doc numbers the manifest marks deleted."""
+
+    def __init__(self, path: str, deleted: Iterable[int]):
+        self.name = os.path.basename(path)
+        self.file = SectionFile(path, MAGIC, FORMAT_VERSION, _SECTIONS)
+        self.meta = json.loads(bytes(self.file.sections["meta"]))
+        self.deleted = frozenset(deleted)
+        self.doc_offsets = self.file.array("doc_offsets", "Q")
+        self.docs = self.file.sections["docs"]
+        self.ids = self.file.strings("id_offsets", "ids")
+        self.lengths = self.file.array("doc_lengths", "I")
+        self.filters = self.file.sections["doc_filters"]
+        self.terms = self.file.strings("term_offsets", "terms")
+        self.term_slots = self.file.array("term_slots", "I")
+        self.postings = self.file.postings("posting_offsets", "postings")
+
+    def resource(self, doc: int) -> Dict[str, Any]:
+        return json.loads(bytes(self.docs[self.doc_offsets[doc]:self.doc_offsets[doc + 1]]))
+
+    def live_docs(self) -> Iterator[int]:
+        return (doc for doc in range(self.meta["docs"]) if doc not in self.deleted)
+
+    def postings_for(self, term: str) -> Optional[memoryview]:
+        index = hash_lookup(self.term_slots, self.terms, term.encode("utf-8"))
+        return self.postings[index] if index is not None else None
+
+
+class _Snapshot:
+    """The segments of one manifest version, plus the searches still reading them."""
+
+    def __init__(self, manifest: Dict[str, Any], segments: List[_Segment]):
+        self.manifest = manifest
+        self.segments = segments
+        self.docs = sum(segment.meta["docs"] for segment in segments)
+        self.avg_length = sum(segment.meta["total_length"] for segment in segments) / self.docs if self.docs else 0.0
+        self.readers = 0
+        self.retired = False
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.file.close()
+
+
+class ResourceIndex:
+    """
+    Read and update access to an index directory.
+
+    Searches are safe from several threads, also while the index reloads;
+    updates (add, remove, compact) are meant for one writer process, typically the CLI.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Index directory; created empty if it does not exist
+        """
+
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self._manifest_stamp = None
+        self._load()
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST)
+
+    def _stamp(self):
+        """Identifies the current manifest file; os.replace gives every commit a new one."""
+
+        try:
+            stat = os.stat(self._manifest_path())
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+    def _load(self) -> None:
+        # Stamped before reading, so a commit in between triggers another reload
+        stamp = self._stamp()
+        manifest = {"version": 0, "segments": [], "deleted": {}}
+        if stamp is not None:
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+
+        snapshot = _Snapshot(manifest, [
+            _Segment(os.path.join(self.directory, name), manifest["deleted"].get(name, []))
+            for name in manifest["segments"]
+        ])
+        with self._snapshot_lock:
+            previous, self._snapshot = self._snapshot, snapshot
+            self._manifest_stamp = stamp
+            if previous is not None:
+                previous.retired = True
+                if previous.readers:
+                    # The last search still reading it closes it
+                    previous = None
+        if previous is not None:
+            previous.close()
+
+    @contextmanager
+    def _reading(self) -> Iterator[_Snapshot]:
+        """Pins the current snapshot so a reload does not unmap it mid-search."""
+
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            snapshot.readers += 1
+        try:
+            yield snapshot
+        finally:
+            with self._snapshot_lock:
+                snapshot.readers -= 1
+                close = snapshot.retired and not snapshot.readers
+            if close:
+                snapshot.close()
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reopens the index if another process has committed a new manifest.
+
+        Costs one stat call when nothing changed, so it can run on every request.
+
+        Returns:
+            True if the index was reloaded
+        """
+
+        if self._stamp() == self._manifest_stamp:
+            return False
+        with self._lock:
+            if self._stamp() == self._manifest_stamp:
+                return False
+            self._load()
+        logger.info("Resource index %s reloaded at version %d", self.directory, self.version)
+        return True
+
+    def __len__(self) -> int:
+        return sum(segment.meta["docs"] - len(segment.deleted) for segment in self._snapshot.segments)
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """The manifest the index was last loaded from."""
+        return self._snapshot.manifest
+
+    @property
+    def version(self) -> int:
+        """Manifest version; increases with every update."""
+        return self.manifest["version"]
+
+    def segments(self) -> List[Dict[str, Any]]:
+        """Name, size and deleted count of every segment."""
+
+        return [
+            {"name": segment.name, "docs": segment.meta["docs"], "deleted": len(segment.deleted),
+             "terms": segment.meta["terms"], "bytes": os.path.getsize(segment.file.path)}
+            for segment in self._snapshot.segments
+        ]
+
+    def resources(self) -> Iterator[Dict[str, Any]]:
+        """All live resources."""
+
+        with self._reading() as snapshot:
+            for segment in snapshot.segments:
+                for doc in segment.live_docs():
+                    yield segment.resource(doc)
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        level: Optional[str] = None,
+        cost: Optional[str] = None,
+        format: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the k best resources for a query by BM25.
+
+        Document frequencies and the average length cover all segments,
+        including deleted copies until the next compaction.
+
+        Args:
+            query: Free-text query
+            k: Number of resources to return
+            level: Only resources for this level; resources for "all" levels always match
+            cost: Only resources with this cost model; "free" includes freemium
+            format: Only resources of this format
+
+        Returns:
+            Resources, best first, each with its "score"
+        """
+
+        started = time.perf_counter()
+        wanted = {"level": level, "cost": cost, "format": format}
+        wanted_codes = [
+            (i, FILTER_VALUES[field].index(wanted[field]) if wanted[field] in FILTER_VALUES[field] else -1)
+            for i, field in enumerate(FILTER_FIELDS)
+            if wanted[field]
+        ]
+
+        with self._reading() as snapshot:
+            results = self._search(snapshot, query, k, wanted_codes)
+
+        metrics.observe("resource_index.search_us", (time.perf_counter() - started) * 1e6)
+        metrics.increment("resource_index.searches", result="hit" if results else "miss")
+        return results
+
+    @staticmethod
+    def _search(snapshot: _Snapshot, query: str, k: int, wanted_codes: List[tuple]) -> List[Dict[str, Any]]:
+        """Scores a pinned snapshot; no view into its mappings outlives the call."""
+
+        # Postings per segment and the inverse document frequency over all segments
+        postings_by_term = {
+            term: [segment.postings_for(term) for segment in snapshot.segments] for term in set(index_terms(query))
+        }
+        idf = {}
+        for term, postings in postings_by_term.items():
+            df = sum(len(p) // 2 for p in postings if p is not None)
+            idf[term] = math.log(1 + (snapshot.docs - df + 0.5) / (df + 0.5))
+
+        scored = []
+        for position, segment in enumerate(snapshot.segments):
+            scores: Dict[int, float] = {}
+            for term, term_postings in postings_by_term.items():
+                postings = term_postings[position]
+                if not postings:
+                    continue
+                for i in range(0, len(postings), 2):
+                    doc, tf = postings[i], postings[i + 1]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * segment.lengths[doc] / snapshot.avg_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+
+            for doc, score in scores.items():
+                if doc in segment.deleted:
+                    continue
+                codes = segment.filters[doc * len(FILTER_FIELDS):(doc + 1) * len(FILTER_FIELDS)]
+                if all(codes[i] == code or codes[i] == _ALSO_MATCHES.get((i, code)) for i, code in wanted_codes):
+                    scored.append((score, segment, doc))
+
+        top = heapq.nlargest(k, scored, key=lambda item: item[0])
+        return [{**segment.resource(doc), "score": round(score, 3)} for score, segment, doc in top]
+
+    def add(self, resources: Iterable[Dict[str, Any]]) -> int:
+        """
+        Adds or replaces resources by writing one new segment.
+
+        Args:
+            resources: Normalized resources; a later copy of an id wins
+
+        Returns:
+            Number of resources written
+        """
+
+        by_id = {resource["id"]: resource for resource in resources}
+        if not by_id:
+            return 0
+
+        with self._lock:
+            version = self.version + 1
+            name = f"segment-{version:06d}.rix"
+            write_segment(list(by_id.values()), os.path.join(self.directory, name))
+            self._commit(version, self._segment_names() + [name], self._deleted_with(set(by_id)))
+        return len(by_id)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """
+        Marks resources deleted; the data goes away at the next compaction.
+
+        Nothing is committed when no live resource has one of the ids.
+
+        Returns:
+            Number of live resources removed
+        """
+
+        ids = set(ids)
+        with self._lock:
+            deleted = self._deleted_with(ids)
+            removed = sum(len(deleted.get(segment.name, ())) - len(segment.deleted) for segment in self._snapshot.segments)
+            if removed:
+                self._commit(self.version + 1, self._segment_names(), deleted)
+            return removed
+
+    def compact(self) -> int:
+        """
+        Merges every live resource into a single segment and deletes the old segment files.
+
+        Returns:
+            Number of resources in the merged segment
+        """
+
+        with self._lock:
+            old_names = self._segment_names()
+            resources = list(self.resources())
+            version = self.version + 1
+            name = f"segment-{version:06d}.rix"
+            write_segment(resources, os.path.join(self.directory, name))
+            self._commit(version, [name], {})
+            # Open mappings in running processes stay valid after the unlink
+            for old_name in old_names:
+                os.unlink(os.path.join(self.directory, old_name))
+        return len(resources)
+
+    def _segment_names(self) -> List[str]:
+        return [segment.name for segment in self._snapshot.segments]
+
+    def _deleted_with(self, ids: set) -> Dict[str, List[int]]:
+        deleted = {}
+        for segment in self._snapshot.segments:
+            docs = set(segment.deleted)
+            docs.update(doc for doc in segment.live_docs() if segment.ids[doc].decode("utf-8") in ids)
+            if docs:
+                deleted[segment.name] = sorted(docs)
+        return deleted
+
+    def _commit(self, version: int, segments: List[str], deleted: Dict[str, List[int]]) -> None:
+        manifest = {"version": version, "segments": segments, "deleted": deleted}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{MANIFEST}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+        self._load()
+
+
+_FILTER_HINTS = {
+    "level": {"beginner": "beginner", "start": "beginner", "starting": "beginner", "basic": "beginner",
+              "intermediate": "intermediate", "advanced": "advanced", "fluent": "advanced"},
+    "cost": {"free": "free", "paid": "paid"},
+}
+_NEGATED_FREE = re.compile(r"\b(?:not|isn't|non)[ -]free\b")
+
+
+def infer_filters(question: str) -> Dict[str, str]:
+    """
+    Level and cost constraints stated in a question ("free apps for beginners").
+
+    The format is left to ranking: "apps" in the question already matches the
+    format term of every app.
+
+    Args:
+        question: The user's question
+
+    Returns:
+        Filter field to value, for the fields the question mentions
+    """
+
+    filters: Dict[str, str] = {}
+    for token in map(fold_plural, tokenize(question)):
+        for field, hints in _FILTER_HINTS.items():
+            if token in hints and field not in filters:
+                filters[field] = hints[token]
+    if filters.get("cost") == "free" and _NEGATED_FREE.search(question.lower()):
+        del filters["cost"]
+    return filters
+
+
+def format_resource_context(resources: List[Dict[str, Any]]) -> str:
+    """Formats search results as a prompt block for the Learning Agent."""
+
+    lines = ["Catalog resources matching the question (recommend from these):"]
+    for resource in resources:
+        lines.append(json.dumps({key: value for key, value in resource.items() if key != "score"}, ensure_ascii=False))
+    return "\n".join(lines)
+
+
+# Number of resources the tool and the entrypoint pass to the agent
+RESOURCE_TOP_K = int(os.getenv("ASL_RESOURCE_INDEX_TOP_K", "5"))
+
+_shared_index: Optional[ResourceIndex] = None
+_shared_tool = None
+_shared_lock = threading.Lock()
+_shared_loaded = False
+
+
+def get_resource_index() -> Optional[ResourceIndex]:
+    """
+    Returns the process-wide index from ASL_RESOURCE_INDEX_DIR, opening it on first use.
+
+    Returns:
+        The index, or None if no directory is configured, it holds no resources,
+        or it cannot be opened
+    """
+
+    global _shared_index, _shared_loaded
+
+    if not _shared_loaded:
+        with _shared_lock:
+            if not _shared_loaded:
+                directory = os.getenv("ASL_RESOURCE_INDEX_DIR")
+                if directory:
+                    if not os.path.exists(os.path.join(directory, MANIFEST)):
+                        logger.warning("Resource index %s has no %s; answering without it", directory, MANIFEST)
+                    else:
+                        try:
+                            _shared_index = ResourceIndex(directory)
+                        except (OSError, ValueError):
+                            logger.exception("Resource index %s could not be opened; answering without it", directory)
+                _shared_loaded = True
+    return _shared_index
+
+
+def get_resource_search_tool():
+    """
+    Returns the process-wide Strands tool over the shared index.
+
+    Returns:
+        The search_learning_resources tool, or None without an index
+    """
+
+    global _shared_tool
+
+    index = get_resource_index()
+    if index is None:
+        return None
+
+    if _shared_tool is None:
+        with _shared_lock:
+            if _shared_tool is None:
+                _shared_tool = create_resource_search_tool(index)
+    return _shared_tool
+
+
+def create_resource_search_tool(index: ResourceIndex):
+    """
+    Creates the search_learning_resources tool for an index.
+
+    Args:
+        index: Index to search
+
+    Returns:
+        Strands tool returning the top resources as JSON
+    """
+
+    from strands import tool
+
+    @tool
+    def search_learning_resources(query: str, level: str = "", cost: str = "", format: str = "") -> str:
+        """
+        Searches the curated catalog of ASL learning resources.
+
+        Args:
+            query: What the learner is looking for, e.g. "fingerspelling practice"
+            level: Optional "beginner", "intermediate" or "advanced"
+            cost: Optional "free", "freemium" or "paid"
+            format: Optional "course", "app", "dictionary", "video", "book", "website" or "community"
+
+        Returns:
+            JSON with the best matching resources: title, URL, description, level, cost and format
+        """
+
+        results = index.search(query, k=RESOURCE_TOP_K, level=level or None, cost=cost or None, format=format or None)
+        return json.dumps({"query": query, "resources": results}, ensure_ascii=False)
+
+    return search_learning_resources
+
+
+def main():
+    """Command-line entry point for maintaining and querying an index directory."""
+
+    parser = argparse.ArgumentParser(description="Maintain and query the ASL learning-resource index")
+    parser.add_argument("--index", type=str, required=True, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Add or replace resources from JSON/JSONL files")
+    add.add_argument("--input", action="append", required=True, help="Catalog file (repeatable)")
+
+    remove = commands.add_parser("remove", help="Remove resources by id")
+    remove.add_argument("ids", nargs="+", help="Resource ids")
+
+    commands.add_parser("compact", help="Merge all segments into one")
+    commands.add_parser("stats", help="Show the index's segments and size")
+
+    search = commands.add_parser("search", help="Search the index")
+    search.add_argument("query", type=str, help="Free-text query")
+    search.add_argument("-k", type=int, default=5, help="Number of results")
+    for field in FILTER_FIELDS:
+        search.add_argument(f"--{field}", type=str, default=None, choices=FILTER_VALUES[field])
+
+    args = parser.parse_args()
+    index = ResourceIndex(args.index)
+
+    if args.command == "add":
+        added = index.add(resource for path in args.input for resource in read_resources(path))
+        print(f"Added {added} resource(s); index version {index.version}, {len(index)} live, "
+              f"{len(index.manifest['segments'])} segment(s)")
+
+    elif args.command == "remove":
+        removed = index.remove(args.ids)
+        print(f"Removed {removed} resource(s); index version {index.version}, {len(index)} live")
+
+    elif args.command == "compact":
+        merged = index.compact()
+        print(f"Compacted into one segment with {merged} resource(s); index version {index.version}")
+
+    elif args.command == "search":
+        started = time.perf_counter()
+        results = index.search(args.query, k=args.k, level=args.level, cost=args.cost, format=args.format)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"{len(results)} result(s) in {elapsed_us:.0f} µs", file=sys.stderr)
+
+    else:
+        print(json.dumps({
+            "version": index.version,
+            "live_resources": len(index),
+            "segments": index.segments(),
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
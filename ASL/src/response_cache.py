@@ -0,0 +1,155 @@
+"""
+ASL Response Cache
+
+Bounded in-memory answer cache placed in front of the Swarm.
+
+Entries are keyed on the normalized question plus the answering configuration
+version, so a prompt or model change never serves stale answers. Memory is
+bounded by both an entry count and a total response size; the least recently
+used entry is evicted first, and every entry expires after its TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from src.metrics import metrics
+from src.text_features import normalize_question
+
+
+def make_cache_key(question: str, config_version: str) -> Tuple[str, str]:
+    """
+    Builds the cache key for a question.
+
+    Args:
+        question: Raw question text
+        config_version: Version of the answering agent configuration
+
+    Returns:
+        Tuple of (config_version, normalized question)
+    """
+
+    return (config_version, normalize_question(question))
+
+
+def _response_size(response: Any) -> int:
+    """Approximate size of a cached response in characters."""
+
+    return len(str(response))
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and a total size budget.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_total_chars: int = 8_000_000,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached answers
+            max_total_chars: Maximum combined size of cached answers
+            ttl_seconds: Default lifetime of an entry
+            clock: Monotonic time source (injectable for testing)
+        """
+
+        self.max_entries = max_entries
+        self.max_total_chars = max_total_chars
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # key -> (expires_at, size, response)
+        self._entries: "OrderedDict[Any, Tuple[float, int, Any]]" = OrderedDict()
+        self._total_chars = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key) -> Optional[Any]:
+        """
+        Returns the cached response for a key, or None on a miss or expiry.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                self._remove(key, reason="ttl")
+                entry = None
+
+            if entry is None:
+                metrics.increment("response_cache.misses")
+                return None
+
+            self._entries.move_to_end(key)
+
+        metrics.increment("response_cache.hits")
+        return entry[2]
+
+    def put(self, key, response: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Stores a response, evicting least recently used entries to stay in budget.
+
+        Responses larger than the whole size budget are not cached.
+        """
+
+        size = _response_size(response)
+        if size > self.max_total_chars:
+            return
+
+        expires_at = self._clock() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, reason=None)
+
+            self._entries[key] = (expires_at, size, response)
+            self._total_chars += size
+
+            while len(self._entries) > self.max_entries or self._total_chars > self.max_total_chars:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key, reason="lru")
+
+            metrics.set_gauge("response_cache.entries", len(self._entries))
+            metrics.set_gauge("response_cache.chars", self._total_chars)
+
+    def clear(self) -> None:
+        """Drops every entry."""
+
+        with self._lock:
+            self._entries.clear()
+            self._total_chars = 0
+            metrics.set_gauge("response_cache.entries", 0)
+            metrics.set_gauge("response_cache.chars", 0)
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss/eviction counters and current occupancy for sizing.
+        """
+
+        hits = metrics.get_counter("response_cache.hits")
+        misses = metrics.get_counter("response_cache.misses")
+
+        return {
+            "entries": len(self._entries),
+            "chars": self._total_chars,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions_lru": metrics.get_counter("response_cache.evictions", reason="lru"),
+            "evictions_ttl": metrics.get_counter("response_cache.evictions", reason="ttl"),
+        }
+
+    def _remove(self, key, reason: Optional[str]) -> None:
+        """Removes an entry; caller must hold the lock."""
+
+        _, size, _ = self._entries.pop(key)
+        self._total_chars -= size
+
+        if reason:
+            metrics.increment("response_cache.evictions", reason=reason)
@@ -0,0 +1,261 @@
+"""
+ASL Question Router
+
+Fast, in-process pre-router that runs in front of the Swarm.
+
+The router combines keyword/regex rules with a bag-of-n-grams classifier built
+from the domain lists in the coordinator's system prompt. When it is confident,
+the Swarm can start directly at the chosen specialist and skip the coordinator's
+model round trip. When it is not, the coordinator stays the entry point.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Protocol
+
+import numpy as np
+
+from src.metrics import metrics
+from src.text_features import char_ngrams, hash_features, tokenize, word_ngrams
+
+
+# Coordinator prompt section titles and the registry keys they route to
+AGENT_TITLES = {
+    "Grammar Expert Agent": "grammar_expert",
+    "Vocabulary Agent": "vocabulary_agent",
+    "Cultural Agent": "cultural_agent",
+    "Learning Resources Agent": "learning_agent",
+    "General ASL Agent": "general_asl_agent",
+}
+
+# High-precision patterns for the most common question shapes
+KEYWORD_RULES = {
+    "grammar_expert": [
+        r"\bgrammar\b",
+        r"\bsyntax\b",
+        r"\bwh-?\s?questions?\b",
+        r"\byes/no questions?\b",
+        r"\bsentence (structure|order)\b",
+        r"\btopic-comment\b",
+        r"\bnon-?manual (markers?|signals?)\b",
+        r"\bclassifiers?\b",
+        r"\bdirectional verbs?\b",
+        r"\b(form|forming|formation of) (a )?(questions?|sentences?|negation)\b",
+    ],
+    "vocabulary_agent": [
+        r"\bhow (do|would|can|should) (i|you|we) sign\b",
+        r"\b(the )?sign for\b",
+        r"\bwhat(?:'s| is) the sign\b",
+        r"\bfingerspell(ing)?\b",
+        r"\bmanual alphabet\b",
+        r"\bhandshapes?\b",
+    ],
+    "cultural_agent": [
+        r"\bdeaf (culture|community|identity|history|heritage|arts?)\b",
+        r"\betiquette\b",
+        r"\bname signs?\b",
+        r"\bculturally\b",
+        r"\bcapital d\b",
+    ],
+    # Resource words ("book", "practice", "study") also show up in vocabulary and
+    # grammar questions, so these rules only fire together with a resource intent
+    "learning_agent": [
+        r"\bwhere (can|do|should) (i|you|we) (learn|find|study|practice)\b",
+        r"\b(recommend|suggest)\w*\b.*\b(courses?|classes|tutorials?|apps?|books?|resources?|websites?)\b",
+        r"\b(what|which|any) (asl )?(courses?|classes|tutorials?|apps?|books?|resources?|websites?)\b",
+        r"\b(best|good|free|online) (asl )?(courses?|classes|tutorials?|apps?|books?|resources?|websites?)\b",
+        r"\b(courses?|classes|tutorials?|apps?|books?|resources?) (for|to) (learn|learning|study|studying|practice|practicing)\b",
+        r"\bbest way to (learn|study|practice)\b",
+        r"\b(study|practice) (plan|schedule|routine|partners?)\b",
+    ],
+    "general_asl_agent": [
+        r"\bwhat is asl\b",
+        r"\bdifference between asl and\b",
+        r"\basl (vs\.?|versus) \w+",
+        r"\bget(ting)? started\b",
+        r"\bmisconceptions?\b",
+        r"\bis asl (a|the same)\b",
+    ],
+}
+
+# Relative weight of keyword hits versus the classifier when both fire
+KEYWORD_WEIGHT = 0.6
+
+
+@dataclass
+class RoutingDecision:
+    """Result of routing a single question."""
+
+    agent_key: str
+    confidence: float
+    confident: bool
+    scores: Dict[str, float] = field(default_factory=dict)
+    method: str = "classifier"
+
+    def domains_above(self, min_score: float) -> List[str]:
+        """Agent keys scoring at least min_score, best first."""
+
+        ranked = sorted(self.scores.items(), key=lambda item: item[1], reverse=True)
+        return [agent_key for agent_key, score in ranked if score >= min_score]
+
+
+class QuestionRouter(Protocol):
+    """Interface for pluggable routers: anything with a route() method."""
+
+    def route(self, question: str) -> RoutingDecision:
+        ...
+
+
+def parse_coordinator_domains(system_prompt: str) -> Dict[str, List[str]]:
+    """
+    Extracts the per-agent domain lists from the coordinator system prompt.
+
+    The prompt lists each specialist as a numbered, bold title followed by
+    bullet points; those bullets become the router's training phrases.
+
+    Args:
+        system_prompt: The coordinator's system prompt
+
+    Returns:
+        Dictionary of agent key to list of domain phrases
+    """
+
+    domains: Dict[str, List[str]] = {}
+    sections = re.finditer(
+        r"^\d+\.\s+\*\*(?P<title>[^*]+)\*\*[^\n]*\n(?P<body>(?:[ \t]+- [^\n]*\n?)+)",
+        system_prompt,
+        re.MULTILINE,
+    )
+
+    for section in sections:
+        agent_key = AGENT_TITLES.get(section.group("title").strip())
+        if agent_key is None:
+            continue
+
+        bullets = re.findall(r"^[ \t]+- (.+)$", section.group("body"), re.MULTILINE)
+        domains[agent_key] = [bullet.strip() for bullet in bullets]
+
+    return domains
+
+
+def _question_features(text: str) -> List[str]:
+    """Word unigrams/bigrams plus character trigrams for robustness to inflection."""
+
+    return word_ngrams(tokenize(text), max_n=2) + char_ngrams(text, n=3)
+
+
+class NgramClassifier:
+    """
+    Bag-of-n-grams nearest-centroid classifier.
+
+    Every agent's domain phrases are hashed into one centroid vector. Scoring a
+    question is a single matrix-vector product over all centroids.
+    """
+
+    def __init__(self, domains: Dict[str, List[str]], dim: int = 2048, temperature: float = 12.0):
+        """
+        Args:
+            domains: Agent key to domain phrases
+            dim: Hashed feature dimension
+            temperature: Softmax sharpness applied to cosine scores
+        """
+
+        self.agent_keys = list(domains)
+        self.dim = dim
+        self.temperature = temperature
+
+        centroids = np.zeros((len(self.agent_keys), dim), dtype=np.float32)
+        for row, agent_key in enumerate(self.agent_keys):
+            for phrase in domains[agent_key]:
+                centroids[row] += hash_features(_question_features(phrase), dim)
+
+            norm = np.linalg.norm(centroids[row])
+            if norm > 0:
+                centroids[row] /= norm
+
+        self._centroids = centroids
+
+    def predict(self, question: str) -> np.ndarray:
+        """
+        Returns a probability per agent (in self.agent_keys order).
+        """
+
+        vector = hash_features(_question_features(question), self.dim)
+        logits = (self._centroids @ vector) * self.temperature
+        logits -= logits.max()
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum()
+
+
+class KeywordNgramRouter:
+    """
+    Default router: keyword/regex rules blended with the n-gram classifier.
+    """
+
+    def __init__(
+        self,
+        domains: Dict[str, List[str]],
+        confidence_threshold: float = 0.6,
+        keyword_rules: Optional[Dict[str, List[str]]] = None,
+    ):
+        """
+        Args:
+            domains: Agent key to domain phrases (see parse_coordinator_domains)
+            confidence_threshold: Minimum confidence to bypass the coordinator
+            keyword_rules: Agent key to regex patterns; defaults to KEYWORD_RULES
+        """
+
+        self.confidence_threshold = confidence_threshold
+        self.classifier = NgramClassifier(domains)
+        self._rules = {
+            agent_key: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for agent_key, patterns in (keyword_rules or KEYWORD_RULES).items()
+            if agent_key in domains
+        }
+
+    def route(self, question: str) -> RoutingDecision:
+        """
+        Routes a question to the most likely specialist.
+
+        Args:
+            question: The user's question
+
+        Returns:
+            RoutingDecision with the chosen agent key and confidence
+        """
+
+        agent_keys = self.classifier.agent_keys
+        combined = self.classifier.predict(question)
+        method = "classifier"
+
+        hits = np.array(
+            [sum(1 for rule in self._rules.get(key, []) if rule.search(question)) for key in agent_keys],
+            dtype=np.float32,
+        )
+        if hits.sum() > 0:
+            combined = KEYWORD_WEIGHT * (hits / hits.sum()) + (1 - KEYWORD_WEIGHT) * combined
+            method = "keyword+classifier"
+
+        best = int(np.argmax(combined))
+        confidence = float(combined[best])
+        decision = RoutingDecision(
+            agent_key=agent_keys[best],
+            confidence=confidence,
+            confident=confidence >= self.confidence_threshold,
+            scores={key: float(score) for key, score in zip(agent_keys, combined)},
+            method=method,
+        )
+
+        record_routing_metrics(decision)
+        return decision
+
+
+def record_routing_metrics(decision: RoutingDecision) -> None:
+    """Exports a routing decision so the confidence threshold can be tuned."""
+
+    metrics.increment(
+        "router.decisions",
+        agent=decision.agent_key,
+        outcome="direct" if decision.confident else "coordinator",
+    )
+    metrics.observe("router.confidence", decision.confidence, method=decision.method)
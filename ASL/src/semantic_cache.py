@@ -0,0 +1,572 @@
+"""
+ASL Semantic Cache
+
+Near-duplicate answer cache backed by a local vectorized similarity index.
+
+Questions are embedded locally (hashed word and character n-grams, no network
+embedding service) into NumPy arrays partitioned by specialist domain, which
+grow with the number of cached questions. A lookup is one matrix-vector product over the rows of a single domain,
+and a cached answer is served when cosine similarity passes the threshold and
+both questions have the same content words. N-gram similarity alone scores
+"learn ASL online" and "learn ASL offline" higher than many real paraphrases;
+requiring the same content words rejects such one-word changes, and the
+threshold, calibrated on a labelled set of question pairs (see `calibrate`),
+guards against the same words in another order ("translate English to ASL").
+
+Sign lookups ("how do I sign X") only match cached questions about the same
+sign. The term is resolved to its gloss in the sign lexicon, so "thanks" and
+"thank you" share THANK-YOU while "thank" and "thank you" stay apart. The index
+can be saved to disk and reloaded on startup.
+
+    python -m src.semantic_cache calibrate --pairs data/semantic_cache_pairs.jsonl
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.metrics import metrics
+from src.sign_lexicon import extract_sign_term
+from src.text_features import (
+    char_ngrams,
+    fold_plural,
+    hash_features,
+    normalize_question,
+    tokenize,
+    word_ngrams,
+)
+
+
+# Question framing that carries no meaning for matching ASL questions against each other
+STOP_WORDS = frozenset(
+    """a about all an and any are as at be being between can could do does every explain for from have how
+    i in into is it me my of please say should sign signs some tell the there to what what's whats which
+    will would you your""".split()
+)
+
+# Content words most questions imply: "fingerspelling" and "fingerspelling in ASL"
+# ask the same thing. They still count towards similarity
+IMPLIED_TERMS = frozenset({"asl"})
+
+# Cosine similarity a hit needs by default; see calibrate()
+DEFAULT_THRESHOLD = 0.9
+
+INDEX_FILE_VERSION = 4
+
+
+def _fold(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    return fold_plural(token)
+
+
+def content_terms(question: str) -> List[str]:
+    """
+    The words of a question that matter for matching, in order.
+
+    Stop words and possessives are dropped, hyphenated words split and plurals
+    folded: "Can you explain topic-comment structures?" -> ["topic", "comment", "structure"].
+
+    Args:
+        question: Raw question text
+
+    Returns:
+        Content words
+    """
+
+    normalized = normalize_question(question).replace("american sign language", "asl")
+    terms = []
+    for token in tokenize(normalized):
+        for part in token.split("-"):
+            if part.endswith("'s"):
+                part = part[:-2]
+            if part and part not in STOP_WORDS:
+                terms.append(_fold(part))
+    return terms
+
+
+def same_content(a: Iterable[str], b: Iterable[str]) -> bool:
+    """Whether two questions' content words agree, apart from implied ones like "asl"."""
+    return set(a) - IMPLIED_TERMS == set(b) - IMPLIED_TERMS
+
+
+def embed_question(question: str, dim: int) -> np.ndarray:
+    """
+    Embeds a question as an L2-normalized hashed n-gram vector.
+
+    Content words, word bigrams and character 3/4-grams of the content words
+    are hashed, so "what's topic-comment structure" and "can you explain topic
+    comment structure" land on the same vector.
+
+    Args:
+        question: Raw question text
+        dim: Embedding dimension
+
+    Returns:
+        Float32 vector of shape (dim,)
+    """
+
+    terms = content_terms(question)
+    content = " ".join(terms)
+    features = word_ngrams(terms, max_n=2) + char_ngrams(content, n=3) + char_ngrams(content, n=4)
+    return hash_features(features, dim)
+
+
+def sign_key(term: str, lexicon=None) -> str:
+    """
+    The key a sign lookup is cached under.
+
+    Args:
+        term: Term from extract_sign_term()
+        lexicon: Optional SignLexicon; a term it knows exactly maps to its gloss
+
+    Returns:
+        The gloss ("THANK-YOU") or, for terms the lexicon does not know, the term
+    """
+
+    gloss = lexicon.gloss_for(term) if lexicon is not None else None
+    return gloss or term
+
+
+def embed_lookup_key(question: str, dim: int, lexicon=None) -> Tuple[np.ndarray, int]:
+    """
+    Embeds a question together with its sign term id.
+
+    A sign lookup is answered by its sign alone, so its vector is the sign key's
+    and its term id (stable across processes) only matches the same sign; other
+    questions get term id 0.
+
+    Args:
+        question: Raw question text
+        dim: Embedding dimension
+        lexicon: Optional SignLexicon used to resolve sign terms to glosses
+
+    Returns:
+        Tuple of (vector, term id)
+    """
+
+    term = extract_sign_term(question)
+    if not term:
+        return embed_question(question, dim), 0
+    key = sign_key(term, lexicon)
+    return hash_features(char_ngrams(key.lower(), n=3), dim), zlib.crc32(key.encode("utf-8")) + 1
+
+
+def calibrate(pairs: Iterable[Dict[str, Any]], thresholds: Iterable[float], dim: int = 256) -> List[Dict[str, Any]]:
+    """
+    Measures hits and false hits of candidate thresholds on labelled question pairs.
+
+    Args:
+        pairs: Records with questions "a" and "b" and "same" (whether one answer serves both)
+        thresholds: Cosine thresholds to evaluate
+        dim: Embedding dimension
+
+    Returns:
+        Per threshold: "threshold", "hits" (pairs with the same meaning served),
+        "false_hits" (pairs with different meanings served), "paraphrases" and "near_misses"
+    """
+
+    scored = []
+    for pair in pairs:
+        a, b = pair["a"], pair["b"]
+        similarity = float(embed_question(a, dim) @ embed_question(b, dim))
+        scored.append((bool(pair["same"]), similarity, same_content(content_terms(a), content_terms(b))))
+
+    paraphrases = sum(1 for same, _, _ in scored if same)
+    return [
+        {
+            "threshold": threshold,
+            "hits": sum(1 for same, score, agree in scored if same and agree and score >= threshold),
+            "false_hits": sum(1 for same, score, agree in scored if not same and agree and score >= threshold),
+            "paraphrases": paraphrases,
+            "near_misses": len(scored) - paraphrases,
+        }
+        for threshold in thresholds
+    ]
+
+
+class SemanticCache:
+    """
+    Similarity cache with one bounded partition per domain.
+
+    Each partition's arrays start small and double as entries arrive, up to
+    `capacity_per_domain` rows; when a partition is full the least recently
+    used row is overwritten, expired rows first. Entries expire `ttl_seconds`
+    after they were added.
+    """
+
+    # Rows allocated per partition before the first growth
+    INITIAL_ROWS = 64
+    # Rows above the threshold checked for the same content words, most similar first
+    MAX_CANDIDATES = 8
+
+    def __init__(
+        self,
+        domains: List[str],
+        config_version: str,
+        capacity_per_domain: int = 20000,
+        dim: int = 256,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl_seconds: float = 3600.0,
+        max_response_chars: int = 20000,
+        lexicon=None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            domains: Specialist agent keys; each gets its own partition
+            config_version: Answering configuration version; a persisted index
+                with a different version is discarded on load
+            capacity_per_domain: Maximum cached questions per domain
+            dim: Embedding dimension
+            threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Lifetime of an entry
+            max_response_chars: Larger answers are not cached
+            lexicon: Optional SignLexicon that resolves sign lookups to glosses
+            clock: Wall-clock time source (injectable for testing)
+        """
+
+        self.domains = list(domains)
+        self.config_version = config_version
+        self.capacity_per_domain = capacity_per_domain
+        self.dim = dim
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_response_chars = max_response_chars
+        self._lexicon = lexicon
+        self._clock = clock
+
+        self._domain_index: Dict[str, int] = {domain: i for i, domain in enumerate(self.domains)}
+        rows = min(self.INITIAL_ROWS, capacity_per_domain)
+        self._vectors = [np.zeros((rows, dim), dtype=np.float32) for _ in self.domains]
+        self._term_ids = [np.zeros(rows, dtype=np.int64) for _ in self.domains]
+        self._added_at = [np.zeros(rows, dtype=np.float64) for _ in self.domains]
+        self._last_used = [np.zeros(rows, dtype=np.float64) for _ in self.domains]
+        self._counts = [0] * len(self.domains)
+        self._questions: List[List[Optional[str]]] = [[] for _ in self.domains]
+        self._responses: List[List[Optional[str]]] = [[] for _ in self.domains]
+        self._dirty = False
+        self._autosave: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(self._counts)
+
+    def _grow(self, domain_row: int, rows: int) -> None:
+        """Makes room for `rows` entries in a partition; caller holds the lock."""
+
+        allocated = len(self._vectors[domain_row])
+        if rows <= allocated:
+            return
+
+        size = min(self.capacity_per_domain, max(rows, allocated * 2))
+        for arrays in (self._vectors, self._term_ids, self._added_at, self._last_used):
+            grown = np.zeros((size,) + arrays[domain_row].shape[1:], dtype=arrays[domain_row].dtype)
+            grown[:allocated] = arrays[domain_row]
+            arrays[domain_row] = grown
+
+    def _scores(self, domain_row: int, vector: np.ndarray, term_id: int) -> np.ndarray:
+        """Similarity to every row; -1 for expired rows and other sign terms. Caller holds the lock."""
+
+        count = self._counts[domain_row]
+        scores = self._vectors[domain_row][:count] @ vector
+        scores[self._term_ids[domain_row][:count] != term_id] = -1.0
+        scores[self._added_at[domain_row][:count] < self._clock() - self.ttl_seconds] = -1.0
+        return scores
+
+    def _best_match(self, domain_row: int, vector: np.ndarray, term_id: int) -> Tuple[int, float]:
+        """Returns (row, score) of the most similar live entry with the same sign term; caller holds the lock."""
+
+        if self._counts[domain_row] == 0:
+            return -1, 0.0
+
+        scores = self._scores(domain_row, vector, term_id)
+        best = int(np.argmax(scores))
+        if scores[best] < 0:
+            return -1, 0.0
+        return best, float(scores[best])
+
+    def _match(self, domain_row: int, question: str, vector: np.ndarray, term_id: int) -> Tuple[int, float]:
+        """
+        Returns (row, score) of the most similar entry that passes the threshold and,
+        outside sign lookups, has the same content words; caller holds the lock.
+        """
+
+        if self._counts[domain_row] == 0:
+            return -1, 0.0
+
+        scores = self._scores(domain_row, vector, term_id)
+        candidates = np.flatnonzero(scores >= self.threshold)
+        if len(candidates) == 0:
+            return -1, 0.0
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")][: self.MAX_CANDIDATES]
+        if term_id != 0:
+            # Same sign, so the same answer however the question is worded
+            return int(candidates[0]), float(scores[candidates[0]])
+
+        terms = content_terms(question)
+        for row in candidates:
+            if same_content(terms, content_terms(self._questions[domain_row][row])):
+                return int(row), float(scores[row])
+        metrics.increment("semantic_cache.content_mismatches")
+        return -1, 0.0
+
+    def lookup(self, question: str, domain: str) -> Optional[Tuple[str, float]]:
+        """
+        Finds a cached answer to a near-duplicate question in the same domain.
+
+        Args:
+            question: Raw question text
+            domain: Specialist agent key the question was routed to
+
+        Returns:
+            Tuple of (cached response, similarity), or None on a miss
+        """
+
+        domain_row = self._domain_index.get(domain)
+        if domain_row is None:
+            return None
+
+        vector, term_id = embed_lookup_key(question, self.dim, self._lexicon)
+        if not vector.any():
+            return None
+
+        with self._lock:
+            row, score = self._match(domain_row, question, vector, term_id)
+            if row < 0:
+                metrics.increment("semantic_cache.misses", domain=domain)
+                return None
+
+            self._last_used[domain_row][row] = self._clock()
+            response = self._responses[domain_row][row]
+
+        metrics.increment("semantic_cache.hits", domain=domain)
+        metrics.observe("semantic_cache.hit_similarity", score)
+        return response, score
+
+    def add(self, question: str, domain: str, response: str) -> None:
+        """
+        Adds an answer to the index, replacing a near-identical entry if present.
+
+        Args:
+            question: Raw question text
+            domain: Specialist agent key that answered
+            response: Answer text
+        """
+
+        domain_row = self._domain_index.get(domain)
+        if domain_row is None or len(response) > self.max_response_chars:
+            return
+
+        vector, term_id = embed_lookup_key(question, self.dim, self._lexicon)
+        if not vector.any():
+            return
+
+        now = self._clock()
+        with self._lock:
+            row, score = self._best_match(domain_row, vector, term_id)
+            count = self._counts[domain_row]
+
+            if row >= 0 and score >= 0.999:
+                pass  # Same question again - refresh the existing row
+            elif count < self.capacity_per_domain:
+                self._grow(domain_row, count + 1)
+                row = count
+                self._counts[domain_row] = count + 1
+                self._questions[domain_row].append(None)
+                self._responses[domain_row].append(None)
+            else:
+                # Expired rows go first, then the least recently used
+                last_used = self._last_used[domain_row][:count].copy()
+                last_used[self._added_at[domain_row][:count] < now - self.ttl_seconds] = -1.0
+                row = int(np.argmin(last_used))
+                metrics.increment("semantic_cache.evictions", domain=domain)
+
+            self._vectors[domain_row][row] = vector
+            self._term_ids[domain_row][row] = term_id
+            self._added_at[domain_row][row] = now
+            self._last_used[domain_row][row] = now
+            self._questions[domain_row][row] = question
+            self._responses[domain_row][row] = response
+            self._dirty = True
+
+        metrics.set_gauge("semantic_cache.entries", len(self))
+
+    def reset(self, config_version: str) -> None:
+        """
+        Drops every entry and keys the index on a new answering configuration.
+
+        Args:
+            config_version: Configuration version now answering requests
+        """
+
+        with self._lock:
+            self.config_version = config_version
+            self._counts = [0] * len(self.domains)
+            self._questions = [[] for _ in self.domains]
+            self._responses = [[] for _ in self.domains]
+            self._dirty = True
+
+        metrics.set_gauge("semantic_cache.entries", 0)
+
+    def save(self, path: str) -> None:
+        """
+        Persists the live entries as `<path>.npz` (vectors) and `<path>.json` (texts).
+
+        Both files are replaced atomically.
+
+        Args:
+            path: Path prefix for the two files
+        """
+
+        with self._lock:
+            live = [
+                np.flatnonzero(self._added_at[i][: self._counts[i]] >= self._clock() - self.ttl_seconds)
+                for i in range(len(self.domains))
+            ]
+            vectors = {f"domain_{i}": self._vectors[i][rows].copy() for i, rows in enumerate(live)}
+            texts = {
+                domain: {
+                    "questions": [self._questions[i][row] for row in live[i]],
+                    "responses": [self._responses[i][row] for row in live[i]],
+                    "added_at": self._added_at[i][live[i]].tolist(),
+                }
+                for i, domain in enumerate(self.domains)
+            }
+            self._dirty = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(f"{path}.npz.tmp", "wb") as f:
+            np.savez(f, **vectors)
+        os.replace(f"{path}.npz.tmp", f"{path}.npz")
+
+        metadata = {
+            "version": INDEX_FILE_VERSION,
+            "config_version": self.config_version,
+            "dim": self.dim,
+            "domains": self.domains,
+            "entries": texts,
+        }
+        tmp_path = f"{path}.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, f"{path}.json")
+
+    def start_autosave(self, path: str, interval_seconds: float = 60.0) -> None:
+        """
+        Saves the index every `interval_seconds` in a daemon thread while it has
+        unsaved entries, so a killed container loses at most one interval of entries.
+
+        Args:
+            path: Path prefix passed to save()
+            interval_seconds: Time between saves
+        """
+
+        if self._autosave is not None:
+            return
+
+        def save_forever():
+            while True:
+                time.sleep(interval_seconds)
+                if self._dirty:
+                    try:
+                        self.save(path)
+                    except OSError:
+                        # Retried at the next interval
+                        self._dirty = True
+
+        self._autosave = threading.Thread(target=save_forever, name="asl-semantic-cache-autosave", daemon=True)
+        self._autosave.start()
+
+    def load(self, path: str) -> int:
+        """
+        Reloads a persisted index into this cache.
+
+        Files written for another configuration version, dimension or file
+        format are ignored so stale answers are never served, and so are
+        entries that have expired since they were saved.
+
+        Args:
+            path: Path prefix used with save()
+
+        Returns:
+            Number of entries loaded
+        """
+
+        if not (os.path.exists(f"{path}.json") and os.path.exists(f"{path}.npz")):
+            return 0
+
+        with open(f"{path}.json", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        if (
+            metadata.get("version") != INDEX_FILE_VERSION
+            or metadata.get("config_version") != self.config_version
+            or metadata.get("dim") != self.dim
+        ):
+            return 0
+
+        loaded = 0
+        cutoff = self._clock() - self.ttl_seconds
+        with np.load(f"{path}.npz") as arrays, self._lock:
+            for saved_row, domain in enumerate(metadata["domains"]):
+                domain_row = self._domain_index.get(domain)
+                if domain_row is None:
+                    continue
+
+                entries = metadata["entries"][domain]
+                added_at = np.asarray(entries["added_at"], dtype=np.float64)
+                rows = np.flatnonzero(added_at >= cutoff)[-self.capacity_per_domain :]
+                count = len(rows)
+
+                self._grow(domain_row, count)
+                self._vectors[domain_row][:count] = arrays[f"domain_{saved_row}"][rows]
+                self._term_ids[domain_row][:count] = [
+                    embed_lookup_key(entries["questions"][row], self.dim, self._lexicon)[1] for row in rows
+                ]
+                self._added_at[domain_row][:count] = added_at[rows]
+                self._last_used[domain_row][:count] = added_at[rows]
+                self._questions[domain_row] = [entries["questions"][row] for row in rows]
+                self._responses[domain_row] = [entries["responses"][row] for row in rows]
+                self._counts[domain_row] = count
+                loaded += count
+
+        metrics.set_gauge("semantic_cache.entries", len(self))
+        return loaded
+
+
+def main():
+    """Command-line entry point for calibrating the similarity threshold."""
+
+    parser = argparse.ArgumentParser(description="ASL semantic cache tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    calibration = commands.add_parser("calibrate", help="Hits and false hits per threshold on labelled question pairs")
+    calibration.add_argument("--pairs", type=str, required=True, help="JSONL of {\"a\", \"b\", \"same\"} records")
+    calibration.add_argument("--dim", type=int, default=256, help="Embedding dimension")
+
+    args = parser.parse_args()
+
+    with open(args.pairs, "r", encoding="utf-8") as f:
+        pairs = [json.loads(line) for line in f if line.strip()]
+
+    thresholds = [round(0.5 + 0.05 * i, 2) for i in range(10)]
+    results = calibrate(pairs, thresholds, dim=args.dim)
+    for result in results:
+        print(f"threshold {result['threshold']:.2f}: {result['hits']}/{result['paraphrases']} paraphrases served, "
+              f"{result['false_hits']}/{result['near_misses']} near misses served")
+
+    safe = [result for result in results if result["false_hits"] == 0]
+    if safe:
+        best = max(safe, key=lambda result: (result["hits"], result["threshold"]))
+        print(f"Highest-recall threshold without false hits: {best['threshold']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+ASL Session Store
+
+Bounded per-session conversation memory keyed by session_id.
+
+Each session holds its recent turns plus a running summary of older ones. When a
+session goes over its token budget, the oldest turns are folded into the summary
+(and the summary itself is trimmed); a single turn that is still too long is cut
+short, so the prompt sent to the Swarm stays flat
+however long a learner keeps chatting. Idle sessions are evicted by LRU and TTL.
+
+Two backends are provided: in-memory and a local on-disk directory of JSON files.
+The store's methods are coroutines: disk reads and writes run in a worker thread
+under a per-session lock, so the event loop never waits on the file system, and
+idle sessions are swept by a background thread (start_sweeper) rather than on
+the request path.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from src.text_features import estimate_tokens
+
+
+# A turn is stored compactly as (role, text, estimated_tokens)
+Turn = Tuple[str, str, int]
+
+
+def summarize_turn(role: str, text: str, max_chars: int = 160) -> str:
+    """
+    Extractive one-line summary of a turn: its first sentence, truncated.
+    """
+
+    first_sentence = re.split(r"(?<=[.!?])\s", text.strip(), maxsplit=1)[0]
+    if len(first_sentence) > max_chars:
+        first_sentence = first_sentence[: max_chars - 3].rstrip() + "..."
+
+    speaker = "Learner" if role == "user" else "Assistant"
+    return f"{speaker}: {first_sentence}"
+
+
+class SessionState:
+    """Conversation memory for one session."""
+
+    __slots__ = ("summary", "turns", "last_active")
+
+    def __init__(self, summary: str = "", turns: Optional[List[Turn]] = None, last_active: float = 0.0):
+        self.summary = summary
+        self.turns: List[Turn] = list(turns or [])
+        self.last_active = last_active
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(turn[2] for turn in self.turns)
+
+    def to_dict(self) -> dict:
+        return {"summary": self.summary, "turns": self.turns, "last_active": self.last_active}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SessionState":
+        return cls(
+            summary=data.get("summary", ""),
+            turns=[tuple(turn) for turn in data.get("turns", [])],
+            last_active=data.get("last_active", 0.0),
+        )
+
+
+class InMemorySessionBackend:
+    """
+    Process-local backend with LRU eviction over at most `max_sessions` sessions.
+    """
+
+    # Operations are in-memory, so the store calls them on the event loop
+    blocking = False
+
+    def __init__(self, max_sessions: int = 10000):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        # The sweeper thread evicts while requests load and save
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is not None:
+                self._sessions.move_to_end(session_id)
+            return state
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        with self._lock:
+            self._sessions[session_id] = state
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_idle(self, cutoff: float) -> int:
+        with self._lock:
+            idle = [sid for sid, state in self._sessions.items() if state.last_active < cutoff]
+            for session_id in idle:
+                del self._sessions[session_id]
+        return len(idle)
+
+
+class DiskSessionBackend:
+    """
+    Local on-disk backend storing one JSON file per session.
+
+    Files are written atomically; the oldest files beyond `max_sessions` are removed
+    during idle eviction.
+    """
+
+    # File I/O; the store runs these operations in a worker thread
+    blocking = True
+
+    def __init__(self, directory: str, max_sessions: int = 100000):
+        self.directory = directory
+        self.max_sessions = max_sessions
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        # Hashed, so distinct IDs never share a file whatever characters they contain
+        file_id = hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{file_id}.json")
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        try:
+            with open(self._path(session_id), encoding="utf-8") as f:
+                return SessionState.from_dict(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, session_id: str, state: SessionState) -> None:
+        path = self._path(session_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def evict_idle(self, cutoff: float) -> int:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except FileNotFoundError:
+                    # Deleted by a request since listdir
+                    continue
+
+        entries.sort()
+        excess = max(0, len(entries) - self.max_sessions)
+        removed = 0
+        for index, (modified, path) in enumerate(entries):
+            if modified < cutoff or index < excess:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+        return removed
+
+
+class SessionStore:
+    """
+    Token-budgeted conversation memory on top of a backend.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        token_budget: int = 1500,
+        summary_budget: int = 300,
+        idle_ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            backend: InMemorySessionBackend (default) or DiskSessionBackend
+            token_budget: Maximum estimated tokens of history per session
+            summary_budget: Maximum estimated tokens of the rolling summary
+            idle_ttl_seconds: Sessions idle longer than this are evicted
+            clock: Wall-clock time source (injectable for testing)
+        """
+
+        self.backend = backend or InMemorySessionBackend()
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._clock = clock
+        # Striped per-session locks: turns appended to one session never interleave,
+        # while different sessions read and write in parallel
+        self._locks = [threading.Lock() for _ in range(64)]
+        self._sweeper: Optional[threading.Thread] = None
+
+    def _lock_for(self, session_id: str) -> threading.Lock:
+        return self._locks[hash(session_id) % len(self._locks)]
+
+    async def _call(self, fn, *args):
+        """Runs a backend operation, in a worker thread if the backend blocks."""
+
+        if getattr(self.backend, "blocking", False):
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _load_live(self, session_id: str) -> Optional[SessionState]:
+        """Loads a session unless it has expired; caller holds the session's lock."""
+
+        state = self.backend.load(session_id)
+        if state is not None and state.last_active < self._clock() - self.idle_ttl_seconds:
+            self.backend.delete(session_id)
+            return None
+        return state
+
+    def _load_locked(self, session_id: str) -> Optional[SessionState]:
+        with self._lock_for(session_id):
+            return self._load_live(session_id)
+
+    async def has_history(self, session_id: str) -> bool:
+        """True if the session has earlier turns that a new turn may depend on."""
+
+        state = await self._call(self._load_locked, session_id)
+        return state is not None and bool(state.turns or state.summary)
+
+    async def build_prompt(self, session_id: str, message: str) -> str:
+        """
+        Prefixes a new message with the session's bounded history.
+
+        Args:
+            session_id: Session ID
+            message: The new user message
+
+        Returns:
+            Prompt for the Swarm; just the message when there is no history
+        """
+
+        state = await self._call(self._load_locked, session_id)
+
+        if state is None or not (state.turns or state.summary):
+            return message
+
+        parts = ["Conversation so far:"]
+        if state.summary:
+            parts.append(f"(Earlier) {state.summary}")
+        parts.extend(
+            f"{'Learner' if role == 'user' else 'Assistant'}: {text}" for role, text, _ in state.turns
+        )
+        parts.append("")
+        parts.append(f"Current question: {message}")
+        return "\n".join(parts)
+
+    async def append_turns(self, session_id: str, turns: List[Tuple[str, str]]) -> None:
+        """
+        Appends (role, text) turns and compacts the session back under budget.
+        """
+
+        await self._call(self._append_locked, session_id, turns)
+
+    def _append_locked(self, session_id: str, turns: List[Tuple[str, str]]) -> None:
+        with self._lock_for(session_id):
+            state = self._load_live(session_id) or SessionState()
+            for role, text in turns:
+                state.turns.append((role, text, estimate_tokens(text)))
+            state.last_active = self._clock()
+
+            self._compact(state)
+            self.backend.save(session_id, state)
+
+    def sweep(self) -> int:
+        """
+        Evicts sessions idle longer than the TTL.
+
+        Returns:
+            Number of sessions removed
+        """
+
+        return self.backend.evict_idle(self._clock() - self.idle_ttl_seconds)
+
+    def start_sweeper(self, interval_seconds: Optional[float] = None) -> None:
+        """
+        Sweeps idle sessions periodically in a daemon thread; later calls are no-ops.
+
+        Args:
+            interval_seconds: Time between sweeps; defaults to a tenth of the idle TTL
+        """
+
+        if self._sweeper is not None:
+            return
+
+        interval = interval_seconds or self.idle_ttl_seconds / 10
+
+        def sweep_forever():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception:
+                    # A failed sweep is retried at the next interval
+                    pass
+
+        self._sweeper = threading.Thread(target=sweep_forever, name="asl-session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _compact(self, state: SessionState) -> None:
+        """
+        Folds the oldest turns into the summary until the session fits its budget.
+
+        The most recent turn is kept verbatim unless it alone is still over budget,
+        in which case its tail is cut. The summary is trimmed from the front, so the
+        oldest context is the first to go.
+        """
+
+        while state.tokens > self.token_budget and len(state.turns) > 1:
+            role, text, _ = state.turns.pop(0)
+            line = summarize_turn(role, text)
+            state.summary = f"{state.summary} {line}".strip() if state.summary else line
+
+        max_summary_chars = self.summary_budget * 4
+        if len(state.summary) > max_summary_chars:
+            state.summary = "..." + state.summary[-(max_summary_chars - 3):]
+
+        if state.tokens > self.token_budget and state.turns:
+            role, text, _ = state.turns[-1]
+            # estimate_tokens() is len // 4 + 1, so this many characters fit what is left
+            max_chars = max(3, (self.token_budget - estimate_tokens(state.summary) - 1) * 4)
+            text = text[: max_chars - 3].rstrip() + "..."
+            state.turns[-1] = (role, text, estimate_tokens(text))
@@ -0,0 +1,602 @@
+"""
+ASL Sign Lexicon
+
+Local, memory-mapped sign dictionary for the Vocabulary Agent.
+
+Each entry describes one sign: gloss, English words, handshape, location,
+movement, palm orientation, non-manual markers and regional variants. The
+entries live in a single binary file that is memory-mapped read-only, so opening
+it is instant and concurrent readers share the OS page cache:
+
+- a sorted key table over normalized glosses and English words: exact and
+  prefix lookups are a binary search (the flattened equivalent of a trie)
+- a delete-neighbourhood index (SymSpell) over the first characters of every
+  key, behind an open-addressing hash table: typos within MAX_EDIT_DISTANCE
+  are found with a few probes instead of a scan
+
+Build the file from CSV or JSON with the CLI; a rebuild writes a new file and
+swaps it in atomically, so running processes keep reading the old one:
+
+    python -m src.sign_lexicon build --input data/sign_lexicon_sample.csv --output data/sign_lexicon.bin
+    python -m src.sign_lexicon build --base data/sign_lexicon.bin --input new_signs.json --output data/sign_lexicon.bin
+    python -m src.sign_lexicon lookup --lexicon data/sign_lexicon.bin "thank you"
+
+CSV columns are the entry fields; list fields are separated by ";" and each
+variant is written "Region: description".
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.metrics import metrics
+from src.mmap_sections import SectionFile, hash_lookup, hash_slots, posting_table, string_table, write_sections
+from src.text_features import normalize_question
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b"ASLLEX01"
+FORMAT_VERSION = 1
+
+# Fuzzy matching: edit distance and how many leading characters get delete variants
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+ENTRY_FIELDS = (
+    "gloss",
+    "english",
+    "handshape",
+    "location",
+    "movement",
+    "orientation",
+    "non_manuals",
+    "variants",
+    "notes",
+)
+LIST_FIELDS = ("english", "variants")
+
+# Section order in the file; each is located through the header's offset table
+_SECTIONS = (
+    "meta",
+    "entry_offsets",
+    "entries",
+    "key_offsets",
+    "keys",
+    "posting_offsets",
+    "postings",
+    "delete_offsets",
+    "deletes",
+    "delete_slots",
+    "delete_posting_offsets",
+    "delete_postings",
+)
+
+
+def normalize_key(text: str) -> str:
+    """Normalizes a gloss or English word for lookups ("THANK-YOU" -> "thank-you")."""
+    return normalize_question(text)
+
+
+def entry_keys(entry: Dict[str, Any]) -> List[str]:
+    """Lookup keys of an entry: its gloss (also with spaces for hyphens) and English words."""
+
+    keys = []
+    gloss = normalize_key(entry.get("gloss", ""))
+    if gloss:
+        keys.append(gloss)
+        keys.append(gloss.replace("-", " "))
+    keys.extend(normalize_key(word) for word in entry.get("english", []))
+    return sorted({key for key in keys if key})
+
+
+def _deletes(text: str, max_distance: int) -> set:
+    """All strings reachable from text by deleting up to max_distance characters."""
+
+    variants = {text}
+    frontier = {text}
+    for _ in range(max_distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+
+    Returns limit + 1 as soon as the distance is known to exceed limit.
+    """
+
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def normalize_entry(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validates a raw CSV/JSON record and converts it to the stored entry shape.
+
+    Args:
+        raw: Record with at least "gloss"; list fields may be lists or ";"-separated strings
+
+    Returns:
+        Entry with every field of ENTRY_FIELDS that has a value
+    """
+
+    gloss = str(raw.get("gloss") or "").strip()
+    if not gloss:
+        raise ValueError(f"Sign entry without a gloss: {raw}")
+
+    entry: Dict[str, Any] = {"gloss": gloss.upper()}
+
+    english = raw.get("english") or []
+    if isinstance(english, str):
+        english = english.split(";")
+    entry["english"] = [word.strip() for word in english if word and word.strip()]
+
+    variants = raw.get("variants") or []
+    if isinstance(variants, str):
+        variants = [part for part in variants.split(";") if part.strip()]
+    parsed_variants = []
+    for variant in variants:
+        if isinstance(variant, str):
+            region, _, description = variant.partition(":")
+            variant = {"region": region.strip(), "description": description.strip()}
+        parsed_variants.append({"region": variant.get("region", ""), "description": variant.get("description", "")})
+    entry["variants"] = parsed_variants
+
+    for field in ENTRY_FIELDS:
+        if field not in LIST_FIELDS and field != "gloss":
+            value = raw.get(field)
+            if value not in (None, ""):
+                entry[field] = str(value).strip()
+
+    return {field: entry[field] for field in ENTRY_FIELDS if entry.get(field) not in (None, [], "")}
+
+
+def read_entries(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Reads raw sign records from CSV, JSON (a list) or JSONL.
+
+    Args:
+        path: Source file
+
+    Yields:
+        Normalized entries
+    """
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield normalize_entry(row)
+        elif path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield normalize_entry(json.loads(line))
+        else:
+            data = json.load(f)
+            for record in data.get("entries", data) if isinstance(data, dict) else data:
+                yield normalize_entry(record)
+
+
+def build_lexicon(entries: Iterable[Dict[str, Any]], output_path: str) -> Dict[str, int]:
+    """
+    Writes a lexicon file, replacing output_path atomically.
+
+    Entries with the same gloss are merged: later ones replace earlier ones.
+
+    Args:
+        entries: Normalized entries (see normalize_entry)
+        output_path: Destination file
+
+    Returns:
+        Counts of entries, keys and fuzzy-index variants written
+    """
+
+    by_gloss: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        by_gloss[entry["gloss"]] = entry
+    ordered = [by_gloss[gloss] for gloss in sorted(by_gloss)]
+
+    key_entries: Dict[str, set] = {}
+    for entry_id, entry in enumerate(ordered):
+        for key in entry_keys(entry):
+            key_entries.setdefault(key, set()).add(entry_id)
+    keys = sorted(key_entries, key=lambda key: key.encode("utf-8"))
+
+    delete_keys: Dict[str, set] = {}
+    for key_id, key in enumerate(keys):
+        for variant in _deletes(key[:PREFIX_LENGTH], MAX_EDIT_DISTANCE):
+            delete_keys.setdefault(variant, set()).add(key_id)
+    deletes = sorted(delete_keys, key=lambda text: text.encode("utf-8"))
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "entries": len(ordered),
+        "keys": len(keys),
+        "max_edit_distance": MAX_EDIT_DISTANCE,
+        "prefix_length": PREFIX_LENGTH,
+    }
+
+    entry_offsets, entry_blob = string_table(json.dumps(e, ensure_ascii=False, separators=(",", ":")) for e in ordered)
+    key_offsets, key_blob = string_table(keys)
+    posting_offsets, postings = posting_table(sorted(key_entries[key]) for key in keys)
+    delete_offsets, delete_blob = string_table(deletes)
+    delete_posting_offsets, delete_postings = posting_table(sorted(delete_keys[text]) for text in deletes)
+
+    sections = {
+        "meta": json.dumps(meta).encode("utf-8"),
+        "entry_offsets": entry_offsets,
+        "entries": entry_blob,
+        "key_offsets": key_offsets,
+        "keys": key_blob,
+        "posting_offsets": posting_offsets,
+        "postings": postings,
+        "delete_offsets": delete_offsets,
+        "deletes": delete_blob,
+        "delete_slots": hash_slots(deletes),
+        "delete_posting_offsets": delete_posting_offsets,
+        "delete_postings": delete_postings,
+    }
+
+    write_sections(output_path, MAGIC, FORMAT_VERSION, _SECTIONS, sections)
+
+    return {"entries": len(ordered), "keys": len(keys), "fuzzy_variants": len(deletes)}
+
+
+class SignLexicon:
+    """
+    Read-only view of a lexicon file.
+
+    Lookups return plain entry dictionaries annotated with how they matched.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Lexicon file written by build_lexicon
+        """
+
+        self.path = path
+        self._file = SectionFile(path, MAGIC, FORMAT_VERSION, _SECTIONS)
+        self.meta = json.loads(bytes(self._file.sections["meta"]))
+        self._entry_offsets = self._file.array("entry_offsets", "Q")
+        self._entry_blob = self._file.sections["entries"]
+        self._keys = self._file.strings("key_offsets", "keys")
+        self._postings = self._file.postings("posting_offsets", "postings")
+        self._deletes = self._file.strings("delete_offsets", "deletes")
+        self._delete_slots = self._file.array("delete_slots", "I")
+        self._delete_postings = self._file.postings("delete_posting_offsets", "delete_postings")
+
+    def close(self) -> None:
+        """Releases the memory map."""
+        self._file.close()
+
+    def __enter__(self) -> "SignLexicon":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entry_offsets) - 1
+
+    def entry(self, entry_id: int) -> Dict[str, Any]:
+        """Decodes one entry."""
+
+        start, end = self._entry_offsets[entry_id], self._entry_offsets[entry_id + 1]
+        return json.loads(bytes(self._entry_blob[start:end]))
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """All entries in gloss order, e.g. for merging into a rebuild."""
+
+        for entry_id in range(len(self)):
+            yield self.entry(entry_id)
+
+    def _entries_for_key(self, key_id: int) -> List[int]:
+        return list(self._postings[key_id])
+
+    def _find_key(self, key: bytes) -> Optional[int]:
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return None
+
+    def _prefix_keys(self, prefix: bytes, limit: int) -> List[int]:
+        key_ids = []
+        index = bisect.bisect_left(self._keys, prefix)
+        while index < len(self._keys) and len(key_ids) < limit and self._keys[index].startswith(prefix):
+            key_ids.append(index)
+            index += 1
+        return key_ids
+
+    def _fuzzy_keys(self, key: str, max_distance: int) -> List[tuple]:
+        """(distance, key_id) pairs within max_distance of key, closest first."""
+
+        candidates = set()
+        for variant in _deletes(key[:self.meta["prefix_length"]], max_distance):
+            index = hash_lookup(self._delete_slots, self._deletes, variant.encode("utf-8"))
+            if index is not None:
+                candidates.update(self._delete_postings[index])
+
+        matches = []
+        for key_id in candidates:
+            distance = edit_distance(key, self._keys[key_id].decode("utf-8"), max_distance)
+            if distance <= max_distance:
+                matches.append((distance, key_id))
+        return sorted(matches)
+
+    def gloss_for(self, term: str) -> Optional[str]:
+        """
+        Returns the gloss of the sign an English word/phrase or gloss names exactly.
+
+        "thanks", "thank you" and "THANK-YOU" all give "THANK-YOU"; a term shared
+        by several signs gives the first in gloss order.
+
+        Args:
+            term: Word, phrase or gloss
+
+        Returns:
+            The gloss, or None without an exact key match
+        """
+
+        key = normalize_key(term)
+        key_id = self._find_key(key.encode("utf-8")) if key else None
+        if key_id is None:
+            return None
+        entry_ids = self._entries_for_key(key_id)
+        return self.entry(min(entry_ids))["gloss"] if entry_ids else None
+
+    def search(self, term: str, limit: int = 5, max_distance: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Finds the signs for an English word/phrase or a gloss.
+
+        Exact key matches win; otherwise prefix matches ("thank" -> "thank you")
+        come first, followed by fuzzy matches ordered by edit distance.
+
+        Args:
+            term: Word, phrase or gloss, e.g. "thank you" or "THANK-YOU"
+            limit: Maximum number of entries returned
+            max_distance: Fuzzy edit distance; defaults to the file's maximum
+                (1 for terms shorter than 5 characters)
+
+        Returns:
+            Entries with "match" ("exact", "prefix" or "fuzzy") and "matched_key"
+        """
+
+        started = time.perf_counter()
+        key = normalize_key(term)
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        kind = "miss"
+
+        def add(key_id: int, match: str, distance: int = 0) -> None:
+            for entry_id in self._entries_for_key(key_id):
+                if entry_id not in seen and len(results) < limit:
+                    seen.add(entry_id)
+                    results.append({
+                        **self.entry(entry_id),
+                        "match": match,
+                        "matched_key": self._keys[key_id].decode("utf-8"),
+                        **({"distance": distance} if match == "fuzzy" else {}),
+                    })
+
+        if key:
+            exact = self._find_key(key.encode("utf-8"))
+            if exact is not None:
+                add(exact, "exact")
+                kind = "exact"
+            else:
+                for key_id in self._prefix_keys(key.encode("utf-8"), limit):
+                    add(key_id, "prefix")
+                if max_distance is None:
+                    max_distance = min(self.meta["max_edit_distance"], 1 if len(key) < 5 else 2)
+                for distance, key_id in self._fuzzy_keys(key, min(max_distance, self.meta["max_edit_distance"])):
+                    add(key_id, "fuzzy", distance)
+                if results:
+                    kind = results[0]["match"]
+
+        metrics.observe("sign_lexicon.lookup_us", (time.perf_counter() - started) * 1e6)
+        metrics.increment("sign_lexicon.lookups", result=kind)
+        return results
+
+
+# "How do I sign X", "what's the sign for X", "sign for X", "how to sign X"
+_SIGN_QUESTION_PATTERNS = [
+    re.compile(r"\bhow (?:do|would|can|should) (?:i|you|we|one) sign\s+(?P<term>.+)"),
+    re.compile(r"\bhow to sign\s+(?P<term>.+)"),
+    re.compile(r"\b(?:what(?:'s| is)? )?the sign for\s+(?P<term>.+)"),
+    re.compile(r"\bsign for\s+(?P<term>.+)"),
+]
+# Any run of trailing filler, e.g. "book in asl please"
+_TRAILING_WORDS = re.compile(r"(?:\s+(?:in asl|in american sign language|please))+$")
+_QUOTES = "'\"`"
+
+
+def extract_sign_term(question: str) -> Optional[str]:
+    """
+    Pulls the word or phrase out of a "how do I sign X" question.
+
+    Args:
+        question: The user's question
+
+    Returns:
+        The term to look up, or None if the question is not a sign lookup
+    """
+
+    normalized = normalize_question(question)
+    for pattern in _SIGN_QUESTION_PATTERNS:
+        match = pattern.search(normalized)
+        if match:
+            term = _TRAILING_WORDS.sub("", match.group("term")).strip().strip(_QUOTES).strip()
+            return term or None
+    return None
+
+
+def format_lexicon_context(term: str, hits: List[Dict[str, Any]]) -> str:
+    """Formats lexicon hits as a prompt block the Vocabulary Agent writes its answer around."""
+
+    lines = [f'Sign dictionary entries for "{term}" (base the formation details on these):']
+    for hit in hits:
+        fields = {key: value for key, value in hit.items() if key not in ("match", "matched_key", "distance")}
+        lines.append(json.dumps(fields, ensure_ascii=False))
+    return "\n".join(lines)
+
+
+_shared_lexicon: Optional[SignLexicon] = None
+_shared_tool = None
+_shared_lock = threading.Lock()
+_shared_loaded = False
+
+
+def get_sign_lexicon() -> Optional[SignLexicon]:
+    """
+    Returns the process-wide lexicon from ASL_SIGN_LEXICON_PATH, opening it on first use.
+
+    Returns:
+        The lexicon, or None if no path is configured or the file cannot be opened
+    """
+
+    global _shared_lexicon, _shared_loaded
+
+    if not _shared_loaded:
+        with _shared_lock:
+            if not _shared_loaded:
+                path = os.getenv("ASL_SIGN_LEXICON_PATH")
+                if path:
+                    try:
+                        _shared_lexicon = SignLexicon(path)
+                    except (OSError, ValueError):
+                        logger.exception("Sign lexicon %s could not be opened; answering without it", path)
+                _shared_loaded = True
+    return _shared_lexicon
+
+
+def get_sign_lookup_tool():
+    """
+    Returns the process-wide Strands tool over the shared lexicon.
+
+    Returns:
+        The lookup_sign tool, or None without a lexicon
+    """
+
+    global _shared_tool
+
+    lexicon = get_sign_lexicon()
+    if lexicon is None:
+        return None
+
+    if _shared_tool is None:
+        with _shared_lock:
+            if _shared_tool is None:
+                _shared_tool = create_sign_lookup_tool(lexicon)
+    return _shared_tool
+
+
+def create_sign_lookup_tool(lexicon: SignLexicon):
+    """
+    Creates the lookup_sign tool for a lexicon.
+
+    Args:
+        lexicon: Lexicon to search
+
+    Returns:
+        Strands tool returning the matching entries as JSON
+    """
+
+    from strands import tool
+
+    @tool
+    def lookup_sign(term: str) -> str:
+        """
+        Looks up how to form an ASL sign in the local sign dictionary.
+
+        Args:
+            term: English word or phrase, or an ASL gloss, e.g. "thank you" or "THANK-YOU"
+
+        Returns:
+            JSON with the matching entries: handshape, location, movement,
+            orientation, non-manual markers and regional variants
+        """
+
+        return json.dumps({"term": term, "hits": lexicon.search(term, limit=3)}, ensure_ascii=False)
+
+    return lookup_sign
+
+
+def main():
+    """Command-line entry point for building and querying lexicon files."""
+
+    parser = argparse.ArgumentParser(description="Build and query the ASL sign lexicon")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build a lexicon file from CSV/JSON/JSONL sources")
+    build.add_argument("--input", action="append", default=[], help="Source file (repeatable)")
+    build.add_argument("--base", type=str, default=None, help="Existing lexicon to merge the sources into")
+    build.add_argument("--output", type=str, required=True, help="Lexicon file to write")
+
+    lookup = commands.add_parser("lookup", help="Search a lexicon file")
+    lookup.add_argument("--lexicon", type=str, required=True, help="Lexicon file")
+    lookup.add_argument("--limit", type=int, default=5, help="Maximum results")
+    lookup.add_argument("term", type=str, help="Word, phrase or gloss")
+
+    stats = commands.add_parser("stats", help="Show a lexicon file's build information")
+    stats.add_argument("--lexicon", type=str, required=True, help="Lexicon file")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not args.input and not args.base:
+            parser.error("build needs at least one --input or a --base")
+
+        def all_entries() -> Iterator[Dict[str, Any]]:
+            if args.base:
+                with SignLexicon(args.base) as base:
+                    yield from base.entries()
+            for path in args.input:
+                yield from read_entries(path)
+
+        started = time.perf_counter()
+        counts = build_lexicon(all_entries(), args.output)
+        print(f"Wrote {args.output}: {counts['entries']} entries, {counts['keys']} keys, "
+              f"{counts['fuzzy_variants']} fuzzy variants in {time.perf_counter() - started:.2f}s")
+
+    elif args.command == "lookup":
+        with SignLexicon(args.lexicon) as lexicon:
+            started = time.perf_counter()
+            hits = lexicon.search(args.term, limit=args.limit)
+            elapsed_us = (time.perf_counter() - started) * 1e6
+            print(json.dumps(hits, indent=2, ensure_ascii=False))
+            print(f"{len(hits)} hit(s) in {elapsed_us:.0f} µs", file=sys.stderr)
+
+    else:
+        with SignLexicon(args.lexicon) as lexicon:
+            print(json.dumps({**lexicon.meta, "path": args.lexicon, "bytes": os.path.getsize(args.lexicon)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+ASL Single-Flight
+
+Coalesces identical in-flight requests onto one execution.
+
+The first request for a key (the leader) starts the execution as a background
+task; requests for the same key that arrive while it runs (followers) attach to
+it instead of starting their own. Every subscriber, the leader included, reads
+the execution's frames from a shared buffer: late joiners first replay what was
+already produced, then follow the live stream.
+
+Executions belong to their subscribers, not to the leader. A subscriber that
+disconnects only unsubscribes; the execution is cancelled when its last
+subscriber is gone, so a leader's disconnect never cuts off its followers.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional
+
+from src.metrics import metrics
+
+
+class _Flight:
+    """One shared execution: its task, the frames produced so far and its subscribers."""
+
+    def __init__(self):
+        self.frames: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.peak_subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, frame: Any) -> None:
+        self.frames.append(frame)
+        self._notify()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self) -> None:
+        await self._changed.wait()
+
+
+class Subscription:
+    """A request's view of a shared execution."""
+
+    def __init__(self, coalescer: "SingleFlight", key: Hashable, flight: _Flight, leader: bool):
+        self._coalescer = coalescer
+        self._key = key
+        self._flight = flight
+        self._closed = False
+        self.leader = leader
+
+    async def frames(self) -> AsyncIterator[Any]:
+        """
+        Yields every frame of the execution, from the first one.
+
+        Raises:
+            Exception: Whatever the execution raised, after its frames
+        """
+
+        flight = self._flight
+        index = 0
+        try:
+            while True:
+                while index < len(flight.frames):
+                    yield flight.frames[index]
+                    index += 1
+                if flight.done:
+                    break
+                await flight.wait()
+            if flight.error is not None:
+                raise flight.error
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Leaves the execution; safe to call more than once.
+
+        Call it when the request ends early (e.g. the client disconnected), since
+        an abandoned frames() iterator is only closed when it is garbage collected.
+        """
+
+        if not self._closed:
+            self._closed = True
+            self._coalescer._unsubscribe(self._key, self._flight)
+
+
+class SingleFlight:
+    """
+    Registry of shared executions by key.
+
+    Keys must capture everything that changes an execution's output, e.g. the
+    normalized question, the configuration version and the request options.
+    """
+
+    def __init__(self, name: str = "coalescing"):
+        """
+        Args:
+            name: Metric name prefix
+        """
+
+        self._name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of executions currently running."""
+        return len(self._flights)
+
+    def join(self, key: Hashable, execute: Callable[[], AsyncIterator[Any]]) -> Subscription:
+        """
+        Subscribes to the execution for a key, starting it if none is running.
+
+        Args:
+            key: Identity of the execution
+            execute: Creates the execution's frame iterator; only called for the leader
+
+        Returns:
+            Subscription whose `leader` tells whether this call started the execution
+        """
+
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.ensure_future(self._run(key, flight, execute))
+            metrics.set_gauge(f"{self._name}.in_flight", len(self._flights))
+
+        flight.subscribers += 1
+        flight.peak_subscribers = max(flight.peak_subscribers, flight.subscribers)
+        metrics.increment(f"{self._name}.requests", role="leader" if leader else "follower")
+        return Subscription(self, key, flight, leader)
+
+    async def _run(self, key: Hashable, flight: _Flight, execute: Callable[[], AsyncIterator[Any]]) -> None:
+        error: Optional[BaseException] = None
+        try:
+            async for frame in execute():
+                flight.publish(frame)
+        except (asyncio.CancelledError, Exception) as e:
+            error = e
+        finally:
+            # Requests arriving from now on start a new execution
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            metrics.set_gauge(f"{self._name}.in_flight", len(self._flights))
+            metrics.observe(f"{self._name}.subscribers_per_execution", flight.peak_subscribers)
+            flight.close(error)
+
+    def _unsubscribe(self, key: Hashable, flight: _Flight) -> None:
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and not flight.done and flight.task is not None:
+            # Nobody is listening any more - stop the execution and release its resources
+            metrics.increment(f"{self._name}.abandoned")
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+                metrics.set_gauge(f"{self._name}.in_flight", len(self._flights))
+            flight.task.cancel()
@@ -0,0 +1,331 @@
+"""
+ASL Speculative Routing
+
+Hides the coordinator's routing latency on questions the local router is unsure about.
+
+While the coordinator decides where a question goes, the specialist the router
+rated most likely starts answering beside it. If the coordinator hands off to
+that specialist, the Swarm stops at the handoff and the answer already under
+way is streamed instead. If it picks another agent or answers itself, the
+speculative run is cancelled and the Swarm carries on as usual.
+
+Cancelled speculations are extra model spend: their cost is charged to a
+SpeculationBudget shared by the process, and speculation pauses while the
+budget is exhausted.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.metrics import metrics
+from src.model_tiers import TIER_PRICES, RequestTiers
+from src.streaming import StreamTimer, SwarmStream, event_frame, text_frame, usage_from_result
+from src.text_features import estimate_tokens
+
+
+class SpeculationBudget:
+    """
+    Caps the model spend wasted on cancelled speculations.
+
+    A USD balance refills continuously at `usd_per_hour`, holding at most one
+    hour's worth; every cancelled speculation withdraws what it cost. New
+    speculations only start while the balance is positive.
+    """
+
+    def __init__(self, usd_per_hour: float):
+        """
+        Args:
+            usd_per_hour: Wasted spend allowed per hour; 0 disables speculation
+        """
+
+        self.usd_per_hour = usd_per_hour
+        self._balance = usd_per_hour
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._balance = min(self.usd_per_hour, self._balance + (now - self._updated) * self.usd_per_hour / 3600)
+        self._updated = now
+
+    @property
+    def balance(self) -> float:
+        """Remaining wasted spend allowed, in USD; negative after an overdraw."""
+
+        with self._lock:
+            self._refill()
+            return self._balance
+
+    def try_start(self) -> bool:
+        """Whether a new speculation may start."""
+
+        if self.balance > 0:
+            return True
+        metrics.increment("speculation.skipped", reason="budget")
+        return False
+
+    def charge(self, cost_usd: float) -> None:
+        """Withdraws the cost of a cancelled speculation."""
+
+        with self._lock:
+            self._refill()
+            self._balance -= cost_usd
+            balance = self._balance
+        metrics.increment("speculation.wasted_cost_usd", cost_usd)
+        metrics.set_gauge("speculation.budget_usd", balance)
+
+
+class SpeculativeRun:
+    """
+    Runs a coordinator-led Swarm with the predicted specialist started beside it.
+
+    Exposes the same attributes as SwarmStream (text, status, node_path,
+    node_results, stopped_early, summary_frame) so the entrypoint can treat
+    every execution mode alike.
+    """
+
+    def __init__(
+        self,
+        swarm,
+        specialist_key: str,
+        specialist,
+        task: str,
+        timer: StreamTimer,
+        coordinator_name: str,
+        tiers: RequestTiers,
+        speculation_tiers: RequestTiers,
+        budget: SpeculationBudget,
+        include_events: bool = False,
+        trace=None,
+        **run_kwargs,
+    ):
+        """
+        Args:
+            swarm: Per-request Swarm whose entry point is the coordinator
+            specialist_key: Agent key of the predicted specialist
+            specialist: A fresh agent for it, separate from the Swarm's, built on
+                speculation_tiers' model
+            task: Prompt for the coordinator and the specialist
+            timer: Request timer used for time-to-first-token
+            coordinator_name: Name of the coordinator node
+            tiers: The request's tier state; the speculative calls are added to it
+            speculation_tiers: RequestTiers.fork() of tiers that records only the speculative calls
+            budget: Budget charged with the cost of a cancelled speculation
+            include_events: Whether to emit handoff and speculation events
+            trace: Optional RequestTrace that gets a span for the speculative run
+            **run_kwargs: Extra keyword arguments for the Swarm run (e.g. session_id)
+        """
+
+        self._specialist_key = specialist_key
+        self._specialist = specialist
+        self._task = task
+        self._timer = timer
+        self._coordinator_name = coordinator_name
+        self._tiers = tiers
+        self._speculation_tiers = speculation_tiers
+        self._budget = budget
+        self._include_events = include_events
+        self._trace = trace
+        self._swarm_run = SwarmStream(
+            swarm,
+            task,
+            timer=timer,
+            coordinator_name=coordinator_name,
+            include_events=include_events,
+            trace=trace,
+            on_handoff=self._on_handoff,
+            **run_kwargs,
+        )
+
+        self._speculation: Optional[asyncio.Task] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._started = 0.0
+        self._span = None
+        self._error: Optional[BaseException] = None
+        self._produced: List[str] = []
+        self._chunks: List[str] = []
+
+        # "hit", "miss" (coordinator chose another agent), "no_handoff" or "failed"
+        self.outcome: Optional[str] = None
+        self.result: Any = None
+        self.stopped_early = False
+        self.wasted_cost_usd = 0.0
+
+    @property
+    def hit(self) -> bool:
+        return self.outcome == "hit"
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks) if self.hit else self._swarm_run.text
+
+    @property
+    def node_path(self) -> List[str]:
+        path = list(self._swarm_run.node_path)
+        if self.hit:
+            path.append(self._specialist.name)
+        return path
+
+    @property
+    def handoffs(self) -> int:
+        return max(0, len(self.node_path) - 1)
+
+    @property
+    def node_results(self) -> Dict[str, Any]:
+        results = self._swarm_run.node_results
+        if self.hit and self.result is not None:
+            results[self._specialist.name] = self.result
+        return results
+
+    @property
+    def status(self) -> str:
+        if not self.hit:
+            return self._swarm_run.status
+        if self.stopped_early:
+            return "budget_exhausted"
+        return "completed" if self.result is not None else "unknown"
+
+    async def _speculate(self) -> None:
+        """Runs the specialist, queueing its text until the coordinator has decided."""
+
+        try:
+            async for event in self._specialist.stream_async(self._task):
+                data = event.get("data")
+                if isinstance(data, str) and data:
+                    self._produced.append(data)
+                    self._queue.put_nowait(data)
+                elif "result" in event:
+                    self.result = event["result"]
+        except Exception as e:
+            self._error = e
+        self._queue.put_nowait(None)
+
+    def _on_handoff(self, sources: List[str], targets: List[str]) -> bool:
+        """Compares the coordinator's first handoff with the prediction; True takes over the answer."""
+
+        if self.outcome is not None or self._coordinator_name not in sources:
+            return False
+
+        if self._specialist.name not in targets:
+            self.outcome = "miss"
+        elif self._error is not None:
+            # The speculative run already failed - let the Swarm's specialist answer
+            self.outcome = "failed"
+        else:
+            self.outcome = "hit"
+            metrics.observe("speculation.head_start_ms", (time.perf_counter() - self._started) * 1000)
+            return True
+
+        self._speculation.cancel()
+        return False
+
+    async def _speculative_frames(self, deadline: Optional[float]):
+        """Replays the speculative text produced so far, then follows it live."""
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                data = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                self.stopped_early = True
+                return
+            if data is None:
+                break
+            self._timer.mark_token()
+            self._chunks.append(data)
+            yield text_frame(data)
+
+        if self._error is not None:
+            raise self._error
+
+    async def frames(self, deadline: Optional[float] = None):
+        """
+        Yields text and event frames from whichever run answers.
+
+        Args:
+            deadline: Optional time.monotonic() value after which the run stops
+                early with whatever answer it has
+        """
+
+        self._queue = asyncio.Queue()
+        self._started = time.perf_counter()
+        if self._trace is not None:
+            self._span = self._trace.start_agent(self._specialist.name)
+            self._span.attributes["speculative"] = True
+        self._speculation = asyncio.ensure_future(self._speculate())
+
+        try:
+            async for frame in self._swarm_run.frames(deadline):
+                yield frame
+
+            if self.outcome is None:
+                self.outcome = "no_handoff"
+            if self._include_events:
+                yield event_frame("speculation", agent=self._specialist.name, outcome=self.outcome)
+            if self.hit:
+                async for frame in self._speculative_frames(deadline):
+                    yield frame
+        finally:
+            await self._finish()
+
+    async def _finish(self) -> None:
+        """Stops the speculative run if it is still going and settles its cost."""
+
+        if not self._speculation.done():
+            self._speculation.cancel()
+        try:
+            await self._speculation
+        except asyncio.CancelledError:
+            pass
+
+        if self.outcome is None:
+            # The request itself was cancelled or timed out before the coordinator decided
+            self.outcome = "no_handoff"
+
+        if self._span is not None:
+            self._trace.end_agent(self._span, self.result, status="ok" if self.hit else "cancelled")
+            self._trace.set_attributes(speculation=self.outcome)
+
+        if not self.hit:
+            cost = self._speculation_tiers.summary()["cost_usd"]
+            if self.result is None:
+                # The call in progress when the run was cancelled never reported its usage
+                tier = self._speculation_tiers.tier_for(self._specialist_key)
+                system_prompt = (
+                    getattr(self._specialist, "system_prompt", None) or getattr(self._specialist, "instructions", None) or ""
+                )
+                cost += TIER_PRICES[tier].cost(
+                    estimate_tokens(system_prompt) + estimate_tokens(self._task),
+                    estimate_tokens("".join(self._produced)),
+                )
+            self.wasted_cost_usd = cost
+            self._budget.charge(cost)
+
+        self._tiers.merge(self._speculation_tiers)
+        metrics.increment("speculation.outcomes", outcome=self.outcome, agent=self._specialist_key)
+
+    def summary_frame(self, **fields) -> dict:
+        """
+        Final frame of the run that answered, plus how the speculation went.
+        """
+
+        speculation = {
+            "agent": self._specialist.name,
+            "outcome": self.outcome,
+            "wasted_cost_usd": round(self.wasted_cost_usd, 6),
+        }
+        if not self.hit:
+            return self._swarm_run.summary_frame(speculation=speculation, **fields)
+
+        return {
+            "type": "summary",
+            "status": self.status,
+            "agents": self.node_path,
+            "handoffs": self.handoffs,
+            "usage": usage_from_result(self.result),
+            "timing": self._timer.timing(),
+            "speculation": speculation,
+            **fields,
+        }
@@ -0,0 +1,413 @@
+"""
+ASL Response Streaming
+
+Turns Swarm stream events into the frames the AgentCore entrypoint yields.
+
+Every frame is a small JSON-serializable dict with a "type":
+
+- "text":    {"type": "text", "data": "<token text>"}
+- "event":   {"type": "event", "event": "routed" | "handoff" | "budget_exhausted", ...}
+- "summary": {"type": "summary", "usage": {...}, "timing": {...}, ...}
+- "error":   {"type": "error", "error": "<message>", "retryable": bool}
+             Shed requests add "code": "overloaded", "reason" and "retry_after" (seconds);
+             requests whose models' circuits are open add "code": "model_unavailable" and "retry_after"
+
+Only the answering specialist's text is forwarded; the coordinator's routing
+output is not part of the answer. Text is forwarded token by token as it arrives,
+except in a model message that opens with a handoff tool call: that message's
+text is held back and dropped when the handoff goes through. Agents that cannot
+hand off (the fast path's single-agent Swarm, agents without the handoff tool)
+never hold anything back.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.metrics import metrics
+
+
+# Name of the tool the Strands Swarm gives each agent for handoffs
+HANDOFF_TOOL_NAME = "handoff_to_agent"
+
+
+def text_frame(data: str) -> dict:
+    """Frame carrying a piece of answer text."""
+    return {"type": "text", "data": data}
+
+
+def event_frame(event: str, **fields) -> dict:
+    """Frame carrying a lightweight progress event."""
+    return {"type": "event", "event": event, **fields}
+
+
+def error_frame(message: str, **fields) -> dict:
+    """Frame carrying an error message."""
+    return {"type": "error", "error": message, **fields}
+
+
+def is_handoff_start(chunk: Any) -> bool:
+    """Whether a raw model chunk opens a handoff tool call."""
+
+    start = ((chunk or {}).get("contentBlockStart") or {}).get("start") or {}
+    return (start.get("toolUse") or {}).get("name") == HANDOFF_TOOL_NAME
+
+
+def is_handoff_message(message: Any) -> bool:
+    """Whether a model message calls the Swarm's handoff tool."""
+
+    content = (message or {}).get("content") or []
+    return any(
+        (block.get("toolUse") or {}).get("name") == HANDOFF_TOOL_NAME for block in content if isinstance(block, dict)
+    )
+
+
+class StreamTimer:
+    """
+    Tracks start, first-token and end times for one request.
+
+    Time-to-first-token is exported as soon as the first text frame is produced.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+
+    def mark_token(self) -> None:
+        """Records the first token; later calls are no-ops."""
+
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            metrics.observe("stream.time_to_first_token_ms", self.ttft_ms)
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        if self.first_token_at is None:
+            return None
+        return (self.first_token_at - self.started_at) * 1000
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def timing(self) -> dict:
+        """Timing section of the summary frame; also exports the total latency."""
+
+        elapsed_ms = self.elapsed_ms
+        metrics.observe("stream.total_latency_ms", elapsed_ms)
+        return {"time_to_first_token_ms": self.ttft_ms, "total_ms": elapsed_ms}
+
+
+def usage_from_result(result: Any) -> Dict[str, int]:
+    """
+    Reads token usage from a Swarm or agent result.
+
+    Returns:
+        Dictionary with input_tokens, output_tokens and total_tokens
+    """
+
+    usage = getattr(result, "accumulated_usage", None)
+    if usage is None:
+        usage = getattr(getattr(result, "metrics", None), "accumulated_usage", None)
+    usage = usage or {}
+
+    input_tokens = int(usage.get("inputTokens", 0))
+    output_tokens = int(usage.get("outputTokens", 0))
+
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": int(usage.get("totalTokens", input_tokens + output_tokens)),
+    }
+
+
+async def stream_until(events, deadline: Optional[float]):
+    """
+    Re-yields an async event stream until a monotonic deadline passes.
+
+    The source stream is always closed, so model streams are released even when
+    the deadline cuts the run short.
+
+    Args:
+        events: Async iterable of events
+        deadline: time.monotonic() value, or None for no deadline
+
+    Raises:
+        asyncio.TimeoutError: If the deadline passes before the stream ends
+    """
+
+    iterator = events.__aiter__()
+    try:
+        while True:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                raise asyncio.TimeoutError()
+
+            try:
+                event = await asyncio.wait_for(iterator.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class SwarmStream:
+    """
+    Runs a Swarm in streaming mode and converts its events into frames.
+
+    After iteration finishes, `result`, `text`, `node_path` and `status` describe
+    the run. If the deadline passes first, the stream stops early and keeps the
+    best partial answer produced so far.
+    """
+
+    def __init__(
+        self,
+        swarm,
+        task: str,
+        timer: StreamTimer,
+        coordinator_name: str,
+        include_events: bool = False,
+        trace=None,
+        on_handoff: Optional[Callable[[List[str], List[str]], bool]] = None,
+        **run_kwargs,
+    ):
+        """
+        Args:
+            swarm: Per-request Swarm
+            task: The user's question
+            timer: Request timer used for time-to-first-token
+            coordinator_name: Name of the coordinator node, whose text is not forwarded
+            include_events: Whether to emit handoff events
+            trace: Optional RequestTrace that gets one span per agent turn
+            on_handoff: Called with the source and target node ids of each handoff;
+                returning True stops the run there and leaves the answer to the caller
+            **run_kwargs: Extra keyword arguments for the Swarm run (e.g. session_id)
+        """
+
+        self._swarm = swarm
+        self._task = task
+        self._timer = timer
+        self._coordinator_name = coordinator_name
+        self._include_events = include_events
+        self._run_kwargs = run_kwargs
+        self._trace = trace
+        self._on_handoff = on_handoff
+        self._agent_span = None
+
+        self.result: Any = None
+        self.node_path: List[str] = []
+        self.stopped_early = False
+        self.handed_over = False
+        self._chunks: List[str] = []
+        # Per node, whether its current model message streams ("live") or is held
+        # back because it opened with a handoff call ("held"); unset until its first content
+        self._message_mode: Dict[str, str] = {}
+        # Text of held-back messages, forwarded only if the message does not hand off
+        self._pending: Dict[str, List[str]] = {}
+        self._can_hand_off: Dict[str, bool] = {}
+
+    @property
+    def text(self) -> str:
+        """The full answer text forwarded so far."""
+        return "".join(self._chunks)
+
+    @property
+    def handoffs(self) -> int:
+        """Number of handoffs between agents in this run."""
+        return max(0, len(self.node_path) - 1)
+
+    @property
+    def status(self) -> str:
+        """'completed', 'failed', 'budget_exhausted' or 'unknown'."""
+
+        if self.stopped_early:
+            return "budget_exhausted"
+
+        status = getattr(self.result, "status", None)
+        return str(status).split(".")[-1].lower() if status is not None else "unknown"
+
+    def _best_partial_text(self) -> str:
+        """Text of the last specialist that finished, for runs that streamed nothing."""
+
+        results = getattr(self.result, "results", None) or {}
+        for node_id in reversed(self.node_path):
+            if node_id != self._coordinator_name and node_id in results:
+                return str(getattr(results[node_id], "result", results[node_id]))
+        return ""
+
+    @property
+    def node_results(self) -> Dict[str, Any]:
+        """Per-node results of the finished run, keyed by agent name."""
+        return dict(getattr(self.result, "results", None) or {})
+
+    def _node_can_hand_off(self, node_id: str) -> bool:
+        """Whether a node has the handoff tool and another node to hand off to."""
+
+        if node_id not in self._can_hand_off:
+            nodes = getattr(self._swarm, "nodes", None)
+            if nodes is None:
+                can_hand_off = True
+            elif len(nodes) < 2:
+                can_hand_off = False
+            else:
+                executor = getattr(nodes.get(node_id), "executor", None)
+                registry = getattr(getattr(executor, "tool_registry", None), "registry", None)
+                can_hand_off = registry is None or HANDOFF_TOOL_NAME in registry
+            self._can_hand_off[node_id] = can_hand_off
+        return self._can_hand_off[node_id]
+
+    def _forward(self, data: str) -> dict:
+        self._timer.mark_token()
+        self._chunks.append(data)
+        return text_frame(data)
+
+    def _commit(self, node_id: str):
+        """Forwards a node's held-back text; yields at most one text frame."""
+
+        self._message_mode.pop(node_id, None)
+        pending = self._pending.pop(node_id, None)
+        if pending:
+            yield self._forward("".join(pending))
+
+    def _discard(self, node_id: str) -> None:
+        """Drops a node's held-back text because the node handed off."""
+
+        self._message_mode.pop(node_id, None)
+        if self._pending.pop(node_id, None):
+            metrics.increment("stream.handoff_text_dropped")
+
+    def _start_agent_span(self, node_id: str) -> None:
+        """Closes the previous agent's span and opens one for the next agent."""
+
+        if self._agent_span is not None:
+            self._trace.end_agent(self._agent_span)
+        source = self.node_path[-1] if self.node_path else None
+        self._agent_span = self._trace.start_agent(node_id, handoff_source=source)
+
+    async def _events(self, deadline: Optional[float]):
+        """Swarm events, stopping when the monotonic deadline passes."""
+
+        try:
+            async for event in stream_until(self._swarm.stream_async(self._task, **self._run_kwargs), deadline):
+                yield event
+        except asyncio.TimeoutError:
+            self.stopped_early = True
+
+    async def frames(self, deadline: Optional[float] = None):
+        """
+        Yields text and event frames as the Swarm produces them.
+
+        Args:
+            deadline: Optional time.monotonic() value after which the run stops
+                early with whatever answer it has
+        """
+
+        events = self._events(deadline)
+        try:
+            async for event in events:
+                event_type = event.get("type")
+
+                if event_type == "multiagent_node_start":
+                    if self._trace is not None:
+                        self._start_agent_span(event.get("node_id"))
+                    self.node_path.append(event.get("node_id"))
+
+                elif event_type == "multiagent_handoff":
+                    for node_id in event.get("from_node_ids", []):
+                        self._discard(node_id)
+                    if self._trace is not None:
+                        self._trace.handoff(
+                            ", ".join(event.get("from_node_ids", [])),
+                            ", ".join(event.get("to_node_ids", [])),
+                            span=self._agent_span,
+                        )
+                    if self._include_events:
+                        yield event_frame(
+                            "handoff",
+                            source=", ".join(event.get("from_node_ids", [])),
+                            target=", ".join(event.get("to_node_ids", [])),
+                        )
+                    if self._on_handoff is not None and self._on_handoff(
+                        list(event.get("from_node_ids", [])), list(event.get("to_node_ids", []))
+                    ):
+                        self.handed_over = True
+                        break
+
+                elif event_type == "multiagent_node_stream":
+                    node_id = event.get("node_id")
+                    if node_id == self._coordinator_name:
+                        continue
+
+                    agent_event = event.get("event") or {}
+                    data = agent_event.get("data")
+                    message = agent_event.get("message")
+                    chunk = agent_event.get("event")
+                    if isinstance(chunk, dict):
+                        # Raw model chunk: the message's first content block decides its mode
+                        if "messageStart" in chunk:
+                            self._message_mode.pop(node_id, None)
+                        elif node_id not in self._message_mode and is_handoff_start(chunk):
+                            self._message_mode[node_id] = "held" if self._node_can_hand_off(node_id) else "live"
+                    elif isinstance(data, str) and data:
+                        mode = self._message_mode.setdefault(node_id, "live")
+                        if mode == "live" or not self._node_can_hand_off(node_id):
+                            yield self._forward(data)
+                        else:
+                            self._pending.setdefault(node_id, []).append(data)
+                    elif isinstance(message, dict) and message.get("role") == "assistant":
+                        if is_handoff_message(message):
+                            self._discard(node_id)
+                        else:
+                            for frame in self._commit(node_id):
+                                yield frame
+
+                elif event_type == "multiagent_node_stop":
+                    for frame in self._commit(event.get("node_id")):
+                        yield frame
+
+                elif event_type == "multiagent_result":
+                    self.result = event.get("result")
+        finally:
+            # Also reached when the caller takes over at a handoff; stop the Swarm there
+            await events.aclose()
+
+        # Text still held back belongs to nodes that did not hand off, e.g. the
+        # agent the deadline interrupted; it is the best partial answer there is
+        for node_id in list(self._pending):
+            for frame in self._commit(node_id):
+                yield frame
+
+        if self._trace is not None:
+            if self._agent_span is not None:
+                self._trace.end_agent(self._agent_span, status="cancelled" if self.stopped_early else "ok")
+            self._trace.attach_results(self.node_results)
+
+        if not self._chunks:
+            partial = self._best_partial_text()
+            if partial:
+                yield self._forward(partial)
+
+        if self.stopped_early:
+            metrics.increment("swarm.stopped_early")
+            if self._include_events:
+                yield event_frame("budget_exhausted", agents=self.node_path)
+
+        metrics.observe("swarm.handoffs_per_request", self.handoffs)
+
+    def summary_frame(self, **fields) -> dict:
+        """
+        Final frame with usage, timing and the agents that took part.
+        """
+
+        return {
+            "type": "summary",
+            "status": self.status,
+            "agents": self.node_path,
+            "handoffs": self.handoffs,
+            "usage": usage_from_result(self.result),
+            "timing": self._timer.timing(),
+            **fields,
+        }
@@ -7,11 +7,25 @@ Useful for development and debugging.
 Usage:
     python test_agent_local.py
     python test_agent_local.py --question "How do I sign thank you?"
+    python test_agent_local.py --mock    # offline, no AWS credentials needed
 """
 
 import argparse
 import asyncio
-from asl_swarm_agent import create_asl_swarm_configuration
+import os
+
+
+# Example test questions (also the seed of the benchmark corpus in src/benchmark.py)
+EXAMPLE_QUESTIONS = [
+    "How do I sign 'thank you' in ASL?",
+    "What are Wh-questions in ASL?",
+    "Tell me about Deaf culture",
+    "Where can I learn ASL online?",
+    "What is the difference between ASL and English?",
+    "How do you form yes/no questions in ASL?",
+    "What are non-manual markers?",
+    "What is a name sign?",
+]
 
 
 async def test_agent_locally(question: str):
@@ -22,6 +36,9 @@ async def test_agent_locally(question: str):
         question: The question to ask the agent
     """
 
+    # Imported here so --mock can select the model backend first
+    from asl_swarm_agent import create_asl_swarm_configuration
+
     print("=" * 80)
     print("ASL Swarm Agent - Local Testing")
     print("=" * 80)
@@ -76,27 +93,24 @@ def main():
         help="Question to ask the agent",
     )
 
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="Use the offline mock model backend instead of Bedrock",
+    )
+
     args = parser.parse_args()
 
+    if args.mock:
+        os.environ["ASL_MODEL_BACKEND"] = "mock"
+
     # Run the async test
     asyncio.run(test_agent_locally(args.question))
 
 
 if __name__ == "__main__":
-    # Example test questions
-    example_questions = [
-        "How do I sign 'thank you' in ASL?",
-        "What are Wh-questions in ASL?",
-        "Tell me about Deaf culture",
-        "Where can I learn ASL online?",
-        "What is the difference between ASL and English?",
-        "How do you form yes/no questions in ASL?",
-        "What are non-manual markers?",
-        "What is a name sign?",
-    ]
-
     print("\nExample questions you can test:")
-    for i, q in enumerate(example_questions, 1):
+    for i, q in enumerate(EXAMPLE_QUESTIONS, 1):
         print(f"{i}. {q}")
 
     print("\n")
@@ -0,0 +1,123 @@
+"""
+ASL Text Features
+
+Local text featurization shared by the router and caches.
+
+Features are word n-grams and character n-grams hashed into a fixed-size NumPy
+vector. Hashing uses CRC32 rather than Python's hash() so vectors are stable
+across processes and can be persisted.
+"""
+
+import re
+import unicodedata
+import zlib
+from typing import Iterable, List
+
+import numpy as np
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+
+# Typographic quotes and dashes mapped to their ASCII forms
+_QUOTE_TRANSLATION = str.maketrans(
+    {
+        "\u2018": "'",
+        "\u2019": "'",
+        "\u201b": "'",
+        "\u2032": "'",
+        "\u0060": "'",
+        "\u00b4": "'",
+        "\u201c": '"',
+        "\u201d": '"',
+        "\u201f": '"',
+        "\u2033": '"',
+        "\u2010": "-",
+        "\u2011": "-",
+        "\u2013": "-",
+        "\u2014": "-",
+    }
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase word tokens.
+
+    Hyphenated and apostrophe forms ("wh-questions", "don't") stay as one token.
+    """
+
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for budgeting."""
+
+    return len(text) // 4 + 1
+
+
+def normalize_question(text: str) -> str:
+    """
+    Normalizes a question for exact-match lookups.
+
+    Folds Unicode compatibility forms, quote styles and dashes, lowercases, and
+    drops punctuation and extra whitespace, so "How do I sign “thank you”?"
+    and "how do i sign 'thank you'" normalize to the same string.
+
+    Args:
+        text: Raw question text
+
+    Returns:
+        Normalized question
+    """
+
+    folded = unicodedata.normalize("NFKC", text).translate(_QUOTE_TRANSLATION)
+    return " ".join(tokenize(folded))
+
+
+def fold_plural(token: str) -> str:
+    """Folds a regular English plural onto its singular ("apps" -> "app", "classes" -> "class")."""
+
+    if token.endswith(("sses", "ches", "shes", "xes")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def word_ngrams(tokens: List[str], max_n: int = 2) -> List[str]:
+    """Returns all word n-grams of the tokens from length 1 up to max_n."""
+
+    grams = list(tokens)
+    for n in range(2, max_n + 1):
+        grams.extend(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def char_ngrams(text: str, n: int = 3) -> List[str]:
+    """Returns character n-grams of the space-joined tokens, padded at both ends."""
+
+    padded = f" {' '.join(tokenize(text))} "
+    return [padded[i : i + n] for i in range(len(padded) - n + 1)]
+
+
+def hash_features(features: Iterable[str], dim: int) -> np.ndarray:
+    """
+    Hashes string features into an L2-normalized float32 vector.
+
+    Args:
+        features: Feature strings (n-grams)
+        dim: Vector dimension
+
+    Returns:
+        Vector of shape (dim,); all zeros if there were no features
+    """
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in features:
+        vector[zlib.crc32(feature.encode("utf-8")) % dim] += 1.0
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+
+    return vector
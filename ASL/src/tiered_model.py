@@ -0,0 +1,101 @@
+"""
+ASL Tiered Model
+
+Per-request, per-agent model that runs each call on the tier chosen by
+RequestTiers (src/model_tiers.py) at call time, so a request that escalates
+mid-Swarm moves its remaining calls to the large tier. Every call's usage and
+latency is attributed to the tier that served it - the fallback model's tier
+when the circuit breakers moved the call (src/fallback_model.py) - and no call
+outlives the request's deadline (src/deadlines.py).
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from strands.models import Model
+
+from src.deadlines import current_deadline
+from src.fallback_model import SERVED_TIER_KEY
+from src.metrics import metrics
+from src.model_provider import get_model
+from src.model_tiers import RequestTiers
+from src.streaming import HANDOFF_TOOL_NAME, stream_until
+
+
+class TieredModel(Model):
+    """
+    Delegates to the shared model of the agent's current tier.
+    """
+
+    def __init__(self, tiers: RequestTiers, agent_key: str, escalate_on_handoff: bool = True):
+        """
+        Args:
+            tiers: The request's tier state
+            agent_key: Agent this model belongs to
+            escalate_on_handoff: Whether a handoff made on the fast tier escalates the request
+        """
+
+        self.tiers = tiers
+        self.agent_key = agent_key
+        self.escalate_on_handoff = escalate_on_handoff
+
+    @property
+    def current(self) -> Model:
+        """The shared model the next call will use."""
+        return get_model(self.tiers.tier_for(self.agent_key))
+
+    def update_config(self, **model_config) -> None:
+        self.current.update_config(**model_config)
+
+    def get_config(self):
+        return self.current.get_config()
+
+    def __getattr__(self, name):
+        if name in ("tiers", "agent_key", "escalate_on_handoff"):
+            raise AttributeError(name)
+        return getattr(self.current, name)
+
+    async def stream(self, messages, tool_specs=None, system_prompt: Optional[str] = None, **kwargs):
+        """
+        Streams from the current tier's model and records the call against the tier that served it.
+
+        Raises:
+            asyncio.TimeoutError: If the request's deadline passes first; the model stream is closed
+        """
+
+        tier = self.tiers.tier_for(self.agent_key)
+        served_tier = tier
+        started = time.perf_counter()
+        first_event_ms = None
+        usage = None
+        handed_off = False
+
+        events = stream_until(get_model(tier).stream(messages, tool_specs, system_prompt, **kwargs), current_deadline())
+        try:
+            async for event in events:
+                if first_event_ms is None:
+                    first_event_ms = (time.perf_counter() - started) * 1000
+                tool_use = event.get("contentBlockStart", {}).get("start", {}).get("toolUse")
+                if tool_use and tool_use.get("name") == HANDOFF_TOOL_NAME:
+                    handed_off = True
+                if "metadata" in event:
+                    usage = event["metadata"].get("usage")
+                    if SERVED_TIER_KEY in event:
+                        served_tier = event[SERVED_TIER_KEY]
+                        event = {key: value for key, value in event.items() if key != SERVED_TIER_KEY}
+                yield event
+        except asyncio.TimeoutError:
+            metrics.increment("model.deadline_exceeded", tier=tier)
+            raise
+        finally:
+            await events.aclose()
+
+        self.tiers.record(served_tier, usage, (time.perf_counter() - started) * 1000, first_event_ms)
+
+        # A fast specialist handing off could not answer alone; finish on the large tier
+        if handed_off and tier == "fast" and self.escalate_on_handoff:
+            self.tiers.escalate("handoff")
+
+    def structured_output(self, output_model, prompt, system_prompt: Optional[str] = None, **kwargs):
+        return self.current.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs)
@@ -0,0 +1,387 @@
+"""
+ASL Request Tracing
+
+Per-agent, per-handoff spans for every request, with request-level aggregates.
+
+Each request gets a RequestTrace with a root span. Every agent turn inside the
+Swarm (or every fan-out branch) becomes a child span carrying the agent name,
+turn duration, model latency, input/output tokens, the handoff source/target and
+the queue wait between the previous handoff and the agent starting. When the
+request finishes, the root span gets aggregates (time per agent, handoffs, total
+tokens) and those are also recorded in the metrics registry.
+
+Spans are exported only for sampled requests, so the overhead under load is a
+few timestamps per agent turn. Configuration:
+
+    ASL_TRACE_EXPORTERS     comma-separated: "json" (structured log lines, default),
+                            "otel" (OpenTelemetry SDK), or "none"
+    ASL_TRACE_SAMPLE_RATE   fraction of requests exported (default 0.1)
+
+A request can force sampling with "trace": true in its payload.
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.metrics import metrics
+from src.streaming import usage_from_result
+
+
+logger = logging.getLogger(__name__)
+
+
+def _new_id(length: int) -> str:
+    return uuid.uuid4().hex[:length]
+
+
+def model_latency_from_result(result: Any) -> Optional[float]:
+    """
+    Reads the accumulated model latency (ms) from a Swarm node or agent result.
+    """
+
+    latency_metrics = getattr(result, "accumulated_metrics", None)
+    if latency_metrics is None:
+        latency_metrics = getattr(getattr(result, "metrics", None), "accumulated_metrics", None)
+    if not latency_metrics:
+        return None
+    return latency_metrics.get("latencyMs")
+
+
+@dataclass
+class Span:
+    """One timed operation: a whole request or one agent turn."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class JsonLogExporter:
+    """
+    Writes each span as one JSON log line.
+
+    Nothing else in the process configures logging, so by default the lines go
+    to the "asl.trace" logger with its own stdout handler and INFO level; a
+    logger that already has handlers is left as it is.
+    """
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        if log is None:
+            log = logging.getLogger("asl.trace")
+            if not log.handlers:
+                handler = logging.StreamHandler(sys.stdout)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                log.addHandler(handler)
+                log.setLevel(logging.INFO)
+                # The root logger may have its own handler; spans are written once
+                log.propagate = False
+        self._log = log
+
+    def export(self, spans: List[Span]) -> None:
+        for span in spans:
+            self._log.info(json.dumps(span.to_dict(), default=str))
+
+
+class OpenTelemetryExporter:
+    """
+    Replays finished spans into the OpenTelemetry SDK with their original timing.
+
+    The global tracer provider (and its exporters, e.g. OTLP) is configured by the
+    deployment; opentelemetry-api comes with strands-agents.
+    """
+
+    def __init__(self, instrumentation_name: str = "asl-swarm-agent"):
+        try:
+            from opentelemetry import trace as otel_trace
+        except ImportError as e:
+            raise ImportError("The 'otel' trace exporter requires the opentelemetry-api package") from e
+
+        self._otel_trace = otel_trace
+        self._tracer = otel_trace.get_tracer(instrumentation_name)
+
+    def export(self, spans: List[Span]) -> None:
+        otel_spans = {}
+        # Parents are always created before their children
+        for span in sorted(spans, key=lambda s: (s.parent_id is not None, s.start_ns)):
+            parent = otel_spans.get(span.parent_id)
+            context = self._otel_trace.set_span_in_context(parent) if parent is not None else None
+            attributes = {
+                key: value
+                for key, value in {"asl.trace_id": span.trace_id, **span.attributes}.items()
+                if isinstance(value, (str, bool, int, float))
+            }
+            otel_span = self._tracer.start_span(
+                span.name, context=context, start_time=span.start_ns, attributes=attributes
+            )
+            if span.status == "error":
+                otel_span.set_status(self._otel_trace.Status(self._otel_trace.StatusCode.ERROR))
+            otel_spans[span.span_id] = otel_span
+
+        for span in spans:
+            otel_spans[span.span_id].end(end_time=span.end_ns)
+
+
+class RequestTrace:
+    """
+    Collects the spans of one request.
+
+    Agent spans are always tracked (a few timestamps each) so the request-level
+    aggregates are recorded for every request; spans are exported only if sampled.
+    """
+
+    def __init__(self, tracer: "Tracer", name: str, sampled: bool, **attributes):
+        self._tracer = tracer
+        self.sampled = sampled
+        self.trace_id = _new_id(32)
+        self.root = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=_new_id(16),
+            parent_id=None,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes),
+        )
+        self.agent_spans: List[Span] = []
+        self.handoffs = 0
+        self._ready_ns = self.root.start_ns
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def set_attributes(self, **attributes) -> None:
+        """Adds attributes to the request's root span."""
+        self.root.attributes.update(attributes)
+
+    def start_agent(self, agent_name: str, handoff_source: Optional[str] = None) -> Span:
+        """
+        Opens the span for one agent turn.
+
+        Queue wait is the time since the request started or, after a handoff, since
+        the handoff was made.
+
+        Args:
+            agent_name: Name of the agent (Swarm node) starting its turn
+            handoff_source: Agent that handed off to this one, if any
+
+        Returns:
+            The agent span, to be closed with end_agent()
+        """
+
+        now = time.time_ns()
+        span = Span(
+            name="agent_turn",
+            trace_id=self.trace_id,
+            span_id=_new_id(16),
+            parent_id=self.root.span_id,
+            start_ns=now,
+            attributes={"agent": agent_name, "queue_wait_ms": (now - self._ready_ns) / 1e6},
+        )
+        if handoff_source:
+            span.attributes["handoff_source"] = handoff_source
+
+        with self._lock:
+            self.agent_spans.append(span)
+        return span
+
+    def end_agent(self, span: Span, result: Any = None, status: str = "ok") -> None:
+        """
+        Closes an agent span, reading tokens and model latency from its result.
+        """
+
+        if span.end_ns is not None:
+            return
+
+        span.end_ns = time.time_ns()
+        span.status = status
+        self._ready_ns = span.end_ns
+        if result is not None:
+            self._apply_result(span, result)
+
+    def handoff(self, source: str, target: str, span: Optional[Span] = None) -> None:
+        """
+        Records a handoff; the target's queue wait starts now.
+
+        Args:
+            source: Agent handing off
+            target: Agent receiving the handoff
+            span: The source agent's open span, if known
+        """
+
+        self.handoffs += 1
+        self._ready_ns = time.time_ns()
+        if span is not None:
+            span.attributes["handoff_target"] = target
+        metrics.increment("trace.handoffs", source=source, target=target)
+
+    def attach_results(self, node_results: Dict[str, Any]) -> None:
+        """
+        Fills in tokens and model latency from results that arrive after the turns
+        ended (a Swarm reports per-node results only when the whole run finishes).
+
+        Args:
+            node_results: Agent name to its result, e.g. SwarmStream.node_results
+        """
+
+        for span in reversed(self.agent_spans):
+            agent_name = span.attributes["agent"]
+            if "input_tokens" not in span.attributes and agent_name in node_results:
+                self._apply_result(span, node_results[agent_name])
+
+    @staticmethod
+    def _apply_result(span: Span, result: Any) -> None:
+        usage = usage_from_result(result)
+        span.attributes["input_tokens"] = usage["input_tokens"]
+        span.attributes["output_tokens"] = usage["output_tokens"]
+        model_latency = model_latency_from_result(result)
+        if model_latency is not None:
+            span.attributes["model_latency_ms"] = model_latency
+
+    def aggregates(self) -> dict:
+        """
+        Request-level totals over all agent turns.
+        """
+
+        per_agent_ms: Dict[str, float] = {}
+        for span in self.agent_spans:
+            agent_name = span.attributes["agent"]
+            per_agent_ms[agent_name] = per_agent_ms.get(agent_name, 0.0) + (span.duration_ms or 0.0)
+
+        return {
+            "agent_turns": len(self.agent_spans),
+            "handoffs": self.handoffs,
+            "input_tokens": sum(s.attributes.get("input_tokens", 0) for s in self.agent_spans),
+            "output_tokens": sum(s.attributes.get("output_tokens", 0) for s in self.agent_spans),
+            "model_latency_ms": sum(s.attributes.get("model_latency_ms", 0) for s in self.agent_spans),
+            "queue_wait_ms": sum(s.attributes["queue_wait_ms"] for s in self.agent_spans),
+            "agent_ms": per_agent_ms,
+        }
+
+    def finish(self, status: str = "ok", error: Optional[str] = None, **attributes) -> None:
+        """
+        Closes the request, records aggregates and exports sampled spans.
+
+        Safe to call more than once; only the first call has an effect.
+        """
+
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+
+        for span in self.agent_spans:
+            self.end_agent(span, status="cancelled")
+
+        self.root.end_ns = time.time_ns()
+        self.root.status = status
+        self.root.attributes.update(attributes)
+        if error:
+            self.root.attributes["error"] = error
+
+        totals = self.aggregates()
+        self.root.attributes.update({k: v for k, v in totals.items() if k != "agent_ms"})
+
+        for span in self.agent_spans:
+            agent_name = span.attributes["agent"]
+            metrics.observe("trace.agent_turn_ms", span.duration_ms, agent=agent_name)
+            metrics.observe("trace.queue_wait_ms", span.attributes["queue_wait_ms"], agent=agent_name)
+        metrics.observe("trace.agent_turns_per_request", totals["agent_turns"])
+        metrics.increment("trace.requests", status=status)
+
+        if self.sampled:
+            self._tracer.export([self.root, *self.agent_spans])
+
+
+class Tracer:
+    """
+    Creates request traces and hands sampled ones to the exporters.
+    """
+
+    def __init__(self, exporters: Optional[list] = None, sample_rate: float = 0.1, seed: Optional[int] = None):
+        """
+        Args:
+            exporters: Objects with export(spans)
+            sample_rate: Fraction of requests whose spans are exported
+            seed: Random seed for the sampling decision
+        """
+
+        self.exporters = list(exporters or [])
+        self.sample_rate = sample_rate
+        self._rng = random.Random(seed)
+
+    def start_trace(self, name: str, force_sample: bool = False, **attributes) -> RequestTrace:
+        """
+        Starts the trace for one request.
+
+        Args:
+            name: Root span name
+            force_sample: Export this request's spans regardless of the sample rate
+            **attributes: Root span attributes
+
+        Returns:
+            RequestTrace for the request
+        """
+
+        sampled = bool(self.exporters) and (force_sample or self._rng.random() < self.sample_rate)
+        return RequestTrace(self, name, sampled, **attributes)
+
+    def export(self, spans: List[Span]) -> None:
+        # Exporting must never fail a request
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception:
+                logger.exception("Trace exporter %s failed", type(exporter).__name__)
+
+
+_EXPORTERS = {
+    "json": JsonLogExporter,
+    "otel": OpenTelemetryExporter,
+}
+
+
+def tracer_from_env() -> Tracer:
+    """
+    Builds the process tracer from ASL_TRACE_EXPORTERS and ASL_TRACE_SAMPLE_RATE.
+
+    Raises:
+        ValueError: If ASL_TRACE_EXPORTERS names an unknown exporter
+    """
+
+    names = [n.strip() for n in os.getenv("ASL_TRACE_EXPORTERS", "json").split(",") if n.strip()]
+    unknown = [name for name in names if name != "none" and name not in _EXPORTERS]
+    if unknown:
+        raise ValueError(f"Unknown trace exporter(s) {unknown}. Available: {sorted(_EXPORTERS) + ['none']}")
+
+    exporters = [_EXPORTERS[name]() for name in names if name != "none"]
+    return Tracer(exporters=exporters, sample_rate=float(os.getenv("ASL_TRACE_SAMPLE_RATE", "0.1")))
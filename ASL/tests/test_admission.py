@@ -0,0 +1,230 @@
+"""
+Tests for src/admission.py: priority queueing, displacement, shedding and slot handover.
+"""
+
+import asyncio
+
+import pytest
+
+from src.admission import AdmissionController, Overloaded
+
+
+async def _settle():
+    """Lets every ready task run until it blocks again."""
+
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_admits_immediately_while_slots_are_free():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=2)
+        assert await admission.acquire("interactive") == 0.0
+        assert await admission.acquire("batch") == 0.0
+        assert admission.in_flight == 2
+        assert admission.queue_depth == 0
+
+        admission.release()
+        admission.release()
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_the_slot_to_the_highest_priority_waiter():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, max_queue_wait_seconds=5.0)
+        await admission.acquire("interactive")
+
+        admitted = []
+
+        async def waiter(name, priority):
+            await admission.acquire(priority)
+            admitted.append(name)
+
+        tasks = [
+            asyncio.ensure_future(waiter("batch-1", "batch")),
+            asyncio.ensure_future(waiter("batch-2", "batch")),
+            asyncio.ensure_future(waiter("interactive", "interactive")),
+        ]
+        await _settle()
+        assert admission.queue_depth == 3
+
+        for _ in range(3):
+            admission.release()
+            await _settle()
+            # The slot moved to a waiter; it was never freed in between
+            assert admission.in_flight == 1
+
+        await asyncio.gather(*tasks)
+        # Interactive first, then batch in arrival order
+        assert admitted == ["interactive", "batch-1", "batch-2"]
+
+        admission.release()
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_unknown_priority_is_treated_as_the_lowest_class():
+    admission = AdmissionController()
+    assert admission.normalize_priority("urgent") == "batch"
+    assert admission.normalize_priority(None) == "batch"
+    assert admission.normalize_priority("interactive") == "interactive"
+
+
+def test_full_queue_rejects_an_arrival_that_does_not_outrank_anyone():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, max_queue_depth=1)
+        await admission.acquire("interactive")
+        queued = asyncio.ensure_future(admission.acquire("interactive"))
+        await _settle()
+
+        with pytest.raises(Overloaded) as shed:
+            await admission.acquire("interactive")
+        assert shed.value.reason == "queue_full"
+        assert shed.value.retry_after >= 1.0
+
+        admission.release()
+        await queued
+        admission.release()
+
+    asyncio.run(scenario())
+
+
+def test_higher_priority_arrival_displaces_the_newest_lowest_priority_waiter():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, max_queue_depth=2)
+        await admission.acquire("interactive")
+        older_batch = asyncio.ensure_future(admission.acquire("batch"))
+        newer_batch = asyncio.ensure_future(admission.acquire("batch"))
+        await _settle()
+
+        interactive = asyncio.ensure_future(admission.acquire("interactive"))
+        await _settle()
+
+        with pytest.raises(Overloaded) as shed:
+            await newer_batch
+        assert shed.value.reason == "displaced"
+        assert not older_batch.done()
+        assert admission.queue_depth == 2
+
+        admission.release()
+        await interactive
+        admission.release()
+        await older_batch
+        admission.release()
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiting_past_the_queue_limit_sheds_with_queue_timeout():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, max_queue_wait_seconds=0.05)
+        await admission.acquire("interactive")
+
+        with pytest.raises(Overloaded) as shed:
+            await admission.acquire("interactive")
+        assert shed.value.reason == "queue_timeout"
+        assert admission.queue_depth == 0
+        assert admission.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_waiting_past_the_callers_deadline_sheds_with_deadline():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, max_queue_wait_seconds=5.0)
+        await admission.acquire("interactive")
+
+        with pytest.raises(Overloaded) as shed:
+            await admission.acquire("interactive", timeout=0.05)
+        assert shed.value.reason == "deadline"
+        assert admission.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1)
+        await admission.acquire("interactive")
+        waiter = asyncio.ensure_future(admission.acquire("interactive"))
+        await _settle()
+        assert admission.queue_depth == 1
+
+        waiter.cancel()
+        await _settle()
+        assert waiter.cancelled()
+        assert admission.queue_depth == 0
+
+        # With nobody waiting the slot is simply freed
+        admission.release()
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiter_abandoned_after_being_granted_a_slot_passes_it_on():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1)
+        await admission.acquire("interactive")
+        # A waiter nobody awaits, standing in for one whose wait timed out or was
+        # cancelled in the same loop iteration as it was granted the slot
+        granted = admission._enqueue("interactive")
+        second = asyncio.ensure_future(admission.acquire("interactive"))
+        await _settle()
+
+        admission.release()
+        assert granted.future.done()
+        assert not second.done()
+
+        admission._abandon(granted)
+        assert await second >= 0.0
+        assert admission.in_flight == 1
+        assert admission.queue_depth == 0
+
+        admission.release()
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_a_waiter_never_leaks_its_slot():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1)
+        await admission.acquire("interactive")
+        first = asyncio.ensure_future(admission.acquire("interactive"))
+        second = asyncio.ensure_future(admission.acquire("interactive"))
+        await _settle()
+
+        # The slot is handed to `first`, which is cancelled before it resumes.
+        # Depending on the Python version, wait_for either delivers the slot anyway
+        # or raises CancelledError, in which case the slot moves on to `second`
+        admission.release()
+        first.cancel()
+        await _settle()
+
+        if first.cancelled():
+            await second
+        else:
+            assert not second.done()
+            admission.release()
+            await second
+
+        assert admission.in_flight == 1
+        admission.release()
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_admit_holds_the_slot_for_the_block():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1)
+        async with admission.admit("interactive"):
+            assert admission.in_flight == 1
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
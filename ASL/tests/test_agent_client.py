@@ -0,0 +1,134 @@
+"""
+Tests for src/agent_client.py: stream decoding and the async client over a fake transport.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.fixture
+def agent_client(requests_importable):
+    import src.agent_client
+
+    return src.agent_client
+
+
+def sse(*frames):
+    return "".join(f"data: {json.dumps(frame)}\n\n" for frame in frames).encode("utf-8")
+
+
+def decode(decoder_class, chunks):
+    decoder = decoder_class()
+    frames = []
+    for chunk in chunks:
+        frames.extend(decoder.feed(chunk)[1])
+    frames.extend(decoder.finish()[1])
+    return frames
+
+
+def test_sse_frames_split_across_chunks(agent_client):
+    body = sse({"type": "text", "data": "Hello"}, {"type": "summary", "status": "completed"})
+
+    for size in (1, 3, 7, len(body)):
+        chunks = [body[i:i + size] for i in range(0, len(body), size)]
+        assert decode(agent_client.StreamDecoder, chunks) == [
+            {"type": "text", "data": "Hello"},
+            {"type": "summary", "status": "completed"},
+        ]
+
+
+def test_multibyte_characters_split_across_chunks(agent_client):
+    body = sse({"type": "text", "data": "naïve “quotes” 👋"})
+
+    frames = decode(agent_client.StreamDecoder, [body[i:i + 1] for i in range(len(body))])
+
+    assert frames == [{"type": "text", "data": "naïve “quotes” 👋"}]
+
+
+def test_crlf_plain_strings_and_unterminated_last_event(agent_client):
+    body = b'data: "plain answer"\r\n\r\ndata: {"type": "summary"}'
+
+    assert decode(agent_client.StreamDecoder, [body]) == [
+        {"type": "text", "data": "plain answer"},
+        {"type": "summary"},
+    ]
+
+
+def test_plain_text_body_passes_through(agent_client):
+    frames = decode(agent_client.StreamDecoder, [b"Hi", b" there, ", b"learner."])
+
+    assert "".join(frame["data"] for frame in frames) == "Hi there, learner."
+    assert {frame["type"] for frame in frames} == {"text"}
+
+
+def test_feed_returns_decoded_text(agent_client):
+    decoder = agent_client.StreamDecoder()
+
+    text, frames = decoder.feed('data: {"type": "text", "data": "é"}\n\n'.encode("utf-8"))
+
+    assert text == 'data: {"type": "text", "data": "é"}\n\n'
+    assert frames == [{"type": "text", "data": "é"}]
+
+
+def fake_client(agent_client, bodies, **policies):
+    """AgentClient whose transport returns the next body, or raises it if it is an exception."""
+
+    class FakeTransportClient(agent_client.AgentClient):
+        def __init__(self):
+            super().__init__(pool_size=2, **policies)
+            self.payloads = []
+
+        def _open(self, payload, session_id):
+            self.payloads.append(payload)
+            body = bodies.pop(0)
+            if isinstance(body, BaseException):
+                raise body
+            return iter([body[i:i + 5] for i in range(0, len(body), 5)])
+
+    return FakeTransportClient()
+
+
+def test_invoke_collects_text_frames_and_timing(agent_client):
+    client = fake_client(
+        agent_client,
+        [sse({"type": "text", "data": "Flat hand "}, {"type": "text", "data": "from the chin."}, {"type": "summary"})],
+    )
+    seen = []
+
+    result = asyncio.run(client.invoke("How do I sign thank you?", session_id="s1", on_text=seen.append, events=True))
+    client.close()
+
+    assert result.text == "Flat hand from the chin."
+    assert seen == ["Flat hand ", "from the chin."]
+    assert result.summary == {"type": "summary"}
+    assert result.timing.first_byte_ms is not None and result.timing.chunks > 1
+    assert client.payloads == [{"input": "How do I sign thank you?", "session_id": "s1", "events": True}]
+
+
+def test_error_frame_raises(agent_client):
+    client = fake_client(agent_client, [sse({"type": "error", "error": "Overloaded", "code": "overloaded"})])
+
+    with pytest.raises(agent_client.AgentClientError) as error:
+        asyncio.run(client.invoke("Hi"))
+    client.close()
+
+    assert error.value.code == "overloaded"
+
+
+def test_failure_before_the_first_byte_is_retried(agent_client):
+    from src.resilience import RetryPolicy
+
+    throttled = agent_client.AgentClientError("Throttled", status_code=429)
+    client = fake_client(
+        agent_client,
+        [throttled, sse({"type": "text", "data": "Answer."})],
+        retry_policy=RetryPolicy(max_attempts=2, base_delay=0.0),
+    )
+
+    result = asyncio.run(client.invoke("Hi"))
+    client.close()
+
+    assert result.text == "Answer."
+    assert len(client.payloads) == 2
@@ -0,0 +1,75 @@
+"""
+Tests for src/agent_registry.py: per-request agent sets and configuration versions.
+"""
+
+import sys
+import types
+
+import pytest
+
+from src.agent_registry import AgentRegistry
+
+
+@pytest.fixture(autouse=True)
+def strands_multiagent(monkeypatch):
+    # warm_up() loads strands.multiagent ahead of the first Swarm; only the import matters here
+    monkeypatch.setitem(sys.modules, "strands", types.ModuleType("strands"))
+    monkeypatch.setitem(sys.modules, "strands.multiagent", types.ModuleType("strands.multiagent"))
+
+
+def make_registry(built):
+    def factory(key):
+        def create(model=None):
+            built.append(key)
+            return types.SimpleNamespace(name=f"{key}_name", model=model)
+        return create
+
+    keys = ["coordinator", "grammar_expert", "vocabulary_agent"]
+    return AgentRegistry(
+        factories={key: factory(key) for key in keys},
+        model="shared-model",
+        system_prompts={key: f"prompt for {key}" for key in keys},
+        model_id="model",
+    )
+
+
+def test_create_agents_builds_only_the_requested_keys():
+    built = []
+    registry = make_registry(built)
+    registry.warm_up()
+    built.clear()
+
+    agents = registry.create_agents(["vocabulary_agent"], models={"vocabulary_agent": "small-model"})
+    assert list(agents) == ["vocabulary_agent"]
+    assert agents["vocabulary_agent"].model == "small-model"
+    assert built == ["vocabulary_agent"]
+
+
+def test_create_agents_defaults_to_every_agent_in_registration_order():
+    built = []
+    registry = make_registry(built)
+    agents = registry.create_agents(["vocabulary_agent", "coordinator"])
+    assert list(agents) == ["coordinator", "vocabulary_agent"]
+    assert agents["coordinator"].model == "shared-model"
+
+    assert list(registry.create_agents()) == ["coordinator", "grammar_expert", "vocabulary_agent"]
+
+
+def test_agent_names_come_from_the_warm_up_build():
+    built = []
+    registry = make_registry(built)
+    assert registry.agent_name("grammar_expert") == "grammar_expert_name"
+    registry.agent_name("coordinator")
+    assert built == ["coordinator", "grammar_expert", "vocabulary_agent"]
+
+
+def test_updating_a_versioned_input_changes_the_configuration_version():
+    registry = make_registry([])
+    before = registry.config_version
+    fingerprints = registry.fingerprints(["grammar_expert", "resource_index"])
+
+    assert registry.update_system_prompt("resource_index", "2") != before
+    assert registry.config_version != before
+    updated = registry.fingerprints(["grammar_expert", "resource_index"])
+    assert updated["grammar_expert"] == fingerprints["grammar_expert"]
+    assert updated["resource_index"] != fingerprints["resource_index"]
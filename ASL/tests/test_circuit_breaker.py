@@ -0,0 +1,231 @@
+"""
+Tests for src/circuit_breaker.py: opening on failures and slow calls, half-open probes.
+"""
+
+import types
+
+import pytest
+
+from src import circuit_breaker
+from src.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, circuit_open_cause
+
+
+class Throttled(Exception):
+    pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def make_breaker(**overrides) -> CircuitBreaker:
+    settings = dict(
+        window_seconds=30.0,
+        min_calls=4,
+        failure_rate=0.5,
+        slow_call_seconds=2.0,
+        slow_call_rate=0.8,
+        open_seconds=10.0,
+        half_open_probes=1,
+        classify=lambda error: isinstance(error, Throttled),
+    )
+    settings.update(overrides)
+    return CircuitBreaker("model@region", **settings)
+
+
+def call(breaker: CircuitBreaker, seconds: float = 0.1, error=None) -> None:
+    permit = breaker.acquire()
+    assert permit is not None
+    breaker.record(permit, seconds, error)
+
+
+def test_stays_closed_until_the_window_has_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        call(breaker, error=Throttled())
+    assert breaker.state == CLOSED
+
+    call(breaker, error=Throttled())
+    assert breaker.state == OPEN
+
+
+def test_opens_at_the_failure_rate_and_rejects_calls(clock):
+    breaker = make_breaker()
+    call(breaker)
+    call(breaker)
+    call(breaker, error=Throttled())
+    assert breaker.state == CLOSED
+
+    call(breaker, error=Throttled())
+    assert breaker.state == OPEN
+    assert breaker.acquire() is None
+    assert not breaker.available
+    assert breaker.retry_after() == pytest.approx(10.0)
+
+    clock.advance(4.0)
+    assert breaker.retry_after() == pytest.approx(6.0)
+
+
+def test_errors_the_classifier_ignores_are_not_failures(clock):
+    breaker = make_breaker()
+    for _ in range(10):
+        call(breaker, error=ValueError("bad request"))
+    assert breaker.state == CLOSED
+
+
+def test_opens_at_the_slow_call_rate(clock):
+    breaker = make_breaker()
+    call(breaker, seconds=0.1)
+    for _ in range(3):
+        call(breaker, seconds=5.0)
+    assert breaker.state == CLOSED
+
+    call(breaker, seconds=5.0)
+    assert breaker.state == OPEN
+
+
+def test_outcomes_older_than_the_window_are_forgotten(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        call(breaker, error=Throttled())
+    clock.advance(31.0)
+
+    call(breaker, error=Throttled())
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, error=Throttled())
+    clock.advance(10.0)
+    assert breaker.state == HALF_OPEN
+    assert breaker.retry_after() == 0.0
+
+    probe = breaker.acquire()
+    assert probe.state == HALF_OPEN
+    assert breaker.acquire() is None
+
+    breaker.record(probe, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.acquire().state == CLOSED
+
+
+def test_failed_or_slow_probe_reopens(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, error=Throttled())
+    clock.advance(10.0)
+
+    breaker.record(breaker.acquire(), 0.1, Throttled())
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == pytest.approx(10.0)
+
+    clock.advance(10.0)
+    breaker.record(breaker.acquire(), 5.0)
+    assert breaker.state == OPEN
+
+
+def test_released_probe_frees_the_probe_slot(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, error=Throttled())
+    clock.advance(10.0)
+
+    probe = breaker.acquire()
+    assert breaker.acquire() is None
+    breaker.release(probe)
+    assert breaker.acquire().state == HALF_OPEN
+    assert breaker.state == HALF_OPEN
+
+
+def test_outcomes_of_calls_admitted_in_an_earlier_state_are_ignored(clock):
+    breaker = make_breaker()
+    stale = breaker.acquire()
+    for _ in range(4):
+        call(breaker, error=Throttled())
+    clock.advance(10.0)
+    probe = breaker.acquire()
+
+    # A slow call admitted while closed finishes during the half-open probe
+    breaker.record(stale, 60.0, Throttled())
+    assert breaker.state == HALF_OPEN
+
+    breaker.record(probe, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_stale_probe_from_an_earlier_half_open_period_is_ignored(clock):
+    breaker = make_breaker(half_open_probes=2)
+    for _ in range(4):
+        call(breaker, error=Throttled())
+    clock.advance(10.0)
+    stale_probe = breaker.acquire()
+    breaker.record(breaker.acquire(), 0.1, Throttled())
+    assert breaker.state == OPEN
+
+    clock.advance(10.0)
+    probe = breaker.acquire()
+    assert probe.state == stale_probe.state == HALF_OPEN
+
+    # Same state as the current probes, but admitted before the breaker reopened
+    breaker.record(stale_probe, 0.1)
+    breaker.release(stale_probe)
+    assert breaker.state == HALF_OPEN
+    assert breaker.acquire() is not None
+    assert breaker.acquire() is None
+
+    breaker.record(probe, 0.1)
+    assert breaker.state == HALF_OPEN
+
+
+def test_transition_callback_runs_outside_the_lock(clock):
+    seen = []
+    breaker = make_breaker(on_transition=lambda name, previous, state: seen.append((state, breaker.state)))
+    for _ in range(4):
+        call(breaker, error=Throttled())
+
+    # Reading the breaker from the callback would deadlock if it held the lock
+    assert seen == [(OPEN, OPEN)]
+
+
+def test_transitions_are_reported(clock):
+    transitions = []
+    breaker = make_breaker(on_transition=lambda name, previous, state: transitions.append((name, previous, state)))
+    for _ in range(4):
+        call(breaker, error=Throttled())
+    clock.advance(10.0)
+    breaker.record(breaker.acquire(), 0.1)
+
+    assert transitions == [
+        ("model@region", CLOSED, OPEN),
+        ("model@region", OPEN, HALF_OPEN),
+        ("model@region", HALF_OPEN, CLOSED),
+    ]
+
+
+def test_circuit_open_cause_finds_a_wrapped_circuit_open():
+    circuit_open = CircuitOpen("model@region", 3.0)
+    try:
+        try:
+            raise circuit_open
+        except CircuitOpen as e:
+            raise RuntimeError("swarm node failed") from e
+    except RuntimeError as wrapped:
+        assert circuit_open_cause(wrapped) is circuit_open
+
+    assert circuit_open_cause(RuntimeError("unrelated")) is None
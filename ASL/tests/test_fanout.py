@@ -0,0 +1,172 @@
+"""
+Tests for src/fanout.py: concurrent specialist branches, failures and the merge step.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.fanout import FanOutRun, build_synthesis_prompt, select_fanout_domains
+from src.router import RoutingDecision
+from src.streaming import StreamTimer
+
+
+class FakeResult:
+    def __init__(self, text, input_tokens=10, output_tokens=5):
+        self.text = text
+        self.accumulated_usage = {"inputTokens": input_tokens, "outputTokens": output_tokens}
+
+    def __str__(self):
+        return self.text
+
+
+class FakeSpecialist:
+    """Answers after `delay` seconds, or raises `error`."""
+
+    def __init__(self, name, answer="", delay=0.0, error=None):
+        self.name = name
+        self.answer = answer
+        self.delay = delay
+        self.error = error
+        self.tasks = []
+
+    async def run_async(self, task):
+        self.tasks.append(task)
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return FakeResult(self.answer)
+
+
+class FakeSynthesizer:
+    """Streams `chunks` with `delay` seconds before each one."""
+
+    name = "Synthesis Agent"
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+        self.prompts = []
+
+    async def stream_async(self, prompt):
+        self.prompts.append(prompt)
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield {"data": chunk}
+        yield {"result": FakeResult("".join(self.chunks), input_tokens=30, output_tokens=8)}
+
+
+def run(branches, synthesizer, deadline_seconds=None, **kwargs):
+    fanout = FanOutRun(branches, synthesizer, task="task", question="question", timer=StreamTimer(), **kwargs)
+
+    async def collect():
+        deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+        return [frame async for frame in fanout.frames(deadline)]
+
+    return fanout, asyncio.run(collect())
+
+
+def text_of(frames):
+    return "".join(frame["data"] for frame in frames if frame["type"] == "text")
+
+
+def test_select_fanout_domains_keeps_strong_domains_best_first():
+    decision = RoutingDecision(
+        agent_key="grammar_expert",
+        confidence=0.5,
+        confident=False,
+        scores={"grammar_expert": 0.5, "vocabulary_agent": 0.35, "cultural_agent": 0.1, "learning_agent": 0.05},
+    )
+
+    assert select_fanout_domains(decision, min_score=0.3) == ["grammar_expert", "vocabulary_agent"]
+    assert select_fanout_domains(decision, min_score=0.05, max_branches=3) == [
+        "grammar_expert",
+        "vocabulary_agent",
+        "cultural_agent",
+    ]
+
+
+def test_build_synthesis_prompt_includes_every_answer():
+    prompt = build_synthesis_prompt("Why?", {"Grammar Expert": " Because. ", "Vocabulary Agent": "Sign it so."})
+
+    assert prompt.startswith("Learner's question: Why?")
+    assert "--- Answer from Grammar Expert ---\nBecause." in prompt
+    assert "--- Answer from Vocabulary Agent ---\nSign it so." in prompt
+
+
+def test_branches_run_concurrently_and_are_merged():
+    branches = {
+        "grammar_expert": FakeSpecialist("Grammar Expert", "Grammar answer.", delay=0.2),
+        "vocabulary_agent": FakeSpecialist("Vocabulary Agent", "Vocabulary answer.", delay=0.2),
+    }
+    synthesizer = FakeSynthesizer(["Merged ", "answer."])
+
+    started = time.perf_counter()
+    fanout, frames = run(branches, synthesizer)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35
+    assert text_of(frames) == "Merged answer."
+    assert "Grammar answer." in synthesizer.prompts[0] and "Vocabulary answer." in synthesizer.prompts[0]
+    assert fanout.status == "completed"
+    assert fanout.node_path == ["Grammar Expert", "Vocabulary Agent", "Synthesis Agent"]
+
+    summary = fanout.summary_frame()
+    assert summary["mode"] == "fanout"
+    assert summary["usage"] == {"input_tokens": 50, "output_tokens": 18, "total_tokens": 68}
+
+
+def test_failed_and_slow_branches_are_dropped():
+    branches = {
+        "grammar_expert": FakeSpecialist("Grammar Expert", "Grammar answer."),
+        "vocabulary_agent": FakeSpecialist("Vocabulary Agent", error=RuntimeError("throttled")),
+        "cultural_agent": FakeSpecialist("Cultural Agent", "Too late.", delay=1.0),
+    }
+    synthesizer = FakeSynthesizer(["unused"])
+
+    fanout, frames = run(branches, synthesizer, branch_timeout=0.1, include_events=True)
+
+    # A single surviving answer is streamed as-is, without a merge step
+    assert text_of(frames) == "Grammar answer."
+    assert synthesizer.prompts == []
+    assert frames[0]["event"] == "fanout"
+    assert fanout.failed_branches == {"vocabulary_agent": "throttled", "cultural_agent": "timeout"}
+    assert fanout.status == "partial"
+    assert fanout.summary_frame()["failed_agents"] == ["vocabulary_agent", "cultural_agent"]
+
+
+def test_all_branches_failing_raises():
+    branches = {
+        "grammar_expert": FakeSpecialist("Grammar Expert", error=RuntimeError("down")),
+        "vocabulary_agent": FakeSpecialist("Vocabulary Agent", error=RuntimeError("down")),
+    }
+
+    with pytest.raises(RuntimeError, match="All specialists failed"):
+        run(branches, FakeSynthesizer([]))
+
+
+def test_merge_past_the_deadline_falls_back_to_the_best_branch():
+    branches = {
+        "grammar_expert": FakeSpecialist("Grammar Expert", "Grammar answer."),
+        "vocabulary_agent": FakeSpecialist("Vocabulary Agent", "Vocabulary answer."),
+    }
+    synthesizer = FakeSynthesizer(["Merged answer."], delay=1.0)
+
+    fanout, frames = run(branches, synthesizer, deadline_seconds=0.2)
+
+    assert text_of(frames) == "Grammar answer."
+    assert fanout.stopped_early
+    assert fanout.status == "budget_exhausted"
+
+
+def test_branches_get_the_task_with_history():
+    specialist = FakeSpecialist("Grammar Expert", "Answer.")
+    task = "Conversation so far: ...\nCurrent question: Why?"
+    fanout = FanOutRun({"grammar_expert": specialist}, FakeSynthesizer([]), task=task, question="Why?", timer=StreamTimer())
+
+    async def collect():
+        return [frame async for frame in fanout.frames()]
+
+    assert text_of(asyncio.run(collect())) == "Answer."
+    assert specialist.tasks == [task]
@@ -0,0 +1,120 @@
+"""
+Tests for src/invoke_agent_iam.py: resumable batch runs.
+"""
+
+import asyncio
+import json
+import types
+
+import pytest
+
+
+@pytest.fixture
+def iam(requests_importable):
+    import src.invoke_agent_iam
+
+    return src.invoke_agent_iam
+
+
+class FakeClient:
+    """Answers every question, failing the ones listed in `fail`; tracks concurrency."""
+
+    region_name = "us-east-1"
+
+    def __init__(self, agent_client_error, fail=()):
+        self.error = agent_client_error
+        self.fail = set(fail)
+        self.questions = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def invoke(self, user_input, session_id=None, on_text=None, priority=None):
+        self.questions.append((user_input, priority))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if user_input in self.fail:
+                raise self.error("Throttled", status_code=429, code="ThrottlingException")
+            return types.SimpleNamespace(text=f"Answer to {user_input}", timing=types.SimpleNamespace(first_byte_ms=5.0))
+        finally:
+            self.in_flight -= 1
+
+
+def write_questions(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(1, count + 1):
+            f.write(json.dumps({"id": f"q{index}", "input": f"question {index}"}) + "\n")
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_read_batch_questions_from_jsonl_and_csv(iam, tmp_path):
+    jsonl = tmp_path / "questions.jsonl"
+    jsonl.write_text('{"id": "a", "input": "How do I sign hello?"}\n\n{"question": "What is ASL?"}\n{"id": "b"}\n')
+    csv_path = tmp_path / "questions.csv"
+    csv_path.write_text("id,input,session_id\nc,How do I sign water?,s1\n")
+
+    assert list(iam.read_batch_questions(str(jsonl))) == [
+        {"id": "a", "input": "How do I sign hello?", "session_id": None},
+        {"id": "2", "input": "What is ASL?", "session_id": None},
+    ]
+    assert list(iam.read_batch_questions(str(csv_path))) == [
+        {"id": "c", "input": "How do I sign water?", "session_id": "s1"},
+    ]
+
+
+def test_batch_runs_with_bounded_concurrency(iam, tmp_path):
+    questions = tmp_path / "questions.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_questions(questions, 10)
+    client = FakeClient(iam.AgentClientError, fail={"question 4"})
+
+    stats = asyncio.run(iam.run_batch_async(client, str(questions), str(output), concurrency=3))
+
+    assert client.max_in_flight == 3
+    assert {priority for _, priority in client.questions} == {"batch"}
+    assert stats["succeeded"] == 9 and stats["failed"] == 1 and stats["skipped"] == 0
+    results = {record["id"]: record for record in read_results(output)}
+    assert len(results) == 10
+    assert results["q4"]["status"] == "error"
+    assert results["q1"]["response"] == "Answer to question 1"
+
+
+def test_resume_skips_succeeded_questions_and_repairs_a_torn_line(iam, tmp_path):
+    questions = tmp_path / "questions.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_questions(questions, 4)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "q1", "status": "success", "response": "earlier"}) + "\n")
+        f.write(json.dumps({"id": "q2", "status": "error", "error": "Throttled"}) + "\n")
+        # The previous run was killed while writing q3's result
+        f.write('{"id": "q3", "status": "succ')
+
+    client = FakeClient(iam.AgentClientError)
+    stats = asyncio.run(iam.run_batch_async(client, str(questions), str(output), concurrency=2, resume=True))
+
+    assert sorted(question for question, _ in client.questions) == ["question 2", "question 3", "question 4"]
+    assert stats["skipped"] == 1 and stats["succeeded"] == 3
+    # Every line parses again, and the retried questions now count as done
+    records = read_results(output)
+    assert [record["id"] for record in records[:2]] == ["q1", "q2"]
+    assert iam.load_completed_ids(str(output)) == {"q1", "q2", "q3", "q4"}
+
+
+def test_truncate_partial_line(iam, tmp_path):
+    output = tmp_path / "results.jsonl"
+
+    assert iam.truncate_partial_line(str(output)) == 0
+
+    output.write_bytes(b'{"id": "q1"}\n' + b"x" * 70000)
+    assert iam.truncate_partial_line(str(output)) == 70000
+    assert output.read_bytes() == b'{"id": "q1"}\n'
+
+    assert iam.truncate_partial_line(str(output)) == 0
+
+    output.write_bytes(b"no newline at all")
+    assert iam.truncate_partial_line(str(output)) == len(b"no newline at all")
+    assert output.read_bytes() == b""
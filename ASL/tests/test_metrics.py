@@ -0,0 +1,58 @@
+"""
+Tests for src/metrics.py: metric keys and CloudWatch EMF export.
+"""
+
+import io
+import json
+
+from src.metrics import MetricsExporter, MetricsRegistry, _metric_key, _split_metric_key
+
+
+def export_emf(registry):
+    stream = io.StringIO()
+    MetricsExporter(registry, export_format="emf", stream=stream).export()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_metric_key_round_trips_labels_with_separators():
+    labels = {"agent": "grammar,expert", "question": "a=b", "path": "C:\\tmp"}
+
+    key = _metric_key("router.decisions", labels)
+
+    assert _split_metric_key(key) == ("router.decisions", labels)
+
+
+def test_emf_labels_become_dimensions():
+    registry = MetricsRegistry()
+    registry.increment("router.decisions", agent="vocabulary_agent")
+
+    [document] = export_emf(registry)
+
+    assert document["agent"] == "vocabulary_agent"
+    assert document["router.decisions"] == 1
+    assert document["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["agent"]]
+
+
+def test_emf_splits_observations_instead_of_dropping_them():
+    registry = MetricsRegistry()
+    for value in range(250):
+        registry.observe("latency_ms", value, tier="fast")
+
+    documents = export_emf(registry)
+
+    chunks = [document["latency_ms"] for document in documents]
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    assert sum(chunks, []) == list(range(250))
+    assert all(document["tier"] == "fast" for document in documents)
+
+
+def test_emf_counters_export_deltas():
+    registry = MetricsRegistry()
+    exporter = MetricsExporter(registry, export_format="emf", stream=io.StringIO())
+    registry.increment("requests", 3)
+    exporter.export()
+    registry.increment("requests", 2)
+
+    [document] = exporter._emf_documents()
+
+    assert document["requests"] == 2
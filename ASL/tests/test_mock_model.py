@@ -0,0 +1,95 @@
+"""
+Tests for src/mock_model.py: simulated Bedrock prompt-cache usage.
+"""
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from src.prompt_cache import MIN_CACHEABLE_TOKENS
+from src.text_features import estimate_tokens
+
+
+@pytest.fixture
+def mock_model(monkeypatch):
+    # The stubs only subclass strands' Model base and raise its throttling error
+    strands = types.ModuleType("strands")
+    models = types.ModuleType("strands.models")
+    models.Model = object
+    exceptions = types.ModuleType("strands.types.exceptions")
+    exceptions.ModelThrottledException = type("ModelThrottledException", (Exception,), {})
+    for name, module in {
+        "strands": strands,
+        "strands.models": models,
+        "strands.types": types.ModuleType("strands.types"),
+        "strands.types.exceptions": exceptions,
+    }.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, "src.mock_model", raising=False)
+
+    import src.mock_model
+
+    return src.mock_model
+
+
+def usage(model, system_prompt, tool_specs=None):
+    async def collect():
+        return [event async for event in model.stream(
+            [{"role": "user", "content": [{"text": "hello"}]}], tool_specs, system_prompt
+        )]
+
+    return asyncio.run(collect())[-1]["metadata"]["usage"]
+
+
+def long_prompt():
+    prompt = "You are an ASL tutor. "
+    while estimate_tokens(prompt) < MIN_CACHEABLE_TOKENS + 10:
+        prompt += "Explain handshape, location, movement and palm orientation. "
+    return prompt
+
+
+def test_prompt_under_minimum_is_never_cached(mock_model):
+    model = mock_model.StubCachingModel(cache_prompt="default")
+    prompt = "You are an ASL tutor."
+
+    for _ in range(2):
+        result = usage(model, prompt)
+        assert result["cacheReadInputTokens"] == 0
+        assert result["cacheWriteInputTokens"] == 0
+        assert result["inputTokens"] >= estimate_tokens(prompt)
+
+
+def test_long_prompt_writes_then_reads(mock_model):
+    model = mock_model.StubCachingModel(cache_prompt="default")
+    prompt = long_prompt()
+
+    first = usage(model, prompt)
+    second = usage(model, prompt)
+
+    assert first["cacheWriteInputTokens"] == estimate_tokens(prompt)
+    assert first["cacheReadInputTokens"] == 0
+    assert second["cacheReadInputTokens"] == estimate_tokens(prompt)
+    assert second["inputTokens"] < estimate_tokens(prompt)
+
+
+def test_tool_specs_count_towards_the_cached_prefix(mock_model):
+    model = mock_model.StubCachingModel(cache_prompt="default", cache_tools="default")
+    prompt = "You are an ASL tutor."
+    tool_specs = [
+        {"name": f"lookup_{i}", "description": "Looks up an ASL sign by its English gloss. " * 8}
+        for i in range(20)
+    ]
+
+    assert usage(model, prompt)["cacheWriteInputTokens"] == 0
+    written = usage(model, prompt, tool_specs)["cacheWriteInputTokens"]
+    assert written >= MIN_CACHEABLE_TOKENS
+    assert usage(model, prompt, tool_specs)["cacheReadInputTokens"] == written
+
+
+def test_caching_disabled_reports_no_usage(mock_model):
+    model = mock_model.StubCachingModel()
+    result = usage(model, long_prompt())
+    assert result["cacheReadInputTokens"] == 0
+    assert result["cacheWriteInputTokens"] == 0
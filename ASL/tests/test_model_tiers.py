@@ -0,0 +1,155 @@
+"""
+Tests for src/model_tiers.py and src/tiered_model.py: tier choice, escalation and cost.
+"""
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from src.model_tiers import TIER_PRICES, TierPolicy
+from src.streaming import HANDOFF_TOOL_NAME
+
+
+DEFAULT_TIERS = {
+    "coordinator": "fast",
+    "vocabulary_agent": "fast",
+    "grammar_expert": "large",
+}
+
+
+def make_policy(**kwargs):
+    return TierPolicy(DEFAULT_TIERS, escalate_below_confidence=0.35, escalate_prompt_tokens=50, **kwargs)
+
+
+def test_unknown_tier_is_rejected():
+    with pytest.raises(ValueError, match="Unknown model tiers"):
+        TierPolicy({"vocabulary_agent": "huge"})
+
+
+def test_confident_short_question_keeps_default_tiers():
+    tiers = make_policy().start(confidence=0.9, question="How do I sign thank you?")
+
+    assert not tiers.escalated
+    assert tiers.tier_for("vocabulary_agent") == "fast"
+    assert tiers.tier_for("grammar_expert") == "large"
+    assert tiers.tier_for("unlisted_agent") == "large"
+
+
+@pytest.mark.parametrize(
+    "confidence, question, reason",
+    [
+        (0.2, "How do I sign thank you?", "low_confidence"),
+        (0.9, "Explain in detail " * 20, "long_question"),
+    ],
+)
+def test_requests_start_escalated(confidence, question, reason):
+    tiers = make_policy().start(confidence=confidence, question=question)
+
+    assert tiers.escalation_reason == reason
+    assert tiers.tier_for("vocabulary_agent") == "large"
+    # Pinned agents keep their default tier
+    assert tiers.tier_for("coordinator") == "fast"
+
+
+def test_first_escalation_reason_wins():
+    tiers = make_policy().start(confidence=0.9, question="Hi")
+    tiers.escalate("handoff")
+    tiers.escalate("low_confidence")
+
+    assert tiers.escalation_reason == "handoff"
+
+
+def test_disabled_policy_runs_everything_on_the_default_tier():
+    tiers = make_policy(enabled=False).start(confidence=0.0, question="Hi")
+
+    assert not tiers.escalated
+    assert {tiers.tier_for(key) for key in DEFAULT_TIERS} == {"large"}
+
+
+def test_summary_costs_each_tier_and_the_saving():
+    tiers = make_policy().start(confidence=0.9, question="Hi")
+    tiers.record("fast", {"inputTokens": 1000, "outputTokens": 200}, 120.0, 40.0)
+    tiers.record("large", {"inputTokens": 500, "outputTokens": 100}, 300.0, None)
+
+    side_run = tiers.fork()
+    side_run.record("fast", {"inputTokens": 1000, "outputTokens": 0}, 80.0, 20.0)
+    tiers.merge(side_run)
+
+    summary = tiers.summary()
+    fast_cost = TIER_PRICES["fast"].cost(2000, 200)
+    large_cost = TIER_PRICES["large"].cost(500, 100)
+
+    assert summary["by_tier"]["fast"]["calls"] == 2
+    assert summary["by_tier"]["fast"]["cost_usd"] == round(fast_cost, 6)
+    assert summary["cost_usd"] == round(fast_cost + large_cost, 6)
+    assert summary["cost_saved_usd"] == round(TIER_PRICES["large"].cost(2000, 200) - fast_cost, 6)
+    assert summary["by_tier"]["large"]["cost_saved_usd"] == 0
+
+
+class FakeModel:
+    """Shared tier model that records calls and may start a handoff tool use."""
+
+    def __init__(self, tier, hand_off=False):
+        self.tier = tier
+        self.hand_off = hand_off
+        self.calls = 0
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        self.calls += 1
+        if self.hand_off:
+            yield {"contentBlockStart": {"start": {"toolUse": {"name": HANDOFF_TOOL_NAME, "toolUseId": "t1"}}}}
+        else:
+            yield {"contentBlockDelta": {"delta": {"text": "Answer."}}}
+        yield {"metadata": {"usage": {"inputTokens": 100, "outputTokens": 10}}}
+
+
+@pytest.fixture
+def tiered_model(monkeypatch):
+    # TieredModel only subclasses strands' Model base
+    strands = types.ModuleType("strands")
+    models = types.ModuleType("strands.models")
+    models.Model = object
+    monkeypatch.setitem(sys.modules, "strands", strands)
+    monkeypatch.setitem(sys.modules, "strands.models", models)
+    for name in ("src.tiered_model", "src.fallback_model"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    import src.tiered_model
+
+    shared = {"fast": FakeModel("fast", hand_off=True), "large": FakeModel("large")}
+    monkeypatch.setattr(src.tiered_model, "get_model", lambda tier: shared[tier])
+    return shared
+
+
+def call(model):
+    async def collect():
+        return [event async for event in model.stream([{"role": "user", "content": [{"text": "Hi"}]}])]
+
+    return asyncio.run(collect())
+
+
+def test_fast_handoff_escalates_the_rest_of_the_request(tiered_model):
+    tiers = make_policy().start(confidence=0.9, question="How do I sign thank you?")
+    vocabulary = tiers.model_for("vocabulary_agent")
+    coordinator = tiers.model_for("coordinator")
+
+    call(vocabulary)
+    assert tiers.escalation_reason == "handoff"
+
+    call(vocabulary)
+    call(coordinator)
+
+    assert tiered_model["fast"].calls == 2
+    assert tiered_model["large"].calls == 1
+    assert tiers.usage["fast"]["calls"] == 2
+    assert tiers.usage["large"]["input_tokens"] == 100
+
+
+def test_pinned_agent_handoff_does_not_escalate(tiered_model):
+    tiers = make_policy().start(confidence=0.9, question="How do I sign thank you?")
+
+    call(tiers.model_for("coordinator"))
+
+    assert not tiers.escalated
@@ -0,0 +1,80 @@
+"""
+Tests for src/resource_index.py: updates, no-op removals and reloading a changed manifest.
+"""
+
+from src.resource_index import ResourceIndex, normalize_resource
+
+
+def resource(id, title, **fields):
+    return normalize_resource({
+        "id": id,
+        "title": title,
+        "url": f"https://example.org/{id}",
+        "description": f"{title} for ASL learners",
+        "level": "beginner",
+        "cost": "free",
+        "format": "app",
+        **fields,
+    })
+
+
+def test_added_resources_are_searchable_and_replace_older_copies(tmp_path):
+    index = ResourceIndex(str(tmp_path))
+    index.add([resource("a", "Fingerspelling practice"), resource("b", "Deaf culture reading")])
+    index.add([resource("a", "Fingerspelling drills")])
+
+    assert len(index) == 2
+    assert index.version == 2
+    titles = [hit["title"] for hit in index.search("fingerspelling")]
+    assert titles == ["Fingerspelling drills"]
+
+
+def test_removing_unknown_ids_commits_nothing(tmp_path):
+    index = ResourceIndex(str(tmp_path))
+    index.add([resource("a", "Fingerspelling practice")])
+    manifest = tmp_path / "manifest.json"
+    before = manifest.stat().st_mtime_ns, manifest.stat().st_ino
+
+    assert index.remove(["missing"]) == 0
+    assert index.version == 1
+    assert (manifest.stat().st_mtime_ns, manifest.stat().st_ino) == before
+
+    assert index.remove(["a", "missing"]) == 1
+    assert index.version == 2
+    # Removing an already deleted resource is a no-op too
+    assert index.remove(["a"]) == 0
+    assert index.version == 2
+
+
+def test_reader_reloads_when_another_writer_commits(tmp_path):
+    writer = ResourceIndex(str(tmp_path))
+    writer.add([resource("a", "Fingerspelling practice")])
+    reader = ResourceIndex(str(tmp_path))
+    assert not reader.reload_if_changed()
+
+    writer.add([resource("b", "Numbers video course", format="video")])
+    assert reader.version == 1
+    assert reader.reload_if_changed()
+    assert reader.version == 2
+    assert [hit["id"] for hit in reader.search("numbers")] == ["b"]
+    assert not reader.reload_if_changed()
+
+
+def test_reload_unmaps_the_replaced_segments_once_unused(tmp_path):
+    writer = ResourceIndex(str(tmp_path))
+    writer.add([resource("a", "Fingerspelling practice"), resource("b", "Numbers course")])
+    reader = ResourceIndex(str(tmp_path))
+    old = reader._snapshot
+
+    # A reader still iterating over the old catalog keeps it mapped
+    iterating = reader.resources()
+    assert next(iterating)["id"] == "a"
+
+    writer.compact()
+    assert reader.reload_if_changed()
+    assert old.retired
+    assert not old.segments[0].file._mmap.closed
+
+    assert [r["id"] for r in iterating] == ["b"]
+    assert old.segments[0].file._mmap.closed
+    assert len(reader) == 2
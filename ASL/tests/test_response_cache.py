@@ -0,0 +1,65 @@
+"""
+Tests for src/response_cache.py: keying, LRU and size eviction, TTL.
+"""
+
+from src.response_cache import ResponseCache, make_cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_keys_normalize_the_question_and_include_the_config_version():
+    assert make_cache_key("How do I sign “thank you”?", "v1") == make_cache_key("how do i sign 'thank you'", "v1")
+    assert make_cache_key("How do I sign hello?", "v1") != make_cache_key("How do I sign hello?", "v2")
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_total_size_budget_evicts_and_oversized_answers_are_skipped():
+    cache = ResponseCache(max_total_chars=10)
+    cache.put("a", "12345")
+    cache.put("b", "123456")
+    assert cache.get("a") is None
+    assert cache.get("b") == "123456"
+
+    cache.put("huge", "x" * 11)
+    assert cache.get("huge") is None
+    assert cache.get("b") == "123456"
+
+
+def test_entries_expire_after_their_ttl():
+    clock = Clock()
+    cache = ResponseCache(ttl_seconds=10.0, clock=clock)
+    cache.put("a", "A")
+    cache.put("short", "S", ttl_seconds=1.0)
+
+    clock.now += 5.0
+    assert cache.get("short") is None
+    assert cache.get("a") == "A"
+    clock.now += 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_replacing_a_key_keeps_the_size_accounting():
+    cache = ResponseCache(max_total_chars=10)
+    cache.put("a", "1234567890")
+    cache.put("a", "12")
+    cache.put("b", "12345678")
+    assert cache.get("a") == "12"
+    assert cache.get("b") == "12345678"
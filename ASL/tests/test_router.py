@@ -0,0 +1,98 @@
+"""
+Tests for src/router.py: coordinator prompt parsing, keyword rules and confidence.
+"""
+
+from src.router import KeywordNgramRouter, parse_coordinator_domains
+
+
+COORDINATOR_PROMPT = """You are the coordinator.
+
+1. **Grammar Expert Agent** - For questions about:
+   - ASL grammar rules and syntax
+   - Question formation (Wh-questions, yes/no questions)
+   - Classifiers
+
+2. **Vocabulary Agent** - For questions about:
+   - How to sign specific words or phrases
+   - Fingerspelling
+   - Numbers, colors, common vocabulary
+
+3. **Cultural Agent** - For questions about:
+   - Deaf culture and community
+   - Social etiquette and norms
+   - Deaf history and heritage
+
+4. **Learning Resources Agent** - For questions about:
+   - Where to learn ASL
+   - Online courses and tutorials
+   - Books and apps
+
+5. **General ASL Agent** - For broad questions about:
+   - What ASL is
+   - Getting started with ASL
+
+6. **Unknown Agent** - Not one of ours:
+   - Anything else
+"""
+
+
+def make_router(threshold=0.6):
+    return KeywordNgramRouter(parse_coordinator_domains(COORDINATOR_PROMPT), confidence_threshold=threshold)
+
+
+def test_parse_coordinator_domains_maps_titles_to_agent_keys():
+    domains = parse_coordinator_domains(COORDINATOR_PROMPT)
+
+    assert list(domains) == [
+        "grammar_expert",
+        "vocabulary_agent",
+        "cultural_agent",
+        "learning_agent",
+        "general_asl_agent",
+    ]
+    assert domains["vocabulary_agent"] == [
+        "How to sign specific words or phrases",
+        "Fingerspelling",
+        "Numbers, colors, common vocabulary",
+    ]
+
+
+def test_keyword_questions_route_confidently():
+    router = make_router()
+    expected = {
+        "How do I sign thank you?": "vocabulary_agent",
+        "How does topic-comment sentence structure work?": "grammar_expert",
+        "What is the etiquette for getting a deaf person's attention?": "cultural_agent",
+        "Can you recommend books for learning ASL?": "learning_agent",
+        "What is ASL?": "general_asl_agent",
+    }
+
+    for question, agent_key in expected.items():
+        decision = router.route(question)
+        assert decision.agent_key == agent_key, question
+        assert decision.confident, question
+        assert decision.method == "keyword+classifier"
+
+
+def test_vague_questions_stay_with_the_coordinator():
+    decision = make_router().route("Can you explain?")
+
+    assert not decision.confident
+    assert decision.method == "classifier"
+    assert abs(sum(decision.scores.values()) - 1.0) < 1e-5
+
+
+def test_domains_above_ranks_multi_domain_questions():
+    decision = make_router().route("What is the grammar of wh-questions and the sign for why?")
+
+    domains = decision.domains_above(0.2)
+
+    assert set(domains) == {"grammar_expert", "vocabulary_agent"}
+    assert domains[0] == decision.agent_key
+
+
+def test_threshold_controls_confidence():
+    question = "How do I sign thank you?"
+
+    assert make_router(threshold=0.0).route(question).confident
+    assert not make_router(threshold=1.01).route(question).confident
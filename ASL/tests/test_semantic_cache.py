@@ -0,0 +1,139 @@
+"""
+Tests for src/semantic_cache.py: paraphrase hits, near-miss rejection, sign keys, TTL and invalidation.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.semantic_cache import DEFAULT_THRESHOLD, SemanticCache, calibrate, content_terms
+from src.sign_lexicon import SignLexicon, build_lexicon, read_entries
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def lexicon(tmp_path):
+    path = str(tmp_path / "lexicon.bin")
+    build_lexicon(read_entries(os.path.join(DATA, "sign_lexicon_sample.csv")), path)
+    with SignLexicon(path) as lexicon:
+        yield lexicon
+
+
+def make_cache(**overrides) -> SemanticCache:
+    settings = dict(domains=["vocabulary_agent", "learning_agent", "grammar_expert"], config_version="v1")
+    settings.update(overrides)
+    return SemanticCache(**settings)
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("Can you explain topic-comment structure in ASL?", "What is topic comment structure in ASL?"),
+    ("How long does it take to learn ASL?", "How long will it take me to learn ASL?"),
+    ("What are ASL classifiers used for?", "What are classifiers used for in American Sign Language?"),
+    ("Is ASL the same in every country?", "Is ASL the same in all countries?"),
+])
+def test_paraphrases_hit(cached, asked):
+    cache = make_cache()
+    cache.add(cached, "grammar_expert", "answer")
+    hit = cache.lookup(asked, "grammar_expert")
+    assert hit is not None and hit[0] == "answer"
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("How can I learn ASL online?", "How can I learn ASL offline?"),
+    ("Where can I find free ASL courses?", "Where can I find paid ASL courses?"),
+    ("How long does it take to learn ASL?", "How long does it take to learn BSL?"),
+    ("Are there ASL classes?", "Are there ASL classes for kids?"),
+    ("How do I translate English to ASL?", "How do I translate ASL to English?"),
+])
+def test_near_misses_do_not_hit(cached, asked):
+    cache = make_cache()
+    cache.add(cached, "learning_agent", "answer")
+    assert cache.lookup(asked, "learning_agent") is None
+
+
+def test_the_most_similar_entry_with_the_same_content_wins():
+    cache = make_cache()
+    cache.add("How can I learn ASL online?", "learning_agent", "online")
+    cache.add("How can I learn ASL offline?", "learning_agent", "offline")
+    assert cache.lookup("Ways to learn ASL offline?", "learning_agent") is None
+    assert cache.lookup("Can I learn ASL offline?", "learning_agent")[0] == "offline"
+
+
+def test_domains_are_separate_partitions():
+    cache = make_cache()
+    cache.add("What is topic comment structure?", "grammar_expert", "answer")
+    assert cache.lookup("What is topic comment structure?", "learning_agent") is None
+    assert cache.lookup("What is topic comment structure?", "unknown_agent") is None
+
+
+def test_sign_lookups_resolve_terms_through_the_lexicon(lexicon):
+    cache = make_cache(lexicon=lexicon)
+    cache.add("How do I sign thanks?", "vocabulary_agent", "THANK-YOU: flat hand from the chin")
+
+    hit = cache.lookup("What's the sign for thank you?", "vocabulary_agent")
+    assert hit is not None and hit[0].startswith("THANK-YOU")
+    # A different sign, however similar the question looks
+    assert cache.lookup("How do I sign thank?", "vocabulary_agent") is None
+    assert cache.lookup("How do I sign please?", "vocabulary_agent") is None
+
+
+def test_sign_lookups_without_a_lexicon_match_the_exact_term():
+    cache = make_cache()
+    cache.add("How do I sign thank you?", "vocabulary_agent", "answer")
+    assert cache.lookup("how to sign 'thank you' in ASL", "vocabulary_agent") is not None
+    assert cache.lookup("How do I sign thanks?", "vocabulary_agent") is None
+
+
+def test_entries_expire_after_the_ttl():
+    clock = Clock()
+    cache = make_cache(ttl_seconds=60.0, clock=clock)
+    cache.add("What is topic comment structure?", "grammar_expert", "answer")
+
+    clock.now += 59.0
+    assert cache.lookup("What is topic comment structure?", "grammar_expert") is not None
+    clock.now += 2.0
+    assert cache.lookup("What is topic comment structure?", "grammar_expert") is None
+
+
+def test_persisted_entries_are_dropped_when_the_config_version_changes(tmp_path):
+    path = str(tmp_path / "semantic")
+    cache = make_cache()
+    cache.add("What is topic comment structure?", "grammar_expert", "answer")
+    cache.save(path)
+
+    assert make_cache().load(path) == 1
+    assert make_cache(config_version="v2").load(path) == 0
+
+
+def test_reset_drops_entries_and_adopts_the_new_version(tmp_path):
+    cache = make_cache()
+    cache.add("What is topic comment structure?", "grammar_expert", "answer")
+    cache.reset("v2")
+
+    assert len(cache) == 0
+    assert cache.config_version == "v2"
+    assert cache.lookup("What is topic comment structure?", "grammar_expert") is None
+
+
+def test_content_terms_drop_framing_and_fold_plurals():
+    assert content_terms("Can you explain topic-comment structures?") == ["topic", "comment", "structure"]
+    assert content_terms("How do I get a Deaf person's attention?") == ["get", "deaf", "person", "attention"]
+
+
+def test_default_threshold_serves_no_labelled_near_miss():
+    with open(os.path.join(DATA, "semantic_cache_pairs.jsonl"), encoding="utf-8") as f:
+        pairs = [json.loads(line) for line in f if line.strip()]
+
+    (result,) = calibrate(pairs, [DEFAULT_THRESHOLD])
+    assert result["false_hits"] == 0
+    assert result["hits"] >= result["paraphrases"] // 2
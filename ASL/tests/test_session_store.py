@@ -0,0 +1,100 @@
+"""
+Tests for src/session_store.py: compaction to the token budget, expiry and backends.
+"""
+
+import asyncio
+
+from src.session_store import DiskSessionBackend, SessionStore, summarize_turn
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def append(store, session_id, turns):
+    asyncio.run(store.append_turns(session_id, turns))
+
+
+def load(store, session_id):
+    return store.backend.load(session_id)
+
+
+def test_short_history_is_kept_verbatim():
+    store = SessionStore(token_budget=500)
+    append(store, "s1", [("user", "How do I sign thank you?"), ("assistant", "Flat hand from the chin.")])
+
+    prompt = asyncio.run(store.build_prompt("s1", "And please?"))
+
+    assert "Learner: How do I sign thank you?" in prompt
+    assert "Assistant: Flat hand from the chin." in prompt
+    assert prompt.endswith("Current question: And please?")
+
+
+def test_old_turns_fold_into_the_summary():
+    store = SessionStore(token_budget=60, summary_budget=40)
+    for index in range(6):
+        append(store, "s1", [("user", f"Question {index}. " + "detail " * 20)])
+
+    state = load(store, "s1")
+
+    assert state.tokens <= store.token_budget
+    assert state.turns[-1][1].startswith("Question 5.")
+    assert "Learner: Question" in state.summary
+    assert len(state.summary) <= store.summary_budget * 4
+
+
+def test_single_turn_over_budget_is_truncated():
+    store = SessionStore(token_budget=50, summary_budget=20)
+    long_answer = "Fingerspelling uses one hand. " * 40
+    append(store, "s1", [("assistant", long_answer)])
+
+    state = load(store, "s1")
+
+    assert len(state.turns) == 1
+    role, text, tokens = state.turns[0]
+    assert role == "assistant"
+    assert text.startswith("Fingerspelling uses one hand.")
+    assert text.endswith("...")
+    assert state.tokens <= store.token_budget
+
+
+def test_last_turn_is_truncated_after_older_turns_are_summarized():
+    store = SessionStore(token_budget=80, summary_budget=30)
+    append(store, "s1", [("user", "What is a classifier?"), ("assistant", "Classifiers show shape. " * 60)])
+
+    state = load(store, "s1")
+
+    assert state.summary == summarize_turn("user", "What is a classifier?")
+    assert len(state.turns) == 1
+    assert state.turns[0][1].endswith("...")
+    assert state.tokens <= store.token_budget
+
+
+def test_idle_sessions_expire():
+    clock = Clock()
+    store = SessionStore(idle_ttl_seconds=60, clock=clock)
+    append(store, "s1", [("user", "Hello")])
+    assert asyncio.run(store.has_history("s1"))
+
+    clock.now += 61
+
+    assert not asyncio.run(store.has_history("s1"))
+    assert asyncio.run(store.build_prompt("s1", "Hi again")) == "Hi again"
+
+
+def test_disk_backend_round_trips(tmp_path):
+    store = SessionStore(backend=DiskSessionBackend(str(tmp_path)))
+    append(store, "learner/1", [("user", "How do I sign water?"), ("assistant", "W handshape at the chin.")])
+
+    reopened = SessionStore(backend=DiskSessionBackend(str(tmp_path)))
+    state = load(reopened, "learner/1")
+
+    assert [turn[:2] for turn in state.turns] == [
+        ("user", "How do I sign water?"),
+        ("assistant", "W handshape at the chin."),
+    ]
+    assert reopened.sweep() == 0
@@ -0,0 +1,30 @@
+"""
+Tests for src/sign_lexicon.py: pulling the sign term out of a lookup question.
+"""
+
+import pytest
+
+from src.sign_lexicon import extract_sign_term
+
+
+@pytest.mark.parametrize(
+    "question, term",
+    [
+        ("How do I sign thank you?", "thank you"),
+        ("how to sign 'book' in ASL please", "book"),
+        ("how to sign 'book' please in ASL", "book"),
+        ("What's the sign for \"mom\", please?", "mom"),
+        ("sign for book in american sign language", "book"),
+        ("How do you sign don't?", "don't"),
+    ],
+)
+def test_extracts_the_term_without_filler_or_quotes(question, term):
+    assert extract_sign_term(question) == term
+
+
+def test_other_questions_are_not_sign_lookups():
+    assert extract_sign_term("What is Deaf culture?") is None
+
+
+def test_a_filler_word_can_itself_be_the_term():
+    assert extract_sign_term("How do I sign 'please'?") == "please"
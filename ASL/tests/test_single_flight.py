@@ -0,0 +1,137 @@
+"""
+Tests for src/single_flight.py: shared executions, replay, disconnects and errors.
+"""
+
+import asyncio
+
+import pytest
+
+from src.single_flight import SingleFlight
+
+
+class Source:
+    """Frame iterator factory that counts executions and releases frames on demand."""
+
+    def __init__(self, frames, error=None):
+        self.frames = frames
+        self.error = error
+        self.executions = 0
+        self.cancelled = False
+        self.gate = asyncio.Event()
+
+    async def execute(self):
+        self.executions += 1
+        try:
+            for index, frame in enumerate(self.frames):
+                if index == 1:
+                    # Everything after the first frame waits for the test
+                    await self.gate.wait()
+                yield frame
+            if self.error is not None:
+                raise self.error
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _collect(subscription):
+    return [frame async for frame in subscription.frames()]
+
+
+def test_concurrent_requests_share_one_execution_and_late_joiners_replay():
+    async def scenario():
+        coalescer = SingleFlight()
+        source = Source(["a", "b", "c"])
+
+        leader = coalescer.join("key", source.execute)
+        leader_frames = asyncio.ensure_future(_collect(leader))
+        await _settle()
+
+        # Joins after "a" was produced
+        follower = coalescer.join("key", source.execute)
+        follower_frames = asyncio.ensure_future(_collect(follower))
+        await _settle()
+
+        source.gate.set()
+        assert await leader_frames == ["a", "b", "c"]
+        assert await follower_frames == ["a", "b", "c"]
+        assert leader.leader and not follower.leader
+        assert source.executions == 1
+        assert coalescer.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_a_finished_execution_is_not_reused():
+    async def scenario():
+        coalescer = SingleFlight()
+        source = Source(["a"])
+
+        assert await _collect(coalescer.join("key", source.execute)) == ["a"]
+        second = coalescer.join("key", source.execute)
+        assert second.leader
+        assert await _collect(second) == ["a"]
+        assert source.executions == 2
+
+    asyncio.run(scenario())
+
+
+def test_leader_disconnect_does_not_cut_off_followers():
+    async def scenario():
+        coalescer = SingleFlight()
+        source = Source(["a", "b", "c"])
+
+        leader = coalescer.join("key", source.execute)
+        follower = coalescer.join("key", source.execute)
+        follower_frames = asyncio.ensure_future(_collect(follower))
+        await _settle()
+
+        leader.close()
+        source.gate.set()
+        assert await follower_frames == ["a", "b", "c"]
+        assert not source.cancelled
+
+    asyncio.run(scenario())
+
+
+def test_execution_is_cancelled_when_its_last_subscriber_leaves():
+    async def scenario():
+        coalescer = SingleFlight()
+        source = Source(["a", "b"])
+
+        first = coalescer.join("key", source.execute)
+        second = coalescer.join("key", source.execute)
+        await _settle()
+
+        first.close()
+        second.close()
+        # Closing twice must not unsubscribe twice
+        second.close()
+        await _settle()
+
+        assert source.cancelled
+        assert coalescer.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_subscriber_after_the_frames():
+    async def scenario():
+        coalescer = SingleFlight()
+        source = Source(["a", "b"], error=RuntimeError("model failed"))
+        source.gate.set()
+
+        subscriptions = [coalescer.join("key", source.execute) for _ in range(2)]
+        for subscription in subscriptions:
+            received = []
+            with pytest.raises(RuntimeError, match="model failed"):
+                async for frame in subscription.frames():
+                    received.append(frame)
+            assert received == ["a", "b"]
+
+    asyncio.run(scenario())
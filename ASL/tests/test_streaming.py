@@ -0,0 +1,157 @@
+"""
+Tests for src/streaming.py: token-by-token forwarding and dropping handoff chatter.
+"""
+
+import asyncio
+import types
+
+from src.streaming import HANDOFF_TOOL_NAME, StreamTimer, SwarmStream
+
+
+class FakeSwarm:
+    """Replays recorded Swarm events, noting how many were read; `nodes` mimics Swarm.nodes when given."""
+
+    def __init__(self, events, nodes=None):
+        self.events = events
+        self.read = 0
+        if nodes is not None:
+            self.nodes = nodes
+
+    async def stream_async(self, task, **kwargs):
+        for event in self.events:
+            self.read += 1
+            yield event
+
+
+def node(*tools):
+    registry = {name: object() for name in tools}
+    return types.SimpleNamespace(executor=types.SimpleNamespace(tool_registry=types.SimpleNamespace(registry=registry)))
+
+
+def stream(node_id, event):
+    return {"type": "multiagent_node_stream", "node_id": node_id, "event": event}
+
+
+def message_start(node_id):
+    return stream(node_id, {"event": {"messageStart": {"role": "assistant"}}})
+
+
+def handoff_start(node_id):
+    return stream(node_id, {"event": {"contentBlockStart": {"start": {"toolUse": {"name": HANDOFF_TOOL_NAME}}}}})
+
+
+def text(node_id, data):
+    return stream(node_id, {"data": data})
+
+
+def message(node_id, *content):
+    return stream(node_id, {"message": {"role": "assistant", "content": list(content)}})
+
+
+HANDOFF = {"toolUse": {"name": HANDOFF_TOOL_NAME, "input": {"agent_name": "grammar_expert"}}}
+
+
+def run(events, nodes=None):
+    """Returns (events read so far, frame) pairs and the finished SwarmStream."""
+
+    swarm = FakeSwarm(events, nodes)
+    swarm_stream = SwarmStream(swarm, "question", timer=StreamTimer(), coordinator_name="coordinator")
+
+    async def collect():
+        return [(swarm.read, frame) async for frame in swarm_stream.frames()]
+
+    return asyncio.run(collect()), swarm_stream
+
+
+def test_text_is_forwarded_delta_by_delta():
+    events = [
+        {"type": "multiagent_node_start", "node_id": "vocabulary_agent"},
+        message_start("vocabulary_agent"),
+        text("vocabulary_agent", "Sign "),
+        text("vocabulary_agent", "THANK-YOU "),
+        text("vocabulary_agent", "from the chin."),
+        message("vocabulary_agent", {"text": "Sign THANK-YOU from the chin."}),
+        {"type": "multiagent_node_stop", "node_id": "vocabulary_agent"},
+    ]
+    frames, swarm_stream = run(events)
+
+    # Each delta goes out before the next event is read
+    assert [(read, frame["data"]) for read, frame in frames] == [
+        (3, "Sign "),
+        (4, "THANK-YOU "),
+        (5, "from the chin."),
+    ]
+    assert swarm_stream.text == "Sign THANK-YOU from the chin."
+
+
+def test_coordinator_text_is_not_forwarded():
+    events = [
+        {"type": "multiagent_node_start", "node_id": "coordinator"},
+        text("coordinator", "Routing to grammar."),
+        {"type": "multiagent_node_start", "node_id": "grammar_expert"},
+        text("grammar_expert", "Topic first."),
+    ]
+    frames, swarm_stream = run(events)
+    assert [frame["data"] for _, frame in frames] == ["Topic first."]
+
+
+def test_message_opening_with_a_handoff_is_dropped():
+    events = [
+        {"type": "multiagent_node_start", "node_id": "vocabulary_agent"},
+        message_start("vocabulary_agent"),
+        handoff_start("vocabulary_agent"),
+        text("vocabulary_agent", "Passing this to grammar."),
+        message("vocabulary_agent", HANDOFF, {"text": "Passing this to grammar."}),
+        {"type": "multiagent_handoff", "from_node_ids": ["vocabulary_agent"], "to_node_ids": ["grammar_expert"]},
+        {"type": "multiagent_node_start", "node_id": "grammar_expert"},
+        message_start("grammar_expert"),
+        text("grammar_expert", "Topic first."),
+    ]
+    frames, swarm_stream = run(events)
+    assert [frame["data"] for _, frame in frames] == ["Topic first."]
+    assert swarm_stream.node_path == ["vocabulary_agent", "grammar_expert"]
+
+
+def test_held_message_that_does_not_hand_off_is_forwarded_when_complete():
+    events = [
+        {"type": "multiagent_node_start", "node_id": "vocabulary_agent"},
+        message_start("vocabulary_agent"),
+        handoff_start("vocabulary_agent"),
+        text("vocabulary_agent", "On second thought, "),
+        text("vocabulary_agent", "sign it like this."),
+        message("vocabulary_agent", {"text": "On second thought, sign it like this."}),
+        {"type": "multiagent_node_stop", "node_id": "vocabulary_agent"},
+    ]
+    frames, swarm_stream = run(events)
+    assert [frame["data"] for _, frame in frames] == ["On second thought, sign it like this."]
+
+
+def test_agent_that_cannot_hand_off_never_holds_text_back():
+    events = [
+        {"type": "multiagent_node_start", "node_id": "vocabulary_agent"},
+        message_start("vocabulary_agent"),
+        handoff_start("vocabulary_agent"),
+        text("vocabulary_agent", "Sign "),
+        text("vocabulary_agent", "it."),
+    ]
+    # Fast path: a Swarm of one agent
+    frames, _ = run(events, nodes={"vocabulary_agent": node(HANDOFF_TOOL_NAME)})
+    assert [frame["data"] for _, frame in frames] == ["Sign ", "it."]
+
+    # An agent without the handoff tool
+    frames, _ = run(events, nodes={"vocabulary_agent": node(), "grammar_expert": node(HANDOFF_TOOL_NAME)})
+    assert [frame["data"] for _, frame in frames] == ["Sign ", "it."]
+
+
+def test_each_message_decides_its_own_mode():
+    events = [
+        {"type": "multiagent_node_start", "node_id": "learning_agent"},
+        message_start("learning_agent"),
+        handoff_start("learning_agent"),
+        text("learning_agent", "Handing off."),
+        message("learning_agent", HANDOFF),
+        message_start("learning_agent"),
+        text("learning_agent", "Try these apps."),
+    ]
+    frames, _ = run(events)
+    assert [frame["data"] for _, frame in frames] == ["Try these apps."]
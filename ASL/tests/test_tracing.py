@@ -0,0 +1,175 @@
+"""
+Tests for src/tracing.py: agent spans, handoffs, aggregates, sampling and export.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import types
+
+import pytest
+
+from src.streaming import StreamTimer, SwarmStream
+from src.tracing import JsonLogExporter, Tracer, tracer_from_env
+
+
+class ListExporter:
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans):
+        self.batches.append(spans)
+
+
+class FailingExporter:
+    def export(self, spans):
+        raise RuntimeError("collector down")
+
+
+def agent_result(input_tokens, output_tokens, latency_ms):
+    return types.SimpleNamespace(
+        accumulated_usage={"inputTokens": input_tokens, "outputTokens": output_tokens},
+        accumulated_metrics={"latencyMs": latency_ms},
+    )
+
+
+def test_agent_turns_and_handoffs_become_child_spans():
+    exporter = ListExporter()
+    trace = Tracer([exporter], sample_rate=1.0).start_trace("agent_invocation", session_id="s1")
+
+    coordinator = trace.start_agent("coordinator")
+    trace.handoff("coordinator", "grammar_expert", span=coordinator)
+    trace.end_agent(coordinator, agent_result(100, 10, 50))
+    grammar = trace.start_agent("grammar_expert", handoff_source="coordinator")
+    trace.end_agent(grammar, agent_result(200, 80, 400))
+    trace.finish(status="completed")
+
+    [spans] = exporter.batches
+    root, *children = spans
+    assert root.parent_id is None and root.status == "completed"
+    assert [span.parent_id for span in children] == [root.span_id, root.span_id]
+    assert {span.trace_id for span in spans} == {trace.trace_id}
+    assert coordinator.attributes["handoff_target"] == "grammar_expert"
+    assert grammar.attributes["handoff_source"] == "coordinator"
+    assert grammar.attributes["input_tokens"] == 200
+    assert grammar.attributes["model_latency_ms"] == 400
+
+    assert root.attributes["session_id"] == "s1"
+    assert root.attributes["handoffs"] == 1
+    assert root.attributes["agent_turns"] == 2
+    assert root.attributes["input_tokens"] == 300
+    assert root.attributes["output_tokens"] == 90
+    assert root.attributes["model_latency_ms"] == 450
+
+
+def test_finish_closes_open_spans_once():
+    exporter = ListExporter()
+    trace = Tracer([exporter], sample_rate=1.0).start_trace("agent_invocation")
+    span = trace.start_agent("vocabulary_agent")
+
+    trace.finish(status="cancelled")
+    trace.finish(status="ok")
+
+    assert len(exporter.batches) == 1
+    assert span.status == "cancelled" and span.end_ns is not None
+    assert trace.root.status == "cancelled"
+
+
+def test_results_arriving_after_the_turn_are_attached():
+    trace = Tracer().start_trace("agent_invocation")
+    span = trace.start_agent("vocabulary_agent")
+    trace.end_agent(span)
+
+    trace.attach_results({"vocabulary_agent": agent_result(40, 12, 30)})
+
+    assert span.attributes["input_tokens"] == 40
+    assert trace.aggregates()["output_tokens"] == 12
+
+
+def test_only_sampled_requests_are_exported():
+    exporter = ListExporter()
+    tracer = Tracer([exporter], sample_rate=0.0)
+
+    tracer.start_trace("agent_invocation").finish()
+    tracer.start_trace("agent_invocation", force_sample=True).finish()
+
+    assert len(exporter.batches) == 1
+    assert not Tracer([], sample_rate=1.0).start_trace("agent_invocation", force_sample=True).sampled
+
+
+def test_failing_exporter_does_not_fail_the_request():
+    exporter = ListExporter()
+    trace = Tracer([FailingExporter(), exporter], sample_rate=1.0).start_trace("agent_invocation")
+
+    trace.finish()
+
+    assert len(exporter.batches) == 1
+
+
+def test_json_exporter_writes_one_line_per_span():
+    stream = io.StringIO()
+    log = logging.getLogger("asl.trace.test")
+    log.addHandler(logging.StreamHandler(stream))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    trace = Tracer([JsonLogExporter(log)], sample_rate=1.0).start_trace("agent_invocation")
+    trace.end_agent(trace.start_agent("vocabulary_agent"))
+
+    trace.finish()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["name"] for line in lines] == ["agent_invocation", "agent_turn"]
+    assert lines[1]["attributes"]["agent"] == "vocabulary_agent"
+
+
+def test_tracer_from_env_rejects_unknown_exporters(monkeypatch):
+    monkeypatch.setenv("ASL_TRACE_EXPORTERS", "json,zipkin")
+
+    with pytest.raises(ValueError, match="zipkin"):
+        tracer_from_env()
+
+    monkeypatch.setenv("ASL_TRACE_EXPORTERS", "none")
+    assert tracer_from_env().exporters == []
+
+
+class FakeSwarm:
+    def __init__(self, events, result=None):
+        self.events = events
+        self.result = result
+
+    async def stream_async(self, task, **kwargs):
+        for event in self.events:
+            yield event
+        yield {"type": "multiagent_result", "result": self.result}
+
+
+def test_swarm_stream_records_a_span_per_agent_turn():
+    result = types.SimpleNamespace(
+        results={"coordinator": agent_result(50, 5, 20), "grammar_expert": agent_result(150, 60, 300)}
+    )
+    swarm = FakeSwarm(
+        [
+            {"type": "multiagent_node_start", "node_id": "coordinator"},
+            {"type": "multiagent_handoff", "from_node_ids": ["coordinator"], "to_node_ids": ["grammar_expert"]},
+            {"type": "multiagent_node_stop", "node_id": "coordinator"},
+            {"type": "multiagent_node_start", "node_id": "grammar_expert"},
+            {"type": "multiagent_node_stream", "node_id": "grammar_expert", "event": {"data": "Answer."}},
+            {"type": "multiagent_node_stop", "node_id": "grammar_expert"},
+        ],
+        result,
+    )
+    trace = Tracer().start_trace("agent_invocation")
+    swarm_stream = SwarmStream(swarm, "question", timer=StreamTimer(), coordinator_name="coordinator", trace=trace)
+
+    async def collect():
+        return [frame async for frame in swarm_stream.frames()]
+
+    asyncio.run(collect())
+
+    coordinator, grammar = trace.agent_spans
+    assert coordinator.attributes["handoff_target"] == "grammar_expert"
+    assert grammar.attributes["handoff_source"] == "coordinator"
+    assert all(span.end_ns is not None for span in trace.agent_spans)
+    assert trace.aggregates()["handoffs"] == 1
+    assert trace.aggregates()["input_tokens"] == 200